@@ -0,0 +1,14 @@
+"""
+性能基准套件
+
+覆盖接收显示链路上的热点：ANSI 解析、终端模拟、文档裁剪、日志视图追加、
+HEX 格式化、校验和，以及按不同波特率模拟的完整接收路径。
+
+运行::
+
+    python -m benchmarks                   # 全部用例，与 baseline.json 比较
+    python -m benchmarks -k receive_path   # 只跑名字包含 receive_path 的用例
+    python -m benchmarks --save-baseline   # 把本次结果写成新基线
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
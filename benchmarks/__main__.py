@@ -0,0 +1,184 @@
+"""
+基准测试入口：python -m benchmarks
+
+默认每个用例在独立子进程中运行，峰值 RSS 才对应单个用例；结果写入 JSON，
+并与基线比较，有指标变差超过容差时以退出码 1 结束。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import NoReturn, Optional, Sequence
+
+from benchmarks.harness import BenchmarkResult
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCHMARK_DIR.parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCHMARK_DIR / "results" / "latest.json"
+
+
+def _isolate(workdir: Path) -> None:
+    """界面用例不能读写用户配置和真实的裁剪日志目录。"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    tempfile.tempdir = str(workdir)
+    from utils.config_manager import ConfigManager
+
+    config_dir = workdir / "config"
+    ConfigManager._CONFIG_DIR = config_dir
+    ConfigManager._SETTINGS_FILE = config_dir / "settings.json"
+    ConfigManager._QUICK_SEND_FILE = config_dir / "quick_sends.json"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run hot-path benchmarks and compare against a baseline.",
+    )
+    parser.add_argument(
+        "-k", dest="keyword", help="only cases whose name contains this"
+    )
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="seconds per case"
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="write results as the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="allowed relative regression before failing (default 0.3)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="run all cases in this process (faster; peak RSS is cumulative)",
+    )
+    # 内部使用：子进程只跑一个用例并把结果以 JSON 打印到标准输出，
+    # 工作目录由父进程创建和清理
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    return parser
+
+
+def _run_in_subprocess(
+    name: str, min_time: float, workdir: Path
+) -> BenchmarkResult:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks",
+            "--case",
+            name,
+            "--min-time",
+            str(min_time),
+            "--workdir",
+            str(workdir),
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return BenchmarkResult.from_dict(json.loads(completed.stdout.splitlines()[-1]))
+
+
+def _format(result: BenchmarkResult) -> str:
+    throughput = (
+        f"{result.bytes_per_sec / 1e6:9.2f} MB/s"
+        if result.bytes_per_sec is not None
+        else " " * 14
+    )
+    rss = f"{result.peak_rss_kb / 1024:7.1f} MiB" if result.peak_rss_kb else ""
+    return (
+        f"{result.name:<44} {result.ops_per_sec:12.1f} ops/s "
+        f"p50 {result.p50_ms:8.3f} ms  p99 {result.p99_ms:8.3f} ms "
+        f"{throughput} {rss}"
+    )
+
+
+def _run_single(name: str, min_time: float, workdir: Path) -> NoReturn:
+    _isolate(workdir)
+    from benchmarks import cases  # noqa: F401  登记用例
+    from benchmarks.harness import CASES, run_case
+
+    result = run_case(CASES[name], min_time=min_time)
+    print(json.dumps(result.to_dict()), flush=True)
+    # 跳过 Qt 对象析构，子进程直接退出
+    os._exit(0)
+
+
+def _run_all(args: argparse.Namespace, workdir: Path) -> int:
+    _isolate(workdir)
+
+    from benchmarks import cases  # noqa: F401  登记用例
+    from benchmarks.harness import (
+        CASES,
+        compare,
+        load_results,
+        run_case,
+        save_results,
+    )
+
+    selected = [
+        name for name in CASES if not args.keyword or args.keyword in name
+    ]
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    results = {}
+    for name in selected:
+        if args.in_process:
+            result = run_case(CASES[name], min_time=args.min_time)
+        else:
+            result = _run_in_subprocess(name, args.min_time, workdir)
+        results[name] = result
+        print(_format(result), flush=True)
+
+    save_results(args.output, results)
+    print(f"\nresults written to {args.output}")
+    if args.save_baseline:
+        baseline = load_results(args.baseline) if args.baseline.exists() else {}
+        baseline.update(results)
+        save_results(args.baseline, baseline)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline")
+        return 0
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression.description}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.case:
+        # 子进程以 os._exit 结束，不能自己持有需要清理的临时目录
+        if args.workdir is None:
+            parser.error("--case requires --workdir")
+        _run_single(args.case, args.min_time, args.workdir)
+
+    with tempfile.TemporaryDirectory(prefix="SerialMonitorBench_") as workdir:
+        return _run_all(args, Path(workdir))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
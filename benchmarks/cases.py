@@ -0,0 +1,243 @@
+"""
+基准用例
+
+界面相关用例需要 QApplication（offscreen 平台即可）和隔离的配置目录，
+由 `benchmarks.__main__` 在导入本模块前准备好。
+"""
+
+from __future__ import annotations
+
+import itertools
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from PyQt6.QtGui import QTextCursor, QTextDocument
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import Operation, benchmark
+from core.ansi_parser import AnsiParser
+from core.loopback import TrafficConfig, TrafficGenerator, TrafficProfile
+from core.protocol import ChecksumEndMode, apply_checksum, format_hex
+
+# ReceiveAccumulator 默认每 16ms 刷新一帧；接收路径用例的一次操作即一帧
+FRAME_SECONDS = 0.016
+# 串口读线程合并后交给 GUI 的典型数据块大小
+READ_CHUNK_BYTES = 256
+_KEEPALIVE: list[Any] = []
+
+
+def _app() -> QApplication:
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+        _KEEPALIVE.append(app)
+    return app  # type: ignore[return-value]
+
+
+@lru_cache(maxsize=None)
+def _stream(profile: TrafficProfile, size: int = 1024 * 1024) -> bytes:
+    """用固定 seed 生成的测试数据，相同配置每次运行内容一致。"""
+    config = TrafficConfig(profile, bytes_per_second=0, total_bytes=size, seed=1)
+    return b"".join(chunk for _, chunk in TrafficGenerator(config))
+
+
+_Sliceable = TypeVar("_Sliceable", str, bytes)
+
+
+def _slices(data: _Sliceable, size: int) -> itertools.cycle[_Sliceable]:
+    return itertools.cycle(
+        [data[i : i + size] for i in range(0, len(data) - size + 1, size)]
+    )
+
+
+def _monitor(**attributes: Any) -> Any:
+    from ui.main_window import SerialMonitor
+
+    _app()
+    monitor = SerialMonitor()
+    for name, value in attributes.items():
+        setattr(monitor, name, value)
+    _KEEPALIVE.append(monitor)
+    return monitor
+
+
+# ── 解析与格式化 ─────────────────────────────────────────
+
+
+@benchmark(
+    "ansi_parser.parse_text",
+    {
+        "plain": {"profile": TrafficProfile.LINES},
+        "ansi": {"profile": TrafficProfile.ANSI},
+    },
+)
+def parse_text(profile: TrafficProfile) -> Operation:
+    _app()
+    parser = AnsiParser()
+    texts = _slices(_stream(profile).decode("utf-8", "replace"), 4096)
+
+    def run() -> int:
+        text = next(texts)
+        parser.parse_text(text)
+        return len(text)
+
+    return run
+
+
+@benchmark(
+    "protocol.format_hex",
+    {"64B": {"size": 64}, "4KiB": {"size": 4096}},
+    inner_loops=20,
+)
+def format_hex_case(size: int) -> Operation:
+    data = _stream(TrafficProfile.BINARY)[:size]
+
+    def run() -> int:
+        format_hex(data)
+        return size
+
+    return run
+
+
+@benchmark(
+    "protocol.apply_checksum",
+    {"64B": {"size": 64}, "4KiB": {"size": 4096}},
+    inner_loops=20,
+)
+def apply_checksum_case(size: int) -> Operation:
+    data = _stream(TrafficProfile.BINARY)[:size]
+
+    def run() -> int:
+        apply_checksum(
+            data, checksum_start_1based=1, checksum_end_mode=ChecksumEndMode.END
+        )
+        return size
+
+    return run
+
+
+# ── 终端模拟 ─────────────────────────────────────────────
+
+
+def _emulator() -> Any:
+    from ui.terminal_emulator import TerminalEmulator
+
+    _app()
+    emulator = TerminalEmulator(rows=24, cols=80)
+    _KEEPALIVE.append(emulator)
+    return emulator
+
+
+@benchmark(
+    "terminal_emulator.process_bytes",
+    {
+        "plain": {"profile": TrafficProfile.LINES},
+        "ansi": {"profile": TrafficProfile.ANSI},
+    },
+)
+def process_bytes(profile: TrafficProfile) -> Operation:
+    emulator = _emulator()
+    chunks = _slices(_stream(profile), 4096)
+
+    def run() -> int:
+        chunk = next(chunks)
+        emulator.process_bytes(chunk)
+        return len(chunk)
+
+    return run
+
+
+@benchmark("terminal_emulator._render_full")
+def render_full() -> Operation:
+    emulator = _emulator()
+    # 先铺满一屏彩色内容，渲染时每行都有多段格式
+    emulator.process_bytes(_stream(TrafficProfile.ANSI)[:16384])
+    return emulator._render_full
+
+
+# ── 日志视图 ─────────────────────────────────────────────
+
+
+@benchmark("trim_manager.trim_if_needed")
+def trim_if_needed() -> Operation:
+    """文档保持在上限附近：每次追加一批行并裁剪掉同样多的旧行。"""
+    from ui.main_window import TerminalTrimManager
+
+    _app()
+    manager = TerminalTrimManager()
+    _KEEPALIVE.append(manager)
+    document = QTextDocument()
+    _KEEPALIVE.append(document)
+    lines = _stream(TrafficProfile.LINES).decode().splitlines()
+    cursor = QTextCursor(document)
+    cursor.insertText("\n".join(lines[: manager.max_lines]))
+    batch = "\n" + "\n".join(lines[: manager.batch_lines])
+
+    def run() -> None:
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(batch)
+        manager.trim_if_needed(document)
+
+    return run
+
+
+@benchmark(
+    "main_window.append_to_terminal",
+    {
+        "plain": {"profile": TrafficProfile.LINES, "ansi_colors": False},
+        "ansi": {"profile": TrafficProfile.ANSI, "ansi_colors": True},
+    },
+)
+def append_to_terminal(profile: TrafficProfile, ansi_colors: bool) -> Operation:
+    monitor = _monitor(enable_ansi_colors=ansi_colors)
+    lines = itertools.cycle(
+        _stream(profile).decode("utf-8", "replace").splitlines(keepends=True)
+    )
+
+    def run() -> int:
+        line = next(lines)
+        monitor.append_to_terminal(line)
+        return len(line)
+
+    return run
+
+
+# ── 完整接收路径 ─────────────────────────────────────────
+
+
+_RECEIVE_RATES = {
+    "115200": {"baudrate": 115200},
+    "921600": {"baudrate": 921600},
+    "3M": {"baudrate": 3_000_000},
+    "921600-hex": {"baudrate": 921600, "hex_mode": True},
+    "921600-terminal": {"baudrate": 921600, "terminal_mode": True},
+}
+
+
+@benchmark("receive_path", _RECEIVE_RATES)
+def receive_path(
+    baudrate: int, hex_mode: bool = False, terminal_mode: bool = False
+) -> Operation:
+    """一次操作 = 该波特率下一个显示帧到达的数据：分块进入合并管线并刷新。
+
+    p50 与 16ms 帧间隔之比即该速率下显示链路的占用率，超过 1 说明跟不上。
+    """
+    monitor = _monitor(receive_hex_mode=hex_mode)
+    if terminal_mode:
+        monitor.toggle_terminal_mode()
+    profile = TrafficProfile.ANSI if terminal_mode else TrafficProfile.LINES
+    frame_bytes = max(1, int(baudrate / 10 * FRAME_SECONDS))
+    frames = _slices(_stream(profile), frame_bytes)
+    pipeline = monitor.receive_pipeline
+    app = _app()
+
+    def run() -> int:
+        frame = next(frames)
+        for offset in range(0, len(frame), READ_CHUNK_BYTES):
+            pipeline.push(frame[offset : offset + READ_CHUNK_BYTES])
+        pipeline.flush()
+        # 终端模拟器的重绘排在事件循环里，一并计入
+        app.processEvents()
+        return len(frame)
+
+    return run
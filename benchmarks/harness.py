@@ -0,0 +1,235 @@
+"""
+基准测试框架：用例登记、计时、结果比较
+
+每个用例是一个工厂函数：接收参数、完成准备工作后返回一次操作的可调用对象。
+框架先预热，再反复调用并逐次计时，直到累计时间达到 `min_time`，由此得出
+每秒操作数与单次延迟的 p50/p99。峰值 RSS 取自进程的 `ru_maxrss`，
+只有每个用例在独立子进程中运行时才对应单个用例。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# 工厂返回的一次操作；返回值为本次处理的字节数时计入吞吐
+Operation = Callable[[], Any]
+Factory = Callable[..., Operation]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    factory: Factory
+    params: dict[str, Any] = field(default_factory=dict)
+    # 单次操作很快的用例可调大，避免计时本身的开销占比过高
+    inner_loops: int = 1
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    ops: int
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_kb: Optional[int]
+    bytes_per_sec: Optional[float] = None
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BenchmarkResult:
+        return cls(
+            name=str(data["name"]),
+            ops=int(data["ops"]),
+            ops_per_sec=float(data["ops_per_sec"]),
+            p50_ms=float(data["p50_ms"]),
+            p99_ms=float(data["p99_ms"]),
+            peak_rss_kb=(
+                int(data["peak_rss_kb"])
+                if data.get("peak_rss_kb") is not None
+                else None
+            ),
+            bytes_per_sec=(
+                float(data["bytes_per_sec"])
+                if data.get("bytes_per_sec") is not None
+                else None
+            ),
+            params=dict(data.get("params") or {}),
+        )
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """与基线相比的一项指标变化；`change` 为相对变化，正数表示变差。"""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+    @property
+    def description(self) -> str:
+        return (
+            f"{self.name}: {self.metric} {self.baseline:.4g} -> "
+            f"{self.current:.4g} ({self.change:+.1%})"
+        )
+
+
+CASES: dict[str, BenchmarkCase] = {}
+
+# 低于此值的延迟主要是计时噪声，不参与比较
+MIN_COMPARED_LATENCY_MS = 0.01
+
+
+def benchmark(
+    name: str,
+    variants: Optional[dict[str, dict[str, Any]]] = None,
+    *,
+    inner_loops: int = 1,
+) -> Callable[[Factory], Factory]:
+    """登记用例。给出 `variants` 时每组参数登记为 ``name[变体]``。"""
+
+    def register(factory: Factory) -> Factory:
+        for suffix, params in (variants or {"": {}}).items():
+            case_name = f"{name}[{suffix}]" if suffix else name
+            if case_name in CASES:
+                raise ValueError(f"duplicate benchmark case {case_name}")
+            CASES[case_name] = BenchmarkCase(
+                case_name, factory, dict(params), inner_loops
+            )
+        return factory
+
+    return register
+
+
+def peak_rss_kb() -> Optional[int]:
+    """进程峰值常驻内存（KiB）；平台不支持时为 None。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节计，Linux 以 KiB 计
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[max(0, index)]
+
+
+def run_case(
+    case: BenchmarkCase,
+    *,
+    min_time: float = 1.0,
+    max_ops: int = 1_000_000,
+    warmup: int = 3,
+) -> BenchmarkResult:
+    operation = case.factory(**case.params)
+    for _ in range(warmup):
+        operation()
+
+    loops = max(1, case.inner_loops)
+    samples: list[float] = []
+    processed = 0
+    counted_bytes = True
+    total = 0.0
+    clock = time.perf_counter
+    while total < min_time and len(samples) * loops < max_ops:
+        started = clock()
+        for _ in range(loops):
+            result = operation()
+        elapsed = clock() - started
+        total += elapsed
+        samples.append(elapsed / loops)
+        if isinstance(result, int) and not isinstance(result, bool):
+            processed += result * loops
+        else:
+            counted_bytes = False
+
+    samples.sort()
+    ops = len(samples) * loops
+    return BenchmarkResult(
+        name=case.name,
+        ops=ops,
+        ops_per_sec=ops / total if total > 0 else 0.0,
+        p50_ms=_percentile(samples, 0.50) * 1000,
+        p99_ms=_percentile(samples, 0.99) * 1000,
+        peak_rss_kb=peak_rss_kb(),
+        bytes_per_sec=processed / total if counted_bytes and total > 0 else None,
+        params=case.params,
+    )
+
+
+def compare(
+    results: dict[str, BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    tolerance: float = 0.3,
+) -> list[Comparison]:
+    """找出比基线差超过 `tolerance` 的指标（吞吐下降、延迟或内存上升）。"""
+    regressions: list[Comparison] = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        metrics: list[tuple[str, Optional[float], Optional[float], bool]] = [
+            ("ops_per_sec", previous.ops_per_sec, current.ops_per_sec, True),
+            ("p99_ms", previous.p99_ms, current.p99_ms, False),
+            ("peak_rss_kb", previous.peak_rss_kb, current.peak_rss_kb, False),
+        ]
+        for metric, before, after, higher_is_better in metrics:
+            if before is None or after is None or before <= 0:
+                continue
+            if metric == "p99_ms" and before < MIN_COMPARED_LATENCY_MS:
+                continue
+            change = (before - after) / before
+            if not higher_is_better:
+                change = -change
+            if change > tolerance:
+                regressions.append(Comparison(name, metric, before, after, change))
+    return regressions
+
+
+def environment() -> dict[str, str]:
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save_results(path: Path, results: dict[str, BenchmarkResult]) -> None:
+    payload = {
+        "environment": environment(),
+        "results": {name: result.to_dict() for name, result in sorted(results.items())},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def load_results(path: Path) -> dict[str, BenchmarkResult]:
+    payload = json.loads(path.read_text())
+    return {
+        name: BenchmarkResult.from_dict(data)
+        for name, data in (payload.get("results") or {}).items()
+    }
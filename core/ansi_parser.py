@@ -7,16 +7,83 @@ Copyright (C) 2026 cpevor. Licensed under GPL v3.
 from __future__ import annotations
 
 import re
-from typing import Any
+from collections import OrderedDict
+from typing import Optional
 
 from PyQt6.QtGui import QColor, QFont, QTextCharFormat
 
+# SGR 状态键：(前景 RGBA, 背景 RGBA, 粗体, 下划线, 反显)，颜色为 None 表示默认
+SgrKey = tuple[Optional[int], Optional[int], bool, bool, bool]
+
+DEFAULT_SGR_KEY: SgrKey = (None, None, False, False, False)
+
+
+class FormatCache:
+    """按 SGR 状态键驻留 QTextCharFormat 的有界 LRU 缓存。
+
+    返回的格式对象在所有调用方之间共享，只能读取或交给 Qt 拷贝
+    （如 insertText），不得原地修改。
+    """
+
+    DEFAULT_MAX_SIZE = 256
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max(1, int(max_size))
+        self._formats: OrderedDict[SgrKey, QTextCharFormat] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._formats)
+
+    def get(self, key: SgrKey) -> QTextCharFormat:
+        fmt = self._formats.get(key)
+        if fmt is not None:
+            self.hits += 1
+            self._formats.move_to_end(key)
+            return fmt
+        self.misses += 1
+        fmt = self._build(key)
+        self._formats[key] = fmt
+        if len(self._formats) > self.max_size:
+            self._formats.popitem(last=False)
+        return fmt
+
+    def clear(self) -> None:
+        self._formats.clear()
+
+    @staticmethod
+    def _build(key: SgrKey) -> QTextCharFormat:
+        fg, bg, bold, underline, reverse = key
+        if reverse:
+            fg, bg = bg, fg
+        fmt = QTextCharFormat()
+        if fg is not None:
+            fmt.setForeground(QColor.fromRgba(fg))
+        if bg is not None:
+            fmt.setBackground(QColor.fromRgba(bg))
+        if bold:
+            fmt.setFontWeight(QFont.Weight.Bold)
+        if underline:
+            fmt.setFontUnderline(True)
+        return fmt
+
+
+# 日志视图与终端模拟器默认共用同一个缓存
+shared_format_cache = FormatCache()
+
+
+def default_format() -> QTextCharFormat:
+    """无任何 SGR 属性时的共享格式。"""
+    return shared_format_cache.get(DEFAULT_SGR_KEY)
+
 
 class AnsiParser:
     """ANSI 转义序列解析器，支持彩色日志显示"""
 
-    def __init__(self) -> None:
+    def __init__(self, format_cache: FormatCache | None = None) -> None:
         self.enabled: bool = True
+        self.format_cache = format_cache or shared_format_cache
         self.setup()
 
     def setup(self) -> None:
@@ -68,7 +135,6 @@ class AnsiParser:
             "107": QColor(255, 255, 255),
         }
 
-        self.current_format = QTextCharFormat()
         self.reset_format()
 
         self._timestamp_format = QTextCharFormat()
@@ -76,8 +142,38 @@ class AnsiParser:
 
     def reset_format(self) -> None:
         """重置文本格式为默认"""
-        self.current_format = QTextCharFormat()
+        self._fg: int | None = None
+        self._bg: int | None = None
+        self._bold = False
+        self._underline = False
         self._reverse_video = False
+        self._current: QTextCharFormat | None = None
+
+    @property
+    def current_key(self) -> SgrKey:
+        """当前 SGR 状态的可哈希键。"""
+        return (
+            self._fg,
+            self._bg,
+            self._bold,
+            self._underline,
+            self._reverse_video,
+        )
+
+    @property
+    def current_format(self) -> QTextCharFormat:
+        """当前 SGR 状态对应的共享格式（只读）。"""
+        fmt = self._current
+        if fmt is None:
+            fmt = self._current = self.format_cache.get(self.current_key)
+        return fmt
+
+    def _set_color(self, is_fg: bool, color: QColor | None) -> None:
+        rgba = None if color is None else color.rgba()
+        if is_fg:
+            self._fg = rgba
+        else:
+            self._bg = rgba
 
     def _xterm_256_color(self, index: int) -> QColor | None:
         """xterm 256 色调色板：0-15 基本色、16-231 立方体、232-255 灰阶。"""
@@ -105,6 +201,7 @@ class AnsiParser:
         code = code.rstrip("m")
         if not code:
             return
+        self._current = None
 
         codes = code.split(";")
         # 零填充参数（如 ESC[01;31m）与未填充等价，必须归一化
@@ -130,10 +227,7 @@ class AnsiParser:
                     except ValueError:
                         color = None
                     if color is not None:
-                        if is_fg:
-                            self.current_format.setForeground(color)
-                        else:
-                            self.current_format.setBackground(color)
+                        self._set_color(is_fg, color)
                     i += 2
                     continue
                 if mode == "2":
@@ -148,46 +242,32 @@ class AnsiParser:
                     except ValueError:
                         i += 4
                         continue
-                    color = QColor(r, g, b)
-                    if is_fg:
-                        self.current_format.setForeground(color)
-                    else:
-                        self.current_format.setBackground(color)
+                    self._set_color(is_fg, QColor(r, g, b))
                     i += 4
                     continue
 
             if c == "0":
                 self.reset_format()
             elif c == "1":
-                self.current_format.setFontWeight(QFont.Weight.Bold)
+                self._bold = True
             elif c == "4":
-                self.current_format.setFontUnderline(True)
+                self._underline = True
             elif c == "7":
-                if not self._reverse_video:
-                    fg = self.current_format.foreground()
-                    bg = self.current_format.background()
-                    self.current_format.setForeground(bg)
-                    self.current_format.setBackground(fg)
-                    self._reverse_video = True
+                self._reverse_video = True
             elif c == "27":
-                if self._reverse_video:
-                    fg = self.current_format.foreground()
-                    bg = self.current_format.background()
-                    self.current_format.setForeground(bg)
-                    self.current_format.setBackground(fg)
-                    self._reverse_video = False
+                self._reverse_video = False
             elif c == "39":
-                self.current_format.clearForeground()
+                self._fg = None
             elif c == "49":
-                self.current_format.clearBackground()
+                self._bg = None
             elif c == "22":
-                self.current_format.setFontWeight(QFont.Weight.Normal)
+                self._bold = False
             elif c == "24":
-                self.current_format.setFontUnderline(False)
+                self._underline = False
             elif c in self.fg_colors:
-                self.current_format.setForeground(self.fg_colors[c])
+                self._set_color(True, self.fg_colors[c])
             elif c in self.bg_colors:
-                self.current_format.setBackground(self.bg_colors[c])
+                self._set_color(False, self.bg_colors[c])
 
     def strip_ansi(self, text: str) -> str:
         """移除文本中的 ANSI 转义序列"""
@@ -196,7 +276,7 @@ class AnsiParser:
     def parse_text(self, text: str) -> list[tuple[str, QTextCharFormat]]:
         """解析带 ANSI 颜色的文本"""
         if not self.enabled:
-            return [(self.strip_ansi(text), QTextCharFormat(self.current_format))]
+            return [(self.strip_ansi(text), self.current_format)]
 
         result: list[tuple[str, QTextCharFormat]] = []
         last_pos = 0
@@ -204,7 +284,7 @@ class AnsiParser:
         for match in self.ansi_escape.finditer(text):
             if match.start() > last_pos:
                 plain_text = text[last_pos : match.start()]
-                result.append((plain_text, QTextCharFormat(self.current_format)))
+                result.append((plain_text, self.current_format))
 
             sgr = self.ansi_color_pattern.fullmatch(match.group(0))
             if sgr is not None:
@@ -214,7 +294,7 @@ class AnsiParser:
 
         if last_pos < len(text):
             plain_text = text[last_pos:]
-            result.append((plain_text, QTextCharFormat(self.current_format)))
+            result.append((plain_text, self.current_format))
 
         return result
 
@@ -6,12 +6,14 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 from functools import partial
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Protocol
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from core.replay_handler import ReplayHandler
 from core.rfc2217_handler import Rfc2217Handler
-from core.serial_handler import SerialHandler
+from core.serial_handler import SerialHandler, SerialIoBackend
 from core.socket_handler import SocketHandler
 from core.transport import (
     DisconnectReason,
@@ -24,6 +26,24 @@ from core.transport import (
 )
 
 
+# Transport signals the controller re-emits for the active mode, in binding order.
+_FORWARDED_SIGNALS = (
+    "data_received",
+    "state_changed",
+    "transport_error",
+    "write_completed",
+    "write_backpressure_changed",
+)
+
+
+class CaptureRecorder(Protocol):
+    """Sink for raw traffic of the active connection (see utils.session_capture)."""
+
+    def received(self, data: bytes) -> bool: ...
+
+    def sent(self, data: bytes) -> bool: ...
+
+
 class ConnectionMode(str, Enum):
     SERIAL = "serial"
     TCP = "tcp"
@@ -78,13 +98,69 @@ ConnectionConfig = (
 )
 
 
+def _mode_for_config(config: ConnectionConfig) -> ConnectionMode:
+    if isinstance(config, SerialConnectionConfig):
+        return ConnectionMode.SERIAL
+    if isinstance(config, TcpConnectionConfig):
+        return ConnectionMode.TCP
+    return ConnectionMode.RFC2217
+
+
+def _open_transport(handler: TransportHandler, config: ConnectionConfig) -> bool:
+    if isinstance(config, SerialConnectionConfig):
+        return handler.open(  # type: ignore[attr-defined]
+            port=config.port,
+            baudrate=config.baudrate,
+            parity=config.parity,
+            databits=config.databits,
+            stopbits=config.stopbits,
+            dtr=config.dtr,
+            rts=config.rts,
+        )
+    if isinstance(config, TcpConnectionConfig):
+        return handler.open(config.host, config.port)  # type: ignore[attr-defined]
+    return handler.open(  # type: ignore[attr-defined]
+        config.host,
+        config.port,
+        baudrate=config.baudrate,
+        parity=config.parity,
+        databits=config.databits,
+        stopbits=config.stopbits,
+        dtr=config.dtr,
+        rts=config.rts,
+        network_timeout=config.network_timeout,
+        ignore_set_control=config.ignore_set_control,
+    )
+
+
+def _write_disposition(
+    handler: TransportHandler, mode: ConnectionMode, data: bytes
+) -> WriteDisposition:
+    handler.last_write_ticket = None
+    if not handler.write_data(data):
+        return WriteDisposition.REJECTED
+    if mode is ConnectionMode.RFC2217 or handler.has_pending_writes():
+        return WriteDisposition.QUEUED
+    return WriteDisposition.SENT
+
+
 class ConnectionController(QObject):
-    """Own connection intent, reconnect policy, and active transport routing."""
+    """Own connection intent, reconnect policy, and active transport routing.
+
+    The three constructor handlers back the single interactive connection.
+    Additional concurrent connections live in `sessions` and are addressed by
+    session ID through `open_session()` and friends. `replay` feeds a recorded
+    capture through `data_received` while the live connection is idle.
+    """
 
     data_received = pyqtSignal(bytes)
     state_changed = pyqtSignal(str, object)
     error_occurred = pyqtSignal(str, object, bool)
     reconnecting = pyqtSignal(str, str)
+    write_completed = pyqtSignal(int, int, float)
+    write_backpressure_changed = pyqtSignal(bool)
+    replay_state_changed = pyqtSignal(object)
+    replay_finished = pyqtSignal(object)
 
     def __init__(
         self,
@@ -94,8 +170,15 @@ class ConnectionController(QObject):
         *,
         clock: Callable[[], float] = time.monotonic,
         reconnect_delay: float = 5.0,
+        sessions: SessionRegistry | None = None,
+        replay_handler: ReplayHandler | None = None,
     ) -> None:
         super().__init__()
+        self.sessions = sessions if sessions is not None else SessionRegistry()
+        self.replay = replay_handler if replay_handler is not None else ReplayHandler()
+        self.replay.data_received.connect(self._on_replay_data)
+        self.replay.state_changed.connect(self.replay_state_changed)
+        self.replay.replay_finished.connect(self.replay_finished)
         self._clock = clock
         self._reconnect_delay = reconnect_delay
         self._mode = ConnectionMode.SERIAL
@@ -110,7 +193,8 @@ class ConnectionController(QObject):
         self._manual_disconnect = {mode: False for mode in ConnectionMode}
         self._interactive_attempt = {mode: False for mode in ConnectionMode}
         self._reconnect_deadlines = {mode: 0.0 for mode in ConnectionMode}
-        self._signal_bindings: dict[ConnectionMode, tuple[object, object, object]] = {}
+        self._signal_bindings: dict[ConnectionMode, tuple[object, ...]] = {}
+        self._capture: CaptureRecorder | None = None
 
         for mode, handler in self._handlers.items():
             self._bind_handler(mode, handler)
@@ -161,7 +245,7 @@ class ConnectionController(QObject):
         return self._configs[ConnectionMode(mode) if mode is not None else self._mode]
 
     def remember_config(self, config: ConnectionConfig) -> None:
-        self._configs[self._mode_for_config(config)] = config
+        self._configs[_mode_for_config(config)] = config
 
     def handler(self, mode: ConnectionMode | str) -> TransportHandler:
         return self._handlers[ConnectionMode(mode)]
@@ -173,9 +257,7 @@ class ConnectionController(QObject):
         old_handler = self._handlers[connection_mode]
         bindings = self._signal_bindings.get(connection_mode)
         if bindings is not None:
-            for signal_name, slot in zip(
-                ("data_received", "state_changed", "transport_error"), bindings
-            ):
+            for signal_name, slot in zip(_FORWARDED_SIGNALS, bindings):
                 try:
                     getattr(old_handler, signal_name).disconnect(slot)
                 except (AttributeError, TypeError):
@@ -187,12 +269,14 @@ class ConnectionController(QObject):
         return self._reconnect_deadlines[ConnectionMode(mode)]
 
     def connect(self, config: ConnectionConfig, *, interactive: bool = True) -> bool:
-        mode = self._mode_for_config(config)
+        mode = _mode_for_config(config)
         if mode is not self._mode:
             return False
         if self.state is not TransportState.DISCONNECTED:
             return True
 
+        # Live traffic wins; never interleave it with replayed data.
+        self.stop_replay()
         self._configs[mode] = config
         self._manual_disconnect[mode] = False
         self._interactive_attempt[mode] = interactive
@@ -219,12 +303,26 @@ class ConnectionController(QObject):
         return self.write_payload(data) is not WriteDisposition.REJECTED
 
     def write_payload(self, data: bytes) -> WriteDisposition:
-        handler = self.active_handler
-        if not handler.write_data(data):
-            return WriteDisposition.REJECTED
-        if self._mode is ConnectionMode.RFC2217 or handler.has_pending_writes():
-            return WriteDisposition.QUEUED
-        return WriteDisposition.SENT
+        disposition = _write_disposition(self.active_handler, self._mode, data)
+        if disposition is not WriteDisposition.REJECTED and self._capture is not None:
+            self._capture.sent(data)
+        return disposition
+
+    @property
+    def capture(self) -> CaptureRecorder | None:
+        return self._capture
+
+    def set_capture(self, capture: CaptureRecorder | None) -> None:
+        """Record raw bytes of the active connection: received and accepted writes."""
+        self._capture = capture
+
+    def is_write_throttled(self) -> bool:
+        return getattr(self.active_handler, "is_write_throttled", lambda: False)() is True
+
+    def last_write_ticket(self) -> int | None:
+        """Ticket of the last accepted write, if it completes asynchronously."""
+        ticket = getattr(self.active_handler, "last_write_ticket", None)
+        return ticket if isinstance(ticket, int) else None
 
     def connection_error(self) -> str:
         return self.active_handler.last_error or ""
@@ -243,6 +341,45 @@ class ConnectionController(QObject):
         result = setter(level)
         return True if result is None else bool(result)
 
+    def open_session(
+        self, config: ConnectionConfig, session_id: str | None = None
+    ) -> str | None:
+        return self.sessions.open(config, session_id)
+
+    def close_session(
+        self, session_id: str, reason: DisconnectReason = DisconnectReason.USER
+    ) -> None:
+        self.sessions.close(session_id, reason)
+
+    def write_session(self, session_id: str, data: bytes) -> WriteDisposition:
+        return self.sessions.write(session_id, data)
+
+    def session_ids(self) -> list[str]:
+        return self.sessions.session_ids()
+
+    def session_state(self, session_id: str) -> TransportState:
+        if session_id not in self.sessions:
+            return TransportState.DISCONNECTED
+        return self.sessions.session(session_id).state
+
+    def start_replay(
+        self, path: str | Path, speed: float = 1.0, *, include_sent: bool = False
+    ) -> bool:
+        """Replay a capture file; refused while the live connection is active.
+
+        `speed` scales the recorded timing; 0 replays as fast as possible.
+        """
+        if self.is_active() or self.is_replaying():
+            return False
+        return self.replay.open(path, speed, include_sent=include_sent)
+
+    def stop_replay(self) -> None:
+        if self.is_replaying():
+            self.replay.close()
+
+    def is_replaying(self) -> bool:
+        return self.replay.state is not TransportState.DISCONNECTED
+
     def poll_reconnect(self, *, auto_reconnect: bool) -> bool:
         mode = self._mode
         config = self._configs[mode]
@@ -265,45 +402,19 @@ class ConnectionController(QObject):
         self.reconnecting.emit(mode.value, config.endpoint)
         return self._open_config(mode, config)
 
-    @staticmethod
-    def _mode_for_config(config: ConnectionConfig) -> ConnectionMode:
-        if isinstance(config, SerialConnectionConfig):
-            return ConnectionMode.SERIAL
-        if isinstance(config, TcpConnectionConfig):
-            return ConnectionMode.TCP
-        return ConnectionMode.RFC2217
-
     def _open_config(self, mode: ConnectionMode, config: ConnectionConfig) -> bool:
-        handler = self._handlers[mode]
-        if isinstance(config, SerialConnectionConfig):
-            return handler.open(  # type: ignore[attr-defined]
-                port=config.port,
-                baudrate=config.baudrate,
-                parity=config.parity,
-                databits=config.databits,
-                stopbits=config.stopbits,
-                dtr=config.dtr,
-                rts=config.rts,
-            )
-        if isinstance(config, TcpConnectionConfig):
-            return handler.open(config.host, config.port)  # type: ignore[attr-defined]
-        return handler.open(  # type: ignore[attr-defined]
-            config.host,
-            config.port,
-            baudrate=config.baudrate,
-            parity=config.parity,
-            databits=config.databits,
-            stopbits=config.stopbits,
-            dtr=config.dtr,
-            rts=config.rts,
-            network_timeout=config.network_timeout,
-            ignore_set_control=config.ignore_set_control,
-        )
+        return _open_transport(self._handlers[mode], config)
 
     def _on_data(self, mode: ConnectionMode, data: bytes) -> None:
         if mode is self._mode:
+            if self._capture is not None:
+                self._capture.received(data)
             self.data_received.emit(data)
 
+    def _on_replay_data(self, data: bytes) -> None:
+        # Replayed bytes bypass the capture so a replay is not re-recorded.
+        self.data_received.emit(data)
+
     def _on_state_changed(
         self, mode: ConnectionMode, transition: TransportTransition
     ) -> None:
@@ -322,6 +433,16 @@ class ConnectionController(QObject):
                 )
         self.state_changed.emit(mode.value, transition)
 
+    def _on_write_completed(
+        self, mode: ConnectionMode, ticket: int, written: int, elapsed: float
+    ) -> None:
+        if mode is self._mode:
+            self.write_completed.emit(ticket, written, elapsed)
+
+    def _on_write_backpressure(self, mode: ConnectionMode, throttled: bool) -> None:
+        if mode is self._mode:
+            self.write_backpressure_changed.emit(throttled)
+
     def _on_error(self, mode: ConnectionMode, error: TransportError) -> None:
         interactive = (
             error.operation is TransportOperation.CONNECT
@@ -337,13 +458,166 @@ class ConnectionController(QObject):
         data_slot = partial(self._on_data, mode)
         state_slot = partial(self._on_state_changed, mode)
         error_slot = partial(self._on_error, mode)
-        self._signal_bindings[mode] = (data_slot, state_slot, error_slot)
-        for signal_name, slot in (
-            ("data_received", data_slot),
-            ("state_changed", state_slot),
-            ("transport_error", error_slot),
-        ):
+        completed_slot = partial(self._on_write_completed, mode)
+        backpressure_slot = partial(self._on_write_backpressure, mode)
+        slots = (data_slot, state_slot, error_slot, completed_slot, backpressure_slot)
+        self._signal_bindings[mode] = slots
+        for signal_name, slot in zip(_FORWARDED_SIGNALS, slots):
             signal = getattr(handler, signal_name, None)
             connect = getattr(signal, "connect", None)
             if callable(connect):
                 connect(slot)
+
+
+HandlerFactory = Callable[[], TransportHandler]
+
+# Registry serial sessions share the reactor thread instead of a reader and
+# writer thread per port; SerialHandler falls back to threads where the
+# reactor is unsupported.
+_DEFAULT_FACTORIES: dict[ConnectionMode, HandlerFactory] = {
+    ConnectionMode.SERIAL: partial(SerialHandler, io_backend=SerialIoBackend.REACTOR),
+    ConnectionMode.TCP: SocketHandler,
+    ConnectionMode.RFC2217: Rfc2217Handler,
+}
+
+
+@dataclass
+class Session:
+    """One registered connection with its own transport handler."""
+
+    id: str
+    mode: ConnectionMode
+    handler: TransportHandler
+    config: ConnectionConfig
+    slots: tuple[object, ...] = ()
+
+    @property
+    def state(self) -> TransportState:
+        return self.handler.state
+
+
+class SessionRegistry(QObject):
+    """Any number of concurrent sessions, addressed by ID.
+
+    Every session gets its own handler instance from the mode's factory. All
+    handlers live on the caller's (GUI) thread, so their signals share one
+    event loop; per-session data is re-emitted tagged with the session ID.
+    Serial sessions default to the shared reactor backend. The window gives
+    each session its own decoder, receive pipeline and trim log
+    (see ui.session_view).
+    Sessions stay registered after disconnecting so they can be reopened;
+    `remove()` shuts the handler down and forgets the session.
+    """
+
+    session_added = pyqtSignal(str)
+    session_removed = pyqtSignal(str)
+    data_received = pyqtSignal(str, bytes)
+    state_changed = pyqtSignal(str, object)
+    error_occurred = pyqtSignal(str, object)
+    write_completed = pyqtSignal(str, int, int, float)
+    write_backpressure_changed = pyqtSignal(str, bool)
+
+    def __init__(
+        self,
+        factories: dict[ConnectionMode, HandlerFactory] | None = None,
+    ) -> None:
+        super().__init__()
+        self._factories = dict(_DEFAULT_FACTORIES)
+        if factories:
+            self._factories.update(factories)
+        self._sessions: dict[str, Session] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def session_ids(self) -> list[str]:
+        return list(self._sessions)
+
+    def set_factory(self, mode: ConnectionMode, factory: HandlerFactory) -> None:
+        """Use `factory` for sessions of `mode` opened from now on."""
+        self._factories[mode] = factory
+
+    def session(self, session_id: str) -> Session:
+        return self._sessions[session_id]
+
+    @staticmethod
+    def default_id(config: ConnectionConfig) -> str:
+        """The ID `open()` assigns when none is given: "<mode>:<endpoint>"."""
+        return f"{_mode_for_config(config).value}:{config.endpoint}"
+
+    def open(
+        self, config: ConnectionConfig, session_id: str | None = None
+    ) -> str | None:
+        """Open (or reopen) a session; returns its ID, or None if refused.
+
+        The default ID is "<mode>:<endpoint>". Reopening an ID reuses its
+        handler and is refused while that session is still active.
+        """
+        mode = _mode_for_config(config)
+        session_id = session_id or self.default_id(config)
+        session = self._sessions.get(session_id)
+        if session is None:
+            handler = self._factories[mode]()
+            session = Session(session_id, mode, handler, config)
+            session.slots = self._bind(session)
+            self._sessions[session_id] = session
+            self.session_added.emit(session_id)
+        elif session.mode is not mode or session.state is not (
+            TransportState.DISCONNECTED
+        ):
+            return None
+        session.config = config
+        if not _open_transport(session.handler, config):
+            return None
+        return session_id
+
+    def close(
+        self, session_id: str, reason: DisconnectReason = DisconnectReason.USER
+    ) -> None:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.handler.close(reason=reason)  # type: ignore[attr-defined]
+
+    def write(self, session_id: str, data: bytes) -> WriteDisposition:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return WriteDisposition.REJECTED
+        return _write_disposition(session.handler, session.mode, data)
+
+    def remove(self, session_id: str, timeout_ms: int = 1000) -> bool:
+        """Shut the session's handler down and drop it from the registry."""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return True
+        handler = session.handler
+        stopped = handler.shutdown(timeout_ms=timeout_ms)  # type: ignore[attr-defined]
+        for signal_name, slot in zip(_FORWARDED_SIGNALS, session.slots):
+            try:
+                getattr(handler, signal_name).disconnect(slot)
+            except (AttributeError, TypeError):
+                pass
+        handler.deleteLater()
+        self.session_removed.emit(session_id)
+        return stopped is not False
+
+    def shutdown(self, timeout_ms: int = 1000) -> bool:
+        results = [
+            self.remove(session_id, timeout_ms) for session_id in self.session_ids()
+        ]
+        return all(results)
+
+    def _bind(self, session: Session) -> tuple[object, ...]:
+        session_id = session.id
+        slots = (
+            partial(self.data_received.emit, session_id),
+            partial(self.state_changed.emit, session_id),
+            partial(self.error_occurred.emit, session_id),
+            partial(self.write_completed.emit, session_id),
+            partial(self.write_backpressure_changed.emit, session_id),
+        )
+        for signal_name, slot in zip(_FORWARDED_SIGNALS, slots):
+            getattr(session.handler, signal_name).connect(slot)
+        return slots
@@ -0,0 +1,286 @@
+"""
+伪终端回环串口
+
+用 Linux/POSIX 伪终端对（pty）模拟一个串口设备：SerialHandler 打开从端
+（`PtyLoopback.port`），本模块的线程在主端按流量配置生成数据、同时收下
+handler 写出的数据。无需 USB 转串口硬件即可压测读写线程或反应器后端。
+
+流量配置：
+    FIXED_RATE：按固定字节率均匀发送；
+    BURSTY：整块突发后静默，模拟设备批量上报；
+    ANSI：带颜色、光标移动和清行的终端输出；
+    BINARY：任意字节（含 0x00、ESC、不完整 UTF-8）；
+    LINES：带序号的文本行，便于校验丢行/乱序。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import select
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def loopback_supported() -> bool:
+    """当前平台能否创建伪终端对（Windows 不支持）。"""
+    return os.name == "posix" and hasattr(os, "openpty")
+
+
+class TrafficProfile(str, Enum):
+    FIXED_RATE = "fixed_rate"
+    BURSTY = "bursty"
+    ANSI = "ansi"
+    BINARY = "binary"
+    LINES = "lines"
+
+
+@dataclass(frozen=True)
+class TrafficConfig:
+    """流量生成参数。`bytes_per_second` 为 0 时不限速，`total_bytes` 为 0 时不停止。"""
+
+    profile: TrafficProfile = TrafficProfile.LINES
+    bytes_per_second: int = 11520
+    chunk_bytes: int = 64
+    burst_bytes: int = 4096
+    burst_interval: float = 0.1
+    total_bytes: int = 0
+    seed: int = 0
+
+
+_ANSI_COLORS = (31, 32, 33, 34, 35, 36, 91, 92, 93, 94)
+_ANSI_WORDS = (b"INFO", b"WARN", b"ERROR", b"DEBUG", b"temp", b"rpm", b"ok", b"fail")
+
+
+class TrafficGenerator:
+    """按配置产生 (发送前等待秒数, 数据块) 序列；相同 seed 生成相同数据。"""
+
+    def __init__(self, config: TrafficConfig) -> None:
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._line = 0
+
+    def __iter__(self) -> Iterator[tuple[float, bytes]]:
+        config = self.config
+        remaining = config.total_bytes or -1
+        while remaining:
+            if config.profile is TrafficProfile.BURSTY:
+                chunk = self._payload(config.burst_bytes)
+                delay = config.burst_interval
+            else:
+                chunk = self._payload(config.chunk_bytes)
+                delay = (
+                    len(chunk) / config.bytes_per_second
+                    if config.bytes_per_second > 0
+                    else 0.0
+                )
+            if remaining > 0:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            yield delay, chunk
+
+    def _payload(self, size: int) -> bytes:
+        size = max(1, size)
+        profile = self.config.profile
+        if profile is TrafficProfile.BINARY:
+            return self._random.randbytes(size)
+        if profile is TrafficProfile.FIXED_RATE:
+            start = self._line
+            self._line += size
+            return bytes(0x20 + (start + i) % 95 for i in range(size))
+        make_line = (
+            self._ansi_line if profile is TrafficProfile.ANSI else self._line_text
+        )
+        # 文本配置按整行生成，一块可能略大于 chunk_bytes
+        out = bytearray()
+        while len(out) < size:
+            out += make_line()
+        return bytes(out)
+
+    def _line_text(self) -> bytes:
+        self._line += 1
+        value = self._random.randint(0, 99999)
+        return b"%08d value=%05d\r\n" % (self._line, value)
+
+    def _ansi_line(self) -> bytes:
+        self._line += 1
+        color = self._random.choice(_ANSI_COLORS)
+        word = self._random.choice(_ANSI_WORDS)
+        line = b"\x1b[%dm%s\x1b[0m %08d" % (color, word, self._line)
+        if self._line % 10 == 0:
+            # 进度条式的回车覆盖与清行
+            line += b"\r\x1b[2K\x1b[1;33m%3d%%\x1b[0m" % (self._line % 101)
+        if self._line % 25 == 0:
+            line += b"\x1b[s\x1b[1;1H\x1b[7mstatus\x1b[0m\x1b[u"
+        return line + b"\r\n"
+
+
+@dataclass(frozen=True)
+class LoopbackStats:
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    chunks_sent: int = 0
+
+
+class PtyLoopback:
+    """伪终端对 + 主端流量线程。
+
+    用法::
+
+        loopback = PtyLoopback(TrafficConfig(TrafficProfile.ANSI))
+        loopback.open()
+        handler.open(loopback.port)
+        loopback.start()
+        ...
+        handler.close()
+        loopback.close()
+
+    从端描述符在回环关闭前一直保持打开，handler 断开重连期间主端不会读到
+    EIO。收到的数据最多保留 `MAX_RECEIVED_BYTES`，超出部分只计数。
+    """
+
+    MAX_RECEIVED_BYTES = 1024 * 1024
+    _READ_CHUNK = 65536
+    _POLL_SECONDS = 0.05
+
+    def __init__(self, config: Optional[TrafficConfig] = None) -> None:
+        self.config = config or TrafficConfig()
+        self.port = ""
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+        self._received = bytearray()
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._chunks_sent = 0
+        self.error: Optional[OSError] = None
+
+    def open(self) -> str:
+        """创建伪终端对，返回从端设备路径。"""
+        if self._master is not None:
+            return self.port
+        if not loopback_supported():
+            raise OSError("pseudo-terminal loopback is not supported on this platform")
+        # tty 依赖 termios，Windows 上没有；放在这里模块本身才能在任何平台导入
+        import tty
+
+        master, slave = os.openpty()
+        # 原始模式：关闭回显和换行转换，handler 打开前写入的数据也原样保留
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        self._master, self._slave = master, slave
+        self.port = os.ttyname(slave)
+        return self.port
+
+    def start(self) -> None:
+        """启动主端线程：按流量配置发送，并持续收下对端写入的数据。"""
+        if self._master is None:
+            self.open()
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="PtyLoopback", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0) -> bool:
+        thread = self._thread
+        if thread is None:
+            return True
+        self._stop.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._thread = None
+        return True
+
+    def close(self, timeout: Optional[float] = 2.0) -> bool:
+        stopped = self.stop(timeout)
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+        return stopped
+
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """等待 `total_bytes` 全部写入主端。"""
+        return self.finished.wait(timeout)
+
+    def stats(self) -> LoopbackStats:
+        with self._lock:
+            return LoopbackStats(
+                self._bytes_sent, self._bytes_received, self._chunks_sent
+            )
+
+    def take_received(self) -> bytes:
+        """取出并清空已收下的对端数据。"""
+        with self._lock:
+            data = bytes(self._received)
+            self._received.clear()
+            return data
+
+    def _run(self) -> None:
+        master = self._master
+        assert master is not None
+        generator = iter(TrafficGenerator(self.config))
+        pending = b""
+        due = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                if not pending and not self.finished.is_set():
+                    try:
+                        delay, pending = next(generator)
+                    except StopIteration:
+                        self.finished.set()
+                    else:
+                        # 按计划时刻发送，累计误差不随块数漂移
+                        due += delay
+                        with self._lock:
+                            self._chunks_sent += 1
+                now = time.monotonic()
+                wants_write = bool(pending) and now >= due
+                # 超时不超过 _POLL_SECONDS，stop() 能及时生效
+                timeout = self._POLL_SECONDS
+                if pending and not wants_write:
+                    timeout = min(timeout, due - now)
+                readable, writable, _ = select.select(
+                    [master], [master] if wants_write else [], [], timeout
+                )
+                if readable:
+                    self._read(master)
+                if writable:
+                    written = os.write(master, pending)
+                    pending = pending[written:]
+                    with self._lock:
+                        self._bytes_sent += written
+        except OSError as e:
+            # 从端关闭后主端读写返回 EIO
+            self.error = e
+            logger.debug("PTY loopback stopped: %s", e)
+
+    def _read(self, master: int) -> None:
+        try:
+            data = os.read(master, self._READ_CHUNK)
+        except BlockingIOError:
+            return
+        with self._lock:
+            self._bytes_received += len(data)
+            room = self.MAX_RECEIVED_BYTES - len(self._received)
+            if room > 0:
+                self._received += data[:room]
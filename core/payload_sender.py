@@ -35,6 +35,8 @@ class SendResult:
     status: SendStatus
     payload: bytes = b""
     checksum: int | None = None
+    # Set for queued writes whose completion arrives later via write_completed.
+    ticket: int | None = None
 
     @property
     def sent(self) -> bool:
@@ -50,9 +52,11 @@ class PayloadSender:
         self,
         writer: Callable[[bytes], bool | WriteDisposition],
         is_connected: Callable[[], bool],
+        write_ticket: Callable[[], int | None] | None = None,
     ) -> None:
         self._writer = writer
         self._is_connected = is_connected
+        self._write_ticket = write_ticket
 
     def send(self, request: PayloadRequest) -> SendResult:
         if not self._is_connected():
@@ -89,7 +93,10 @@ class PayloadSender:
 
         disposition = self._writer(payload)
         if disposition is WriteDisposition.QUEUED:
-            return SendResult(SendStatus.QUEUED, payload=payload, checksum=checksum)
+            ticket = self._write_ticket() if self._write_ticket else None
+            return SendResult(
+                SendStatus.QUEUED, payload=payload, checksum=checksum, ticket=ticket
+            )
         if disposition is WriteDisposition.REJECTED or not disposition:
             return SendResult(SendStatus.WRITE_FAILED, payload=payload)
         return SendResult(SendStatus.SENT, payload=payload, checksum=checksum)
@@ -0,0 +1,194 @@
+"""录制文件回放：把 .smcap 里的接收数据块按原始节奏重新送入接收管线。"""
+
+from __future__ import annotations
+
+import math
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from PyQt6.QtCore import QTimer, Qt, pyqtSignal
+
+from core.transport import (
+    DisconnectReason,
+    TransportHandler,
+    TransportOperation,
+    TransportState,
+)
+from utils.session_capture import (
+    CaptureDirection,
+    CaptureRecord,
+    iter_records,
+    load_index,
+    read_header,
+)
+
+# 速度为 0 表示不按录制时间等待，尽快回放
+AS_FAST_AS_POSSIBLE = 0.0
+
+
+@dataclass(frozen=True)
+class ReplayStats:
+    """一次回放送出的数据量与耗时（秒）。
+
+    `elapsed` 量到最后一块数据发出为止；`started_at` 是回放开始时的单调
+    时钟时刻，显示端把自己的收尾处理也计入耗时时以它为起点。
+    """
+
+    records: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    started_at: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ReplayHandler(TransportHandler):
+    """只读传输：按录制时间（或其 N 倍速）逐块发出 data_received。
+
+    数据块边界与录制时一致，终端模拟、ANSI 解析、HEX 显示和裁剪看到的输入
+    与现场相同。所有工作都在 GUI 线程的定时器里完成：每次最多占用
+    `SLICE_SECONDS` 就让出事件循环，尽快模式下也不会卡住界面，
+    因此尽快模式的耗时即整条显示链路的吞吐。
+    """
+
+    replay_finished = pyqtSignal(object)
+
+    SLICE_SECONDS = 0.008
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.path: Optional[Path] = None
+        self.speed = 1.0
+        self.include_sent = False
+        self._records: Optional[Iterator[CaptureRecord]] = None
+        self._pending: Optional[CaptureRecord] = None
+        # (录制时间, 本机单调时间)：按此换算每块数据的到期时刻
+        self._origin: Optional[tuple[float, float]] = None
+        self._started_at = 0.0
+        self._sent_records = 0
+        self._sent_bytes = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._pump)
+
+    @property
+    def endpoint(self) -> str:
+        return str(self.path) if self.path is not None else ""
+
+    def open(
+        self, path: Path | str, speed: float = 1.0, include_sent: bool = False
+    ) -> bool:
+        if self.state is not TransportState.DISCONNECTED:
+            return False
+        self.path = Path(path)
+        self.include_sent = include_sent
+        self.set_speed(speed)
+        self._transition(TransportState.CONNECTING)
+        try:
+            read_header(self.path)
+            load_index(self.path)
+        except (OSError, ValueError) as e:
+            self._emit_error(
+                TransportOperation.CONNECT,
+                str(e),
+                reason=DisconnectReason.CONNECT_FAILED,
+            )
+            self._transition(
+                TransportState.DISCONNECTED, DisconnectReason.CONNECT_FAILED
+            )
+            return False
+
+        self._records = iter_records(self.path)
+        self._pending = None
+        self._origin = None
+        self._sent_records = 0
+        self._sent_bytes = 0
+        self._started_at = time.monotonic()
+        self._transition(TransportState.CONNECTED)
+        self._timer.start(0)
+        return True
+
+    def close(self, reason: DisconnectReason = DisconnectReason.USER) -> None:
+        self._timer.stop()
+        self._records = None
+        self._pending = None
+        if self.state is not TransportState.DISCONNECTED:
+            self._transition(TransportState.DISCONNECTED, reason)
+
+    def shutdown(self, timeout_ms: int = 0) -> bool:
+        self.close(reason=DisconnectReason.SHUTDOWN)
+        return True
+
+    def set_speed(self, speed: float) -> None:
+        """调整倍速；回放中调整时从下一块数据重新对时。"""
+        speed = float(speed)
+        if not math.isfinite(speed) or speed <= 0:
+            speed = AS_FAST_AS_POSSIBLE
+        self.speed = speed
+        self._origin = None
+
+    def write_data(self, data: bytes) -> bool:
+        # 回放没有对端，发送一律拒绝
+        return False
+
+    def stats(self) -> ReplayStats:
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return ReplayStats(
+            self._sent_records, self._sent_bytes, elapsed, self._started_at
+        )
+
+    def _next_record(self) -> Optional[CaptureRecord]:
+        if self._pending is not None:
+            record, self._pending = self._pending, None
+            return record
+        assert self._records is not None
+        for record in self._records:
+            if record.direction is CaptureDirection.RX or self.include_sent:
+                return record
+        return None
+
+    def _pump(self) -> None:
+        now = time.monotonic()
+        deadline = now + self.SLICE_SECONDS
+        while self._records is not None:
+            try:
+                record = self._next_record()
+            except (OSError, ValueError, zlib.error) as e:
+                self._emit_error(
+                    TransportOperation.READ, str(e), reason=DisconnectReason.IO_ERROR
+                )
+                self.close(reason=DisconnectReason.IO_ERROR)
+                return
+            if record is None:
+                self._finish()
+                return
+
+            if self.speed > 0:
+                if self._origin is None:
+                    self._origin = (record.timestamp, now)
+                recorded_at, started_at = self._origin
+                due = started_at + (record.timestamp - recorded_at) / self.speed
+                if due > now:
+                    self._pending = record
+                    self._timer.start(max(1, math.ceil((due - now) * 1000)))
+                    return
+
+            self._sent_records += 1
+            self._sent_bytes += len(record.data)
+            # 槽函数里可能关闭回放，emit 之后重新检查 _records
+            self.data_received.emit(record.data)
+            now = time.monotonic()
+            if now >= deadline:
+                self._timer.start(0)
+                return
+
+    def _finish(self) -> None:
+        stats = self.stats()
+        self.close(reason=DisconnectReason.REMOTE)
+        self.replay_finished.emit(stats)
@@ -31,10 +31,65 @@ class _WorkerCommandError(Exception):
         self.context = context
 
 
+class _NotifyingQueue(queue.Queue):
+    """pySerial's receive queue that also wakes the worker on every put."""
+
+    def __init__(self, wake: threading.Event) -> None:
+        super().__init__()
+        self._wake = wake
+
+    def put(self, item: Any, block: bool = True, timeout: Any = None) -> None:
+        super().put(item, block, timeout)
+        if not self._wake.is_set():
+            self._wake.set()
+
+
+class _WakingRfc2217Serial(serial.rfc2217.Serial):
+    """RFC2217 client whose receive queue signals a shared wake event.
+
+    pySerial's own reader thread owns the socket and feeds `_read_buffer`,
+    so readability is observed at that queue rather than on the socket.
+    """
+
+    def __init__(self, *args: Any, wake: threading.Event, **kwargs: Any) -> None:
+        self._wake = wake
+        super().__init__(*args, **kwargs)
+
+    @property
+    def _read_buffer(self) -> Optional[queue.Queue]:
+        return self._notifying_buffer
+
+    @_read_buffer.setter
+    def _read_buffer(self, value: Optional[queue.Queue]) -> None:
+        if value is not None and not isinstance(value, _NotifyingQueue):
+            value = _NotifyingQueue(self._wake)
+        self._notifying_buffer = value
+
+
 class _Rfc2217Worker(QThread):
+    """Owns one RFC2217 session.
+
+    The thread sleeps on a single wake event that is set by queued commands,
+    stop requests and received bytes, so writes and control changes go out
+    immediately and an idle link only wakes every `IDLE_CHECK_SECONDS`.
+
+    Queued writes are limited by bytes rather than entries. Consecutive
+    writes are merged into one send of at most `MAX_WRITE_BATCH_BYTES`;
+    `backpressure_changed` reports crossing `HIGH_WATER` and draining back
+    to `LOW_WATER`.
+    """
+
     connected = pyqtSignal(object, str)
     data_received = pyqtSignal(object, bytes)
     error_occurred = pyqtSignal(object, str, str)
+    backpressure_changed = pyqtSignal(object, bool)
+
+    IDLE_CHECK_SECONDS = 1.0
+    MAX_READ_BYTES = 64 * 1024
+    MAX_WRITE_BATCH_BYTES = 64 * 1024
+    MAX_QUEUE_BYTES = 16 * 1024 * 1024
+    HIGH_WATER = 1024 * 1024
+    LOW_WATER = 256 * 1024
 
     def __init__(
         self,
@@ -62,18 +117,24 @@ class _Rfc2217Worker(QThread):
         self._connected_event = threading.Event()
         self._interrupt_started = threading.Event()
         self._worker_done = threading.Event()
-        self._commands: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=1024)
+        self._wake = threading.Event()
+        self._commands: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self._queue_lock = threading.Lock()
+        self._pending_write_bytes = 0
+        self._throttled = False
         self._remote: Optional[serial.rfc2217.Serial] = None
         self._close_lock = threading.Lock()
 
     def request_stop(self) -> None:
         self._close_requested.set()
+        self._wake.set()
         if not self._connected_event.is_set():
             self._start_interrupt()
 
     def force_stop(self) -> None:
         self._close_requested.set()
         self._stop_event.set()
+        self._wake.set()
         self._start_interrupt()
 
     def _start_interrupt(self) -> None:
@@ -107,19 +168,41 @@ class _Rfc2217Worker(QThread):
             option.state = serial.rfc2217.ACTIVE
 
     def enqueue(self, command: str, value: Any) -> bool:
+        """Queue a command; writes are refused once the byte limit is reached.
+
+        An empty queue always accepts a write, however large.
+        """
         if self._stop_event.is_set() or self._close_requested.is_set():
             return False
-        try:
-            self._commands.put_nowait((command, value))
-            return True
-        except queue.Full:
-            return False
+        throttle = False
+        if command == "write":
+            size = len(value)
+            with self._queue_lock:
+                pending = self._pending_write_bytes
+                if pending and pending + size > self.MAX_QUEUE_BYTES:
+                    return False
+                self._pending_write_bytes = pending + size
+                throttle = (
+                    not self._throttled
+                    and self._pending_write_bytes >= self.HIGH_WATER
+                )
+                if throttle:
+                    self._throttled = True
+        self._commands.put_nowait((command, value))
+        self._wake.set()
+        if throttle:
+            self.backpressure_changed.emit(self, True)
+        return True
+
+    def pending_write_bytes(self) -> int:
+        with self._queue_lock:
+            return self._pending_write_bytes
 
     def run(self) -> None:
         connected = False
         remote: Optional[serial.rfc2217.Serial] = None
         try:
-            remote = serial.rfc2217.Serial(
+            remote = _WakingRfc2217Serial(
                 port=None,
                 baudrate=self.baudrate,
                 bytesize=self.databits,
@@ -131,6 +214,7 @@ class _Rfc2217Worker(QThread):
                 xonxoff=False,
                 rtscts=False,
                 dsrdtr=False,
+                wake=self._wake,
             )
             remote.port = self.url
             remote.dtr = self.dtr
@@ -151,21 +235,23 @@ class _Rfc2217Worker(QThread):
             self.connected.emit(self, self.endpoint)
 
             while not self._stop_event.is_set():
+                # Clear before looking at either source: anything queued
+                # after this point sets the event again, so no wakeup is lost.
+                self._wake.clear()
                 self._process_commands(remote)
                 if self._close_requested.is_set():
                     self._stop_event.set()
                 if self._stop_event.is_set():
                     break
-                data = remote.read(remote.in_waiting or 1)
+                data, eof = self._drain_received(remote)
                 if data:
                     self.data_received.emit(self, data)
-                elif (
-                    getattr(remote, "_thread", None) is not None
-                    and not remote._thread.is_alive()
-                ):
+                reader = getattr(remote, "_thread", None)
+                if eof or (reader is not None and not reader.is_alive()):
                     raise _WorkerCommandError(
                         "remote", serial.SerialException("RFC2217 peer disconnected")
                     )
+                self._wake.wait(self.IDLE_CHECK_SECONDS)
         except _WorkerCommandError as e:
             if not self._stop_event.is_set() and not self._close_requested.is_set():
                 self.error_occurred.emit(self, str(e), e.context)
@@ -197,23 +283,72 @@ class _Rfc2217Worker(QThread):
         reader = getattr(remote, "_thread", None)
         return "remote" if reader is not None and not reader.is_alive() else "io"
 
+    def _drain_received(self, remote: serial.rfc2217.Serial) -> tuple[bytes, bool]:
+        """Take the bytes pySerial has buffered; True once its reader hit EOF."""
+        buffer = remote._read_buffer
+        data = bytearray()
+        while len(data) < self.MAX_READ_BYTES:
+            try:
+                item = buffer.get_nowait()
+            except queue.Empty:
+                return bytes(data), False
+            if item is None:
+                return bytes(data), True
+            data += item
+        # More may still be queued without a pending wakeup.
+        self._wake.set()
+        return bytes(data), False
+
     def _process_commands(self, remote: serial.rfc2217.Serial) -> None:
+        writes: list[bytes] = []
+        size = 0
         while True:
             try:
                 command, value = self._commands.get_nowait()
             except queue.Empty:
-                return
-
+                break
+
+            if command == "write":
+                if writes and size + len(value) > self.MAX_WRITE_BATCH_BYTES:
+                    self._send_writes(remote, writes)
+                    writes, size = [], 0
+                writes.append(value)
+                size += len(value)
+                continue
+            # Control changes must not overtake writes queued before them.
+            if writes:
+                self._send_writes(remote, writes)
+                writes, size = [], 0
             try:
-                if command == "write":
-                    remote.write(value)
-                elif command == "dtr":
+                if command == "dtr":
                     remote.dtr = bool(value)
                 elif command == "rts":
                     remote.rts = bool(value)
             except Exception as e:
-                context = "write" if command == "write" else "control"
-                raise _WorkerCommandError(context, e) from e
+                raise _WorkerCommandError("control", e) from e
+        if writes:
+            self._send_writes(remote, writes)
+
+    def _send_writes(
+        self, remote: serial.rfc2217.Serial, writes: list[bytes]
+    ) -> None:
+        data = writes[0] if len(writes) == 1 else b"".join(writes)
+        try:
+            remote.write(data)
+        except Exception as e:
+            raise _WorkerCommandError("write", e) from e
+        finally:
+            with self._queue_lock:
+                self._pending_write_bytes = max(
+                    0, self._pending_write_bytes - len(data)
+                )
+                release = (
+                    self._throttled and self._pending_write_bytes <= self.LOW_WATER
+                )
+                if release:
+                    self._throttled = False
+            if release:
+                self.backpressure_changed.emit(self, False)
 
 
 class Rfc2217Handler(TransportHandler):
@@ -231,6 +366,7 @@ class Rfc2217Handler(TransportHandler):
         self._worker: Optional[_Rfc2217Worker] = None
         self._disconnect_reason: Optional[DisconnectReason] = None
         self._ever_connected = False
+        self._write_throttled = False
 
     @property
     def endpoint(self) -> str:
@@ -334,6 +470,7 @@ class Rfc2217Handler(TransportHandler):
         worker.connected.connect(self._on_worker_connected)
         worker.data_received.connect(self._on_worker_data)
         worker.error_occurred.connect(self._on_worker_error)
+        worker.backpressure_changed.connect(self._on_worker_backpressure)
         worker.finished.connect(self._on_worker_finished)
         self._worker = worker
         self._transition(TransportState.CONNECTING)
@@ -379,18 +516,31 @@ class Rfc2217Handler(TransportHandler):
             return False
         if worker.enqueue(command, value):
             return True
-        operation = (
-            TransportOperation.WRITE
-            if command == "write"
-            else TransportOperation.CONTROL
-        )
-        self._emit_error(
-            operation,
-            "RFC2217 command queue is full",
-            reason=DisconnectReason.IO_ERROR,
-        )
+        # A full write queue is backpressure, not a failed session.
+        if command == "write":
+            self._emit_error(TransportOperation.WRITE, "RFC2217 write queue is full")
+        else:
+            self._emit_error(
+                TransportOperation.CONTROL, "RFC2217 command queue is closed"
+            )
         return False
 
+    def has_pending_writes(self) -> bool:
+        worker = self._worker
+        return worker is not None and worker.pending_write_bytes() > 0
+
+    def is_write_throttled(self) -> bool:
+        return self._write_throttled
+
+    def _set_write_throttled(self, throttled: bool) -> None:
+        if throttled != self._write_throttled:
+            self._write_throttled = throttled
+            self.write_backpressure_changed.emit(throttled)
+
+    def _on_worker_backpressure(self, worker: object, throttled: bool) -> None:
+        if worker is self._worker:
+            self._set_write_throttled(throttled)
+
     def _on_worker_connected(self, worker: object, endpoint: str) -> None:
         if worker is not self._worker or self._state is TransportState.CLOSING:
             return
@@ -453,6 +603,7 @@ class Rfc2217Handler(TransportHandler):
                 else DisconnectReason.CONNECT_FAILED
             )
         self._worker = None
+        self._set_write_throttled(False)
         self._transition(TransportState.DISCONNECTED, reason)
         if was_active:
             self._ever_connected = False
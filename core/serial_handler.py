@@ -9,11 +9,14 @@ from __future__ import annotations
 import logging
 import queue
 import threading
-from typing import Optional
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Optional, Protocol
 
 import serial
 import serial.tools.list_ports
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread, pyqtBoundSignal, pyqtSignal
 
 from core.transport import (
     DisconnectReason,
@@ -22,72 +25,232 @@ from core.transport import (
     TransportState,
 )
 
+if TYPE_CHECKING:
+    from core.serial_reactor import SerialReactor
+
 logger = logging.getLogger(__name__)
 
 
 class _SerialReadThread(QThread):
-    """后台串口读取线程（阻塞读 + timeout 轮询退出）。"""
+    """后台串口读取线程（阻塞读 + timeout 轮询退出）。
+
+    每次先按 `in_waiting` 决定读取长度，缓冲区为空时只等 1 字节，首字节
+    到达即返回，不会空等满整个 timeout。数据持续到达时，在
+    `coalesce_window` 秒或 `coalesce_bytes` 字节内把后续读取合并成一次
+    信号发出；小块数据（交互回显）读完立即发出，不增加延迟。
+    """
 
-    data_received = pyqtSignal(bytes)
-    error_occurred = pyqtSignal(str)
     session_data_received = pyqtSignal(object, bytes)
     session_error_occurred = pyqtSignal(object, str)
 
-    def __init__(self, serial_port: serial.Serial) -> None:
+    DEFAULT_COALESCE_WINDOW = 0.005
+    DEFAULT_COALESCE_BYTES = 64 * 1024
+    # 单次读到的数据少于一个 USB 包时视为交互数据，不再等待后续数据
+    _BURST_BYTES = 64
+    _POLL_SECONDS = 0.001
+
+    def __init__(
+        self,
+        serial_port: serial.Serial,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        coalesce_bytes: int = DEFAULT_COALESCE_BYTES,
+    ) -> None:
         super().__init__()
         self._serial_port = serial_port
         self._running = True
+        self.coalesce_window = max(0.0, float(coalesce_window))
+        self.coalesce_bytes = max(1, int(coalesce_bytes))
 
     def stop(self) -> None:
         self._running = False
 
+    def _in_waiting(self) -> int:
+        waiting = self._serial_port.in_waiting
+        # 部分驱动/替身对象不提供整数计数，按"未知"处理
+        return waiting if isinstance(waiting, int) and waiting > 0 else 0
+
+    def _read_batch(self) -> bytes:
+        port = self._serial_port
+        limit = self.coalesce_bytes
+        data = port.read(max(1, min(self._in_waiting(), limit)))
+        if not data:
+            return b""
+
+        parts = [data]
+        size = len(data)
+        deadline = time.monotonic() + self.coalesce_window
+        while self._running and size < limit:
+            waiting = self._in_waiting()
+            if not waiting:
+                remaining = deadline - time.monotonic()
+                if len(data) < self._BURST_BYTES or remaining <= 0:
+                    break
+                # 刚读到整包数据，线路大概率仍在发送，稍等下一包
+                time.sleep(min(self._POLL_SECONDS, remaining))
+                waiting = self._in_waiting()
+                if not waiting:
+                    break
+            elif time.monotonic() >= deadline:
+                break
+            data = port.read(min(waiting, limit - size))
+            if not data:
+                break
+            parts.append(data)
+            size += len(data)
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
     def run(self) -> None:  # noqa: D401
         while self._running:
             try:
-                data = self._serial_port.read(4096)
+                data = self._read_batch()
                 if data:
-                    self.data_received.emit(data)
                     self.session_data_received.emit(self, data)
             except (OSError, serial.SerialException) as e:
-                self.error_occurred.emit(str(e))
                 self.session_error_occurred.emit(self, str(e))
                 return
             except Exception as e:
                 logger.exception("Unexpected error in serial read thread")
-                self.error_occurred.emit(str(e))
                 self.session_error_occurred.emit(self, str(e))
                 return
 
 
+@dataclass(frozen=True)
+class SerialWriteStats:
+    """写入线程的累计统计：一次 write 调用可合并多个载荷。"""
+
+    writes: int = 0
+    payloads: int = 0
+    bytes: int = 0
+    max_merged: int = 0
+
+    @property
+    def merged_per_write(self) -> float:
+        return self.payloads / self.writes if self.writes else 0.0
+
+
+_WriteItem = tuple[int, bytes, float]
+
+
+class WritePacing(str, Enum):
+    """发送限速模式：不限速、按串口波特率折算、或自定义字节/秒。"""
+
+    OFF = "off"
+    BAUD = "baud"
+    CUSTOM = "custom"
+
+
+def _line_bytes_per_second(port: serial.Serial) -> float:
+    """按波特率和帧格式（起始位 + 数据位 + 校验位 + 停止位）折算线路速率。"""
+    try:
+        bits = 1 + int(port.bytesize) + float(port.stopbits)
+        if port.parity != serial.PARITY_NONE:
+            bits += 1
+        return float(port.baudrate) / bits
+    except (TypeError, ValueError, AttributeError):
+        return 0.0
+
+
+class SerialIoBackend(str, Enum):
+    """串口读写后端：每端口读写线程，或所有端口共用一个反应器线程。"""
+
+    THREADS = "threads"
+    REACTOR = "reactor"
+
+
 class _SerialWriteThread(QThread):
-    """后台串口写入线程（FIFO 队列，避免阻塞 GUI）。"""
+    """后台串口写入线程（FIFO 队列，避免阻塞 GUI）。
+
+    每次唤醒把队列里已有的载荷（至多 `max_coalesce_bytes` 字节）拼成一块
+    连续缓冲区，只调用一次 write。每个载荷带一个票据号，写完（或失败）后
+    通过 `session_write_completed` 逐个报告实际写出的字节数和从入队到写完
+    的耗时。
+
+    队列按字节计上限：待写数据超过 `max_queue_bytes` 时拒绝入队，越过
+    `high_water` 时发出背压信号，回落到 `low_water` 以下时解除。设置
+    `pace_bytes_per_second` 后按该速率分片写出。
+    """
 
     session_error_occurred = pyqtSignal(object, str)
+    session_write_completed = pyqtSignal(object, int, int, float)
+    session_backpressure_changed = pyqtSignal(object, bool)
+
+    DEFAULT_MAX_COALESCE_BYTES = 64 * 1024
+    DEFAULT_MAX_QUEUE_BYTES = 16 * 1024 * 1024
+    DEFAULT_HIGH_WATER = 1024 * 1024
+    DEFAULT_LOW_WATER = 256 * 1024
+    # 限速时每片至多覆盖这么长时间的数据，停止请求能及时生效
+    PACE_SLICE_SECONDS = 0.05
 
-    def __init__(self, serial_port: serial.Serial) -> None:
+    def __init__(
+        self,
+        serial_port: serial.Serial,
+        max_coalesce_bytes: int = DEFAULT_MAX_COALESCE_BYTES,
+        max_queue_bytes: int = DEFAULT_MAX_QUEUE_BYTES,
+        high_water: int = DEFAULT_HIGH_WATER,
+        low_water: int = DEFAULT_LOW_WATER,
+    ) -> None:
         super().__init__()
         self._serial_port = serial_port
-        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self.max_coalesce_bytes = max(1, int(max_coalesce_bytes))
+        self.max_queue_bytes = max(1, int(max_queue_bytes))
+        self.high_water = max(1, min(int(high_water), self.max_queue_bytes))
+        self.low_water = max(0, min(int(low_water), self.high_water - 1))
+        self.pace_bytes_per_second = 0.0
+        self._queue: "queue.Queue[Optional[_WriteItem]]" = queue.Queue()
         self._lock = threading.Lock()
         self._pending = 0
+        self._throttled = False
+        self._discard = False
+        self._next_send = 0.0
+        self._wake = threading.Event()
+        self._stats = SerialWriteStats()
         self._idle = threading.Event()
         self._idle.set()
 
-    def enqueue(self, data: bytes) -> None:
+    def enqueue(self, data: bytes, ticket: int = 0) -> bool:
+        """入队；待写数据会超过上限时返回 False（队列为空时总是接受）。"""
         with self._lock:
+            pending = self._pending
+            if pending and pending + len(data) > self.max_queue_bytes:
+                return False
             self._pending += len(data)
+            throttle = not self._throttled and self._pending >= self.high_water
+            if throttle:
+                self._throttled = True
         self._idle.clear()
-        self._queue.put(data)
+        self._queue.put((ticket, data, time.monotonic()))
+        if throttle:
+            self.session_backpressure_changed.emit(self, True)
+        return True
 
     def pending_bytes(self) -> int:
         with self._lock:
             return self._pending
 
+    @property
+    def throttled(self) -> bool:
+        with self._lock:
+            return self._throttled
+
+    def _release_if_drained(self) -> bool:
+        """调用方持有锁；回落到低水位以下时解除背压，返回是否需要通知。"""
+        if self._throttled and self._pending <= self.low_water:
+            self._throttled = False
+            return True
+        return False
+
+    @property
+    def stats(self) -> SerialWriteStats:
+        with self._lock:
+            return self._stats
+
     def wait_idle(self, timeout_s: float) -> bool:
         return self._idle.wait(timeout_s)
 
     def stop(self, drain: bool = False) -> None:
         if not drain:
+            self._discard = True
+            self._wake.set()
             while True:
                 try:
                     self._queue.get_nowait()
@@ -95,49 +258,208 @@ class _SerialWriteThread(QThread):
                     break
             with self._lock:
                 self._pending = 0
+                released = self._release_if_drained()
             self._idle.set()
+            if released:
+                self.session_backpressure_changed.emit(self, False)
         self._queue.put(None)
 
+    def _collect(
+        self, first: _WriteItem
+    ) -> tuple[list[_WriteItem], Optional[_WriteItem], bool]:
+        """取出队列里已有的载荷直到字节上限，返回 (批次, 放不下的载荷, 是否收到停止)。"""
+        limit = self.max_coalesce_bytes
+        rate = self.pace_bytes_per_second
+        if rate > 0:
+            # 限速时只合并一片的量，各载荷的完成回报不会被整批拖后
+            limit = min(limit, max(1, int(rate * self.PACE_SLICE_SECONDS)))
+        batch = [first]
+        size = len(first[1])
+        while size < limit:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, None, True
+            if size + len(item[1]) > limit:
+                return batch, item, False
+            batch.append(item)
+            size += len(item[1])
+        return batch, None, False
+
     def run(self) -> None:  # noqa: D401
-        while True:
-            item = self._queue.get()
+        carry: Optional[_WriteItem] = None
+        stop = False
+        while not stop:
+            item = carry if carry is not None else self._queue.get()
+            carry = None
             if item is None:
                 break
-            try:
-                written = self._serial_port.write(item)
-                if written is not None and written != len(item):
-                    self.session_error_occurred.emit(
-                        self,
-                        f"Serial write accepted {written} of {len(item)} bytes",
-                    )
-            except (OSError, serial.SerialException) as e:
-                self.session_error_occurred.emit(self, str(e))
-            except Exception as e:  # noqa: BLE001
-                logger.exception("Unexpected error in serial write thread")
-                self.session_error_occurred.emit(self, str(e))
-            finally:
-                with self._lock:
-                    self._pending = max(0, self._pending - len(item))
-                    drained = self._pending == 0 and self._queue.empty()
-                if drained:
-                    self._idle.set()
+            batch, carry, stop = self._collect(item)
+            if self._discard:
+                break
+            self._write_batch(batch)
         self._idle.set()
 
+    def _write_batch(self, batch: list[_WriteItem]) -> None:
+        data = batch[0][1] if len(batch) == 1 else b"".join(p for _, p, _ in batch)
+        written = 0
+        failed = False
+        try:
+            rate = self.pace_bytes_per_second
+            result = (
+                self._write_paced(data, rate) if rate > 0 else self._write_chunk(data)
+            )
+            if isinstance(result, int):
+                written = result
+            else:
+                failed = True
+                self.session_error_occurred.emit(
+                    self, f"Serial write returned {result!r}"
+                )
+        except (OSError, serial.SerialException) as e:
+            failed = True
+            self.session_error_occurred.emit(self, str(e))
+        except Exception as e:  # noqa: BLE001
+            failed = True
+            logger.exception("Unexpected error in serial write thread")
+            self.session_error_occurred.emit(self, str(e))
+        finally:
+            with self._lock:
+                self._pending = max(0, self._pending - len(data))
+                drained = self._pending == 0 and self._queue.empty()
+                released = self._release_if_drained()
+                stats = self._stats
+                self._stats = SerialWriteStats(
+                    writes=stats.writes + 1,
+                    payloads=stats.payloads + len(batch),
+                    bytes=stats.bytes + max(0, written),
+                    max_merged=max(stats.max_merged, len(batch)),
+                )
+            if drained:
+                self._idle.set()
+            if released:
+                self.session_backpressure_changed.emit(self, False)
+
+        # 按顺序把实际写出的字节分摊到各个载荷，逐个报告
+        remaining = max(0, written)
+        now = time.monotonic()
+        for ticket, payload, queued_at in batch:
+            share = min(len(payload), remaining)
+            remaining -= share
+            if share != len(payload) and not failed and not self._discard:
+                self.session_error_occurred.emit(
+                    self,
+                    f"Serial write accepted {share} of {len(payload)} bytes",
+                )
+            self.session_write_completed.emit(self, ticket, share, now - queued_at)
+
+    def _write_chunk(self, data: bytes) -> object:
+        result = self._serial_port.write(data)
+        return len(data) if result is None else result
+
+    def _write_paced(self, data: bytes, rate: float) -> object:
+        """按限速分片写出，返回累计写出的字节数；短写或停止时提前返回。
+
+        下一片的发送时刻以上一片实际写完的时间为基准，硬件流控让 write
+        阻塞之后不会补发积压的额度。
+        """
+        step = max(1, int(rate * self.PACE_SLICE_SECONDS))
+        view = memoryview(data)
+        total = 0
+        while total < len(data):
+            delay = self._next_send - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+            if self._discard:
+                break
+            chunk = bytes(view[total : total + step])
+            written = self._write_chunk(chunk)
+            if not isinstance(written, int):
+                return written
+            self._next_send = max(time.monotonic(), self._next_send) + written / rate
+            total += written
+            if written < len(chunk):
+                break
+        return total
+
+
+class _SerialReader(Protocol):
+    """串口读取端：`_SerialReadThread` 或反应器中的 `_ReactorReader`。
+
+    会话信号的第一个参数是读取端自身，handler 据此丢弃旧读取端的迟到信号。
+    """
+
+    @property
+    def session_data_received(self) -> pyqtBoundSignal: ...
+
+    @property
+    def session_error_occurred(self) -> pyqtBoundSignal: ...
+
+    def stop(self) -> None: ...
+
+    def wait(self, timeout_ms: int, /) -> bool: ...
+
+
+class _SerialWriter(Protocol):
+    """串口写入端：`_SerialWriteThread` 或反应器中的 `_ReactorWriter`。"""
+
+    pace_bytes_per_second: float
+
+    @property
+    def session_error_occurred(self) -> pyqtBoundSignal: ...
+
+    @property
+    def session_write_completed(self) -> pyqtBoundSignal: ...
+
+    @property
+    def session_backpressure_changed(self) -> pyqtBoundSignal: ...
+
+    @property
+    def stats(self) -> SerialWriteStats: ...
+
+    def start(self) -> None: ...
+
+    def enqueue(self, data: bytes, ticket: int = 0) -> bool: ...
+
+    def pending_bytes(self) -> int: ...
+
+    def wait_idle(self, timeout_s: float) -> bool: ...
+
+    def stop(self, drain: bool = False) -> None: ...
+
+    def wait(self, timeout_ms: int, /) -> bool: ...
+
 
 class SerialHandler(TransportHandler):
     """串口通信处理类"""
 
-    _WRITE_ACK_SECONDS = 0.05
     _WRITE_DRAIN_SECONDS = 2.0
 
-    def __init__(self) -> None:
+    def __init__(
+        self, io_backend: SerialIoBackend | str = SerialIoBackend.THREADS
+    ) -> None:
         super().__init__()
         self.serial_port: Optional[serial.Serial] = None
         self.current_port: Optional[str] = None
         self._target_port: Optional[str] = None
-        self._reader_thread: Optional[_SerialReadThread] = None
-        self._orphan_readers: list[_SerialReadThread] = []
-        self._writer_thread: Optional[_SerialWriteThread] = None
+        self._reader_thread: Optional[_SerialReader] = None
+        self._orphan_readers: list[_SerialReader] = []
+        self._writer_thread: Optional[_SerialWriter] = None
+        # 当前端口由反应器读写时指向共享反应器，否则为 None
+        self._reactor: Optional[SerialReactor] = None
+        self.io_backend = SerialIoBackend.THREADS
+        self.set_io_backend(io_backend)
+        self.read_coalesce_window = _SerialReadThread.DEFAULT_COALESCE_WINDOW
+        self.read_coalesce_bytes = _SerialReadThread.DEFAULT_COALESCE_BYTES
+        self.write_coalesce_bytes = _SerialWriteThread.DEFAULT_MAX_COALESCE_BYTES
+        self.write_queue_bytes = _SerialWriteThread.DEFAULT_MAX_QUEUE_BYTES
+        self.write_high_water = _SerialWriteThread.DEFAULT_HIGH_WATER
+        self.write_low_water = _SerialWriteThread.DEFAULT_LOW_WATER
+        self.write_pacing = WritePacing.OFF
+        self.write_pacing_bps = 0
+        self._write_throttled = False
 
     @property
     def endpoint(self) -> str:
@@ -243,16 +565,43 @@ class SerialHandler(TransportHandler):
             self._target_port = None
             return False
 
+    def set_io_backend(self, backend: SerialIoBackend | str) -> None:
+        """选择读写后端；从下一次打开串口起生效。"""
+        try:
+            self.io_backend = SerialIoBackend(backend)
+        except ValueError:
+            self.io_backend = SerialIoBackend.THREADS
+
     def _start_reader(self) -> None:
         if not self._stop_reader():
             # 旧线程无法停止时必须脱离，否则会被静默覆盖并泄漏
             self._detach_reader()
         if not self.serial_port:
             return
-        self._reader_thread = _SerialReadThread(self.serial_port)
-        self._reader_thread.session_data_received.connect(self._on_reader_data)
-        self._reader_thread.session_error_occurred.connect(self._on_reader_error)
-        self._reader_thread.start()
+        if self.io_backend is SerialIoBackend.REACTOR:
+            from core.serial_reactor import SerialReactor, reactor_supported
+
+            if reactor_supported(self.serial_port):
+                self._reactor = SerialReactor.shared()
+                reader = self._reactor.attach(
+                    self.serial_port,
+                    coalesce_window=self.read_coalesce_window,
+                    coalesce_bytes=self.read_coalesce_bytes,
+                )
+                reader.session_data_received.connect(self._on_reader_data)
+                reader.session_error_occurred.connect(self._on_reader_error)
+                self._reader_thread = reader
+                return
+            # 端口没有可 select 的文件描述符（如 Windows），退回读写线程
+        thread = _SerialReadThread(
+            self.serial_port,
+            coalesce_window=self.read_coalesce_window,
+            coalesce_bytes=self.read_coalesce_bytes,
+        )
+        thread.session_data_received.connect(self._on_reader_data)
+        thread.session_error_occurred.connect(self._on_reader_error)
+        thread.start()
+        self._reader_thread = thread
 
     def _stop_reader(self, timeout_ms: int = 1000) -> bool:
         if self._reader_thread is None:
@@ -273,36 +622,99 @@ class SerialHandler(TransportHandler):
             return False
 
         self._reader_thread = None
+        self._reactor = None
         return True
 
     def _start_writer(self) -> None:
         self._stop_writer(drain=False)
         if not self.serial_port:
             return
-        self._writer_thread = _SerialWriteThread(self.serial_port)
-        self._writer_thread.session_error_occurred.connect(self._on_writer_error)
-        self._writer_thread.start()
+        limits = dict(
+            max_coalesce_bytes=self.write_coalesce_bytes,
+            max_queue_bytes=self.write_queue_bytes,
+            high_water=self.write_high_water,
+            low_water=self.write_low_water,
+        )
+        reader = self._reader_thread
+        writer: _SerialWriter
+        if self._reactor is not None and reader is not None:
+            from core.serial_reactor import _ReactorReader
+
+            assert isinstance(reader, _ReactorReader)
+            writer = self._reactor.writer(reader, **limits)
+        else:
+            writer = _SerialWriteThread(self.serial_port, **limits)
+        writer.pace_bytes_per_second = self._pace_rate()
+        writer.session_error_occurred.connect(self._on_writer_error)
+        writer.session_write_completed.connect(self._on_writer_completed)
+        writer.session_backpressure_changed.connect(self._on_writer_backpressure)
+        writer.start()
+        self._writer_thread = writer
 
     def _stop_writer(self, drain: bool, timeout_ms: int = 1000) -> None:
         writer = self._writer_thread
         if writer is None:
             return
-        if drain:
-            writer.wait_idle(self._WRITE_DRAIN_SECONDS)
+        if drain and not writer.wait_idle(self._WRITE_DRAIN_SECONDS):
+            # 限速或慢速设备上排空时间有上限，剩余数据丢弃
+            drain = False
         writer.stop(drain=drain)
         if not writer.wait(timeout_ms):
             logger.warning("Serial writer thread did not stop")
-        try:
-            writer.session_error_occurred.disconnect(self._on_writer_error)
-        except (TypeError, RuntimeError):
-            pass
+        for signal, slot in (
+            (writer.session_error_occurred, self._on_writer_error),
+            (writer.session_write_completed, self._on_writer_completed),
+            (writer.session_backpressure_changed, self._on_writer_backpressure),
+        ):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
         self._writer_thread = None
+        self._set_write_throttled(False)
 
     def _on_writer_error(self, writer: object, message: str) -> None:
         if writer is not self._writer_thread:
             return
         self._emit_error(TransportOperation.WRITE, message)
 
+    def _on_writer_completed(
+        self, writer: object, ticket: int, written: int, elapsed: float
+    ) -> None:
+        if writer is self._writer_thread:
+            self.write_completed.emit(ticket, written, elapsed)
+
+    def _on_writer_backpressure(self, writer: object, throttled: bool) -> None:
+        if writer is self._writer_thread:
+            self._set_write_throttled(throttled)
+
+    def _set_write_throttled(self, throttled: bool) -> None:
+        if throttled != self._write_throttled:
+            self._write_throttled = throttled
+            self.write_backpressure_changed.emit(throttled)
+
+    def is_write_throttled(self) -> bool:
+        return self._write_throttled
+
+    def set_write_pacing(
+        self, mode: WritePacing | str, bytes_per_second: int = 0
+    ) -> None:
+        """设置发送限速；对正在运行的写入线程立即生效。"""
+        try:
+            self.write_pacing = WritePacing(mode)
+        except ValueError:
+            self.write_pacing = WritePacing.OFF
+        self.write_pacing_bps = max(0, int(bytes_per_second))
+        if self._writer_thread is not None:
+            self._writer_thread.pace_bytes_per_second = self._pace_rate()
+
+    def _pace_rate(self) -> float:
+        if self.write_pacing is WritePacing.CUSTOM:
+            return float(self.write_pacing_bps)
+        if self.write_pacing is WritePacing.BAUD and self.serial_port is not None:
+            return _line_bytes_per_second(self.serial_port)
+        return 0.0
+
     def _detach_reader(self) -> None:
         """放弃无法停止的读取线程：断开信号并保留引用直到它自行结束。"""
         reader = self._reader_thread
@@ -321,13 +733,16 @@ class SerialHandler(TransportHandler):
         except RuntimeError:
             pass
         self._orphan_readers.append(reader)
-        try:
-            reader.finished.connect(
-                lambda r=reader: self._forget_orphan_reader(r)
-            )
-        except (AttributeError, RuntimeError):
-            pass
+        # 只有读取线程会在结束时发 finished
+        if isinstance(reader, QThread):
+            try:
+                reader.finished.connect(
+                    lambda r=reader: self._forget_orphan_reader(r)
+                )
+            except RuntimeError:
+                pass
         self._reader_thread = None
+        self._reactor = None
 
     def _forget_orphan_reader(self, reader: object) -> None:
         if reader in self._orphan_readers:
@@ -340,6 +755,7 @@ class SerialHandler(TransportHandler):
     def _on_reader_error(
         self, reader_or_message: object, message: str | None = None
     ) -> None:
+        reader: object
         if message is None:
             reader = self._reader_thread
             message = str(reader_or_message)
@@ -417,7 +833,8 @@ class SerialHandler(TransportHandler):
             data: 要发送的字节数据。
 
         Returns:
-            是否已被接受（写入结果通过 transport_error 异步反馈）。
+            是否已被接受（写队列已满时拒绝）。写完后以 `last_write_ticket`
+            为票据号发出 write_completed，失败另经 transport_error 反馈。
         """
         if not self.is_open():
             return False
@@ -427,10 +844,12 @@ class SerialHandler(TransportHandler):
         if self._writer_thread is None:
             return False
 
+        ticket = self._next_write_ticket()
+        if not self._writer_thread.enqueue(data, ticket):
+            self.last_write_ticket = None
+            self._emit_error(TransportOperation.WRITE, "Serial write queue is full")
+            return False
         self.last_error = None
-        self._writer_thread.enqueue(data)
-        # 短暂等待，常见的小报文可在返回前完成，从而如实报告 SENT
-        self._writer_thread.wait_idle(self._WRITE_ACK_SECONDS)
         return True
 
     def has_pending_writes(self) -> bool:
@@ -438,6 +857,11 @@ class SerialHandler(TransportHandler):
         writer = self._writer_thread
         return writer is not None and writer.pending_bytes() > 0
 
+    def write_stats(self) -> SerialWriteStats:
+        """当前写入线程的合并统计；尚未写入时为空统计。"""
+        writer = self._writer_thread
+        return writer.stats if writer is not None else SerialWriteStats()
+
     def check_device_exists(self) -> bool:
         """检查当前连接的设备是否还存在。"""
         if not self.current_port:
@@ -0,0 +1,632 @@
+"""
+串口 I/O 反应器
+
+可选的串口后端：一个线程用 selectors（Linux 上为 epoll）同时等待所有已打开
+串口的文件描述符，以非阻塞方式读写，每轮把所有端口的结果合成一次信号投递
+到 GUI 线程。线程数与端口数无关；没有待发数据时线程阻塞在 select 上，空闲
+端口不会产生任何唤醒。
+
+读取端和写入端对 SerialHandler 暴露与读写线程相同的接口和会话信号，
+handler 的其余逻辑（票据、背压、限速、关闭顺序）无需区分后端。
+
+仅支持 POSIX：Windows 上串口句柄不能交给 select，由 SerialHandler 退回
+每端口读写线程。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import selectors
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import serial
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.serial_handler import SerialWriteStats, _SerialReadThread, _SerialWriteThread
+
+logger = logging.getLogger(__name__)
+
+_WriteItem = tuple[int, bytes, float]
+# (信号所属对象, 信号名, 参数)；在 GUI 线程按顺序发出
+_Event = tuple[QObject, str, tuple]
+
+
+def reactor_supported(port: object) -> bool:
+    """端口能否交给反应器：需要 POSIX 且端口提供真实的文件描述符。"""
+    if os.name != "posix":
+        return False
+    fileno = getattr(port, "fileno", None)
+    if not callable(fileno):
+        return False
+    try:
+        return isinstance(fileno(), int)
+    except (OSError, ValueError, serial.SerialException):
+        return False
+
+
+class _ReactorReader(QObject):
+    """反应器中一个端口的读取端，实现 `_SerialReader` 协议。"""
+
+    session_data_received = pyqtSignal(object, bytes)
+    session_error_occurred = pyqtSignal(object, str)
+
+    def __init__(self, reactor: SerialReactor, channel: _Channel) -> None:
+        super().__init__()
+        self._reactor = reactor
+        self._channel = channel
+
+    def stop(self) -> None:
+        self._reactor._detach(self._channel)
+
+    def wait(self, timeout_ms: int = 1000) -> bool:
+        """等待反应器线程确认不再访问该端口的文件描述符。"""
+        return self._channel.detached.wait(max(0, timeout_ms) / 1000)
+
+
+class _ReactorWriter(QObject):
+    """反应器中一个端口的写入端，实现 `_SerialWriter` 协议。
+
+    队列、字节上限和高低水位与写入线程相同；实际写出在反应器线程里以
+    非阻塞 write 完成，写不下的部分等端口可写时继续。
+    """
+
+    session_error_occurred = pyqtSignal(object, str)
+    session_write_completed = pyqtSignal(object, int, int, float)
+    session_backpressure_changed = pyqtSignal(object, bool)
+
+    def __init__(
+        self,
+        reactor: SerialReactor,
+        reader: _ReactorReader,
+        max_coalesce_bytes: int = _SerialWriteThread.DEFAULT_MAX_COALESCE_BYTES,
+        max_queue_bytes: int = _SerialWriteThread.DEFAULT_MAX_QUEUE_BYTES,
+        high_water: int = _SerialWriteThread.DEFAULT_HIGH_WATER,
+        low_water: int = _SerialWriteThread.DEFAULT_LOW_WATER,
+    ) -> None:
+        super().__init__()
+        self._reactor = reactor
+        self._channel = reader._channel
+        self.max_coalesce_bytes = max(1, int(max_coalesce_bytes))
+        self.max_queue_bytes = max(1, int(max_queue_bytes))
+        self.high_water = max(1, min(int(high_water), self.max_queue_bytes))
+        self.low_water = max(0, min(int(low_water), self.high_water - 1))
+        self._pace = 0.0
+        self._items: deque[_WriteItem] = deque()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._throttled = False
+        self._discard = False
+        self._stats = SerialWriteStats()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @property
+    def pace_bytes_per_second(self) -> float:
+        return self._pace
+
+    @pace_bytes_per_second.setter
+    def pace_bytes_per_second(self, rate: float) -> None:
+        self._pace = max(0.0, float(rate))
+        # 新速率可能让下一片提前到期，唤醒反应器重新计算等待时间
+        self._reactor._request_write(self._channel)
+
+    def start(self) -> None:
+        self._channel.writer = self
+
+    def enqueue(self, data: bytes, ticket: int = 0) -> bool:
+        """入队；待写数据会超过上限时返回 False（队列为空时总是接受）。"""
+        with self._lock:
+            if self._discard:
+                return False
+            pending = self._pending
+            if pending and pending + len(data) > self.max_queue_bytes:
+                return False
+            self._pending += len(data)
+            self._items.append((ticket, data, time.monotonic()))
+            throttle = not self._throttled and self._pending >= self.high_water
+            if throttle:
+                self._throttled = True
+            self._idle.clear()
+        self._reactor._request_write(self._channel)
+        if throttle:
+            self.session_backpressure_changed.emit(self, True)
+        return True
+
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return self._pending
+
+    @property
+    def throttled(self) -> bool:
+        with self._lock:
+            return self._throttled
+
+    @property
+    def stats(self) -> SerialWriteStats:
+        with self._lock:
+            return self._stats
+
+    def wait_idle(self, timeout_s: float) -> bool:
+        return self._idle.wait(timeout_s)
+
+    def stop(self, drain: bool = False) -> None:
+        if drain:
+            return
+        with self._lock:
+            self._discard = True
+            self._items.clear()
+            self._pending = 0
+            released = self._throttled
+            self._throttled = False
+        self._idle.set()
+        self._reactor._request_write(self._channel)
+        if released:
+            self.session_backpressure_changed.emit(self, False)
+
+    def wait(self, timeout_ms: int = 1000) -> bool:
+        return self._idle.wait(max(0, timeout_ms) / 1000)
+
+    # ── 以下只在反应器线程调用 ────────────────────────────────
+
+    def _take_batch(self, limit: int) -> list[_WriteItem]:
+        """取出队首的若干载荷，总长不超过 limit（至少取一个）。"""
+        with self._lock:
+            batch: list[_WriteItem] = []
+            size = 0
+            while self._items:
+                item = self._items[0]
+                if batch and size + len(item[1]) > limit:
+                    break
+                batch.append(self._items.popleft())
+                size += len(item[1])
+            return batch
+
+    def _record_write(self, written: int) -> None:
+        with self._lock:
+            stats = self._stats
+            self._stats = SerialWriteStats(
+                writes=stats.writes + 1,
+                payloads=stats.payloads,
+                bytes=stats.bytes + written,
+                max_merged=stats.max_merged,
+            )
+
+    def _finish_batch(
+        self, batch: list[_WriteItem], size: int, events: list[_Event]
+    ) -> None:
+        """释放批次占用的队列字节；回落到低水位以下时解除背压。"""
+        with self._lock:
+            self._pending = max(0, self._pending - size)
+            stats = self._stats
+            self._stats = SerialWriteStats(
+                writes=stats.writes,
+                payloads=stats.payloads + len(batch),
+                bytes=stats.bytes,
+                max_merged=max(stats.max_merged, len(batch)),
+            )
+            released = self._throttled and self._pending <= self.low_water
+            if released:
+                self._throttled = False
+            if self._pending == 0 and not self._items:
+                self._idle.set()
+        if released:
+            events.append((self, "session_backpressure_changed", (False,)))
+
+
+class _Channel:
+    """一个已登记的串口；除 `detached` 外只在反应器线程访问。"""
+
+    def __init__(
+        self, port: serial.Serial, coalesce_window: float, coalesce_bytes: int
+    ) -> None:
+        self.port = port
+        self.fd: int = port.fileno()
+        self.coalesce_window = max(0.0, float(coalesce_window))
+        self.coalesce_bytes = max(1, int(coalesce_bytes))
+        self.reader: Optional[_ReactorReader] = None
+        self.writer: Optional[_ReactorWriter] = None
+        self.registered = False
+        self.want_write = False
+        self.failed = False
+        self.detached = threading.Event()
+
+        self.read_parts: list[bytes] = []
+        self.read_size = 0
+        self.read_deadline: Optional[float] = None
+
+        self.batch: list[_WriteItem] = []
+        self.buffer: Optional[memoryview] = None
+        self.offset = 0
+        self.next_send = 0.0
+
+
+class _Dispatcher(QObject):
+    """在 GUI 线程把反应器一轮的事件逐个转发到各端口的会话信号。"""
+
+    events_ready = pyqtSignal(list)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.dispatches = 0
+        self.events_ready.connect(self._dispatch)
+
+    def _dispatch(self, events: list[_Event]) -> None:
+        self.dispatches += 1
+        for target, name, args in events:
+            try:
+                getattr(target, name).emit(target, *args)
+            except RuntimeError:
+                # 接收端已随 handler 一起删除
+                pass
+
+
+class SerialReactor:
+    """所有串口共用的 I/O 线程。
+
+    GUI 线程通过命令队列 + 自管道唤醒反应器登记/注销端口或提交写入；
+    反应器线程每轮收集全部端口的读写结果，只向 GUI 线程投递一次。
+    反应器本身不是 QObject，投递借助在 GUI 线程创建的 `_Dispatcher`；
+    它随 QApplication 销毁后，下一次登记端口时重新创建。
+    """
+
+    _shared: Optional[SerialReactor] = None
+
+    def __init__(self) -> None:
+        self._commands: queue.SimpleQueue[tuple[str, _Channel]] = queue.SimpleQueue()
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r = -1
+        self._wake_w = -1
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._channels: set[_Channel] = set()
+        self._dispatcher: Optional[_Dispatcher] = None
+        # 诊断计数：select 返回次数
+        self.wakeups = 0
+
+    @classmethod
+    def shared(cls) -> SerialReactor:
+        """进程内共享的反应器。"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @property
+    def dispatches(self) -> int:
+        """投递到 GUI 线程的批次数。"""
+        dispatcher = self._dispatcher
+        return dispatcher.dispatches if dispatcher is not None else 0
+
+    def attach(
+        self,
+        port: serial.Serial,
+        coalesce_window: float = _SerialReadThread.DEFAULT_COALESCE_WINDOW,
+        coalesce_bytes: int = _SerialReadThread.DEFAULT_COALESCE_BYTES,
+    ) -> _ReactorReader:
+        """登记端口并返回其读取端，数据从返回对象的会话信号发出。"""
+        channel = _Channel(port, coalesce_window, coalesce_bytes)
+        reader = _ReactorReader(self, channel)
+        channel.reader = reader
+        os.set_blocking(channel.fd, False)
+        if self._dispatcher is None:
+            self._dispatcher = _Dispatcher()
+            self._dispatcher.destroyed.connect(self._forget_dispatcher)
+        self._ensure_thread()
+        self._command("attach", channel)
+        return reader
+
+    def writer(self, reader: _ReactorReader, **kwargs: int) -> _ReactorWriter:
+        """为已登记的端口创建写入端；`start()` 之后才会写出。"""
+        return _ReactorWriter(self, reader, **kwargs)
+
+    def port_count(self) -> int:
+        return len(self._channels)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ── GUI 线程 ─────────────────────────────────────────────
+
+    def _detach(self, channel: _Channel) -> None:
+        if not channel.detached.is_set():
+            self._command("detach", channel)
+
+    def _request_write(self, channel: _Channel) -> None:
+        self._command("write", channel)
+
+    def _command(self, name: str, channel: _Channel) -> None:
+        self._commands.put((name, channel))
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            # 管道已满说明反应器本来就会被唤醒
+            pass
+        except OSError as e:
+            logger.debug("Failed to wake serial reactor: %s", e)
+
+    def _ensure_thread(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+            os.set_blocking(self._wake_w, False)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+            self._thread = threading.Thread(
+                target=self._run, name="SerialReactor", daemon=True
+            )
+            self._thread.start()
+
+    def _forget_dispatcher(self) -> None:
+        self._dispatcher = None
+
+    # ── 反应器线程 ───────────────────────────────────────────
+
+    def _run(self) -> None:
+        selector = self._selector
+        assert selector is not None
+        while True:
+            events: list[_Event] = []
+            timeout = self._next_timeout()
+            try:
+                ready = selector.select(timeout)
+            except OSError as e:
+                logger.exception("Serial reactor select failed: %s", e)
+                time.sleep(0.1)
+                continue
+            self.wakeups += 1
+            now = time.monotonic()
+            for key, mask in ready:
+                channel = key.data
+                if channel is None:
+                    self._drain_wake_pipe()
+                    continue
+                if mask & selectors.EVENT_READ:
+                    self._read(channel, now, events)
+                if mask & selectors.EVENT_WRITE and not channel.failed:
+                    self._write(channel, now, events)
+            self._process_commands(now, events)
+            for channel in list(self._channels):
+                if channel.buffer is not None and not channel.want_write:
+                    # 限速等待到期的端口
+                    self._write(channel, now, events)
+                self._flush_read(channel, now, events)
+            if events:
+                self._post(events)
+
+    def _post(self, events: list[_Event]) -> None:
+        dispatcher = self._dispatcher
+        if dispatcher is None:
+            return
+        try:
+            dispatcher.events_ready.emit(events)
+        except RuntimeError:
+            # QApplication 正在退出，投递对象已销毁
+            pass
+
+    def _next_timeout(self) -> Optional[float]:
+        deadline: Optional[float] = None
+        for channel in self._channels:
+            for candidate in (
+                channel.read_deadline,
+                channel.next_send if channel.buffer is not None else None,
+            ):
+                if candidate is not None and (deadline is None or candidate < deadline):
+                    deadline = candidate
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _drain_wake_pipe(self) -> None:
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _process_commands(self, now: float, events: list[_Event]) -> None:
+        while True:
+            try:
+                name, channel = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if name == "attach":
+                self._channels.add(channel)
+                self._update_interest(channel)
+            elif name == "detach":
+                self._release(channel)
+            elif name == "write" and channel in self._channels:
+                self._write(channel, now, events)
+
+    def _update_interest(self, channel: _Channel) -> None:
+        assert self._selector is not None
+        mask = 0 if channel.failed else selectors.EVENT_READ
+        if channel.want_write and not channel.failed:
+            mask |= selectors.EVENT_WRITE
+        try:
+            if not mask:
+                if channel.registered:
+                    self._selector.unregister(channel.fd)
+                    channel.registered = False
+            elif channel.registered:
+                self._selector.modify(channel.fd, mask, channel)
+            else:
+                self._selector.register(channel.fd, mask, channel)
+                channel.registered = True
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Failed to update serial reactor interest: %s", e)
+            channel.registered = False
+
+    def _release(self, channel: _Channel) -> None:
+        channel.failed = True
+        self._update_interest(channel)
+        self._channels.discard(channel)
+        channel.detached.set()
+
+    def _fail(self, channel: _Channel, message: str, events: list[_Event]) -> None:
+        if channel.failed:
+            return
+        channel.failed = True
+        self._update_interest(channel)
+        if channel.reader is not None:
+            events.append((channel.reader, "session_error_occurred", (message,)))
+
+    def _read(self, channel: _Channel, now: float, events: list[_Event]) -> None:
+        if channel.failed:
+            return
+        try:
+            data = os.read(channel.fd, channel.coalesce_bytes - channel.read_size)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._fail(channel, str(e), events)
+            return
+        if not data:
+            # 与 pySerial 一致：可读却读不到数据说明设备已断开
+            self._fail(
+                channel,
+                "device reports readiness to read but returned no data "
+                "(device disconnected or multiple access on port?)",
+                events,
+            )
+            return
+        channel.read_parts.append(data)
+        channel.read_size += len(data)
+        if (
+            len(data) < _SerialReadThread._BURST_BYTES
+            or channel.read_size >= channel.coalesce_bytes
+        ):
+            # 交互小块或已攒满，本轮结束时立即发出
+            channel.read_deadline = now
+        elif channel.read_deadline is None:
+            channel.read_deadline = now + channel.coalesce_window
+
+    def _flush_read(self, channel: _Channel, now: float, events: list[_Event]) -> None:
+        if not channel.read_parts or channel.read_deadline is None:
+            return
+        if now < channel.read_deadline and not channel.failed:
+            return
+        parts = channel.read_parts
+        data = parts[0] if len(parts) == 1 else b"".join(parts)
+        channel.read_parts = []
+        channel.read_size = 0
+        channel.read_deadline = None
+        if channel.reader is not None:
+            # 出错前已读到的数据排在错误事件之前
+            events.insert(
+                self._error_index(channel, events),
+                (channel.reader, "session_data_received", (data,)),
+            )
+
+    @staticmethod
+    def _error_index(channel: _Channel, events: list[_Event]) -> int:
+        for index, (target, name, _args) in enumerate(events):
+            if target is channel.reader and name == "session_error_occurred":
+                return index
+        return len(events)
+
+    def _write(self, channel: _Channel, now: float, events: list[_Event]) -> None:
+        writer = channel.writer
+        if writer is None:
+            return
+        while True:
+            if writer._discard:
+                self._abandon_batch(channel, writer, events)
+                return
+            if channel.buffer is None:
+                rate = writer.pace_bytes_per_second
+                limit = writer.max_coalesce_bytes
+                if rate > 0:
+                    step = max(1, int(rate * _SerialWriteThread.PACE_SLICE_SECONDS))
+                    limit = min(limit, step)
+                batch = writer._take_batch(limit)
+                if not batch:
+                    self._set_want_write(channel, False)
+                    return
+                data = (
+                    batch[0][1]
+                    if len(batch) == 1
+                    else b"".join(payload for _, payload, _ in batch)
+                )
+                channel.batch = batch
+                channel.buffer = memoryview(data)
+                channel.offset = 0
+
+            rate = writer.pace_bytes_per_second
+            end = len(channel.buffer)
+            if rate > 0:
+                if now < channel.next_send:
+                    self._set_want_write(channel, False)
+                    return
+                step = max(1, int(rate * _SerialWriteThread.PACE_SLICE_SECONDS))
+                end = min(end, channel.offset + step)
+            if channel.failed:
+                self._abandon_batch(channel, writer, events, "Serial port is closed")
+                return
+            try:
+                written = os.write(channel.fd, channel.buffer[channel.offset : end])
+            except BlockingIOError:
+                written = 0
+            except OSError as e:
+                self._abandon_batch(channel, writer, events, str(e))
+                return
+            if written:
+                writer._record_write(written)
+            channel.offset += written
+            if rate > 0 and written:
+                now = time.monotonic()
+                channel.next_send = max(now, channel.next_send) + written / rate
+            if channel.offset >= len(channel.buffer):
+                self._complete_batch(channel, writer, events, len(channel.buffer))
+                continue
+            if channel.offset < end:
+                # 驱动缓冲区已满，等端口可写
+                self._set_want_write(channel, True)
+                return
+
+    def _set_want_write(self, channel: _Channel, want: bool) -> None:
+        if channel.want_write != want:
+            channel.want_write = want
+            self._update_interest(channel)
+
+    def _complete_batch(
+        self,
+        channel: _Channel,
+        writer: _ReactorWriter,
+        events: list[_Event],
+        size: int,
+    ) -> None:
+        """按顺序把已写出的字节分摊到批次中的各载荷并逐个报告。"""
+        batch = channel.batch
+        remaining = channel.offset
+        now = time.monotonic()
+        channel.batch = []
+        channel.buffer = None
+        channel.offset = 0
+        writer._finish_batch(batch, size, events)
+        for ticket, payload, queued_at in batch:
+            share = min(len(payload), remaining)
+            remaining -= share
+            events.append(
+                (writer, "session_write_completed", (ticket, share, now - queued_at))
+            )
+
+    def _abandon_batch(
+        self,
+        channel: _Channel,
+        writer: _ReactorWriter,
+        events: list[_Event],
+        message: Optional[str] = None,
+    ) -> None:
+        self._set_want_write(channel, False)
+        if message is not None:
+            events.append((writer, "session_error_occurred", (message,)))
+        if channel.buffer is not None:
+            self._complete_batch(channel, writer, events, len(channel.buffer))
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, replace
+from enum import Enum
 from typing import Optional
 
 from PyQt6.QtCore import QTimer
@@ -15,13 +17,49 @@ from core.transport import (
 )
 
 
+class SocketWritePolicy(str, Enum):
+    """发送策略。
+
+    INTERACTIVE：关闭 Nagle，每次写入立即 flush，适合按键交互；
+    BATCHED：关闭 Nagle，`BATCH_WINDOW_MS` 内的写入合并后 flush 一次；
+    THROUGHPUT：开启 Nagle 并加大内核发送缓冲，由事件循环按需写出。
+    """
+
+    INTERACTIVE = "interactive"
+    BATCHED = "batched"
+    THROUGHPUT = "throughput"
+
+
+@dataclass(frozen=True)
+class SocketWriteStats:
+    """本会话的发送统计。`sends` 为 Qt 实际交给内核的次数（bytesWritten）。"""
+
+    writes: int = 0
+    flushes: int = 0
+    sends: int = 0
+    bytes: int = 0
+
+    @property
+    def bytes_per_send(self) -> float:
+        return self.bytes / self.sends if self.sends else 0.0
+
+
 class SocketHandler(TransportHandler):
     """基于 Qt 事件循环的非阻塞透明 TCP client。"""
 
     _CONNECT_TIMEOUT_MS = 10000
+    # Qt 读缓冲上限：GUI 处理不过来时由 TCP 流控让对端减速，而不是在内存里
+    # 无限堆积；每次 readyRead 取出的数据块大小也因此有上限
+    DEFAULT_RECEIVE_BUFFER_BYTES = 1024 * 1024
+    BATCH_WINDOW_MS = 5
+    THROUGHPUT_SEND_BUFFER_BYTES = 1024 * 1024
 
     def __init__(self) -> None:
         super().__init__()
+        self.receive_buffer_bytes = self.DEFAULT_RECEIVE_BUFFER_BYTES
+        self.write_policy = SocketWritePolicy.INTERACTIVE
+        self._write_stats = SocketWriteStats()
+        self._batch = bytearray()
         self._socket = self._create_socket()
         self.current_host: Optional[str] = None
         self.current_port: Optional[int] = None
@@ -32,11 +70,16 @@ class SocketHandler(TransportHandler):
         self._connect_timer = QTimer(self)
         self._connect_timer.setSingleShot(True)
         self._connect_timer.timeout.connect(self._on_connect_timeout)
+        self._batch_timer = QTimer(self)
+        self._batch_timer.setSingleShot(True)
+        self._batch_timer.timeout.connect(self._flush_batch)
 
     def _create_socket(self) -> QTcpSocket:
         socket = QTcpSocket(self)
+        socket.setReadBufferSize(getattr(self, "receive_buffer_bytes", 0))
         socket.connected.connect(self._on_connected)
         socket.readyRead.connect(self._on_ready_read)
+        socket.bytesWritten.connect(self._on_bytes_written)
         socket.disconnected.connect(self._on_disconnected)
         socket.errorOccurred.connect(self._on_error)
         return socket
@@ -84,6 +127,7 @@ class SocketHandler(TransportHandler):
         self._disconnect_reason = None
         self._session_active = True
         self._connected_once = False
+        self._write_stats = SocketWriteStats()
         self._transition(TransportState.CONNECTING)
         self._connect_timer.start(self._CONNECT_TIMEOUT_MS)
         self._socket.connectToHost(host, socket_port)
@@ -106,6 +150,8 @@ class SocketHandler(TransportHandler):
     def close(
         self, reason: DisconnectReason = DisconnectReason.USER
     ) -> None:
+        # 合并窗口里尚未交给 Qt 的数据先写出，随后的 disconnectFromHost 会等它发完
+        self._flush_batch()
         if self._state is TransportState.DISCONNECTED:
             return
 
@@ -164,29 +210,95 @@ class SocketHandler(TransportHandler):
         return finished or self._state is TransportState.DISCONNECTED
 
     def has_pending_writes(self) -> bool:
-        """Qt 写缓冲中是否仍有未真正发出的数据。"""
+        """合并窗口或 Qt 写缓冲中是否仍有未真正发出的数据。"""
         socket = self._socket
-        return socket is not None and socket.bytesToWrite() > 0
+        return bool(self._batch) or (
+            socket is not None and socket.bytesToWrite() > 0
+        )
 
     def write_data(self, data: bytes) -> bool:
         if not self.is_open():
             return False
 
-        written = self._socket.write(data)
-        if written < 0:
-            message = self._socket.errorString()
-            self._emit_error(TransportOperation.WRITE, message)
-            self._manual_close = True
-            self._disconnect_reason = DisconnectReason.IO_ERROR
-            self._socket.abort()
-            if self._session_active:
-                self._finish_disconnected(DisconnectReason.IO_ERROR)
+        if self.write_policy is SocketWritePolicy.BATCHED:
+            # Qt 在下一轮事件循环就会写出缓冲，跨事件的合并只能先攒在这里
+            self._batch += data
+            if not self._batch_timer.isActive():
+                self._batch_timer.start(self.BATCH_WINDOW_MS)
+        elif not self._write_to_socket(data):
             return False
-        self._socket.flush()
+        elif self.write_policy is SocketWritePolicy.INTERACTIVE:
+            self._flush_socket()
+        self._write_stats = replace(
+            self._write_stats, writes=self._write_stats.writes + 1
+        )
         self.last_error = None
         self.last_error_context = None
         return True
 
+    def _write_to_socket(self, data: bytes) -> bool:
+        written = self._socket.write(data)
+        if written >= 0:
+            return True
+        message = self._socket.errorString()
+        self._emit_error(TransportOperation.WRITE, message)
+        self._manual_close = True
+        self._disconnect_reason = DisconnectReason.IO_ERROR
+        self._socket.abort()
+        if self._session_active:
+            self._finish_disconnected(DisconnectReason.IO_ERROR)
+        return False
+
+    def set_write_policy(self, policy: SocketWritePolicy | str) -> None:
+        """切换发送策略；已连接时立即作用到当前 socket。"""
+        try:
+            policy = SocketWritePolicy(policy)
+        except ValueError:
+            policy = SocketWritePolicy.INTERACTIVE
+        if policy is self.write_policy:
+            return
+        self.write_policy = policy
+        if self._state is TransportState.CONNECTED:
+            self._apply_write_policy()
+            self._flush_batch()
+
+    def write_stats(self) -> SocketWriteStats:
+        return self._write_stats
+
+    def _apply_write_policy(self) -> None:
+        throughput = self.write_policy is SocketWritePolicy.THROUGHPUT
+        self._socket.setSocketOption(
+            QAbstractSocket.SocketOption.LowDelayOption, 0 if throughput else 1
+        )
+        if throughput:
+            self._socket.setSocketOption(
+                QAbstractSocket.SocketOption.SendBufferSizeSocketOption,
+                self.THROUGHPUT_SEND_BUFFER_BYTES,
+            )
+
+    def _flush_socket(self) -> None:
+        self._socket.flush()
+        self._write_stats = replace(
+            self._write_stats, flushes=self._write_stats.flushes + 1
+        )
+
+    def _flush_batch(self) -> None:
+        self._batch_timer.stop()
+        if not self._batch or self._state is not TransportState.CONNECTED:
+            return
+        data = bytes(self._batch)
+        self._batch.clear()
+        if self._write_to_socket(data):
+            self._flush_socket()
+
+    def _on_bytes_written(self, size: int) -> None:
+        if not self._is_current_socket_signal():
+            return
+        stats = self._write_stats
+        self._write_stats = replace(
+            stats, sends=stats.sends + 1, bytes=stats.bytes + size
+        )
+
     def _on_connected(self) -> None:
         if not self._is_current_socket_signal():
             return
@@ -197,9 +309,7 @@ class SocketHandler(TransportHandler):
         self.last_error = None
         self.last_error_context = None
         self._connected_once = True
-        self._socket.setSocketOption(
-            QAbstractSocket.SocketOption.LowDelayOption, 1
-        )
+        self._apply_write_policy()
         self._socket.setSocketOption(
             QAbstractSocket.SocketOption.KeepAliveOption, 1
         )
@@ -262,6 +372,8 @@ class SocketHandler(TransportHandler):
         if self._state is TransportState.DISCONNECTED:
             return
         self._connect_timer.stop()
+        self._batch_timer.stop()
+        self._batch.clear()
         self._session_active = False
         self._connected_once = False
         self._transition(
@@ -0,0 +1,552 @@
+"""
+本地串口服务器替身
+
+在本机起一个 TCP 服务端，代替 ser2net / 串口服务器，用来测量
+SocketHandler（透明 TCP）与 Rfc2217Handler 的连接耗时、往返延迟和持续吞吐。
+既可在进程内启动（测试、基准），也可作为子进程运行::
+
+    python -m core.standin_server --protocol rfc2217 --source generator \\
+        --profile ansi --rate 115200 --latency 0.005
+
+子进程启动后在标准输出打印一行 ``host:port``，收到 SIGTERM/SIGINT 后退出。
+
+数据来源：
+    ECHO：原样回显客户端发来的数据，用于测往返延迟；
+    GENERATOR：每个连接由 TrafficGenerator 直接产生数据；
+    PTY：服务器打开 PtyLoopback 的从端做真实串口读写，主端由流量生成器驱动。
+
+链路整形只作用于服务器发往客户端的方向：固定附加延迟、带宽上限，
+以及按字节数或时长主动断开，用来复现慢链路和掉线。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Optional, Sequence
+
+import serial
+import serial.rfc2217
+
+from core.loopback import PtyLoopback, TrafficConfig, TrafficGenerator, TrafficProfile
+
+logger = logging.getLogger(__name__)
+
+_IAC = serial.rfc2217.IAC
+_IAC_DOUBLED = serial.rfc2217.IAC_DOUBLED
+
+
+class ServerProtocol(str, Enum):
+    RAW = "raw"
+    RFC2217 = "rfc2217"
+
+
+class ByteSource(str, Enum):
+    ECHO = "echo"
+    GENERATOR = "generator"
+    PTY = "pty"
+
+
+@dataclass(frozen=True)
+class LinkShaping:
+    """下行链路整形。0 表示不启用对应项。"""
+
+    latency: float = 0.0
+    bandwidth: int = 0
+    disconnect_after_bytes: int = 0
+    disconnect_after: float = 0.0
+
+
+@dataclass(frozen=True)
+class StandinStats:
+    connections: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+
+class _VirtualPort:
+    """交给 PortManager 协商的串口对象。
+
+    串口参数直接保存，有真实端口（伪终端）时尽力同步过去；伪终端不支持
+    调制解调线 ioctl，控制线只做回环模拟：CTS 跟随 RTS，DSR 跟随 DTR。
+    """
+
+    _FORWARDED = (
+        "baudrate",
+        "bytesize",
+        "parity",
+        "stopbits",
+        "rtscts",
+        "xonxoff",
+    )
+
+    def __init__(self, port: Optional[serial.Serial] = None) -> None:
+        object.__setattr__(self, "_port", port)
+        # pySerial 客户端 open() 的最后一步是清发送缓冲，此后才算打开完成
+        object.__setattr__(self, "client_ready", threading.Event())
+        self.baudrate = 9600
+        self.bytesize = serial.EIGHTBITS
+        self.parity = serial.PARITY_NONE
+        self.stopbits = serial.STOPBITS_ONE
+        self.rtscts = False
+        self.xonxoff = False
+        self.rts = True
+        self.dtr = True
+        self.break_condition = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        port = self._port
+        if port is not None and name in self._FORWARDED:
+            try:
+                setattr(port, name, value)
+            except (ValueError, OSError, serial.SerialException) as e:
+                logger.debug("Stand-in port ignored %s=%r: %s", name, value, e)
+
+    @property
+    def cts(self) -> bool:
+        return bool(self.rts)
+
+    @property
+    def dsr(self) -> bool:
+        return bool(self.dtr)
+
+    @property
+    def ri(self) -> bool:
+        return False
+
+    @property
+    def cd(self) -> bool:
+        return True
+
+    def reset_input_buffer(self) -> None:
+        if self._port is not None:
+            self._port.reset_input_buffer()
+
+    def reset_output_buffer(self) -> None:
+        if self._port is not None:
+            self._port.reset_output_buffer()
+        self.client_ready.set()
+
+
+class _Session:
+    """一个客户端连接：读线程收数据，写线程按整形规则发数据。"""
+
+    # 下行队列上限：生成器比链路快时阻塞在这里，而不是无限堆积
+    MAX_QUEUED_BYTES = 1024 * 1024
+    MODEM_POLL_SECONDS = 1.0
+    # RFC2217 客户端在 open() 末尾清空接收缓冲，之前送达的数据会被丢掉；
+    # 数据来源等客户端打开完成再开始，最多等这么久
+    CLIENT_READY_TIMEOUT = 3.0
+    _RECV_BYTES = 65536
+
+    def __init__(
+        self, server: StandinServer, sock: socket.socket, port: Optional[serial.Serial]
+    ) -> None:
+        self.server = server
+        self.sock = sock
+        self.port = port
+        self.shaping = server.shaping
+        self._cond = threading.Condition()
+        self._queue: deque[tuple[float, bytes]] = deque()
+        self._queued_bytes = 0
+        self._sent_bytes = 0
+        self.closed = threading.Event()
+        self.virtual_port = _VirtualPort(port)
+        self.manager: Optional[serial.rfc2217.PortManager] = None
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.server.protocol is ServerProtocol.RFC2217:
+            # 构造时即发出初始协商，经 write() 进入下行队列
+            self.manager = serial.rfc2217.PortManager(self.virtual_port, self)
+        targets = [self._read_loop, self._write_loop]
+        if self.server.source is ByteSource.GENERATOR:
+            targets.append(self._generate_loop)
+        elif self.server.source is ByteSource.PTY:
+            targets.append(self._port_loop)
+        for target in targets:
+            thread = threading.Thread(
+                target=target, name="StandinSession", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def close(self) -> None:
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        with self._cond:
+            self._cond.notify_all()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            if thread is threading.current_thread():
+                continue
+            if deadline is None:
+                thread.join()
+            else:
+                thread.join(max(0.0, deadline - time.monotonic()))
+        return not any(t.is_alive() for t in self._threads)
+
+    # PortManager 的 connection 接口：协商报文与数据走同一条整形链路
+    def write(self, data: bytes) -> None:
+        self._enqueue(data, block=False)
+
+    def send_data(self, data: bytes) -> None:
+        """发送串口数据；RFC2217 下转义 IAC。队列满时阻塞。"""
+        if self.manager is not None:
+            data = data.replace(_IAC, _IAC_DOUBLED)
+        self._enqueue(data, block=True)
+
+    def _enqueue(self, data: bytes, *, block: bool) -> None:
+        if not data:
+            return
+        with self._cond:
+            while (
+                block
+                and self._queued_bytes >= self.MAX_QUEUED_BYTES
+                and not self.closed.is_set()
+            ):
+                self._cond.wait(0.1)
+            if self.closed.is_set():
+                return
+            self._queue.append((time.monotonic() + self.shaping.latency, data))
+            self._queued_bytes += len(data)
+            self._cond.notify_all()
+
+    def _deliver(self, data: bytes) -> None:
+        """把客户端发来的串口数据交给数据来源。"""
+        source = self.server.source
+        if source is ByteSource.ECHO:
+            self.send_data(data)
+        elif source is ByteSource.PTY and self.port is not None:
+            self.port.write(data)
+
+    def _read_loop(self) -> None:
+        try:
+            while not self.closed.is_set():
+                data = self.sock.recv(self._RECV_BYTES)
+                if not data:
+                    break
+                self.server._count(received=len(data))
+                manager = self.manager
+                if manager is not None:
+                    # 快速路径：不在 Telnet 命令中且没有 IAC 时整块都是数据
+                    if manager.mode == serial.rfc2217.M_NORMAL and _IAC not in data:
+                        payload = data
+                    else:
+                        payload = b"".join(manager.filter(data))
+                else:
+                    payload = data
+                if payload:
+                    self._deliver(payload)
+        except (OSError, serial.SerialException):
+            pass
+        finally:
+            self.close()
+
+    def _write_loop(self) -> None:
+        shaping = self.shaping
+        opened = time.monotonic()
+        next_modem_poll = opened + self.MODEM_POLL_SECONDS
+        # 带宽整形：下一字节最早可发送的时刻
+        send_at = opened
+        try:
+            while not self.closed.is_set():
+                now = time.monotonic()
+                elapsed = now - opened
+                if shaping.disconnect_after and elapsed >= shaping.disconnect_after:
+                    break
+                if self.manager is not None and now >= next_modem_poll:
+                    next_modem_poll = now + self.MODEM_POLL_SECONDS
+                    self.manager.check_modem_lines()
+                with self._cond:
+                    if not self._queue:
+                        self._cond.wait(0.05)
+                        continue
+                    due, data = self._queue[0]
+                    if due > now:
+                        self._cond.wait(min(due - now, 0.05))
+                        continue
+                    self._queue.popleft()
+                    self._queued_bytes -= len(data)
+                    self._cond.notify_all()
+                send_at = self._send(data, send_at)
+                if (
+                    shaping.disconnect_after_bytes
+                    and self._sent_bytes >= shaping.disconnect_after_bytes
+                ):
+                    break
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def _send(self, data: bytes, send_at: float) -> float:
+        bandwidth = self.shaping.bandwidth
+        limit = self.shaping.disconnect_after_bytes
+        if limit:
+            data = data[: max(0, limit - self._sent_bytes)]
+        # 限速时按约 20ms 的量切片，避免整块突发
+        step = max(1, bandwidth // 50) if bandwidth > 0 else len(data)
+        for offset in range(0, len(data), step):
+            piece = data[offset : offset + step]
+            if bandwidth > 0:
+                delay = send_at - time.monotonic()
+                if delay > 0 and self.closed.wait(delay):
+                    return send_at
+                send_at = max(send_at, time.monotonic()) + len(piece) / bandwidth
+            self.sock.sendall(piece)
+            self._sent_bytes += len(piece)
+            self.server._count(sent=len(piece))
+        return send_at
+
+    def _wait_client_ready(self) -> bool:
+        if self.manager is not None:
+            deadline = time.monotonic() + self.CLIENT_READY_TIMEOUT
+            ready = self.virtual_port.client_ready
+            while not ready.wait(0.05) and not self.closed.is_set():
+                if time.monotonic() >= deadline:
+                    break
+        return not self.closed.is_set()
+
+    def _generate_loop(self) -> None:
+        if not self._wait_client_ready():
+            return
+        due = time.monotonic()
+        for delay, chunk in TrafficGenerator(self.server.traffic):
+            due += delay
+            wait = due - time.monotonic()
+            if wait > 0 and self.closed.wait(wait):
+                return
+            if self.closed.is_set():
+                return
+            self.send_data(chunk)
+
+    def _port_loop(self) -> None:
+        port = self.port
+        assert port is not None
+        if not self._wait_client_ready():
+            return
+        try:
+            while not self.closed.is_set():
+                data = port.read(max(1, port.in_waiting))
+                if data:
+                    self.send_data(data)
+        except (OSError, serial.SerialException) as e:
+            logger.debug("Stand-in port read stopped: %s", e)
+            self.close()
+
+
+class StandinServer:
+    """透明 TCP / RFC2217 服务端替身。
+
+    ECHO 与 GENERATOR 每个连接相互独立；PTY 模拟单个物理串口，同一时刻只
+    服务一个连接，后到的连接会被立即关闭。
+    """
+
+    def __init__(
+        self,
+        protocol: ServerProtocol | str = ServerProtocol.RAW,
+        source: ByteSource | str = ByteSource.ECHO,
+        *,
+        traffic: Optional[TrafficConfig] = None,
+        shaping: Optional[LinkShaping] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.protocol = ServerProtocol(protocol)
+        self.source = ByteSource(source)
+        self.traffic = traffic or TrafficConfig()
+        self.shaping = shaping or LinkShaping()
+        self.host = host
+        self.port = port
+        self.loopback: Optional[PtyLoopback] = None
+        self._serial: Optional[serial.Serial] = None
+        self._listener: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._sessions: list[_Session] = []
+        self._connections = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.host, self.port
+
+    def start(self) -> tuple[str, int]:
+        """开始监听，返回实际地址（port=0 时由系统分配）。"""
+        if self._listener is not None:
+            return self.address
+        if self.source is ByteSource.PTY:
+            self.loopback = PtyLoopback(self.traffic)
+            self._serial = serial.Serial(self.loopback.open(), timeout=0.05)
+        listener = socket.create_server((self.host, self.port))
+        listener.settimeout(0.1)
+        self._listener = listener
+        self.host, self.port = listener.getsockname()[:2]
+        self._thread = threading.Thread(
+            target=self._accept_loop, name="StandinServer", daemon=True
+        )
+        self._thread.start()
+        return self.address
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        stopped = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+            stopped = not self._thread.is_alive()
+            self._thread = None
+        for session in self._take_sessions():
+            session.close()
+            stopped = session.join(timeout) and stopped
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+        if self.loopback is not None:
+            stopped = self.loopback.close(timeout) and stopped
+            self.loopback = None
+        return stopped
+
+    def disconnect_all(self) -> int:
+        """主动断开当前所有连接（模拟服务器掉线），返回断开数。"""
+        sessions = self._take_sessions()
+        for session in sessions:
+            session.close()
+        return len(sessions)
+
+    def active_connections(self) -> int:
+        with self._lock:
+            self._sessions = [s for s in self._sessions if not s.closed.is_set()]
+            return len(self._sessions)
+
+    def virtual_ports(self) -> list[_VirtualPort]:
+        """当前连接协商出的串口参数，供测试检查 RFC2217 设置。"""
+        with self._lock:
+            return [s.virtual_port for s in self._sessions if not s.closed.is_set()]
+
+    def stats(self) -> StandinStats:
+        with self._lock:
+            return StandinStats(
+                self._connections, self._bytes_sent, self._bytes_received
+            )
+
+    def _take_sessions(self) -> list[_Session]:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        return sessions
+
+    def _count(self, *, sent: int = 0, received: int = 0) -> None:
+        with self._lock:
+            self._bytes_sent += sent
+            self._bytes_received += received
+
+    def _accept_loop(self) -> None:
+        while self._listener is not None:
+            listener = self._listener
+            try:
+                sock, _peer = listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            sock.setblocking(True)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.source is ByteSource.PTY and self.active_connections():
+                sock.close()
+                continue
+            session = _Session(self, sock, self._serial)
+            with self._lock:
+                self._sessions.append(session)
+                self._connections += 1
+            if self.loopback is not None:
+                self.loopback.start()
+            session.start()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m core.standin_server",
+        description="Local raw TCP / RFC2217 stand-in serial server.",
+    )
+    parser.add_argument(
+        "--protocol", choices=[p.value for p in ServerProtocol], default="raw"
+    )
+    parser.add_argument(
+        "--source", choices=[s.value for s in ByteSource], default="echo"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument(
+        "--profile", choices=[p.value for p in TrafficProfile], default="lines"
+    )
+    parser.add_argument(
+        "--rate", type=int, default=11520, help="bytes/s, 0 = unlimited"
+    )
+    parser.add_argument("--chunk", type=int, default=64)
+    parser.add_argument("--total", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--bandwidth", type=int, default=0, help="bytes/s")
+    parser.add_argument("--disconnect-after-bytes", type=int, default=0)
+    parser.add_argument("--disconnect-after", type=float, default=0.0, help="seconds")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    server = StandinServer(
+        args.protocol,
+        args.source,
+        traffic=TrafficConfig(
+            TrafficProfile(args.profile),
+            bytes_per_second=args.rate,
+            chunk_bytes=args.chunk,
+            total_bytes=args.total,
+            seed=args.seed,
+        ),
+        shaping=LinkShaping(
+            latency=args.latency,
+            bandwidth=args.bandwidth,
+            disconnect_after_bytes=args.disconnect_after_bytes,
+            disconnect_after=args.disconnect_after,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+    host, port = server.start()
+    print(f"{host}:{port}", flush=True)
+    try:
+        while not stop.wait(0.2):
+            pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
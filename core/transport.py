@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import itertools
 from dataclasses import dataclass
 from enum import Enum
 
@@ -63,6 +64,10 @@ class TransportHandler(QObject):
     error_occurred = pyqtSignal(str)
     state_changed = pyqtSignal(object)
     transport_error = pyqtSignal(object)
+    # ticket, bytes_written, elapsed seconds since the write was accepted
+    write_completed = pyqtSignal(int, int, float)
+    # True once queued writes pass the high-water mark, False below low-water
+    write_backpressure_changed = pyqtSignal(bool)
 
     def __init__(self) -> None:
         super().__init__()
@@ -70,6 +75,10 @@ class TransportHandler(QObject):
         self._session_was_connected = False
         self.last_error: str | None = None
         self.last_error_context: str | None = None
+        # Set by transports that finish writes asynchronously; the ticket is
+        # echoed back through write_completed once the payload is written.
+        self.last_write_ticket: int | None = None
+        self._write_tickets = itertools.count(1)
 
     @property
     def endpoint(self) -> str:
@@ -95,6 +104,15 @@ class TransportHandler(QObject):
         """是否仍有数据在传输层排队未真正发出。"""
         return False
 
+    def is_write_throttled(self) -> bool:
+        """Whether producers should pause until write_backpressure_changed(False)."""
+        return False
+
+    def _next_write_ticket(self) -> int:
+        ticket = next(self._write_tickets)
+        self.last_write_ticket = ticket
+        return ticket
+
     def _transition(
         self,
         state: TransportState,
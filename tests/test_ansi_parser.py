@@ -294,3 +294,54 @@ class TestExtendedColorEdgeCases:
         parser.parse_code("38;5m")
         fmt = parser.current_format
         assert not fmt.hasProperty(QTextFormat.Property.ForegroundBrush)
+
+
+class TestFormatCache:
+    def test_same_state_returns_shared_format(self):
+        parser = AnsiParser()
+        first = parser.parse_text("\x1b[31mA\x1b[0mB\x1b[31mC")
+        assert first[0][1] is first[2][1]
+        assert first[1][1] is not first[0][1]
+
+    def test_parsers_share_default_cache(self):
+        a = AnsiParser()
+        b = AnsiParser()
+        a.parse_code("1;32m")
+        b.parse_code("32;1m")
+        assert a.current_key == b.current_key
+        assert a.current_format is b.current_format
+
+    def test_cache_is_bounded_lru(self):
+        from core.ansi_parser import FormatCache
+
+        cache = FormatCache(max_size=2)
+        red = (QColor(255, 0, 0).rgba(), None, False, False, False)
+        green = (QColor(0, 255, 0).rgba(), None, False, False, False)
+        blue = (QColor(0, 0, 255).rgba(), None, False, False, False)
+
+        red_fmt = cache.get(red)
+        cache.get(green)
+        assert cache.get(red) is red_fmt
+        cache.get(blue)
+
+        assert len(cache) == 2
+        assert cache.get(red) is red_fmt
+        assert cache.misses == 3
+        cache.get(green)
+        assert cache.misses == 4
+
+    def test_reverse_key_swaps_colors_in_format(self):
+        parser = AnsiParser()
+        parser.parse_code("31;42;7m")
+        assert parser.current_key[4] is True
+        assert parser.current_format.foreground().color() == QColor(13, 188, 121)
+        assert parser.current_format.background().color() == QColor(205, 49, 49)
+
+    def test_default_fg_code_clears_logical_color_under_reverse(self):
+        parser = AnsiParser(format_cache=None)
+        parser.parse_code("31;7m")
+        parser.parse_code("39m")
+        parser.parse_code("27m")
+        assert not parser.current_format.hasProperty(
+            QTextFormat.Property.ForegroundBrush
+        )
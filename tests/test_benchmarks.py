@@ -0,0 +1,185 @@
+"""
+测试 benchmarks/harness.py 与 benchmarks/__main__.py
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.harness import (
+    BenchmarkCase,
+    BenchmarkResult,
+    CASES,
+    benchmark,
+    compare,
+    load_results,
+    run_case,
+    save_results,
+)
+
+
+def _result(name="case", ops_per_sec=1000.0, p99_ms=1.0, peak_rss_kb=1000):
+    return BenchmarkResult(
+        name=name,
+        ops=100,
+        ops_per_sec=ops_per_sec,
+        p50_ms=0.5,
+        p99_ms=p99_ms,
+        peak_rss_kb=peak_rss_kb,
+    )
+
+
+class TestRunCase:
+    def test_reports_rate_latency_and_throughput(self):
+        calls = []
+
+        def factory(size):
+            def run():
+                calls.append(size)
+                return size
+
+            return run
+
+        result = run_case(
+            BenchmarkCase("bytes", factory, {"size": 10}, inner_loops=5),
+            min_time=0.02,
+        )
+
+        assert result.ops > 0 and result.ops % 5 == 0
+        assert len(calls) == result.ops + 3
+        assert result.ops_per_sec > 0
+        assert 0 <= result.p50_ms <= result.p99_ms
+        assert result.bytes_per_sec == pytest.approx(result.ops_per_sec * 10)
+        assert result.params == {"size": 10}
+
+    def test_no_throughput_when_operation_returns_nothing(self):
+        result = run_case(
+            BenchmarkCase("none", lambda: lambda: None), min_time=0.01
+        )
+        assert result.bytes_per_sec is None
+
+    def test_variants_register_separate_cases(self):
+        @benchmark("test_only.variants", {"a": {"x": 1}, "b": {"x": 2}})
+        def factory(x):
+            return lambda: x
+
+        try:
+            assert CASES["test_only.variants[a]"].params == {"x": 1}
+            assert CASES["test_only.variants[b]"].params == {"x": 2}
+            with pytest.raises(ValueError):
+                benchmark("test_only.variants", {"a": {}})(factory)
+        finally:
+            CASES.pop("test_only.variants[a]")
+            CASES.pop("test_only.variants[b]")
+
+
+class TestCompare:
+    def test_flags_only_regressions_beyond_tolerance(self):
+        baseline = {
+            "slower": _result("slower"),
+            "noisy": _result("noisy"),
+            "faster": _result("faster"),
+            "bigger": _result("bigger"),
+        }
+        results = {
+            "slower": _result("slower", ops_per_sec=600.0, p99_ms=2.0),
+            "noisy": _result("noisy", ops_per_sec=900.0, p99_ms=1.2),
+            "faster": _result("faster", ops_per_sec=5000.0, p99_ms=0.1),
+            "bigger": _result("bigger", peak_rss_kb=2000),
+            "new": _result("new"),
+        }
+
+        regressions = compare(results, baseline, tolerance=0.3)
+
+        assert [(r.name, r.metric) for r in regressions] == [
+            ("bigger", "peak_rss_kb"),
+            ("slower", "ops_per_sec"),
+            ("slower", "p99_ms"),
+        ]
+        assert regressions[1].change == pytest.approx(0.4)
+        assert "1000 -> 600" in regressions[1].description
+
+    def test_sub_resolution_latency_is_ignored(self):
+        baseline = {"tiny": _result("tiny", p99_ms=0.001)}
+        results = {"tiny": _result("tiny", p99_ms=0.004)}
+        assert compare(results, baseline) == []
+
+    def test_missing_rss_is_skipped(self):
+        baseline = {"case": _result(peak_rss_kb=None)}
+        assert compare({"case": _result(peak_rss_kb=9999)}, baseline) == []
+
+
+class TestResultFiles:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "results.json"
+        results = {"case": _result()}
+
+        save_results(path, results)
+
+        assert load_results(path) == results
+
+
+class TestCases:
+    def test_hot_paths_are_covered(self):
+        from benchmarks import cases  # noqa: F401
+
+        names = set(CASES)
+        for prefix in (
+            "ansi_parser.parse_text",
+            "terminal_emulator.process_bytes",
+            "terminal_emulator._render_full",
+            "trim_manager.trim_if_needed",
+            "main_window.append_to_terminal",
+            "protocol.format_hex",
+            "protocol.apply_checksum",
+            "receive_path",
+        ):
+            assert any(name.startswith(prefix) for name in names), prefix
+        assert sum(name.startswith("receive_path[") for name in names) >= 3
+
+    def test_receive_path_case_runs(self, qtbot):
+        from benchmarks import cases  # noqa: F401
+
+        result = run_case(CASES["receive_path[115200]"], min_time=0.01, warmup=1)
+        assert result.bytes_per_sec and result.bytes_per_sec > 0
+
+
+class TestCommandLine:
+    def test_subprocess_run_leaves_no_workdir(self, tmp_path):
+        tmp = tmp_path / "tmp"
+        tmp.mkdir()
+        env = dict(os.environ, TMPDIR=str(tmp), QT_QPA_PLATFORM="offscreen")
+
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks",
+                "-k",
+                "protocol.format_hex[64B]",
+                "--min-time",
+                "0.01",
+                "--output",
+                str(tmp_path / "out.json"),
+                "--baseline",
+                str(tmp_path / "missing.json"),
+            ],
+            cwd=Path(__file__).resolve().parent.parent,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+        assert completed.returncode == 0, completed.stderr
+        assert "protocol.format_hex[64B]" in completed.stdout
+        assert list(tmp.iterdir()) == []
+
+    def test_case_requires_workdir(self):
+        from benchmarks.__main__ import main
+
+        with pytest.raises(SystemExit):
+            main(["--case", "protocol.format_hex[64B]"])
@@ -7,10 +7,11 @@ from core.connection_controller import (
     ConnectionMode,
     Rfc2217ConnectionConfig,
     SerialConnectionConfig,
+    SessionRegistry,
     TcpConnectionConfig,
 )
 from core.rfc2217_handler import Rfc2217Handler
-from core.serial_handler import SerialHandler
+from core.serial_handler import SerialHandler, SerialIoBackend
 from core.socket_handler import SocketHandler
 from core.transport import (
     DisconnectReason,
@@ -18,6 +19,7 @@ from core.transport import (
     TransportState,
     WriteDisposition,
 )
+from utils.session_capture import CaptureDirection, CaptureFileSink, CaptureHeader
 
 
 def _controller(clock=lambda: 10.0):
@@ -59,6 +61,29 @@ def test_rfc2217_write_reports_queued_disposition():
     assert controller.write_payload(b"x") is WriteDisposition.QUEUED
 
 
+def test_controller_forwards_active_write_completion(qtbot):
+    controller, serial, tcp, _rfc2217 = _controller()
+    completed = []
+    controller.write_completed.connect(
+        lambda *args: completed.append(args)
+    )
+
+    serial.write_completed.emit(3, 10, 0.5)
+    tcp.write_completed.emit(4, 10, 0.5)
+
+    assert completed == [(3, 10, 0.5)]
+
+
+def test_write_ticket_is_cleared_for_synchronous_writes():
+    controller, serial, _tcp, _rfc2217 = _controller()
+    serial.last_write_ticket = 9
+    serial.write_data = Mock(return_value=True)
+
+    controller.write_payload(b"x")
+
+    assert controller.last_write_ticket() is None
+
+
 def test_controller_forwards_only_active_transport_data(qtbot):
     controller, serial, tcp, _rfc2217 = _controller()
     received = []
@@ -170,3 +195,207 @@ def test_controller_dispatches_rfc2217_configuration():
         network_timeout=2.5,
         ignore_set_control=True,
     )
+
+
+def test_controller_forwards_active_write_backpressure(qtbot):
+    controller, serial, tcp, _rfc2217 = _controller()
+    changes = []
+    controller.write_backpressure_changed.connect(changes.append)
+
+    serial.write_backpressure_changed.emit(True)
+    tcp.write_backpressure_changed.emit(True)
+
+    assert changes == [True]
+    assert controller.is_write_throttled() is False
+
+
+def _tcp_factory(created):
+    def create():
+        handler = SocketHandler()
+        handler.open = Mock(return_value=True)
+        handler.write_data = Mock(return_value=True)
+        created.append(handler)
+        return handler
+
+    return create
+
+
+def test_session_registry_opens_independent_handlers_per_session(qtbot):
+    created = []
+    registry = SessionRegistry({ConnectionMode.TCP: _tcp_factory(created)})
+    received = []
+    registry.data_received.connect(lambda *args: received.append(args))
+
+    first = registry.open(TcpConnectionConfig("10.0.0.1", 9000))
+    second = registry.open(TcpConnectionConfig("10.0.0.2", 9000))
+
+    assert (first, second) == ("tcp:10.0.0.1:9000", "tcp:10.0.0.2:9000")
+    assert registry.session_ids() == [first, second]
+    assert created[0] is not created[1]
+    created[0].open.assert_called_once_with("10.0.0.1", 9000)
+    created[1].open.assert_called_once_with("10.0.0.2", 9000)
+
+    created[1].data_received.emit(b"b")
+    created[0].data_received.emit(b"a")
+    assert received == [(second, b"b"), (first, b"a")]
+
+
+def test_session_registry_uses_replaced_factory_for_new_sessions(qtbot):
+    created = []
+    registry = SessionRegistry()
+    registry.set_factory(ConnectionMode.TCP, _tcp_factory(created))
+
+    registry.open(TcpConnectionConfig("10.0.0.1", 9000))
+
+    assert len(created) == 1
+
+
+def test_session_registry_refuses_to_reopen_active_session(qtbot):
+    created = []
+    registry = SessionRegistry({ConnectionMode.TCP: _tcp_factory(created)})
+    config = TcpConnectionConfig("10.0.0.1", 9000)
+    session_id = registry.open(config, "board-a")
+    created[0]._transition(TransportState.CONNECTED)
+
+    assert registry.open(config, "board-a") is None
+
+    created[0]._transition(TransportState.DISCONNECTED)
+    assert registry.open(config, "board-a") == "board-a"
+    assert len(created) == 1
+    assert created[0].open.call_count == 2
+    assert session_id == "board-a"
+
+
+def test_session_registry_routes_writes_and_tags_state(qtbot):
+    created = []
+    registry = SessionRegistry({ConnectionMode.TCP: _tcp_factory(created)})
+    states = []
+    registry.state_changed.connect(
+        lambda session_id, transition: states.append(
+            (session_id, transition.current)
+        )
+    )
+    session_id = registry.open(TcpConnectionConfig("10.0.0.1", 9000))
+    created[0]._transition(TransportState.CONNECTED)
+
+    assert registry.write(session_id, b"ping") is WriteDisposition.SENT
+    created[0].write_data.assert_called_once_with(b"ping")
+    assert registry.write("missing", b"ping") is WriteDisposition.REJECTED
+    assert states[-1] == (session_id, TransportState.CONNECTED)
+
+
+def test_session_registry_remove_stops_forwarding(qtbot):
+    created = []
+    registry = SessionRegistry({ConnectionMode.TCP: _tcp_factory(created)})
+    removed = []
+    received = []
+    registry.session_removed.connect(removed.append)
+    registry.data_received.connect(lambda *args: received.append(args))
+    session_id = registry.open(TcpConnectionConfig("10.0.0.1", 9000))
+    handler = created[0]
+
+    assert registry.shutdown() is True
+    handler.data_received.emit(b"late")
+
+    assert removed == [session_id]
+    assert received == []
+    assert len(registry) == 0
+
+
+def test_session_registry_default_id_and_reactor_serial_factory(qtbot):
+    registry = SessionRegistry()
+    config = SerialConnectionConfig("/dev/ttyUSB0")
+    assert SessionRegistry.default_id(config) == "serial:/dev/ttyUSB0"
+
+    handler = registry._factories[ConnectionMode.SERIAL]()
+
+    assert handler.io_backend is SerialIoBackend.REACTOR
+
+
+def test_controller_addresses_background_sessions_by_id(qtbot):
+    created = []
+    registry = SessionRegistry({ConnectionMode.TCP: _tcp_factory(created)})
+    controller = ConnectionController(
+        SerialHandler(), SocketHandler(), Rfc2217Handler(), sessions=registry
+    )
+    forwarded = []
+    controller.data_received.connect(forwarded.append)
+
+    session_id = controller.open_session(TcpConnectionConfig("10.0.0.1", 9000))
+    created[0]._transition(TransportState.CONNECTED)
+    created[0].data_received.emit(b"bg")
+
+    assert controller.session_ids() == [session_id]
+    assert controller.session_state(session_id) is TransportState.CONNECTED
+    assert controller.session_state("missing") is TransportState.DISCONNECTED
+    assert controller.write_session(session_id, b"x") is WriteDisposition.SENT
+    assert forwarded == []
+
+
+class _RecordingCapture:
+    def __init__(self):
+        self.events = []
+
+    def received(self, data):
+        self.events.append(("rx", data))
+        return True
+
+    def sent(self, data):
+        self.events.append(("tx", data))
+        return True
+
+
+def test_capture_records_active_traffic_and_accepted_writes(qtbot):
+    controller, serial, tcp, _rfc2217 = _controller()
+    capture = _RecordingCapture()
+    controller.set_capture(capture)
+    serial.write_data = Mock(side_effect=[True, False])
+    serial.has_pending_writes = Mock(return_value=False)
+
+    serial.data_received.emit(b"in")
+    tcp.data_received.emit(b"other")
+    controller.write_payload(b"out")
+    controller.write_payload(b"rejected")
+
+    assert capture.events == [("rx", b"in"), ("tx", b"out")]
+    controller.set_capture(None)
+    serial.data_received.emit(b"late")
+    assert capture.events == [("rx", b"in"), ("tx", b"out")]
+
+
+def _replay_file(tmp_path):
+    sink = CaptureFileSink(tmp_path / "r.smcap", CaptureHeader(0.0, 0))
+    sink.open()
+    sink.write([(CaptureDirection.RX, 0, b"one"), (CaptureDirection.RX, 1000, b"two")])
+    sink.close()
+    return sink.path
+
+
+def test_replay_feeds_data_received_without_recording_it(qtbot, tmp_path):
+    controller, _serial, _tcp, _rfc2217 = _controller()
+    capture = _RecordingCapture()
+    controller.set_capture(capture)
+    received = []
+    controller.data_received.connect(received.append)
+
+    with qtbot.waitSignal(controller.replay_finished, timeout=2000):
+        assert controller.start_replay(_replay_file(tmp_path), 0)
+        assert controller.is_replaying()
+
+    assert received == [b"one", b"two"]
+    assert capture.events == []
+    assert controller.is_replaying() is False
+
+
+def test_replay_is_refused_while_live_and_stopped_by_connect(qtbot, tmp_path):
+    controller, serial, _tcp, _rfc2217 = _controller()
+    path = _replay_file(tmp_path)
+    serial.open = Mock(return_value=True)
+
+    assert controller.start_replay(path, 1.0)
+    assert controller.start_replay(path, 1.0) is False
+    controller.connect(SerialConnectionConfig("COM1"))
+    assert controller.is_replaying() is False
+
+    serial._state = TransportState.CONNECTED
+    assert controller.start_replay(path, 1.0) is False
@@ -77,3 +77,26 @@ def test_panel_emits_user_commands(qtbot):
         panel.connect_button.click()
     with qtbot.waitSignal(panel.refresh_requested):
         panel.refresh_button.click()
+
+
+def test_write_policy_combo_is_tcp_only_and_emits_on_user_choice(qtbot):
+    panel = ConnectionPanel()
+    qtbot.addWidget(panel)
+    panel.show()
+    requested = []
+    panel.write_policy_requested.connect(requested.append)
+
+    panel.set_mode("tcp")
+    assert panel.socket_write_policy_combo.isVisible() is True
+    panel.set_mode("rfc2217")
+    assert panel.socket_write_policy_combo.isVisible() is False
+
+    panel.set_write_policy("throughput")
+    assert panel.socket_write_policy_combo.currentData() == "throughput"
+    assert requested == []
+
+    panel.socket_write_policy_combo.activated.emit(1)
+    assert requested == ["batched"]
+
+    panel.set_controls_enabled(False, mode="tcp", is_connected=True)
+    assert panel.socket_write_policy_combo.isEnabled() is True
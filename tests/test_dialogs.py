@@ -4,7 +4,13 @@
 
 from PyQt6.QtWidgets import QDialog
 
-from ui.dialogs import HelpDialog, QuickSendItemDialog
+from core.connection_controller import (
+    ConnectionMode,
+    Rfc2217ConnectionConfig,
+    SerialConnectionConfig,
+    TcpConnectionConfig,
+)
+from ui.dialogs import AddSessionDialog, HelpDialog, QuickSendItemDialog
 
 
 class TestHelpDialog:
@@ -67,3 +73,40 @@ class TestQuickSendItemDialog:
 
         _, _, _, _, _, line_ending = dialog.get_data()
         assert line_ending == "\r"
+
+
+
+class TestAddSessionDialog:
+    def _select(self, dialog, mode):
+        dialog.mode_combo.setCurrentIndex(dialog.mode_combo.findData(mode))
+
+    def test_serial_config_uses_selected_port(self, qtbot):
+        dialog = AddSessionDialog(ports=["/dev/ttyUSB0", "/dev/ttyUSB1"])
+        qtbot.addWidget(dialog)
+        dialog.port_combo.setCurrentIndex(1)
+
+        assert dialog.get_config() == SerialConnectionConfig("/dev/ttyUSB1", "115200")
+
+    def test_network_configs(self, qtbot):
+        dialog = AddSessionDialog(language="en")
+        qtbot.addWidget(dialog)
+        dialog.host_input.setText("10.0.0.1")
+        dialog.tcp_port_input.setText("2217")
+
+        self._select(dialog, ConnectionMode.TCP)
+        assert dialog.baudrate_row.isHidden()
+        assert dialog.get_config() == TcpConnectionConfig("10.0.0.1", 2217)
+        self._select(dialog, ConnectionMode.RFC2217)
+        assert dialog.get_config() == Rfc2217ConnectionConfig(
+            "10.0.0.1", 2217, "115200"
+        )
+
+    def test_incomplete_endpoint_returns_none(self, qtbot):
+        dialog = AddSessionDialog()
+        qtbot.addWidget(dialog)
+        assert dialog.get_config() is None
+
+        self._select(dialog, ConnectionMode.TCP)
+        dialog.host_input.setText("10.0.0.1")
+        dialog.tcp_port_input.setText("70000")
+        assert dialog.get_config() is None
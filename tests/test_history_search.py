@@ -0,0 +1,136 @@
+"""
+测试 utils/history_search.py
+"""
+
+import threading
+
+from utils.history_search import (
+    MAX_LINE_CHARS,
+    compile_query,
+    search_archive_segment,
+    search_history,
+    search_plain_log,
+)
+from utils.trim_archive import TrimArchiveSink, list_segments
+
+
+def _write_archive(tmp_path, chunks, block_bytes=64):
+    sink = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=block_bytes)
+    sink.open()
+    sink.write(chunks)
+    sink.close()
+    return list_segments(tmp_path, "trimmed_s")
+
+
+class TestSearchPlainLog:
+    def test_line_numbers_across_chunks(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text(
+            "".join(f"line {i}{' hit' if i % 7 == 0 else ''}\n" for i in range(100))
+        )
+
+        matches = list(
+            search_plain_log(path, compile_query("hit", False), chunk_size=37)
+        )
+
+        assert [m.line for m in matches] == [i + 1 for i in range(0, 100, 7)]
+        assert matches[1].text == "line 7 hit"
+        assert all(m.timestamp is None for m in matches)
+
+    def test_one_result_per_line(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("hit hit hit\nmiss\nHIT\n")
+
+        matches = list(search_plain_log(path, compile_query("hit", False)))
+
+        assert [(m.line, m.text) for m in matches] == [(1, "hit hit hit"), (3, "HIT")]
+
+    def test_case_sensitive(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("hit\nHIT\n")
+
+        matches = list(search_plain_log(path, compile_query("HIT", True)))
+
+        assert [m.line for m in matches] == [2]
+
+    def test_unterminated_last_line(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_bytes(b"a\nlast hit")
+
+        matches = list(
+            search_plain_log(path, compile_query("hit", False), chunk_size=4)
+        )
+
+        assert [(m.line, m.text) for m in matches] == [(2, "last hit")]
+
+    def test_long_lines_are_clipped(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("x" * 5000 + "hit\n")
+
+        (match,) = search_plain_log(path, compile_query("hit", False))
+
+        assert len(match.text) == MAX_LINE_CHARS + 1
+
+    def test_cancel_stops_scan(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("hit\n" * 1000)
+        cancel = threading.Event()
+
+        found = []
+        for match in search_plain_log(
+            path, compile_query("hit", False), cancel, chunk_size=16
+        ):
+            found.append(match)
+            cancel.set()
+
+        assert len(found) < 1000
+
+    def test_progress_reports_bytes(self, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("abc\n" * 100)
+        sizes = []
+
+        list(
+            search_plain_log(
+                path, compile_query("zzz", False), progress=sizes.append, chunk_size=64
+            )
+        )
+
+        assert sum(sizes) == 400
+
+
+class TestSearchArchive:
+    def test_session_line_numbers_and_timestamps(self, tmp_path):
+        chunks = [
+            (f"row {i}{' hit' if i in (3, 40) else ''}\n", 1000.0 + i)
+            for i in range(50)
+        ]
+        (segment,) = _write_archive(tmp_path, chunks)
+
+        matches = list(search_archive_segment(segment, compile_query("hit", False)))
+
+        assert [m.line for m in matches] == [4, 41]
+        assert matches[1].text == "row 40 hit"
+        assert all(m.timestamp is not None and m.timestamp <= 1040.0 for m in matches)
+
+    def test_search_history_mixes_sources(self, tmp_path):
+        segments = _write_archive(tmp_path, [("archived hit\n", 5.0)])
+        plain = tmp_path / "trimmed_s.log"
+        plain.write_text("plain hit\n")
+
+        matches = list(search_history([plain, *segments], compile_query("hit", False)))
+
+        assert [(m.source.name, m.text) for m in matches] == [
+            ("trimmed_s.log", "plain hit"),
+            (segments[0].name, "archived hit"),
+        ]
+
+    def test_missing_file_is_skipped(self, tmp_path):
+        plain = tmp_path / "trimmed_s.log"
+        plain.write_text("hit\n")
+
+        matches = list(
+            search_history([tmp_path / "gone.log", plain], compile_query("hit", False))
+        )
+
+        assert len(matches) == 1
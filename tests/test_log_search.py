@@ -0,0 +1,245 @@
+"""
+测试 ui/log_search.py
+"""
+
+import threading
+
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from ui.log_search import HistorySearch, LogSearchIndex
+from utils.history_search import HistoryMatch
+from ui.main_window import TerminalTrimManager
+
+
+def _append(doc, text):
+    cursor = QTextCursor(doc)
+    cursor.movePosition(QTextCursor.MoveOperation.End)
+    cursor.insertText(text)
+
+
+def _doc(lines):
+    doc = QTextDocument()
+    _append(doc, "".join(f"{line}\n" for line in lines))
+    return doc
+
+
+class TestLogSearchIndex:
+    def test_count_and_cycle_forward(self, qtbot):
+        doc = _doc(["a hit", "miss", "hit hit"])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+
+        cursor = QTextCursor(doc)
+        positions = []
+        for _ in range(4):
+            current, cursor = index.find(cursor, forward=True)
+            positions.append((current, cursor.selectionStart()))
+
+        assert index.count() == 3
+        assert positions == [(1, 2), (2, 11), (3, 15), (1, 2)]
+        assert cursor.selectedText() == "hit"
+
+    def test_backward_wraps_to_last(self, qtbot):
+        doc = _doc(["hit", "hit"])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+
+        current, cursor = index.find(QTextCursor(doc), forward=False)
+
+        assert current == 2
+        assert cursor.selectionStart() == 4
+
+    def test_case_sensitivity(self, qtbot):
+        doc = _doc(["Hello hello HELLO"])
+        index = LogSearchIndex(doc)
+
+        index.set_query("hello", True)
+        assert index.count() == 1
+        index.set_query("hello", False)
+        assert index.count() == 3
+
+    def test_find_reports_position_of_match_at_cursor(self, qtbot):
+        doc = QTextDocument()
+        doc.setPlainText("hello world hello")
+        index = LogSearchIndex(doc)
+        index.set_query("hello", True)
+        first = doc.find("hello")
+
+        current, cursor = index.find(QTextCursor(doc), forward=True)
+        assert (current, cursor.selectionStart()) == (1, first.selectionStart())
+        current, cursor = index.find(first, forward=True)
+        assert (current, cursor.selectionStart()) == (2, 12)
+
+    def test_append_scans_only_new_blocks(self, qtbot):
+        doc = _doc([f"line {i} hit" for i in range(100)])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+        assert index.count() == 100
+        scanned = index.scanned_blocks
+
+        _append(doc, "more hit\nand hit\n")
+
+        assert index.count() == 102
+        # 只重扫原来的末尾块和新增的块
+        assert index.scanned_blocks - scanned == 3
+
+    def test_match_split_across_appends_in_last_block(self, qtbot):
+        doc = QTextDocument()
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+        _append(doc, "h")
+        assert index.count() == 0
+
+        _append(doc, "it\n")
+
+        assert index.count() == 1
+
+    def test_trim_shifts_without_rescan(self, qtbot, monkeypatch):
+        doc = _doc([f"line {i} hit" for i in range(20)])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+        assert index.count() == 20
+        scanned = index.scanned_blocks
+
+        trim = TerminalTrimManager()
+        trim.max_lines = 10
+        trim.batch_lines = 5
+        monkeypatch.setattr(trim, "_append_log", lambda text: True)
+        trim.trim_if_needed(doc)
+
+        # 21 块超出 10 块上限，裁掉 11 块
+        assert index.count() == 9
+        assert index.scanned_blocks - scanned == 1
+        current, cursor = index.find(QTextCursor(doc), forward=True)
+        assert current == 1
+        assert cursor.block().text() == "line 11 hit"
+
+    def test_other_edits_trigger_rebuild(self, qtbot):
+        doc = _doc(["hit", "hit"])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+        assert index.count() == 2
+
+        doc.setPlainText("hit only once")
+
+        assert index.count() == 1
+
+    def test_clear_resets(self, qtbot):
+        doc = _doc(["hit"])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+        assert index.count() == 1
+
+        doc.clear()
+
+        assert index.count() == 0
+        assert index.find(QTextCursor(doc), True) is None
+
+    def test_astral_characters_use_utf16_columns(self, qtbot):
+        doc = _doc(["😀 hit"])
+        index = LogSearchIndex(doc)
+        index.set_query("hit", False)
+
+        _current, cursor = index.find(QTextCursor(doc), True)
+
+        assert cursor.selectedText() == "hit"
+
+
+class TestHistorySearch:
+    def test_results_stream_then_finish(self, qtbot, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("".join(f"{i} hit\n" for i in range(500)))
+        search = HistorySearch()
+        search.BATCH_SIZE = 100
+        batches = []
+        search.results_found.connect(batches.append)
+
+        with qtbot.waitSignal(search.search_finished, timeout=5000) as blocker:
+            search.start([path], "hit", False)
+
+        assert blocker.args == [500, False]
+        assert len(batches) >= 5
+        assert [m.line for batch in batches for m in batch] == list(range(1, 501))
+
+    def test_prepare_runs_before_scan(self, qtbot, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("")
+        search = HistorySearch()
+        batches = []
+        search.results_found.connect(batches.append)
+
+        with qtbot.waitSignal(search.search_finished, timeout=5000) as blocker:
+            search.start(
+                [path], "hit", False, prepare=lambda: path.write_text("late hit\n")
+            )
+
+        assert blocker.args == [1, False]
+        assert batches[0][0].text == "late hit"
+
+    def test_cancel_reports_cancelled(self, qtbot, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("hit\n")
+        gate = threading.Event()
+        search = HistorySearch()
+
+        with qtbot.waitSignal(search.search_finished, timeout=5000) as blocker:
+            search.start([path], "hit", False, prepare=gate.wait)
+            search.cancel()
+            gate.set()
+
+        assert blocker.args == [0, True]
+
+    def test_restart_drops_stale_results(self, qtbot, tmp_path):
+        old = tmp_path / "old.log"
+        old.write_text("old hit\n")
+        new = tmp_path / "new.log"
+        new.write_text("new hit\n")
+        gate = threading.Event()
+        search = HistorySearch()
+        texts = []
+        search.results_found.connect(lambda batch: texts.extend(m.text for m in batch))
+
+        search.start([old], "hit", False, prepare=gate.wait)
+        with qtbot.waitSignal(search.search_finished, timeout=5000):
+            search.start([new], "hit", False)
+        gate.set()
+        assert search.cancel(timeout=5)
+        qtbot.wait(50)
+
+        assert texts == ["new hit"]
+
+    def test_signals_queued_by_replaced_search_are_dropped(self, qtbot, tmp_path):
+        path = tmp_path / "new.log"
+        path.write_text("new hit\n")
+        search = HistorySearch()
+        texts = []
+        progress = []
+        search.results_found.connect(lambda batch: texts.extend(m.text for m in batch))
+        search.progress_changed.connect(lambda *args: progress.append(args))
+        finished = []
+        search.search_finished.connect(lambda *args: finished.append(args))
+
+        search.start([path], "hit", False)
+        stale = search._generation - 1
+        # 旧线程在代号检查之后、start() 之前排队的信号
+        search._worker_results.emit(stale, [HistoryMatch(path, 1, "old hit")])
+        search._worker_progress.emit(stale, 99, 100)
+        search._worker_finished.emit(stale, 10_000, False, True)
+        qtbot.waitUntil(lambda: finished != [], timeout=5000)
+
+        assert texts == ["new hit"]
+        assert (99, 100) not in progress
+        assert finished == [(1, False)]
+        assert search.truncated is False
+
+    def test_result_cap(self, qtbot, tmp_path):
+        path = tmp_path / "trimmed_a.log"
+        path.write_text("hit\n" * 50)
+        search = HistorySearch()
+        search.MAX_RESULTS = 10
+
+        with qtbot.waitSignal(search.search_finished, timeout=5000) as blocker:
+            search.start([path], "hit", False)
+
+        assert blocker.args == [10, False]
+        assert search.truncated
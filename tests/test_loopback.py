@@ -0,0 +1,169 @@
+"""
+测试 core/loopback.py - 伪终端回环串口与流量生成
+"""
+
+import importlib
+import itertools
+import re
+import sys
+import time
+
+import pytest
+
+from core.loopback import (
+    PtyLoopback,
+    TrafficConfig,
+    TrafficGenerator,
+    TrafficProfile,
+    loopback_supported,
+)
+from core.serial_handler import SerialHandler, SerialIoBackend
+
+# 保活：避免 handler 被 GC 后 C++ 地址复用
+_KEEPALIVE: list = []
+
+
+def _take(config: TrafficConfig, count: int) -> list[tuple[float, bytes]]:
+    return list(itertools.islice(TrafficGenerator(config), count))
+
+
+class TestTrafficGenerator:
+    def test_same_seed_generates_same_traffic(self):
+        for profile in TrafficProfile:
+            config = TrafficConfig(profile, seed=7)
+            assert _take(config, 5) == _take(config, 5)
+
+    def test_fixed_rate_delays_match_rate(self):
+        chunks = _take(
+            TrafficConfig(
+                TrafficProfile.FIXED_RATE, bytes_per_second=1000, chunk_bytes=50
+            ),
+            20,
+        )
+        assert all(len(chunk) == 50 for _, chunk in chunks)
+        assert sum(delay for delay, _ in chunks) == pytest.approx(1.0)
+
+    def test_unlimited_rate_has_no_delay(self):
+        chunks = _take(TrafficConfig(TrafficProfile.BINARY, bytes_per_second=0), 3)
+        assert [delay for delay, _ in chunks] == [0.0, 0.0, 0.0]
+
+    def test_bursty_sends_whole_bursts_then_waits(self):
+        chunks = _take(
+            TrafficConfig(
+                TrafficProfile.BURSTY, burst_bytes=1000, burst_interval=0.5
+            ),
+            3,
+        )
+        assert all(delay == 0.5 and len(chunk) >= 1000 for delay, chunk in chunks)
+
+    def test_lines_are_numbered_in_order(self):
+        data = b"".join(chunk for _, chunk in _take(TrafficConfig(), 10))
+        numbers = [int(n) for n in re.findall(rb"^(\d{8}) value=", data, re.M)]
+        assert numbers == list(range(1, len(numbers) + 1))
+        assert data.endswith(b"\r\n")
+
+    def test_ansi_profile_contains_escape_sequences(self):
+        data = b"".join(
+            chunk for _, chunk in _take(TrafficConfig(TrafficProfile.ANSI), 30)
+        )
+        assert b"\x1b[0m" in data
+        assert b"\x1b[2K" in data
+        assert b"\x1b[1;1H" in data
+
+    def test_binary_profile_covers_control_bytes(self):
+        data = b"".join(
+            chunk
+            for _, chunk in _take(
+                TrafficConfig(TrafficProfile.BINARY, chunk_bytes=4096), 4
+            )
+        )
+        assert b"\x00" in data and b"\x1b" in data and b"\xff" in data
+
+    def test_total_bytes_stops_generator(self):
+        chunks = list(TrafficGenerator(TrafficConfig(total_bytes=100)))
+        assert sum(len(chunk) for _, chunk in chunks) == 100
+
+
+class TestPlatformSupport:
+    def test_module_imports_without_termios(self, monkeypatch):
+        # 模拟 Windows：tty/termios 不可用
+        monkeypatch.setitem(sys.modules, "tty", None)
+        monkeypatch.setitem(sys.modules, "termios", None)
+        monkeypatch.delitem(sys.modules, "core.loopback")
+
+        module = importlib.import_module("core.loopback")
+        monkeypatch.setattr(module, "loopback_supported", lambda: False)
+
+        with pytest.raises(OSError):
+            module.PtyLoopback(module.TrafficConfig()).open()
+
+
+@pytest.mark.skipif(not loopback_supported(), reason="需要伪终端（POSIX）")
+class TestPtyLoopback:
+    @pytest.mark.parametrize("backend", list(SerialIoBackend))
+    def test_serial_handler_receives_generated_traffic(self, qtbot, backend):
+        config = TrafficConfig(
+            TrafficProfile.LINES, bytes_per_second=0, total_bytes=64 * 1024
+        )
+        loopback = PtyLoopback(config)
+        handler = SerialHandler(io_backend=backend)
+        _KEEPALIVE.append(handler)
+        received = bytearray()
+        handler.data_received.connect(received.extend)
+        try:
+            assert handler.open(loopback.open())
+            loopback.start()
+            qtbot.waitUntil(lambda: len(received) >= config.total_bytes, timeout=5000)
+        finally:
+            handler.close()
+            loopback.close()
+
+        expected = b"".join(chunk for _, chunk in TrafficGenerator(config))
+        assert bytes(received) == expected
+        assert loopback.stats().bytes_sent == config.total_bytes
+        assert loopback.wait_finished(0)
+
+    def test_handler_writes_reach_master(self, qtbot):
+        loopback = PtyLoopback(TrafficConfig(total_bytes=1))
+        handler = SerialHandler()
+        _KEEPALIVE.append(handler)
+        try:
+            assert handler.open(loopback.open())
+            loopback.start()
+            assert handler.write_data(b"AT+RST\r\n")
+            deadline = time.monotonic() + 2.0
+            while loopback.stats().bytes_received < 8 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            handler.close()
+            loopback.close()
+
+        assert loopback.take_received() == b"AT+RST\r\n"
+        assert loopback.take_received() == b""
+
+    def test_fixed_rate_is_paced(self):
+        loopback = PtyLoopback(
+            TrafficConfig(
+                TrafficProfile.FIXED_RATE,
+                bytes_per_second=2000,
+                chunk_bytes=100,
+                total_bytes=600,
+            )
+        )
+        loopback.open()
+        started = time.monotonic()
+        loopback.start()
+        try:
+            assert loopback.wait_finished(3.0)
+            assert time.monotonic() - started >= 0.28
+        finally:
+            loopback.close()
+
+    def test_stop_is_prompt_with_slow_rate(self):
+        loopback = PtyLoopback(
+            TrafficConfig(bytes_per_second=1, chunk_bytes=64)
+        )
+        loopback.start()
+        started = time.monotonic()
+        assert loopback.close()
+        assert time.monotonic() - started < 1.0
@@ -3,6 +3,7 @@
 """
 
 import json
+import re
 import socket
 import time
 from pathlib import Path
@@ -19,6 +20,7 @@ from core.connection_controller import (
     SerialConnectionConfig,
     TcpConnectionConfig,
 )
+from core.socket_handler import SocketHandler
 from core.transport import (
     DisconnectReason,
     TransportError,
@@ -27,6 +29,7 @@ from core.transport import (
     TransportTransition,
 )
 from ui.main_window import TerminalTrimManager, SerialMonitor
+from utils.session_capture import CaptureDirection, CaptureFileSink, CaptureHeader
 from utils.settings import AppSettings
 
 
@@ -158,6 +161,7 @@ class TestTerminalTrimManager:
         lines = "\n".join(f"line{i}" for i in range(20))
         doc.setPlainText(lines)
         tm.trim_if_needed(doc)
+        assert tm.flush(timeout=5)
 
         assert tmp_path.joinpath("test.log").exists()
         content = tmp_path.joinpath("test.log").read_text(encoding="utf-8")
@@ -190,6 +194,62 @@ class TestTerminalTrimManager:
         assert doc.toPlainText() == before
 
 
+    def test_trim_keeps_document_when_writer_is_full(self, tmp_path):
+        tm = TerminalTrimManager()
+        tm.max_lines = 5
+        tm.batch_lines = 3
+        tm._log_file = tmp_path / "test.log"
+
+        doc = QTextDocument("\n".join(f"line{i}" for i in range(20)))
+        with patch("utils.trim_log.TrimLogWriter.submit", return_value=False):
+            tm.trim_if_needed(doc)
+        assert doc.blockCount() == 20
+
+        tm.trim_if_needed(doc)
+        assert doc.blockCount() == 5
+        assert tm.close(timeout=5)
+        content = tmp_path.joinpath("test.log").read_text(encoding="utf-8")
+        assert content == "".join(f"line{i}\n" for i in range(15))
+
+    def test_archive_mode_writes_indexed_segments(self, tmp_path):
+        from utils.trim_archive import extract_lines, list_segments
+
+        tm = TerminalTrimManager()
+        tm.max_lines = 5
+        tm.batch_lines = 3
+        tm.archive_enabled = True
+        tm._log_file = tmp_path / "trimmed_test.log"
+
+        doc = QTextDocument("\n".join(f"line{i}" for i in range(20)))
+        tm.trim_if_needed(doc)
+        assert tm.close(timeout=5)
+
+        segments = list_segments(tmp_path, tm.archive_stem)
+        assert extract_lines(segments, 0, 15) == [f"line{i}" for i in range(15)]
+        assert not tmp_path.joinpath("trimmed_test.log").exists()
+
+    def test_archive_toggled_off_and_on_continues_line_numbers(self, tmp_path):
+        from utils.trim_archive import extract_lines, list_segments, load_index
+
+        tm = TerminalTrimManager()
+        tm.max_lines = 5
+        tm.batch_lines = 3
+        tm.archive_enabled = True
+        tm._log_file = tmp_path / "trimmed_test.log"
+
+        tm.trim_if_needed(QTextDocument("\n".join(f"a{i}" for i in range(20))))
+        tm.archive_enabled = False
+        tm.trim_if_needed(QTextDocument("\n".join(f"p{i}" for i in range(20))))
+        tm.archive_enabled = True
+        tm.trim_if_needed(QTextDocument("\n".join(f"b{i}" for i in range(20))))
+        assert tm.close(timeout=5)
+
+        segments = list_segments(tmp_path, tm.archive_stem)
+        blocks = [b for segment in segments for b in load_index(segment)]
+        assert [(b.first_line, b.lines) for b in blocks] == [(0, 15), (15, 15)]
+        assert extract_lines(segments, 15, 15) == [f"b{i}" for i in range(15)]
+
+
 class TestSerialMonitorStatic:
     def test_get_timestamp_format(self):
         ts = SerialMonitor.get_timestamp()
@@ -198,25 +258,6 @@ class TestSerialMonitorStatic:
         assert ":" in ts
 
 
-class TestSerialMonitorSearchHelpers:
-    def test_count_matches(self):
-        doc = QTextDocument()
-        doc.setPlainText("hello world hello")
-        assert SerialMonitor._count_matches(doc, "hello", True) == 2
-
-    def test_count_matches_case_insensitive(self):
-        doc = QTextDocument()
-        doc.setPlainText("Hello HELLO hello")
-        assert SerialMonitor._count_matches(doc, "hello", False) == 3
-
-    def test_current_match_index(self):
-        doc = QTextDocument()
-        doc.setPlainText("hello world hello")
-        cursor = doc.find("hello")
-        idx = SerialMonitor._current_match_index(doc, cursor, "hello", True)
-        assert idx == 1
-
-
 class TestSerialMonitorLifecycle:
     def test_initial_state(self, qtbot):
         monitor = SerialMonitor()
@@ -479,7 +520,7 @@ class TestSerialMonitorDataProcessing:
         monitor = SerialMonitor()
         qtbot.addWidget(monitor)
         monitor.show_timestamp = True
-        monkeypatch.setattr(monitor, "get_timestamp", lambda: "[T] ")
+        monkeypatch.setattr("ui.main_window.format_timestamp", lambda stamp: "[T] ")
 
         monitor._on_serial_data(b"first\r")
         monitor._on_serial_data(b"\nsecond")
@@ -520,11 +561,11 @@ class TestSerialMonitorDataProcessing:
         monitor = SerialMonitor()
         qtbot.addWidget(monitor)
         monitor._on_serial_data(b"partial")
-        assert monitor._receive_at_line_start is False
+        assert monitor.receive_decoder.at_line_start is False
 
         monitor._append_transport_error("ERR1")
 
-        assert monitor._receive_at_line_start is True
+        assert monitor.receive_decoder.at_line_start is True
 
     def test_error_flushes_pending_cr_before_message(self, qtbot):
         monitor = SerialMonitor()
@@ -557,6 +598,80 @@ class TestSerialMonitorDataProcessing:
         assert "cmd" in monitor.statusBar().currentMessage()
         assert monitor.terminal_display.toPlainText() == doc_before
 
+    def _queued_send(self, monitor, ticket):
+        from core.payload_sender import PayloadRequest, SendResult, SendStatus
+
+        monitor.show_timestamp = False
+        with patch.object(
+            monitor.payload_sender,
+            "send",
+            return_value=SendResult(SendStatus.QUEUED, payload=b"cmd", ticket=ticket),
+        ):
+            monitor.send_payload(PayloadRequest(text="cmd"), display_text="cmd")
+
+    def test_queued_send_logs_sent_on_completion(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        self._queued_send(monitor, ticket=5)
+        assert monitor.terminal_display.toPlainText() == ""
+
+        monitor.connection_controller.write_completed.emit(5, 3, 0.001)
+        qtbot.wait(monitor.SEND_ACK_MS * 2)
+
+        assert monitor.terminal_display.toPlainText() == monitor.t("sent", "cmd") + "\n"
+
+    def test_slow_send_logs_queued_after_ack_window(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        self._queued_send(monitor, ticket=6)
+
+        qtbot.waitUntil(
+            lambda: monitor.terminal_display.toPlainText()
+            == monitor.t("queued", "cmd") + "\n",
+            timeout=1000,
+        )
+        monitor.connection_controller.write_completed.emit(6, 3, 1.0)
+
+        assert monitor.terminal_display.toPlainText() == (
+            monitor.t("queued", "cmd") + "\n" + monitor.t("sent", "cmd") + "\n"
+        )
+        assert monitor._pending_send_lines == {}
+
+    def test_short_write_is_logged_as_partial(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        self._queued_send(monitor, ticket=8)
+
+        monitor.connection_controller.write_completed.emit(8, 2, 0.001)
+
+        assert monitor.terminal_display.toPlainText() == (
+            monitor.t("sent_partial", 2, 3, "cmd") + "\n"
+        )
+
+    def test_new_connection_drops_unacknowledged_sends(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        self._queued_send(monitor, ticket=9)
+
+        monitor.connection_controller.state_changed.emit(
+            monitor.connection_mode,
+            TransportTransition(
+                TransportState.CONNECTING, TransportState.CONNECTED, "COM1"
+            ),
+        )
+
+        assert monitor._pending_send_lines == {}
+
+    def test_failed_async_send_is_not_logged_as_sent(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        self._queued_send(monitor, ticket=7)
+
+        monitor.connection_controller.write_completed.emit(7, 0, 0.001)
+        qtbot.wait(monitor.SEND_ACK_MS * 2)
+
+        assert monitor.terminal_display.toPlainText() == ""
+
     def test_checksum_end_mode_survives_startup_and_save(self, qtbot):
         with patch(
             "ui.main_window.ConfigManager.load_app_settings",
@@ -741,6 +856,43 @@ class TestSerialMonitorDataProcessing:
         assert monitor.terminal_mode_button.isChecked() is True
         assert not monitor.terminal_display.isVisibleTo(monitor)
 
+    def test_terminal_mode_forces_interactive_socket_policy(self, qtbot):
+        from core.socket_handler import SocketWritePolicy
+
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.connection_panel.write_policy_requested.emit("batched")
+        assert monitor.socket_handler.write_policy is SocketWritePolicy.BATCHED
+
+        monitor.toggle_terminal_mode()
+        assert monitor.socket_handler.write_policy is SocketWritePolicy.INTERACTIVE
+        assert monitor.socket_write_policy_combo.currentData() == "interactive"
+        assert not monitor.socket_write_policy_combo.isEnabled()
+
+        monitor.toggle_terminal_mode()
+        assert monitor.socket_handler.write_policy is SocketWritePolicy.BATCHED
+        assert monitor.socket_write_policy_combo.currentData() == "batched"
+        assert monitor.socket_write_policy_combo.isEnabled()
+
+    def test_socket_write_policy_is_restored_and_saved(self, qtbot):
+        from core.socket_handler import SocketWritePolicy
+
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        with patch(
+            "ui.main_window.ConfigManager.load_app_settings",
+            return_value=AppSettings(socket_write_policy="throughput"),
+        ):
+            monitor.load_settings()
+        assert monitor.socket_handler.write_policy is SocketWritePolicy.THROUGHPUT
+        assert "0 writes" in monitor.socket_write_policy_combo.toolTip() or (
+            "写入 0 次" in monitor.socket_write_policy_combo.toolTip()
+        )
+
+        with patch("ui.main_window.ConfigManager.save_app_settings") as save:
+            monitor.save_settings()
+        assert save.call_args.args[0].socket_write_policy == "throughput"
+
     def test_terminal_mode_data_participates_in_trimming(self, qtbot):
         monitor = SerialMonitor()
         qtbot.addWidget(monitor)
@@ -1126,6 +1278,7 @@ class TestSerialMonitorConnectionAndChecksum:
 
         monitor.connection_controller._on_data(ConnectionMode.SERIAL, b"stale serial")
         monitor.connection_controller._on_data(ConnectionMode.TCP, b"socket data")
+        monitor.receive_pipeline.flush()
 
         text = monitor.terminal_display.toPlainText()
         assert "stale serial" not in text
@@ -1141,6 +1294,7 @@ class TestSerialMonitorConnectionAndChecksum:
             ConnectionMode.RFC2217, b"stale rfc2217"
         )
         monitor.connection_controller._on_data(ConnectionMode.TCP, b"socket data")
+        monitor.receive_pipeline.flush()
 
         text = monitor.terminal_display.toPlainText()
         assert "stale rfc2217" not in text
@@ -1883,6 +2037,37 @@ class TestSerialMonitorSearch:
         # 正常模式下不做任何操作，不抛异常
         monitor._clear_search_highlights()
 
+    def test_history_search_finds_trimmed_lines(self, qtbot, tmp_path):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        tm = monitor.trim_manager
+        tm.max_lines = 5
+        tm.batch_lines = 3
+        tm._log_file = tmp_path / "trimmed_test.log"
+        doc = QTextDocument("\n".join(f"line{i}" for i in range(20)))
+        tm.trim_if_needed(doc)
+
+        with qtbot.waitSignal(
+            monitor.history_search.search_finished, timeout=5000
+        ) as blocker:
+            monitor._do_history_search("LINE1", False)
+
+        assert blocker.args == [6, False]
+        assert monitor.history_results.count() == 6
+        assert monitor.history_results.item(0).text() == "trimmed_test.log:2  line1"
+        assert monitor.search_bar.result_label.text() == monitor.t("history_done", 6)
+        assert not monitor.search_bar.stop_button.isVisible()
+
+    def test_history_search_without_history(self, qtbot, tmp_path):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.trim_manager._log_file = tmp_path / "trimmed_none.log"
+
+        monitor._do_history_search("x", False)
+
+        assert monitor.search_bar.result_label.text() == monitor.t("history_empty")
+        assert not monitor.history_search.is_running()
+
 
 class TestSerialMonitorCheckDeviceMore:
     def test_check_device_auto_reconnect_terminal_mode(self, qtbot):
@@ -1976,3 +2161,135 @@ class TestSerialMonitorCheckDeviceMore:
                           return_value=["/dev/ttyUSB0"]):
             monitor.check_device_connection()
         monitor.serial_handler.open.assert_not_called()
+
+
+class TestSerialMonitorCapture:
+    def test_restart_within_same_second_opens_new_file(self, qtbot, tmp_path):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.trim_manager._log_dir = tmp_path
+
+        with patch("ui.main_window.QMessageBox.warning") as warning:
+            for _ in range(3):
+                monitor._set_capture_enabled(True)
+                assert monitor.connection_controller.capture is not None
+                monitor._set_capture_enabled(False)
+
+        warning.assert_not_called()
+        assert len(list(tmp_path.glob("capture_*.smcap"))) == 3
+
+
+class TestSerialMonitorReplay:
+    def _capture(self, tmp_path):
+        sink = CaptureFileSink(tmp_path / "r.smcap", CaptureHeader(0.0, 0))
+        sink.open()
+        sink.write(
+            [
+                (CaptureDirection.RX, 0, b"boot "),
+                (CaptureDirection.TX, 10, b"help\r\n"),
+                (CaptureDirection.RX, 20, b"ok\n"),
+            ]
+        )
+        sink.close()
+        return sink.path
+
+    def test_replay_goes_through_receive_pipeline(self, qtbot, tmp_path):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.show_timestamp = False
+
+        with qtbot.waitSignal(
+            monitor.connection_controller.replay_finished, timeout=2000
+        ):
+            assert monitor.start_replay(self._capture(tmp_path), 0)
+
+        text = monitor.terminal_display.toPlainText()
+        assert "boot ok" in text
+        assert "help" not in text
+        assert "8" in text.splitlines()[-1]
+
+    def test_finished_elapsed_includes_final_flush(self, qtbot):
+        from core.replay_handler import ReplayStats
+
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        stats = ReplayStats(records=1, bytes=1024, started_at=time.monotonic())
+
+        with patch.object(
+            monitor.receive_pipeline, "flush", side_effect=lambda: time.sleep(0.05)
+        ):
+            monitor._on_replay_finished(stats)
+
+        line = monitor.terminal_display.toPlainText().splitlines()[-1]
+        elapsed = float(re.search(r"用时 ([0-9.]+) 秒", line).group(1))
+        assert elapsed >= 0.05
+
+    def test_replay_refused_while_connected(self, qtbot, tmp_path):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.connection_controller.is_active = Mock(return_value=True)
+
+        with patch("ui.main_window.QMessageBox.warning") as warning:
+            assert monitor.start_replay(self._capture(tmp_path), 0) is False
+
+        warning.assert_called_once()
+        assert monitor.connection_controller.is_replaying() is False
+
+
+class TestSerialMonitorSessions:
+    def _monitor(self, qtbot):
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        created = []
+
+        def create():
+            handler = SocketHandler()
+            handler.open = Mock(return_value=True)
+            created.append(handler)
+            return handler
+
+        monitor.connection_controller.sessions.set_factory(
+            ConnectionMode.TCP, create
+        )
+        return monitor, created
+
+    def test_session_data_goes_to_its_own_view(self, qtbot):
+        monitor, created = self._monitor(qtbot)
+
+        first = monitor.open_session(TcpConnectionConfig("10.0.0.1", 9000))
+        second = monitor.open_session(TcpConnectionConfig("10.0.0.2", 9000))
+        created[0]._transition(TransportState.CONNECTED)
+        created[0].data_received.emit(b"alpha\n")
+        created[1].data_received.emit(b"beta\n")
+        for view in monitor.session_views.values():
+            view.receive_pipeline.flush()
+
+        assert list(monitor.session_views) == [first, second]
+        assert "alpha" in monitor.session_views[first].display.toPlainText()
+        assert "beta" in monitor.session_views[second].display.toPlainText()
+        assert "alpha" not in monitor.terminal_display.toPlainText()
+        assert monitor.session_views[first].state is TransportState.CONNECTED
+
+    def test_reopening_session_reuses_view(self, qtbot):
+        monitor, created = self._monitor(qtbot)
+        config = TcpConnectionConfig("10.0.0.1", 9000)
+
+        session_id = monitor.open_session(config)
+        view = monitor.session_views[session_id]
+        monitor.reconnect_session(session_id)
+
+        assert monitor.session_views[session_id] is view
+        assert len(created) == 1
+        assert created[0].open.call_count == 2
+
+    def test_close_session_removes_view_and_registry_entry(self, qtbot):
+        monitor, created = self._monitor(qtbot)
+        session_id = monitor.open_session(TcpConnectionConfig("10.0.0.1", 9000))
+        view = monitor.session_views[session_id]
+
+        view.close_button.click()
+
+        assert session_id not in monitor.session_views
+        assert session_id not in monitor.connection_controller.sessions
+        created[0].data_received.emit(b"late")
+        assert view.receive_pipeline.pending_chunks() == 0
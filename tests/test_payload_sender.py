@@ -86,3 +86,27 @@ def test_async_writer_reports_queue_acceptance_not_delivery():
     assert result.status is SendStatus.QUEUED
     assert result.accepted is True
     assert result.sent is False
+
+
+def test_queued_write_carries_completion_ticket():
+    sender = PayloadSender(
+        Mock(return_value=WriteDisposition.QUEUED), lambda: True, lambda: 42
+    )
+
+    result = sender.send(PayloadRequest(text="hello"))
+
+    assert result.status is SendStatus.QUEUED
+    assert result.ticket == 42
+
+
+def test_sent_write_has_no_ticket():
+    ticket = Mock(return_value=42)
+    sender = PayloadSender(
+        Mock(return_value=WriteDisposition.SENT), lambda: True, ticket
+    )
+
+    result = sender.send(PayloadRequest(text="hello"))
+
+    assert result.status is SendStatus.SENT
+    assert result.ticket is None
+    ticket.assert_not_called()
@@ -204,6 +204,29 @@ class TestQuickSendPanelActions:
         assert panel.send_checked_button.isEnabled()
         assert not panel.stop_button.isEnabled()
 
+    def test_paused_sequence_keeps_queue(self, qtbot):
+        panel = QuickSendPanel(language="zh")
+        qtbot.addWidget(panel)
+        panel.add_item_to_list("item1", checked=True)
+        panel.add_item_to_list("item2", checked=True)
+        panel.add_item_to_list("item3", checked=True)
+        sent = []
+        panel.send_requested.connect(lambda content, *_args: sent.append(content))
+
+        panel._start_sequence_send()
+        panel.set_send_paused(True)
+        panel._send_next_in_queue()
+
+        assert sent == ["item1"]
+        assert not panel.quick_send_timer.isActive()
+        assert len(panel.quick_send_queue) == 2
+
+        panel.set_send_paused(False)
+        assert panel.quick_send_timer.isActive()
+        panel._send_next_in_queue()
+        assert sent == ["item1", "item2"]
+        panel.stop_sequence_send()
+
     def test_add_item_with_mocked_dialog(self, qtbot):
         panel = QuickSendPanel(language="zh")
         qtbot.addWidget(panel)
@@ -0,0 +1,198 @@
+"""
+测试 ui/receive_pipeline.py
+"""
+
+from unittest.mock import patch
+
+from ui.receive_pipeline import (
+    ReceiveAccumulator,
+    ReceiveFlushStats,
+    ReceiveTextDecoder,
+)
+
+
+class TestReceiveAccumulator:
+    def test_push_defers_until_flush(self, qtbot):
+        batches: list[list[bytes]] = []
+        acc = ReceiveAccumulator(lambda chunks, stamps: batches.append(chunks) or 0)
+
+        acc.push(b"a")
+        acc.push(b"b")
+
+        assert batches == []
+        assert acc.pending_chunks() == 2
+        assert acc.pending_bytes() == 2
+
+        acc.flush()
+        assert batches == [[b"a", b"b"]]
+        assert acc.pending_chunks() == 0
+
+    def test_timer_flushes_once_per_interval(self, qtbot):
+        batches: list[list[bytes]] = []
+        acc = ReceiveAccumulator(
+            lambda chunks, stamps: batches.append(chunks) or len(chunks), interval_ms=5
+        )
+
+        with qtbot.waitSignal(acc.flushed, timeout=1000) as blocker:
+            for i in range(10):
+                acc.push(bytes([65 + i]))
+
+        assert len(batches) == 1
+        assert blocker.args[0] == ReceiveFlushStats(chunks=10, lines=10, bytes=10)
+        assert acc.last_stats == blocker.args[0]
+
+    def test_empty_push_and_flush_are_noops(self, qtbot):
+        calls: list[list[bytes]] = []
+        acc = ReceiveAccumulator(lambda chunks, stamps: calls.append(chunks) or 0)
+
+        acc.push(b"")
+        assert acc.flush() is None
+        assert calls == []
+
+    def test_interval_is_clamped(self, qtbot):
+        acc = ReceiveAccumulator(lambda chunks, stamps: 0, interval_ms=0)
+        assert acc.interval_ms == ReceiveAccumulator.MIN_INTERVAL_MS
+
+        acc.interval_ms = 10_000
+        assert acc.interval_ms == ReceiveAccumulator.MAX_INTERVAL_MS
+
+    def test_reentrant_flush_does_not_duplicate(self, qtbot):
+        batches: list[list[bytes]] = []
+
+        def sink(chunks, stamps):
+            batches.append(chunks)
+            acc.flush()
+            return 0
+
+        acc = ReceiveAccumulator(sink)
+        acc.push(b"x")
+        acc.flush()
+
+        assert batches == [[b"x"]]
+
+    def test_discard_drops_pending(self, qtbot):
+        batches: list[list[bytes]] = []
+        acc = ReceiveAccumulator(lambda chunks, stamps: batches.append(chunks) or 0)
+        acc.push(b"x")
+
+        acc.discard()
+
+        assert acc.flush() is None
+        assert batches == []
+
+
+class TestMainWindowReceivePipeline:
+    def _monitor(self, qtbot):
+        from ui.main_window import SerialMonitor
+
+        monitor = SerialMonitor()
+        qtbot.addWidget(monitor)
+        monitor.show_timestamp = False
+        return monitor
+
+    def test_controller_data_is_coalesced_into_one_flush(self, qtbot):
+        monitor = self._monitor(qtbot)
+
+        with patch.object(
+            monitor.trim_manager,
+            "trim_if_needed",
+            wraps=monitor.trim_manager.trim_if_needed,
+        ) as trim:
+            for i in range(50):
+                monitor.connection_controller.data_received.emit(
+                    f"line{i}\n".encode()
+                )
+            assert monitor.terminal_display.toPlainText() == ""
+
+            with qtbot.waitSignal(monitor.receive_pipeline.flushed, timeout=1000):
+                pass
+
+        stats = monitor.receive_pipeline.last_stats
+        assert stats == ReceiveFlushStats(chunks=50, lines=50, bytes=340)
+        assert trim.call_count == 1
+        assert monitor.terminal_display.toPlainText().splitlines() == [
+            f"line{i}" for i in range(50)
+        ]
+
+    def test_hex_mode_keeps_one_line_per_chunk(self, qtbot):
+        monitor = self._monitor(qtbot)
+        monitor.receive_hex_mode = True
+
+        monitor.receive_pipeline.push(b"\x01\x02")
+        monitor.receive_pipeline.push(b"\x03")
+        monitor.receive_pipeline.flush()
+
+        assert monitor.terminal_display.toPlainText() == "01 02\n03\n"
+
+    def test_status_message_flushes_pending_data_first(self, qtbot):
+        monitor = self._monitor(qtbot)
+
+        monitor.receive_pipeline.push(b"data\n")
+        monitor.append_to_terminal("status\n", with_timestamp=True)
+
+        assert monitor.terminal_display.toPlainText() == "data\nstatus\n"
+
+    def test_receive_mode_toggle_renders_pending_in_old_mode(self, qtbot):
+        monitor = self._monitor(qtbot)
+
+        monitor.receive_pipeline.push(b"AB\n")
+        monitor.toggle_receive_mode()
+
+        assert monitor.receive_hex_mode is True
+        assert monitor.terminal_display.toPlainText() == "AB\n"
+
+    def test_lines_are_stamped_at_arrival_not_flush(self, qtbot, monkeypatch):
+        monitor = self._monitor(qtbot)
+        monitor.show_timestamp = True
+        monkeypatch.setattr(
+            "ui.main_window.format_timestamp", lambda stamp: f"[{stamp:g}] "
+        )
+
+        monitor.receive_pipeline.push(b"a\nb", stamp=1.0)
+        monitor.receive_pipeline.push(b"c\nd\n", stamp=2.0)
+        monitor.receive_pipeline.push(b"e\n", stamp=3.0)
+        monitor.receive_pipeline.flush()
+
+        assert monitor.terminal_display.toPlainText() == (
+            "[1] a\n[1] bc\n[2] d\n[3] e\n"
+        )
+
+    def test_push_records_arrival_time(self, qtbot):
+        stamps_seen: list[list[float]] = []
+        acc = ReceiveAccumulator(
+            lambda chunks, stamps: stamps_seen.append(stamps) or 0
+        )
+
+        with patch("ui.receive_pipeline.time.time", side_effect=[5.0, 6.0]):
+            acc.push(b"a")
+            acc.push(b"b")
+        acc.flush()
+
+        assert stamps_seen == [[5.0, 6.0]]
+
+
+class TestReceiveTextDecoder:
+    def test_split_utf8_and_crlf_across_chunks(self):
+        decoder = ReceiveTextDecoder()
+
+        assert decoder.feed(b"ab\r", 1.0) == [("ab", 1.0)]
+        assert decoder.pending_cr is True
+        assert decoder.feed(b"\ncd\xe4\xb8", 2.0) == [("\r\n", None), ("cd", 2.0)]
+        assert decoder.feed(b"\xad\n", 3.0) == [("中\n", None)]
+        assert decoder.at_line_start is True
+
+    def test_feed_chunks_merges_continuations(self):
+        decoder = ReceiveTextDecoder()
+
+        parts = decoder.feed_chunks([b"ab", b"c\nd", b"", b"e\n"], [1.0, 2.0, 3.0, 4.0])
+
+        assert parts == [("abc\n", 1.0), ("de\n", 2.0)]
+
+    def test_reset_drops_partial_state(self):
+        decoder = ReceiveTextDecoder()
+        decoder.feed(b"x\xe4\r", 1.0)
+
+        decoder.reset()
+
+        assert decoder.feed(b"y", 2.0) == [("y", 2.0)]
+        assert decoder.pending_cr is False
@@ -0,0 +1,131 @@
+"""
+测试 core/replay_handler.py
+"""
+
+import time
+
+from core.replay_handler import AS_FAST_AS_POSSIBLE, ReplayHandler, ReplayStats
+from core.transport import DisconnectReason, TransportOperation, TransportState
+from utils.session_capture import CaptureDirection, CaptureFileSink, CaptureHeader
+
+_BASE_NS = 5_000_000_000
+
+# 保活：避免 handler 被 GC 后 C++ 地址复用
+_KEEPALIVE: list = []
+
+
+def _write_capture(path, records):
+    sink = CaptureFileSink(path, CaptureHeader(1700000000.0, _BASE_NS), 64)
+    sink.open()
+    sink.write(
+        [(direction, _BASE_NS + int(at * 1e9), data) for direction, at, data in records]
+    )
+    sink.close()
+    return path
+
+
+def _handler() -> ReplayHandler:
+    handler = ReplayHandler()
+    _KEEPALIVE.append(handler)
+    return handler
+
+
+class TestReplayHandler:
+    def test_fast_replay_keeps_chunk_boundaries_and_skips_sent(self, qtbot, tmp_path):
+        path = _write_capture(
+            tmp_path / "r.smcap",
+            [
+                (CaptureDirection.RX, 0.0, b"\x1b[31mre"),
+                (CaptureDirection.TX, 0.5, b"AT\r\n"),
+                (CaptureDirection.RX, 1.0, b"d\x1b[0m\r\n"),
+                (CaptureDirection.RX, 60.0, b"x" * 100),
+            ],
+        )
+        handler = _handler()
+        received = []
+        handler.data_received.connect(received.append)
+
+        with qtbot.waitSignal(handler.replay_finished, timeout=2000) as blocker:
+            assert handler.open(path, AS_FAST_AS_POSSIBLE)
+            assert handler.is_open()
+
+        assert received == [b"\x1b[31mre", b"d\x1b[0m\r\n", b"x" * 100]
+        stats = blocker.args[0]
+        assert isinstance(stats, ReplayStats)
+        assert (stats.records, stats.bytes) == (3, 114)
+        assert stats.elapsed < 5.0
+        assert 0 < stats.started_at <= time.monotonic() - stats.elapsed
+        assert handler.state is TransportState.DISCONNECTED
+
+    def test_include_sent_replays_both_directions(self, qtbot, tmp_path):
+        path = _write_capture(
+            tmp_path / "r.smcap",
+            [(CaptureDirection.TX, 0.0, b"tx"), (CaptureDirection.RX, 0.1, b"rx")],
+        )
+        handler = _handler()
+        received = []
+        handler.data_received.connect(received.append)
+
+        with qtbot.waitSignal(handler.replay_finished, timeout=2000):
+            handler.open(path, AS_FAST_AS_POSSIBLE, include_sent=True)
+
+        assert received == [b"tx", b"rx"]
+
+    def test_speed_scales_recorded_timing(self, qtbot, tmp_path):
+        path = _write_capture(
+            tmp_path / "r.smcap",
+            [(CaptureDirection.RX, 10.0, b"a"), (CaptureDirection.RX, 10.3, b"b")],
+        )
+        elapsed = {}
+        for speed in (1.0, 10.0):
+            handler = _handler()
+            started = time.monotonic()
+            with qtbot.waitSignal(handler.replay_finished, timeout=3000):
+                handler.open(path, speed)
+            elapsed[speed] = time.monotonic() - started
+
+        assert elapsed[1.0] >= 0.29
+        assert elapsed[10.0] < elapsed[1.0] / 2
+
+    def test_close_stops_replay(self, qtbot, tmp_path):
+        path = _write_capture(
+            tmp_path / "r.smcap",
+            [(CaptureDirection.RX, 0.0, b"first"), (CaptureDirection.RX, 30.0, b"no")],
+        )
+        handler = _handler()
+        received = []
+        handler.data_received.connect(received.append)
+        finished = []
+        handler.replay_finished.connect(finished.append)
+
+        handler.open(path, 1.0)
+        qtbot.waitUntil(lambda: received == [b"first"], timeout=1000)
+        with qtbot.waitSignal(handler.state_changed, timeout=1000) as blocker:
+            handler.close()
+
+        assert blocker.args[0].reason is DisconnectReason.USER
+        qtbot.wait(50)
+        assert received == [b"first"]
+        assert finished == []
+
+    def test_invalid_file_fails_to_open(self, qtbot, tmp_path):
+        path = tmp_path / "bad.smcap"
+        path.write_bytes(b"not a capture")
+        handler = _handler()
+
+        with qtbot.waitSignal(handler.transport_error, timeout=1000) as blocker:
+            assert handler.open(path) is False
+
+        assert blocker.args[0].operation is TransportOperation.CONNECT
+        assert handler.state is TransportState.DISCONNECTED
+        assert handler.open(tmp_path / "missing.smcap") is False
+
+    def test_writes_are_rejected(self, qtbot):
+        assert _handler().write_data(b"x") is False
+
+    def test_invalid_speed_means_as_fast_as_possible(self, qtbot):
+        handler = _handler()
+        handler.set_speed(-3)
+        assert handler.speed == AS_FAST_AS_POSSIBLE
+        handler.set_speed(float("inf"))
+        assert handler.speed == AS_FAST_AS_POSSIBLE
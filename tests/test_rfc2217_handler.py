@@ -172,6 +172,109 @@ class TestRfc2217UserDisconnectReason:
         assert rfc_handler._disconnect_reason is DisconnectReason.USER
 
 
+def _worker(**kwargs):
+    from core.rfc2217_handler import _Rfc2217Worker
+
+    worker = _Rfc2217Worker(
+        url="rfc2217://127.0.0.1:1",
+        endpoint="127.0.0.1:1",
+        baudrate=115200,
+        parity=serial.PARITY_NONE,
+        databits=8,
+        stopbits=1,
+        dtr=True,
+        rts=True,
+    )
+    for name, value in kwargs.items():
+        setattr(worker, name, value)
+    return worker
+
+
+class TestRfc2217WriteBatching:
+    def test_consecutive_writes_are_sent_once(self):
+        worker = _worker()
+        remote = Mock()
+        for payload in (b"a", b"bb", b"ccc"):
+            assert worker.enqueue("write", payload)
+
+        worker._process_commands(remote)
+
+        remote.write.assert_called_once_with(b"abbccc")
+        assert worker.pending_write_bytes() == 0
+
+    def test_control_command_flushes_preceding_writes(self):
+        worker = _worker()
+        remote = Mock()
+        calls = []
+        remote.write.side_effect = lambda data: calls.append(("write", data))
+        type(remote).dtr = property(
+            fset=lambda _self, level: calls.append(("dtr", level))
+        )
+        worker.enqueue("write", b"a")
+        worker.enqueue("write", b"b")
+        worker.enqueue("dtr", False)
+        worker.enqueue("write", b"c")
+
+        worker._process_commands(remote)
+
+        assert calls == [("write", b"ab"), ("dtr", False), ("write", b"c")]
+
+    def test_batch_size_is_capped(self):
+        worker = _worker(MAX_WRITE_BATCH_BYTES=4)
+        remote = Mock()
+        for payload in (b"12", b"34", b"56", b"789"):
+            worker.enqueue("write", payload)
+
+        worker._process_commands(remote)
+
+        assert [c.args[0] for c in remote.write.call_args_list] == [
+            b"1234",
+            b"56",
+            b"789",
+        ]
+
+    def test_write_limit_is_bytes_not_entries(self):
+        worker = _worker(MAX_QUEUE_BYTES=8)
+
+        assert all(worker.enqueue("write", b"x") for _ in range(8))
+        assert worker.enqueue("write", b"y") is False
+        assert worker.enqueue("dtr", True) is True
+
+    def test_empty_queue_accepts_oversized_write(self):
+        worker = _worker(MAX_QUEUE_BYTES=4)
+
+        assert worker.enqueue("write", b"123456") is True
+
+    def test_water_marks_toggle_backpressure(self):
+        worker = _worker(HIGH_WATER=4, LOW_WATER=1)
+        changes = []
+        worker.backpressure_changed.connect(
+            lambda _w, throttled: changes.append(throttled)
+        )
+        worker.enqueue("write", b"12")
+        assert changes == []
+        worker.enqueue("write", b"34")
+        assert changes == [True]
+
+        worker._process_commands(Mock())
+
+        assert changes == [True, False]
+
+    def test_failed_send_releases_queued_bytes(self):
+        from core.rfc2217_handler import _WorkerCommandError
+
+        worker = _worker()
+        remote = Mock()
+        remote.write.side_effect = OSError("broken pipe")
+        worker.enqueue("write", b"abc")
+
+        with pytest.raises(_WorkerCommandError) as excinfo:
+            worker._process_commands(remote)
+
+        assert excinfo.value.context == "write"
+        assert worker.pending_write_bytes() == 0
+
+
 class TestRfc2217Handler:
     def test_initial_state(self, rfc_handler):
         assert rfc_handler.is_open() is False
@@ -245,6 +348,47 @@ class TestRfc2217Handler:
         qtbot.waitUntil(lambda: rfc2217_server.serial.dtr is False, timeout=2000)
         qtbot.waitUntil(lambda: rfc2217_server.serial.rts is False, timeout=2000)
 
+    def test_round_trip_does_not_wait_for_read_poll(
+        self, qtbot, rfc2217_server, rfc_handler
+    ):
+        with qtbot.waitSignal(rfc_handler.connection_changed, timeout=3000):
+            assert rfc_handler.open(
+                "127.0.0.1", rfc2217_server.port, network_timeout=1
+            ) is True
+
+        received = bytearray()
+        rfc_handler.data_received.connect(received.extend)
+        samples = []
+        for _ in range(20):
+            received.clear()
+            started = time.monotonic()
+            assert rfc_handler.write_data(b"p") is True
+            qtbot.waitUntil(lambda: bool(received), timeout=2000)
+            samples.append(time.monotonic() - started)
+
+        # 轮询实现的往返中位数约 40 ms（写入排在 50 ms 阻塞读之后）
+        assert sorted(samples)[len(samples) // 2] < 0.02
+
+    def test_idle_worker_does_not_spin(self, qtbot, rfc2217_server, rfc_handler):
+        with qtbot.waitSignal(rfc_handler.connection_changed, timeout=3000):
+            assert rfc_handler.open(
+                "127.0.0.1", rfc2217_server.port, network_timeout=1
+            ) is True
+
+        worker = rfc_handler._worker
+        passes = []
+        process_commands = worker._process_commands
+        worker._process_commands = lambda remote: (
+            passes.append(None),
+            process_commands(remote),
+        )
+        # 等待当前这一轮空闲等待结束后再计数
+        qtbot.wait(1100)
+        passes.clear()
+        qtbot.wait(500)
+
+        assert len(passes) <= 2
+
     def test_peer_eof_is_reported_as_remote_disconnect(
         self, qtbot, rfc2217_server, rfc_handler
     ):
@@ -366,6 +510,23 @@ class TestRfc2217Handler:
             assert rfc_handler.write_data(b"data") is False
 
         assert blocker.args[0].operation is TransportOperation.WRITE
+        # 队列满只是背压，不应当作 I/O 错误断开会话
+        assert blocker.args[0].reason is None
+        assert rfc_handler.state is TransportState.CONNECTED
+
+    def test_worker_backpressure_is_forwarded(self, qtbot, rfc_handler):
+        worker = _worker()
+        rfc_handler._worker = worker
+        changes = []
+        rfc_handler.write_backpressure_changed.connect(changes.append)
+
+        rfc_handler._on_worker_backpressure(worker, True)
+        rfc_handler._on_worker_backpressure(Mock(), False)
+
+        assert changes == [True]
+        assert rfc_handler.is_write_throttled() is True
+        rfc_handler._complete_worker(worker)
+        assert changes == [True, False]
 
     def test_worker_write_error_keeps_write_operation(self, qtbot, rfc_handler):
         worker = Mock()
@@ -177,3 +177,42 @@ class TestSearchBarSignals:
             bar.prev_button.click()
         assert blocker.args[0] == "back"
         assert blocker.args[1] is False  # backward
+
+
+class TestSearchBarHistoryMode:
+    def test_enter_emits_history_request(self, qtbot):
+        bar = SearchBar()
+        qtbot.addWidget(bar)
+        bar.history_button.click()
+        assert bar.history_mode
+
+        with qtbot.assertNotEmitted(bar.search_requested):
+            bar.input.setText("hello")
+        with qtbot.waitSignal(bar.history_requested, timeout=500) as blocker:
+            bar.input.returnPressed.emit()
+
+        assert blocker.args == ["hello", False]
+
+    def test_leaving_history_mode_cancels(self, qtbot):
+        bar = SearchBar()
+        qtbot.addWidget(bar)
+        bar.history_button.click()
+        bar.input.setText("hello")
+
+        with qtbot.waitSignals(
+            [bar.history_cancel_requested, bar.search_requested], timeout=500
+        ):
+            bar.history_button.click()
+
+    def test_stop_button_visible_while_running(self, qtbot):
+        bar = SearchBar()
+        qtbot.addWidget(bar)
+        bar.show_bar()
+
+        bar.set_history_running(True)
+        assert bar.stop_button.isVisible()
+        with qtbot.waitSignal(bar.history_cancel_requested, timeout=500):
+            bar.stop_button.click()
+
+        bar.set_history_running(False)
+        assert not bar.stop_button.isVisible()
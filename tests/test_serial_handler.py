@@ -2,6 +2,7 @@
 测试 core/serial_handler.py - 静态方法和基础功能
 """
 
+import threading
 import time
 
 import pytest
@@ -304,7 +305,7 @@ class TestSerialHandlerInstance:
 
     @patch("core.serial_handler.SerialHandler._start_reader")
     @patch("core.serial_handler.serial.Serial")
-    def test_write_data_success(self, mock_serial_class, mock_start_reader):
+    def test_write_data_success(self, mock_serial_class, mock_start_reader, qtbot):
         handler = SerialHandler()
         mock_port = Mock()
         mock_port.is_open = True
@@ -312,9 +313,12 @@ class TestSerialHandlerInstance:
         mock_serial_class.return_value = mock_port
 
         handler.open("/dev/ttyUSB0")
-        result = handler.write_data(b"hello")
+        with qtbot.waitSignal(handler.write_completed, timeout=2000) as blocker:
+            result = handler.write_data(b"hello")
         assert result is True
+        assert blocker.args[:2] == [handler.last_write_ticket, 5]
         mock_port.write.assert_called_once_with(b"hello")
+        handler.close()
 
     def test_write_data_rejects_partial_write(self, qtbot):
         handler = SerialHandler()
@@ -383,9 +387,11 @@ class TestSerialHandlerReaderThread:
         thread = _SerialReadThread(mock_port)
 
         received: list[bytes] = []
-        thread.data_received.connect(received.append)
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000):
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000):
             thread.run()
 
         assert received == [b"hello"]
@@ -398,7 +404,7 @@ class TestSerialHandlerReaderThread:
         mock_port.read.side_effect = serial.SerialException("disconnected")
         thread = _SerialReadThread(mock_port)
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000):
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000):
             thread.run()
 
     def test_reader_unexpected_error(self, qtbot):
@@ -408,7 +414,7 @@ class TestSerialHandlerReaderThread:
         mock_port.read.side_effect = ValueError("unexpected")
         thread = _SerialReadThread(mock_port)
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000):
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000):
             thread.run()
 
 
@@ -433,7 +439,9 @@ class TestSerialReadThreadLifecycle:
         thread.stop()
 
         received = []
-        thread.data_received.connect(received.append)
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
         # 由于 _running=False，run() 应立即返回
         thread.run()
         assert received == []
@@ -446,12 +454,14 @@ class TestSerialReadThreadLifecycle:
         thread = _SerialReadThread(mock_port)
 
         received = []
-        thread.data_received.connect(received.append)
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
         # 让 read 返回空字节，run 会持续循环直到 _running=False
         # 这里我们在收到 3 个 chunk 后调用 stop
-        def on_first_data(data):
+        def on_first_data(_reader, data):
             thread.stop()
-        thread.data_received.connect(on_first_data)
+        thread.session_data_received.connect(on_first_data)
 
         thread.run()
         # 至少收到一个 chunk
@@ -459,7 +469,7 @@ class TestSerialReadThreadLifecycle:
         assert received[0] == b"chunk1"
 
     def test_empty_data_not_emitted(self, qtbot):
-        """read() 返回空字节不应触发 data_received 信号。"""
+        """read() 返回空字节不应触发 session_data_received 信号。"""
         from core.serial_handler import _SerialReadThread
 
         mock_port = Mock()
@@ -468,27 +478,29 @@ class TestSerialReadThreadLifecycle:
         thread = _SerialReadThread(mock_port)
 
         received = []
-        thread.data_received.connect(received.append)
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000):
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000):
             thread.run()
         # 应该有 1 个真实数据
         assert received == [b"real_data"]
 
     def test_os_error_exits_thread(self, qtbot):
-        """OSError 应触发 error_occurred 并退出。"""
+        """OSError 应触发 session_error_occurred 并退出。"""
         from core.serial_handler import _SerialReadThread
 
         mock_port = Mock()
         mock_port.read.side_effect = OSError("device unplugged")
         thread = _SerialReadThread(mock_port)
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000) as blocker:
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000) as blocker:
             thread.run()
-        assert "device unplugged" in blocker.args[0]
+        assert "device unplugged" in blocker.args[1]
 
     def test_serial_exception_exits_thread(self, qtbot):
-        """SerialException 应触发 error_occurred 并退出。"""
+        """SerialException 应触发 session_error_occurred 并退出。"""
         import serial as _serial
         from core.serial_handler import _SerialReadThread
 
@@ -496,9 +508,9 @@ class TestSerialReadThreadLifecycle:
         mock_port.read.side_effect = _serial.SerialException("port lost")
         thread = _SerialReadThread(mock_port)
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000) as blocker:
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000) as blocker:
             thread.run()
-        assert "port lost" in blocker.args[0]
+        assert "port lost" in blocker.args[1]
 
     def test_unexpected_exception_logged(self, qtbot):
         """未知异常应被记录并触发 error_occurred。"""
@@ -508,9 +520,9 @@ class TestSerialReadThreadLifecycle:
         mock_port.read.side_effect = RuntimeError("weird")
         thread = _SerialReadThread(mock_port)
 
-        with qtbot.waitSignal(thread.error_occurred, timeout=1000) as blocker:
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000) as blocker:
             thread.run()
-        assert "weird" in blocker.args[0]
+        assert "weird" in blocker.args[1]
 
     def test_thread_stops_gracefully(self, qtbot):
         """stop() 后 run 应能优雅退出。"""
@@ -521,7 +533,9 @@ class TestSerialReadThreadLifecycle:
         thread = _SerialReadThread(mock_port)
 
         received = []
-        thread.data_received.connect(received.append)
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
 
         # 异步停止线程
         def stop_later():
@@ -565,6 +579,133 @@ class TestSerialReadThreadLifecycle:
         assert not thread.isRunning()
 
 
+class _BufferedPort:
+    """按字节缓冲模拟串口：in_waiting 为整数，read(n) 取出至多 n 字节。"""
+
+    def __init__(self, data: bytes = b"") -> None:
+        self.buffer = bytearray(data)
+        self.reads: list[int] = []
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.buffer)
+
+    def read(self, size: int) -> bytes:
+        self.reads.append(size)
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+class TestSerialReadCoalescing:
+    def test_read_size_follows_in_waiting(self):
+        from core.serial_handler import _SerialReadThread
+
+        port = _BufferedPort(b"x" * 300)
+        thread = _SerialReadThread(port)
+
+        assert thread._read_batch() == b"x" * 300
+        assert port.reads == [300]
+
+    def test_empty_buffer_waits_for_one_byte(self):
+        from core.serial_handler import _SerialReadThread
+
+        mock_port = Mock()
+        mock_port.read.return_value = b"a"
+        thread = _SerialReadThread(mock_port)
+
+        assert thread._read_batch() == b"a"
+        mock_port.read.assert_called_once_with(1)
+
+    def test_small_reads_are_emitted_without_waiting(self, monkeypatch):
+        from core import serial_handler
+        from core.serial_handler import _SerialReadThread
+
+        sleeps: list[float] = []
+        monkeypatch.setattr(serial_handler.time, "sleep", sleeps.append)
+        thread = _SerialReadThread(_BufferedPort(b"ok\r\n"))
+
+        assert thread._read_batch() == b"ok\r\n"
+        assert sleeps == []
+
+    def test_bursts_are_coalesced_within_window(self, monkeypatch):
+        from core import serial_handler
+        from core.serial_handler import _SerialReadThread
+
+        port = _BufferedPort(b"a" * 64)
+        arrivals = [b"b" * 64, b"c" * 10]
+
+        def next_packet(_seconds):
+            if arrivals:
+                port.buffer.extend(arrivals.pop(0))
+
+        monkeypatch.setattr(serial_handler.time, "sleep", next_packet)
+        thread = _SerialReadThread(port, coalesce_window=1.0)
+
+        assert thread._read_batch() == b"a" * 64 + b"b" * 64 + b"c" * 10
+        assert port.reads == [64, 64, 10]
+
+    def test_byte_cap_limits_batch(self):
+        from core.serial_handler import _SerialReadThread
+
+        port = _BufferedPort(b"x" * 1000)
+        thread = _SerialReadThread(port, coalesce_window=1.0, coalesce_bytes=256)
+
+        assert len(thread._read_batch()) == 256
+        assert len(thread._read_batch()) == 256
+        assert port.in_waiting == 488
+
+    def test_expired_window_stops_coalescing(self):
+        from core.serial_handler import _SerialReadThread
+
+        class _StreamingPort(_BufferedPort):
+            def read(self, size):
+                data = super().read(size)
+                self.buffer.extend(b"y" * 100)
+                return data
+
+        port = _StreamingPort(b"x" * 100)
+        thread = _SerialReadThread(port, coalesce_window=0.0)
+
+        assert thread._read_batch() == b"x" * 100
+        assert port.reads == [100]
+
+    def test_run_emits_once_per_batch(self, qtbot):
+        from core.serial_handler import _SerialReadThread
+
+        class _OncePort(_BufferedPort):
+            def read(self, size):
+                if not self.buffer:
+                    raise serial.SerialException("done")
+                return super().read(size)
+
+        thread = _SerialReadThread(_OncePort(b"z" * 5000))
+        received: list[bytes] = []
+        thread.session_data_received.connect(
+            lambda _reader, data: received.append(data)
+        )
+
+        with qtbot.waitSignal(thread.session_error_occurred, timeout=1000):
+            thread.run()
+
+        assert received == [b"z" * 5000]
+
+    def test_handler_passes_coalesce_settings(self):
+        handler = _tracked_handler()
+        handler.serial_port = Mock()
+        handler.serial_port.read.return_value = b""
+        handler.read_coalesce_window = 0.02
+        handler.read_coalesce_bytes = 1024
+
+        handler._start_reader()
+        try:
+            reader = handler._reader_thread
+            assert reader.coalesce_window == 0.02
+            assert reader.coalesce_bytes == 1024
+        finally:
+            assert handler._stop_reader()
+
+
 class TestSerialWriteWorker:
     def _connected_handler(self, write_impl):
         handler = SerialHandler()
@@ -596,12 +737,54 @@ class TestSerialWriteWorker:
     def test_fast_write_reports_completed(self, qtbot):
         handler, port = self._connected_handler(lambda data: len(data))
         try:
-            assert handler.write_data(b"ok") is True
+            with qtbot.waitSignal(handler.write_completed, timeout=2000) as blocker:
+                assert handler.write_data(b"ok") is True
+            ticket, written, elapsed = blocker.args
+            assert ticket == handler.last_write_ticket
+            assert written == 2
+            assert 0 <= elapsed < 2
             assert handler.has_pending_writes() is False
             port.write.assert_called_once_with(b"ok")
         finally:
             handler.close()
 
+    def test_write_returns_without_waiting_for_completion(self, qtbot):
+        def slow_write(data):
+            time.sleep(0.2)
+            return len(data)
+
+        handler, _port = self._connected_handler(slow_write)
+        completed = []
+        handler.write_completed.connect(
+            lambda ticket, written, _elapsed: completed.append((ticket, written))
+        )
+        try:
+            started = time.monotonic()
+            handler.write_data(b"one")
+            first = handler.last_write_ticket
+            handler.write_data(b"three")
+            second = handler.last_write_ticket
+            assert time.monotonic() - started < 0.1
+            assert completed == []
+
+            qtbot.waitUntil(lambda: len(completed) == 2, timeout=2000)
+            assert completed == [(first, 3), (second, 5)]
+            assert second == first + 1
+        finally:
+            handler.close()
+
+    def test_failed_write_completes_with_zero_bytes(self, qtbot):
+        def failing_write(data):
+            raise serial.SerialException("gone")
+
+        handler, _port = self._connected_handler(failing_write)
+        try:
+            with qtbot.waitSignal(handler.write_completed, timeout=2000) as blocker:
+                handler.write_data(b"x")
+            assert blocker.args[1] == 0
+        finally:
+            handler.close()
+
     def test_write_error_is_reported_asynchronously(self, qtbot):
         def failing_write(data):
             raise serial.SerialException("write failed")
@@ -630,7 +813,253 @@ class TestSerialWriteWorker:
 
         handler.close()
 
-        assert sent == [b"first", b"last"]
+        # 两个载荷可能被合并成一次写入，顺序和内容不变
+        assert b"".join(sent) == b"firstlast"
+
+
+class TestSerialWriteCoalescing:
+    def _writer(self, write_impl, **kwargs):
+        from core.serial_handler import _SerialWriteThread
+
+        port = Mock()
+        port.write.side_effect = write_impl
+        return _SerialWriteThread(port, **kwargs), port
+
+    def _run(self, writer):
+        writer.stop(drain=True)
+        writer.run()
+
+    def test_queued_payloads_merge_into_one_write(self):
+        writer, port = self._writer(lambda data: len(data))
+        completed = []
+        writer.session_write_completed.connect(
+            lambda _w, ticket, written, _elapsed: completed.append((ticket, written))
+        )
+        for ticket, payload in enumerate((b"a", b"bb", b"ccc"), start=1):
+            writer.enqueue(payload, ticket)
+
+        self._run(writer)
+
+        port.write.assert_called_once_with(b"abbccc")
+        assert completed == [(1, 1), (2, 2), (3, 3)]
+        stats = writer.stats
+        assert (stats.writes, stats.payloads, stats.bytes) == (1, 3, 6)
+        assert stats.max_merged == 3
+        assert stats.merged_per_write == 3.0
+        assert writer.pending_bytes() == 0
+
+    def test_byte_cap_splits_batches_without_reordering(self):
+        writer, port = self._writer(lambda data: len(data), max_coalesce_bytes=4)
+        for payload in (b"12", b"34", b"56", b"789"):
+            writer.enqueue(payload)
+
+        self._run(writer)
+
+        assert [c.args[0] for c in port.write.call_args_list] == [
+            b"1234",
+            b"56",
+            b"789",
+        ]
+        assert writer.stats.writes == 3
+
+    def test_partial_write_is_reported_per_payload(self):
+        writer, _port = self._writer(lambda data: 3)
+        errors = []
+        completed = []
+        writer.session_error_occurred.connect(lambda _w, msg: errors.append(msg))
+        writer.session_write_completed.connect(
+            lambda _w, ticket, written, _elapsed: completed.append((ticket, written))
+        )
+        writer.enqueue(b"ab", 1)
+        writer.enqueue(b"cd", 2)
+        writer.enqueue(b"ef", 3)
+
+        self._run(writer)
+
+        assert completed == [(1, 2), (2, 1), (3, 0)]
+        assert errors == [
+            "Serial write accepted 1 of 2 bytes",
+            "Serial write accepted 0 of 2 bytes",
+        ]
+
+    def test_exception_fails_every_merged_payload(self):
+        def failing_write(data):
+            raise serial.SerialException("gone")
+
+        writer, _port = self._writer(failing_write)
+        errors = []
+        completed = []
+        writer.session_error_occurred.connect(lambda _w, msg: errors.append(msg))
+        writer.session_write_completed.connect(
+            lambda _w, ticket, written, _elapsed: completed.append((ticket, written))
+        )
+        writer.enqueue(b"ab", 1)
+        writer.enqueue(b"cd", 2)
+
+        self._run(writer)
+
+        assert errors == ["gone"]
+        assert completed == [(1, 0), (2, 0)]
+
+    def test_discarding_stop_skips_queued_payloads(self):
+        writer, port = self._writer(lambda data: len(data))
+        writer.enqueue(b"dropped")
+
+        writer.stop(drain=False)
+        writer.run()
+
+        port.write.assert_not_called()
+
+    def test_handler_exposes_write_stats(self, qtbot):
+        handler = SerialHandler()
+        assert handler.write_stats().writes == 0
+
+        port = Mock()
+        port.is_open = True
+        port.write.side_effect = lambda data: len(data)
+        handler.serial_port = port
+        handler._state = TransportState.CONNECTED
+        handler.write_coalesce_bytes = 128
+        with qtbot.waitSignal(handler.write_completed, timeout=2000):
+            handler.write_data(b"x")
+
+        assert handler._writer_thread.max_coalesce_bytes == 128
+        assert handler.write_stats().payloads == 1
+        handler.close()
+
+
+class TestSerialWriteBackpressure:
+    def _writer(self, **kwargs):
+        from core.serial_handler import _SerialWriteThread
+
+        port = Mock()
+        port.write.side_effect = lambda data: len(data)
+        return _SerialWriteThread(port, **kwargs), port
+
+    def test_full_queue_rejects_payload(self):
+        writer, _port = self._writer(max_queue_bytes=8)
+
+        assert writer.enqueue(b"12345")
+        assert not writer.enqueue(b"6789")
+        assert writer.enqueue(b"678")
+        assert writer.pending_bytes() == 8
+
+    def test_empty_queue_accepts_oversized_payload(self):
+        writer, _port = self._writer(max_queue_bytes=4)
+
+        assert writer.enqueue(b"123456")
+
+    def test_water_marks_toggle_backpressure(self):
+        writer, _port = self._writer(
+            max_coalesce_bytes=4, high_water=8, low_water=4
+        )
+        changes = []
+        writer.session_backpressure_changed.connect(
+            lambda _w, throttled: changes.append(throttled)
+        )
+        writer.enqueue(b"1234")
+        assert changes == []
+        writer.enqueue(b"5678")
+        writer.enqueue(b"9abc")
+        assert changes == [True]
+        assert writer.throttled
+
+        writer.stop(drain=True)
+        writer.run()
+
+        assert changes == [True, False]
+        assert not writer.throttled
+
+    def test_discarding_stop_releases_backpressure(self):
+        writer, _port = self._writer(high_water=4, low_water=0)
+        changes = []
+        writer.session_backpressure_changed.connect(
+            lambda _w, throttled: changes.append(throttled)
+        )
+        writer.enqueue(b"12345")
+
+        writer.stop(drain=False)
+
+        assert changes == [True, False]
+
+    def test_pacing_spreads_writes_over_time(self):
+        writer, port = self._writer()
+        writer.pace_bytes_per_second = 200.0
+        writer.enqueue(b"x" * 30)
+
+        started = time.monotonic()
+        writer.stop(drain=True)
+        writer.run()
+        elapsed = time.monotonic() - started
+
+        # 每片 10 字节（0.05 秒的量），第一片立即写出，其余两片各等 0.05 秒
+        assert [len(c.args[0]) for c in port.write.call_args_list] == [10, 10, 10]
+        assert elapsed >= 0.09
+
+    def test_line_rate_follows_frame_format(self):
+        from core.serial_handler import _line_bytes_per_second
+
+        port = Mock()
+        port.baudrate = 115200
+        port.bytesize = serial.EIGHTBITS
+        port.stopbits = serial.STOPBITS_ONE
+        port.parity = serial.PARITY_NONE
+        assert _line_bytes_per_second(port) == 11520.0
+
+        port.parity = serial.PARITY_EVEN
+        port.stopbits = serial.STOPBITS_TWO
+        assert _line_bytes_per_second(port) == 115200 / 12
+
+    def test_handler_rejects_write_when_queue_full(self, qtbot):
+        handler = SerialHandler()
+        port = Mock()
+        port.is_open = True
+        release = threading.Event()
+        port.write.side_effect = lambda data: release.wait(2) and len(data)
+        handler.serial_port = port
+        handler._state = TransportState.CONNECTED
+        handler.write_queue_bytes = 4
+        handler.write_high_water = 2
+        handler.write_low_water = 0
+        errors = []
+        handler.transport_error.connect(lambda error: errors.append(error.message))
+
+        with qtbot.waitSignal(handler.write_backpressure_changed) as blocker:
+            assert handler.write_data(b"abc")
+        assert blocker.args == [True]
+        assert handler.is_write_throttled()
+        assert not handler.write_data(b"de")
+        assert handler.last_write_ticket is None
+        assert "Serial write queue is full" in errors
+
+        release.set()
+        handler.close()
+        assert not handler.is_write_throttled()
+
+    def test_handler_applies_pacing_to_running_writer(self, qtbot):
+        from core.serial_handler import WritePacing
+
+        handler = SerialHandler()
+        port = Mock()
+        port.is_open = True
+        port.write.side_effect = lambda data: len(data)
+        port.baudrate = 9600
+        port.bytesize = serial.EIGHTBITS
+        port.stopbits = serial.STOPBITS_ONE
+        port.parity = serial.PARITY_NONE
+        handler.serial_port = port
+        handler._state = TransportState.CONNECTED
+        with qtbot.waitSignal(handler.write_completed, timeout=2000):
+            handler.write_data(b"x")
+
+        handler.set_write_pacing("baud")
+        assert handler.write_pacing is WritePacing.BAUD
+        assert handler._writer_thread.pace_bytes_per_second == 960.0
+        handler.set_write_pacing(WritePacing.CUSTOM, 500)
+        assert handler._writer_thread.pace_bytes_per_second == 500.0
+        handler.set_write_pacing("bogus")
+        assert handler._writer_thread.pace_bytes_per_second == 0.0
+        handler.close()
 
 
 class TestSerialHandlerClosePath:
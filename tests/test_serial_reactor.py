@@ -0,0 +1,188 @@
+"""
+测试 core/serial_reactor.py - 共享反应器线程的串口读写（基于伪终端）
+"""
+
+import os
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.serial_handler import SerialHandler, SerialIoBackend
+from core.serial_reactor import SerialReactor, reactor_supported
+from core.transport import DisconnectReason, TransportState
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "openpty"), reason="需要伪终端（POSIX）"
+)
+
+# 保活：避免 handler 被 GC 后 C++ 地址复用
+_KEEPALIVE: list = []
+
+
+def _open_pty_handler(**kwargs) -> tuple[SerialHandler, int]:
+    master, slave = os.openpty()
+    path = os.ttyname(slave)
+    os.close(slave)
+    handler = SerialHandler(io_backend=SerialIoBackend.REACTOR)
+    for name, value in kwargs.items():
+        setattr(handler, name, value)
+    _KEEPALIVE.append(handler)
+    assert handler.open(path)
+    return handler, master
+
+
+def _read_master(master: int, size: int, timeout: float = 2.0) -> bytes:
+    os.set_blocking(master, False)
+    data = b""
+    deadline = time.monotonic() + timeout
+    while len(data) < size and time.monotonic() < deadline:
+        try:
+            data += os.read(master, size - len(data))
+        except BlockingIOError:
+            time.sleep(0.005)
+    return data
+
+
+def _reactor_threads() -> int:
+    return sum(1 for t in threading.enumerate() if t.name == "SerialReactor")
+
+
+class TestSerialReactor:
+    def test_round_trip_through_reactor(self, qtbot):
+        handler, master = _open_pty_handler()
+        try:
+            assert handler.is_open()
+            assert handler._reactor is SerialReactor.shared()
+
+            received = []
+            handler.data_received.connect(received.append)
+            os.write(master, b"hello")
+            qtbot.waitUntil(lambda: b"".join(received) == b"hello", timeout=2000)
+
+            with qtbot.waitSignal(handler.write_completed, timeout=2000) as blocker:
+                assert handler.write_data(b"ping")
+            assert blocker.args[0] == handler.last_write_ticket
+            assert blocker.args[1] == 4
+            assert _read_master(master, 4) == b"ping"
+            assert handler.write_stats().bytes == 4
+        finally:
+            handler.close()
+            os.close(master)
+
+    def test_many_ports_share_one_thread(self, qtbot):
+        opened = [_open_pty_handler() for _ in range(6)]
+        try:
+            assert _reactor_threads() == 1
+            assert all(h._reader_thread.__class__.__name__ == "_ReactorReader"
+                       for h, _ in opened)
+            received = {id(h): [] for h, _ in opened}
+            for handler, _master in opened:
+                handler.data_received.connect(received[id(handler)].append)
+            for index, (_handler, master) in enumerate(opened):
+                os.write(master, b"port%d" % index)
+
+            def all_arrived():
+                return all(
+                    b"".join(received[id(h)]) == b"port%d" % i
+                    for i, (h, _) in enumerate(opened)
+                )
+
+            qtbot.waitUntil(all_arrived, timeout=2000)
+        finally:
+            for handler, master in opened:
+                handler.close()
+                os.close(master)
+        assert _reactor_threads() == 1
+
+    def test_idle_ports_do_not_wake_reactor(self, qtbot):
+        opened = [_open_pty_handler() for _ in range(4)]
+        reactor = SerialReactor.shared()
+        try:
+            time.sleep(0.05)
+            before = reactor.wakeups
+            time.sleep(0.3)
+            assert reactor.wakeups == before
+        finally:
+            for handler, master in opened:
+                handler.close()
+                os.close(master)
+
+    def test_close_detaches_port(self, qtbot):
+        reactor = SerialReactor.shared()
+        count = reactor.port_count()
+        handler, master = _open_pty_handler()
+        # 登记在反应器线程里异步完成
+        qtbot.waitUntil(lambda: reactor.port_count() == count + 1, timeout=1000)
+        handler.close()
+        os.close(master)
+
+        assert handler._reader_thread is None
+        assert handler._reactor is None
+        qtbot.waitUntil(lambda: reactor.port_count() == count, timeout=1000)
+
+    def test_hangup_reports_read_error_and_closes(self, qtbot):
+        handler, master = _open_pty_handler()
+        transitions = []
+        handler.state_changed.connect(transitions.append)
+
+        with patch.object(
+            SerialHandler, "get_available_ports", return_value=[handler.current_port]
+        ), qtbot.waitSignal(handler.transport_error, timeout=2000) as blocker:
+            os.close(master)
+
+        assert blocker.args[0].reason is DisconnectReason.IO_ERROR
+        qtbot.waitUntil(
+            lambda: handler.state is TransportState.DISCONNECTED, timeout=1000
+        )
+
+    def test_full_driver_buffer_applies_backpressure(self, qtbot):
+        handler, master = _open_pty_handler(
+            write_high_water=64 * 1024, write_low_water=1024
+        )
+        changes = []
+        handler.write_backpressure_changed.connect(changes.append)
+        try:
+            # 伪终端缓冲区只有几 KiB，对端不读时写不完
+            for _ in range(8):
+                assert handler.write_data(b"x" * 16 * 1024)
+            assert changes == [True]
+            assert handler.has_pending_writes()
+
+            drained = bytearray()
+
+            def drain():
+                try:
+                    drained.extend(os.read(master, 65536))
+                except BlockingIOError:
+                    pass
+                return not handler.is_write_throttled()
+
+            os.set_blocking(master, False)
+            qtbot.waitUntil(drain, timeout=5000)
+            assert changes == [True, False]
+        finally:
+            handler.close(reason=DisconnectReason.SHUTDOWN)
+            os.close(master)
+
+    def test_port_without_descriptor_falls_back_to_threads(self, qtbot):
+        assert reactor_supported(Mock()) is False
+
+        handler = SerialHandler(io_backend="reactor")
+        _KEEPALIVE.append(handler)
+        port = Mock(is_open=True)
+        port.read.return_value = b""
+        port.in_waiting = 0
+        handler.serial_port = port
+        handler._start_reader()
+        try:
+            assert handler._reactor is None
+            assert handler._reader_thread.__class__.__name__ == "_SerialReadThread"
+        finally:
+            handler._stop_reader()
+
+    def test_unknown_backend_falls_back_to_threads(self):
+        handler = SerialHandler(io_backend="epoll")
+        _KEEPALIVE.append(handler)
+        assert handler.io_backend is SerialIoBackend.THREADS
@@ -0,0 +1,137 @@
+"""
+测试 utils/session_capture.py
+"""
+
+import os
+import time
+
+from utils.session_capture import (
+    CaptureDirection,
+    CaptureFileSink,
+    CaptureHeader,
+    SessionCapture,
+    index_path_for,
+    iter_records,
+    load_index,
+    read_block,
+    read_header,
+    scan_blocks,
+)
+
+_BASE_NS = 1_000_000_000
+
+
+def _sink(tmp_path, block_bytes=64):
+    sink = CaptureFileSink(
+        tmp_path / "s.smcap", CaptureHeader(1700000000.0, _BASE_NS), block_bytes
+    )
+    sink.open()
+    return sink
+
+
+class TestCaptureFileSink:
+    def test_records_round_trip_with_direction_and_time(self, tmp_path):
+        sink = _sink(tmp_path, block_bytes=1024)
+        sink.write(
+            [
+                (CaptureDirection.TX, _BASE_NS + 1_000, b"AT\r\n"),
+                (CaptureDirection.RX, _BASE_NS + 2_500_000, b"OK\r\n"),
+            ]
+        )
+        sink.close()
+
+        header = read_header(sink.path)
+        assert header == CaptureHeader(1700000000.0, _BASE_NS)
+        records = list(iter_records(sink.path))
+        assert [(r.direction, r.data) for r in records] == [
+            (CaptureDirection.TX, b"AT\r\n"),
+            (CaptureDirection.RX, b"OK\r\n"),
+        ]
+        assert records[0].timestamp == 0.000001
+        assert records[1].timestamp == 0.0025
+
+    def test_blocks_are_indexed_and_seekable_by_time(self, tmp_path):
+        sink = _sink(tmp_path, block_bytes=64)
+        for i in range(10):
+            sink.write([(CaptureDirection.RX, _BASE_NS + i * 1_000_000_000, b"x" * 80)])
+        sink.close()
+
+        blocks = load_index(sink.path)
+        assert len(blocks) == 10
+        assert [b.first_record for b in blocks] == list(range(10))
+        assert read_block(blocks[3])[0].timestamp == 3.0
+        assert [r.timestamp for r in iter_records(sink.path, 4.0, 6.0)] == [
+            4.0,
+            5.0,
+            6.0,
+        ]
+
+    def test_missing_index_is_rebuilt_from_block_headers(self, tmp_path):
+        sink = _sink(tmp_path, block_bytes=64)
+        for i in range(4):
+            sink.write([(CaptureDirection.RX, _BASE_NS + i * 1000, b"y" * 80)])
+        sink.close()
+        expected = load_index(sink.path)
+        os.remove(index_path_for(sink.path))
+
+        assert scan_blocks(sink.path) == expected
+        assert load_index(sink.path) == expected
+
+    def test_truncated_tail_block_is_ignored(self, tmp_path):
+        sink = _sink(tmp_path, block_bytes=64)
+        for i in range(3):
+            sink.write([(CaptureDirection.TX, _BASE_NS + i, b"z" * 80)])
+        sink.close()
+        size = sink.path.stat().st_size
+        with open(sink.path, "r+b") as f:
+            f.truncate(size - 5)
+
+        assert len(scan_blocks(sink.path)) == 2
+
+
+class TestSessionCapture:
+    def test_background_writer_records_both_directions(self, tmp_path):
+        capture = SessionCapture(tmp_path / "c.smcap", flush_interval=0.05)
+        assert capture.open()
+        assert capture.sent(b"ping")
+        assert capture.received(b"pong")
+        assert capture.flush(timeout=2.0)
+
+        records = list(iter_records(capture.path))
+        assert [(r.direction, r.data) for r in records] == [
+            (CaptureDirection.TX, b"ping"),
+            (CaptureDirection.RX, b"pong"),
+        ]
+        assert records[0].timestamp <= records[1].timestamp
+        assert capture.close(timeout=2.0)
+
+    def test_idle_partial_block_is_written_when_due(self, tmp_path):
+        capture = SessionCapture(tmp_path / "c.smcap", flush_interval=0.05)
+        capture.sink.BLOCK_MAX_AGE = 0.3
+        assert capture.open()
+        assert capture.received(b"quiet")
+
+        deadline = time.monotonic() + 5
+        while not load_index(capture.path) and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert [b.records for b in load_index(capture.path)] == [1]
+        assert capture.close(timeout=2.0)
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        capture = SessionCapture(tmp_path / "c.smcap", max_pending_bytes=8)
+        # 未启动写入线程时只入队，便于观察上限
+        capture.sink.open()
+        capture._thread = object()  # type: ignore[assignment]
+        assert capture.received(b"12345678")
+        assert capture.received(b"9") is False
+        assert capture.dropped_bytes == 1
+
+    def test_existing_file_is_not_overwritten(self, tmp_path):
+        path = tmp_path / "c.smcap"
+        path.write_bytes(b"keep")
+        capture = SessionCapture(path)
+
+        assert capture.open() is False
+        assert path.read_bytes() == b"keep"
+        assert capture.received(b"x") is False
@@ -0,0 +1,87 @@
+"""
+测试 ui/session_view.py
+"""
+
+from unittest.mock import patch
+
+from core.ansi_parser import shared_format_cache
+from core.transport import TransportState, TransportTransition
+from ui.main_window import TerminalTrimManager
+from ui.session_view import SessionView
+
+
+def _view(qtbot, tmp_path, session_id="tcp:10.0.0.1:9000"):
+    with patch.object(TerminalTrimManager, "_get_log_dir", return_value=tmp_path):
+        manager = TerminalTrimManager(label=session_id)
+    view = SessionView(session_id, manager)
+    view.show_timestamp = False
+    qtbot.addWidget(view)
+    return view
+
+
+class TestSessionView:
+    def test_push_is_merged_and_decoded_per_frame(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path)
+
+        view.push(b"hel")
+        view.push(b"lo\r")
+        assert view.display.toPlainText() == ""
+        view.push(b"\n\xe4\xb8")
+        view.push(b"\xad")
+        view.receive_pipeline.flush()
+
+        assert view.display.toPlainText() == "hello\n中"
+        assert view.receive_pipeline.last_stats.chunks == 4
+
+    def test_parser_uses_shared_format_cache(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path)
+
+        assert view.ansi_parser.format_cache is shared_format_cache
+
+    def test_hex_mode_flushes_text_received_before_toggle(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path)
+
+        view.push(b"ab\n")
+        view.hex_checkbox.setChecked(True)
+        view.push(b"\x01\x02")
+        view.receive_pipeline.flush()
+
+        assert view.display.toPlainText().splitlines() == ["ab", "01 02"]
+
+    def test_messages_start_on_a_new_line(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path)
+
+        view.push(b"partial")
+        view.set_state(
+            TransportTransition(
+                TransportState.CONNECTED, TransportState.DISCONNECTED, "x"
+            )
+        )
+
+        assert view.display.toPlainText().splitlines()[0] == "partial"
+        assert view.state is TransportState.DISCONNECTED
+        assert view.reconnect_button.isEnabled()
+
+    def test_trimmed_lines_go_to_session_log(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path, "tcp:10.0.0.2:23")
+        view.trim_manager.max_lines = 10
+        view.trim_manager.batch_lines = 5
+
+        view.push(b"".join(b"line %d\n" % i for i in range(20)))
+        view.receive_pipeline.flush()
+
+        assert view.shutdown(timeout=2.0)
+        logs = list(tmp_path.glob("trimmed_*_tcp_10_0_0_2_23.log"))
+        assert len(logs) == 1
+        assert logs[0].read_text(encoding="utf-8").startswith("line 0\n")
+
+    def test_buttons_request_close_and_reconnect(self, qtbot, tmp_path):
+        view = _view(qtbot, tmp_path)
+
+        with qtbot.waitSignal(view.reconnect_requested) as reconnect:
+            view.reconnect_button.click()
+        with qtbot.waitSignal(view.close_requested) as close:
+            view.close_button.click()
+
+        assert reconnect.args == [view.session_id]
+        assert close.args == [view.session_id]
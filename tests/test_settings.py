@@ -104,6 +104,7 @@ def test_out_of_range_integers_fall_back():
             "checksum_start": 10**400,
             "max_terminal_lines": 10**400,
             "trim_batch_lines": 10**400,
+            "terminal_scrollback_lines": 10**6,
         }
     )
 
@@ -111,6 +112,7 @@ def test_out_of_range_integers_fall_back():
     assert settings.checksum_start == 1
     assert settings.max_terminal_lines == 5000
     assert settings.trim_batch_lines == 800
+    assert settings.terminal_scrollback_lines == 10_000
 
 
 def test_future_schema_version_keeps_connections():
@@ -149,3 +151,42 @@ def test_invalid_terminal_mode_falls_back_to_false():
     for bad in ("yes", 1, 0, None, []):
         settings = AppSettings.from_dict({"terminal_mode": bad})
         assert settings.terminal_mode is False
+
+
+def test_write_pacing_round_trip_and_validation():
+    settings = AppSettings.from_dict(
+        {"schema_version": 2, "write_pacing": "custom", "write_pacing_bps": 4800}
+    )
+    assert settings.write_pacing == "custom"
+    assert settings.write_pacing_bps == 4800
+    assert AppSettings.from_dict(settings.to_dict()) == settings
+
+    invalid = AppSettings.from_dict(
+        {"schema_version": 2, "write_pacing": "fast", "write_pacing_bps": -1}
+    )
+    assert invalid.write_pacing == "off"
+    assert invalid.write_pacing_bps == 0
+
+
+def test_serial_io_backend_round_trip_and_validation():
+    settings = AppSettings.from_dict(
+        {"schema_version": 2, "serial_io_backend": "reactor"}
+    )
+    assert settings.serial_io_backend == "reactor"
+    assert AppSettings.from_dict(settings.to_dict()) == settings
+
+    invalid = AppSettings.from_dict({"schema_version": 2, "serial_io_backend": 1})
+    assert invalid.serial_io_backend == "threads"
+
+
+def test_socket_write_policy_round_trip_and_validation():
+    settings = AppSettings.from_dict(
+        {"schema_version": 2, "socket_write_policy": "batched"}
+    )
+    assert settings.socket_write_policy == "batched"
+    assert AppSettings.from_dict(settings.to_dict()) == settings
+
+    invalid = AppSettings.from_dict(
+        {"schema_version": 2, "socket_write_policy": "nagle"}
+    )
+    assert invalid.socket_write_policy == "interactive"
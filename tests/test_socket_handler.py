@@ -278,3 +278,170 @@ def test_socket_handler_close_flushes_pending_write(qtbot):
     finally:
         handler.close()
         listener.close()
+
+
+def test_socket_handler_bounds_receive_chunks(qtbot):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    port = listener.getsockname()[1]
+    payload = bytes(range(256)) * 1024
+
+    def serve():
+        connection, _address = listener.accept()
+        with connection:
+            connection.sendall(payload)
+            time.sleep(1)
+
+    server_thread = threading.Thread(target=serve, daemon=True)
+    server_thread.start()
+    handler = SocketHandler()
+    handler.receive_buffer_bytes = 4096
+    chunks = []
+    handler.data_received.connect(chunks.append)
+
+    try:
+        with qtbot.waitSignal(handler.connection_changed, timeout=2000):
+            assert handler.open("127.0.0.1", port) is True
+        assert handler._socket.readBufferSize() == 4096
+
+        qtbot.waitUntil(
+            lambda: sum(len(chunk) for chunk in chunks) >= len(payload),
+            timeout=3000,
+        )
+        assert b"".join(chunks) == payload
+        assert max(len(chunk) for chunk in chunks) <= 4096
+    finally:
+        handler.close()
+        server_thread.join(timeout=2)
+        listener.close()
+
+
+class _CollectingServer:
+    """本地 TCP 服务端：记录每次 recv 得到的数据。"""
+
+    def __init__(self):
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(1)
+        self.port = self.listener.getsockname()[1]
+        self.received = bytearray()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        connection, _address = self.listener.accept()
+        connection.settimeout(0.05)
+        with connection:
+            while not self.stop.is_set():
+                try:
+                    data = connection.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                self.received.extend(data)
+
+    def close(self):
+        self.stop.set()
+        self.thread.join(timeout=2)
+        self.listener.close()
+
+
+class TestSocketWritePolicy:
+    def _connect(self, qtbot, server, policy):
+        handler = SocketHandler()
+        handler.set_write_policy(policy)
+        with qtbot.waitSignal(handler.connection_changed, timeout=2000):
+            assert handler.open("127.0.0.1", server.port) is True
+        return handler
+
+    def test_interactive_flushes_every_write(self, qtbot):
+        server = _CollectingServer()
+        handler = self._connect(qtbot, server, "interactive")
+        try:
+            for payload in (b"a", b"b", b"c"):
+                assert handler.write_data(payload) is True
+
+            assert handler.write_stats().flushes == 3
+            qtbot.waitUntil(lambda: bytes(server.received) == b"abc", timeout=2000)
+        finally:
+            handler.close()
+            server.close()
+
+    def test_batched_flushes_once_per_window(self, qtbot):
+        from core.socket_handler import SocketWritePolicy
+
+        server = _CollectingServer()
+        handler = self._connect(qtbot, server, SocketWritePolicy.BATCHED)
+        try:
+            assert (
+                handler._socket.socketOption(
+                    QAbstractSocket.SocketOption.LowDelayOption
+                )
+                == 1
+            )
+            for payload in (b"a", b"b", b"c"):
+                assert handler.write_data(payload) is True
+            assert handler.write_stats().flushes == 0
+
+            qtbot.waitUntil(lambda: bytes(server.received) == b"abc", timeout=2000)
+            stats = handler.write_stats()
+            assert stats.writes == 3
+            assert stats.flushes == 1
+            assert stats.sends == 1
+            assert stats.bytes_per_send == 3.0
+        finally:
+            handler.close()
+            server.close()
+
+    def test_close_sends_pending_batch(self, qtbot):
+        server = _CollectingServer()
+        handler = self._connect(qtbot, server, "batched")
+        try:
+            assert handler.write_data(b"last words") is True
+            assert handler.has_pending_writes() is True
+
+            handler.close()
+
+            qtbot.waitUntil(
+                lambda: bytes(server.received) == b"last words", timeout=2000
+            )
+        finally:
+            handler.close()
+            server.close()
+
+    def test_throughput_enables_nagle(self, qtbot):
+        server = _CollectingServer()
+        handler = self._connect(qtbot, server, "throughput")
+        try:
+            assert (
+                handler._socket.socketOption(
+                    QAbstractSocket.SocketOption.LowDelayOption
+                )
+                == 0
+            )
+            assert handler.write_data(b"bulk") is True
+            assert handler.write_stats().flushes == 0
+            qtbot.waitUntil(lambda: bytes(server.received) == b"bulk", timeout=2000)
+
+            handler.set_write_policy("interactive")
+            assert (
+                handler._socket.socketOption(
+                    QAbstractSocket.SocketOption.LowDelayOption
+                )
+                == 1
+            )
+        finally:
+            handler.close()
+            server.close()
+
+    def test_unknown_policy_falls_back_to_interactive(self):
+        from core.socket_handler import SocketWritePolicy
+
+        handler = SocketHandler()
+        handler.set_write_policy("batched")
+        handler.set_write_policy("bogus")
+
+        assert handler.write_policy is SocketWritePolicy.INTERACTIVE
@@ -0,0 +1,211 @@
+"""
+测试 core/standin_server.py - 本地透明 TCP / RFC2217 服务器替身
+"""
+
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from core.loopback import TrafficConfig, TrafficGenerator, loopback_supported
+from core.rfc2217_handler import Rfc2217Handler
+from core.socket_handler import SocketHandler
+from core.standin_server import ByteSource, LinkShaping, StandinServer
+from core.transport import TransportState
+
+# 保活：避免 handler 被 GC 后 C++ 地址复用
+_KEEPALIVE: list = []
+
+
+@pytest.fixture
+def servers():
+    started: list[StandinServer] = []
+
+    def start(*args, **kwargs) -> StandinServer:
+        server = StandinServer(*args, **kwargs)
+        server.start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        assert server.stop()
+
+
+def _recv_exactly(sock: socket.socket, size: int, timeout: float = 3.0) -> bytes:
+    sock.settimeout(timeout)
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _recv_until_closed(sock: socket.socket, timeout: float = 3.0) -> bytes:
+    sock.settimeout(timeout)
+    data = b""
+    while chunk := sock.recv(65536):
+        data += chunk
+    return data
+
+
+class TestRawServer:
+    def test_echo_with_injected_latency(self, servers):
+        server = servers(shaping=LinkShaping(latency=0.05))
+        with socket.create_connection(server.address) as client:
+            started = time.monotonic()
+            client.sendall(b"ping")
+            assert _recv_exactly(client, 4) == b"ping"
+            assert time.monotonic() - started >= 0.05
+        assert server.stats().bytes_received == 4
+
+    def test_generator_streams_profile_bytes(self, servers):
+        traffic = TrafficConfig(bytes_per_second=0, total_bytes=32 * 1024, seed=3)
+        server = servers(source=ByteSource.GENERATOR, traffic=traffic)
+        with socket.create_connection(server.address) as client:
+            data = _recv_exactly(client, traffic.total_bytes)
+        assert data == b"".join(chunk for _, chunk in TrafficGenerator(traffic))
+
+    def test_bandwidth_cap(self, servers):
+        traffic = TrafficConfig(bytes_per_second=0, total_bytes=20000)
+        server = servers(
+            source=ByteSource.GENERATOR,
+            traffic=traffic,
+            shaping=LinkShaping(bandwidth=100_000),
+        )
+        started = time.monotonic()
+        with socket.create_connection(server.address) as client:
+            assert len(_recv_exactly(client, 20000)) == 20000
+        assert time.monotonic() - started >= 0.15
+
+    def test_disconnect_after_bytes(self, servers):
+        server = servers(
+            source=ByteSource.GENERATOR,
+            traffic=TrafficConfig(bytes_per_second=0),
+            shaping=LinkShaping(disconnect_after_bytes=1000),
+        )
+        with socket.create_connection(server.address) as client:
+            assert len(_recv_until_closed(client)) == 1000
+
+    def test_disconnect_after_seconds(self, servers):
+        server = servers(shaping=LinkShaping(disconnect_after=0.1))
+        with socket.create_connection(server.address) as client:
+            started = time.monotonic()
+            assert _recv_until_closed(client) == b""
+            assert 0.05 <= time.monotonic() - started < 2.0
+
+    def test_disconnect_all(self, servers):
+        server = servers()
+        with socket.create_connection(server.address) as client:
+            client.sendall(b"x")
+            assert _recv_exactly(client, 1) == b"x"
+            assert server.active_connections() == 1
+            assert server.disconnect_all() == 1
+            assert _recv_until_closed(client) == b""
+        assert server.stats().connections == 1
+
+    def test_socket_handler_round_trip(self, qtbot, servers):
+        server = servers()
+        handler = SocketHandler()
+        _KEEPALIVE.append(handler)
+        received = bytearray()
+        handler.data_received.connect(received.extend)
+
+        with qtbot.waitSignal(handler.connection_changed, timeout=3000):
+            handler.open(*server.address)
+        handler.write_data(b"hello")
+        qtbot.waitUntil(lambda: bytes(received) == b"hello", timeout=3000)
+
+        with qtbot.waitSignal(handler.connection_changed, timeout=3000) as blocker:
+            server.disconnect_all()
+        assert blocker.args[0] is False
+        handler.shutdown()
+
+    def test_runs_as_subprocess(self):
+        root = Path(__file__).resolve().parents[1]
+        process = subprocess.Popen(
+            [sys.executable, "-m", "core.standin_server", "--latency", "0.01"],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            host, port = process.stdout.readline().strip().rsplit(":", 1)
+            with socket.create_connection((host, int(port)), timeout=5) as client:
+                client.sendall(b"sub")
+                assert _recv_exactly(client, 3) == b"sub"
+        finally:
+            process.terminate()
+            assert process.wait(timeout=5) == 0
+            process.stdout.close()
+
+
+class TestRfc2217Server:
+    def test_handler_negotiates_and_echoes_iac(self, qtbot, servers):
+        server = servers("rfc2217")
+        handler = Rfc2217Handler()
+        _KEEPALIVE.append(handler)
+        received = bytearray()
+        handler.data_received.connect(received.extend)
+
+        handler.open(*server.address, baudrate=57600, network_timeout=3.0)
+        qtbot.waitUntil(handler.is_open, timeout=5000)
+        assert [port.baudrate for port in server.virtual_ports()] == [57600]
+
+        payload = b"a\xffb\x00\xff"
+        assert handler.write_data(payload)
+        qtbot.waitUntil(lambda: bytes(received) == payload, timeout=3000)
+
+        server.disconnect_all()
+        qtbot.waitUntil(
+            lambda: handler.state is TransportState.DISCONNECTED, timeout=5000
+        )
+        assert handler.shutdown(timeout_ms=3000)
+
+    def test_generator_through_rfc2217_escapes_payload(self, qtbot, servers):
+        traffic = TrafficConfig(
+            profile="binary", bytes_per_second=0, total_bytes=8192, seed=5
+        )
+        server = servers("rfc2217", ByteSource.GENERATOR, traffic=traffic)
+        handler = Rfc2217Handler()
+        _KEEPALIVE.append(handler)
+        received = bytearray()
+        handler.data_received.connect(received.extend)
+
+        handler.open(*server.address, network_timeout=3.0)
+        qtbot.waitUntil(lambda: len(received) >= 8192, timeout=5000)
+        assert bytes(received) == b"".join(
+            chunk for _, chunk in TrafficGenerator(traffic)
+        )
+        assert handler.shutdown(timeout_ms=3000)
+
+
+@pytest.mark.skipif(not loopback_supported(), reason="需要伪终端（POSIX）")
+class TestPtySource:
+    def test_relays_between_client_and_pty(self, servers):
+        traffic = TrafficConfig(bytes_per_second=0, total_bytes=2048)
+        server = servers(source=ByteSource.PTY, traffic=traffic)
+        with socket.create_connection(server.address) as client:
+            data = _recv_exactly(client, 2048)
+            client.sendall(b"AT\r\n")
+            deadline = time.monotonic() + 3.0
+            while (
+                server.loopback.stats().bytes_received < 4
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+        assert data == b"".join(chunk for _, chunk in TrafficGenerator(traffic))
+        assert server.loopback.take_received() == b"AT\r\n"
+
+    def test_second_client_is_refused(self, servers):
+        server = servers(source=ByteSource.PTY)
+        with socket.create_connection(server.address) as first:
+            first.settimeout(3.0)
+            assert first.recv(1)
+            with socket.create_connection(server.address) as second:
+                assert _recv_until_closed(second) == b""
@@ -8,7 +8,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QKeyEvent, QTextCursor
 from PyQt6.QtWidgets import QTextEdit
 
-from ui.terminal_emulator import TerminalEmulator, _Cell
+from ui.terminal_emulator import TerminalEmulator, _Cell, _StyleTable
 
 
 class TestTerminalEmulatorBasic:
@@ -111,6 +111,38 @@ class TestTerminalEmulatorText:
         term.process_bytes(b"d")
         assert term.grid[1][0].char == "d"
 
+    def test_long_run_wraps_and_scrolls_per_row(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=3)
+        qtbot.addWidget(term)
+
+        term.process_bytes(b"abcdefgh")
+
+        assert ["".join(c.char for c in row) for row in term.grid] == [
+            "def",
+            "gh ",
+        ]
+        assert (term.cursor_row, term.cursor_col) == (1, 2)
+        assert term._wrap_pending is False
+
+    def test_run_matches_char_by_char_feed(self, qtbot):
+        data = b"\x1b[31mred\x1b[0m plain\x7f text\r\n\x1b(0qx\x1b(Bend"
+        whole = TerminalEmulator(rows=3, cols=6)
+        split = TerminalEmulator(rows=3, cols=6)
+        qtbot.addWidget(whole)
+        qtbot.addWidget(split)
+
+        whole.process_bytes(data)
+        for byte in data:
+            split.process_bytes(bytes([byte]))
+
+        assert [[(c.char, c.fmt) for c in row] for row in whole.grid] == [
+            [(c.char, c.fmt) for c in row] for row in split.grid
+        ]
+        assert (whole.cursor_row, whole.cursor_col) == (
+            split.cursor_row,
+            split.cursor_col,
+        )
+
     def test_scroll_up(self, qtbot):
         term = TerminalEmulator(rows=3, cols=10)
         qtbot.addWidget(term)
@@ -1179,3 +1211,293 @@ class TestTerminalResize:
         assert (term.rows, term.cols) == (expected_rows, expected_cols)
         assert term.rows > 2
         assert term.cols > 5
+
+
+class TestSharedCellFormats:
+    def test_cells_with_same_attributes_share_one_format(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=10)
+        qtbot.addWidget(term)
+        term.process_bytes(b"\x1b[33mabc\x1b[0mde")
+
+        assert term.grid[0][0].fmt is term.grid[0][2].fmt
+        assert term.grid[0][3].fmt is term.grid[1][5].fmt
+
+
+class TestIncrementalRender:
+    def _rendered(self, qtbot, rows=4, cols=10):
+        term = TerminalEmulator(rows=rows, cols=cols)
+        qtbot.addWidget(term)
+        term._render_full()
+        return term
+
+    @staticmethod
+    def _snapshot(term):
+        """文档中每个字符的 (文本, 前景, 背景)。"""
+        doc = term.document()
+        cursor = QTextCursor(doc)
+        cells = []
+        for pos in range(doc.characterCount() - 1):
+            cursor.setPosition(pos + 1)
+            fmt = cursor.charFormat()
+            cells.append(
+                (
+                    doc.characterAt(pos),
+                    fmt.foreground().color().rgba(),
+                    fmt.background().color().rgba(),
+                )
+            )
+        return cells
+
+    def test_write_updates_only_touched_row(self, qtbot):
+        term = self._rendered(qtbot)
+        term.process_bytes(b"\x1b[3;1Hab")
+
+        term._do_scheduled_render()
+
+        # 第 3 行写入 + 光标从第 1 行移走
+        assert term._last_render_rows == 2
+        assert term.toPlainText().split("\n")[2] == "ab        "
+
+    def test_blink_redraws_single_row(self, qtbot):
+        term = self._rendered(qtbot)
+
+        term._blink_cursor()
+        term._do_scheduled_render()
+
+        assert term._last_render_rows == 1
+
+    def test_search_highlight_move_redraws_two_rows(self, qtbot):
+        term = self._rendered(qtbot)
+        term._cursor_visible = False
+        term.search_highlight = (1, 0, 2)
+        term._dirty = True
+        term._do_scheduled_render()
+
+        term.search_highlight = (3, 0, 2)
+        term._dirty = True
+        term._do_scheduled_render()
+
+        assert term._last_render_rows == 2
+
+    def test_identical_formats_merge_into_runs(self, qtbot):
+        term = self._rendered(qtbot, rows=1, cols=12)
+        term._cursor_visible = False
+        term.process_bytes(b"ab\x1b[31mcd\x1b[0mef")
+
+        runs = term._row_runs(0, None)
+
+        assert [text for text, _fmt in runs] == ["ab", "cd", "ef      "]
+
+    def test_incremental_matches_full_render(self, qtbot):
+        term = self._rendered(qtbot, rows=3, cols=8)
+        term.process_bytes(b"\x1b[32mone\r\ntwo\x1b[0m\r\nthree\r\nfour\x1b[2;2H\x1b[K")
+        term._do_scheduled_render()
+        incremental = self._snapshot(term)
+
+        term._render_full()
+
+        assert incremental == self._snapshot(term)
+
+    def test_external_clear_triggers_rebuild(self, qtbot):
+        term = self._rendered(qtbot)
+        term.process_bytes(b"hi")
+        term.clear()
+
+        term._do_scheduled_render()
+
+        assert term.document().blockCount() == term.rows
+        assert term.toPlainText().startswith("hi")
+
+
+class TestCompactGrid:
+    def test_rows_store_chars_and_style_ids(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=6)
+        qtbot.addWidget(term)
+
+        term.process_bytes(b"a\x1b[31mbc\x1b[0md")
+
+        row = term.grid[0]
+        assert row.text() == "abcd  "
+        assert list(row.styles[:4]) == [0, 1, 1, 0]
+        assert row[1].fmt is term._styles.formats[1]
+        assert row[1] == _Cell("b", term._styles.formats[1])
+
+    def test_styles_are_interned_once(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=10)
+        qtbot.addWidget(term)
+
+        term.process_bytes(b"\x1b[32mx\x1b[0m\x1b[32my\x1b[0m\r\n\x1b[32mz")
+
+        assert len(term._styles) == 2
+
+    def test_clear_screen_resets_style_table(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=10)
+        qtbot.addWidget(term)
+        term.process_bytes(b"\x1b[31ma\x1b[32mb\x1b[33mc")
+
+        term.clear_screen()
+
+        assert len(term._styles) == 1
+        term.process_bytes(b"\x1b[34mz")
+        assert list(term.grid[0].styles[:1]) == [1]
+
+    def test_reset_keeps_only_styles_left_in_scrollback(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=4)
+        qtbot.addWidget(term)
+        term.process_bytes(b"\x1b[31ma\x1b[0m\r\n\r\n\x1b[32mb\x1b[33mc")
+        red = term._styles.formats[1]
+
+        term.process_bytes(b"\x1bc")
+
+        assert term._styles.formats == [term._styles.formats[0], red]
+        text, styles = term._scrollback[0]
+        assert text.startswith("a") and styles[0] == 1
+
+    def test_style_table_is_compacted_past_cap(self, qtbot, monkeypatch):
+        monkeypatch.setattr(_StyleTable, "MAX_STYLES", 8)
+        term = TerminalEmulator(rows=2, cols=4, scrollback_lines=0)
+        qtbot.addWidget(term)
+
+        for color in range(16, 64):
+            term.process_bytes(b"\x1b[38;5;%dmx\r" % color)
+
+        assert len(term._styles) <= 8
+        current = term._ansi_parser.current_format
+        assert term.grid[0][0].fmt.foreground() == current.foreground()
+
+    def test_erase_and_scroll_reuse_row_storage(self, qtbot):
+        term = TerminalEmulator(rows=2, cols=4)
+        qtbot.addWidget(term)
+        term.process_bytes(b"\x1b[31mabcd")
+        rows_before = list(term.grid)
+
+        term.process_bytes(b"\x1b[2J")
+        assert [row.text() for row in term.grid] == ["    ", "    "]
+        assert set(term.grid[0].styles) == {0}
+
+        term.process_bytes(b"\x1b[2;1H\nxy")
+        assert [id(row) for row in sorted(term.grid, key=id)] == sorted(
+            id(row) for row in rows_before
+        )
+        assert term.grid[1].text() == "xy  "
+
+
+class TestScrollback:
+    def _term(self, qtbot, rows=3, cols=6, scrollback=100):
+        term = TerminalEmulator(rows=rows, cols=cols, scrollback_lines=scrollback)
+        qtbot.addWidget(term)
+        return term
+
+    @staticmethod
+    def _feed_lines(term, count):
+        term.process_bytes("".join(f"L{i}\r\n" for i in range(count)).encode())
+
+    def test_full_screen_scroll_feeds_history(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 5)
+
+        assert term.history_length() == 3
+        assert term._scrollback[0][0] == "L0    "
+        assert term._scrollback[2][0] == "L2    "
+
+    def test_capacity_bounds_memory(self, qtbot):
+        term = self._term(qtbot, scrollback=4)
+        self._feed_lines(term, 50)
+
+        assert term.history_length() == 4
+        assert term._scrollback[0][0].startswith("L44")
+
+    def test_scroll_region_does_not_feed_history(self, qtbot):
+        term = self._term(qtbot, rows=4)
+        term.process_bytes(b"\x1b[2;3r\x1b[3;1H" + b"x\n" * 5)
+
+        assert term.history_length() == 0
+
+    def test_default_rows_store_no_style_array(self, qtbot):
+        term = self._term(qtbot)
+        term.process_bytes(b"plain\r\n\x1b[31mred\x1b[0m\r\n\r\n\r\n")
+
+        assert term._scrollback[0][1] is None
+        assert list(term._scrollback[1][1][:3]) == [1, 1, 1]
+
+    def test_view_shows_history_window(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 5)
+        term._render_full()
+
+        term.scroll_view(2)
+        term._do_scheduled_render()
+
+        assert term.view_offset == 2
+        assert [line.rstrip() for line in term.toPlainText().split("\n")] == [
+            "L1",
+            "L2",
+            "L3",
+        ]
+
+    def test_view_stays_anchored_while_output_arrives(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 5)
+        term.scroll_view(1)
+
+        self._feed_lines(term, 2)
+        term._do_scheduled_render()
+
+        assert term.view_offset == 3
+        assert term.toPlainText().split("\n")[0].rstrip() == "L2"
+
+    def test_offset_is_clamped_and_key_returns_live(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 5)
+        term.scroll_view(100)
+        assert term.view_offset == 3
+
+        with qtbot.waitSignal(term.key_pressed):
+            term.keyPressEvent(
+                QKeyEvent(
+                    QKeyEvent.Type.KeyPress,
+                    Qt.Key.Key_A,
+                    Qt.KeyboardModifier.NoModifier,
+                    "a",
+                )
+            )
+
+        assert term.view_offset == 0
+        term._do_scheduled_render()
+        assert term.toPlainText().split("\n")[0].rstrip() == "L3"
+
+    def test_shift_page_up_scrolls_locally(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 10)
+        sent = []
+        term.key_pressed.connect(sent.append)
+
+        term.keyPressEvent(
+            QKeyEvent(
+                QKeyEvent.Type.KeyPress,
+                Qt.Key.Key_PageUp,
+                Qt.KeyboardModifier.ShiftModifier,
+            )
+        )
+
+        assert sent == []
+        assert term.view_offset == 2
+
+    def test_ed3_clears_history(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 5)
+        term.scroll_view(1)
+
+        term.process_bytes(b"\x1b[3J")
+
+        assert term.history_length() == 0
+        assert term.view_offset == 0
+
+    def test_shrinking_capacity_keeps_newest(self, qtbot):
+        term = self._term(qtbot)
+        self._feed_lines(term, 10)
+
+        term.set_scrollback_lines(2)
+
+        assert term.scrollback_lines == 2
+        assert [term._scrollback[i][0].rstrip() for i in range(2)] == ["L6", "L7"]
@@ -0,0 +1,202 @@
+"""
+测试 utils/trim_archive.py
+"""
+
+import gzip
+import os
+import time
+
+from utils.trim_archive import (
+    ArchiveRetention,
+    TrimArchiveSink,
+    enforce_retention,
+    extract_lines,
+    extract_time_range,
+    list_segments,
+    load_index,
+    read_block,
+)
+from utils.trim_log import TrimLogWriter
+
+
+def _lines(first, count):
+    return "".join(f"line{i}\n" for i in range(first, first + count))
+
+
+class TestTrimArchiveSink:
+    def test_blocks_are_independent_gzip_members(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=50)
+        sink.open()
+        sink.write([(_lines(0, 10), 100.0), (_lines(10, 10), 101.0)])
+        sink.close()
+
+        segment = list_segments(tmp_path, "trimmed_s")[0]
+        blocks = load_index(segment)
+        assert len(blocks) == 2
+        assert [b.first_line for b in blocks] == [0, 10]
+        assert (blocks[1].start, blocks[1].end) == (101.0, 101.0)
+        # 每块可单独解压，整个文件也能整体解压
+        assert read_block(blocks[1]) == _lines(10, 10)
+        assert gzip.decompress(segment.read_bytes()).decode() == _lines(0, 20)
+
+    def test_partial_block_written_on_forced_sync(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s")
+        sink.open()
+        sink.write([(_lines(0, 3), 5.0)])
+        assert load_index(sink.segment_path) == []
+
+        sink.sync(force=True)
+
+        assert [b.lines for b in load_index(sink.segment_path)] == [3]
+        sink.close()
+
+    def test_segments_rotate_at_size_cap(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=1, segment_bytes=1)
+        sink.open()
+        sink.write([(_lines(i, 1), float(i)) for i in range(3)])
+        sink.close()
+
+        segments = list_segments(tmp_path, "trimmed_s")
+        assert [s.name for s in segments][:3] == [
+            "trimmed_s.0000.log.gz",
+            "trimmed_s.0001.log.gz",
+            "trimmed_s.0002.log.gz",
+        ]
+        assert extract_lines(segments, 1, 2) == ["line1", "line2"]
+
+    def test_extract_by_line_and_time_reads_only_needed_blocks(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=1)
+        sink.open()
+        sink.write([(_lines(i * 5, 5), 1000.0 + i * 60) for i in range(10)])
+        sink.close()
+        segments = list_segments(tmp_path, "trimmed_s")
+
+        assert extract_lines(segments, 12, 6) == [f"line{i}" for i in range(12, 18)]
+        assert extract_time_range(segments, 1110.0, 1170.0) == [
+            f"line{i}" for i in range(10, 15)
+        ]
+
+    def test_only_newline_splits_lines(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s")
+        sink.open()
+        sink.write([("a\x0cb\r\u2028\n", 1.0), ("c\n", 2.0), ("d\n", 3.0)])
+        sink.close()
+        segments = list_segments(tmp_path, "trimmed_s")
+
+        assert [extract_lines(segments, i, 1) for i in range(3)] == [
+            ["a\x0cb\r\u2028"],
+            ["c"],
+            ["d"],
+        ]
+        assert extract_time_range(segments, 0.0, 5.0) == ["a\x0cb\r\u2028", "c", "d"]
+
+    def test_truncated_index_line_is_ignored(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=1)
+        sink.open()
+        sink.write([(_lines(0, 2), 1.0)])
+        sink.close()
+        with open(sink.index_path, "a", encoding="ascii") as f:
+            f.write('{"offset": 12')
+
+        assert len(load_index(sink.segment_path)) == 1
+
+    def test_reopen_resumes_segment_and_line_numbers(self, tmp_path):
+        first = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=1)
+        first.open()
+        first.write([(_lines(0, 4), 1.0)])
+        first.close()
+
+        second = TrimArchiveSink(tmp_path, "trimmed_s", block_bytes=1)
+        second.open()
+        second.write([(_lines(4, 2), 2.0)])
+        second.close()
+
+        segments = list_segments(tmp_path, "trimmed_s")
+        assert len(segments) == 1
+        assert [b.first_line for b in load_index(segments[0])] == [0, 4]
+        assert extract_lines(segments, 3, 3) == ["line3", "line4", "line5"]
+
+    def test_sync_reports_time_until_block_is_due(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s")
+        sink.open()
+        assert sink.sync() is None
+
+        sink.write([(_lines(0, 1), 1.0)])
+        due_in = sink.sync()
+
+        assert due_in is not None and 0 < due_in <= sink.BLOCK_MAX_AGE
+        assert load_index(sink.segment_path) == []
+        sink.close()
+
+
+class TestRetention:
+    def _touch(self, path, size, mtime):
+        path.write_bytes(b"x" * size)
+        os.utime(path, (mtime, mtime))
+
+    def test_age_limit_removes_old_groups(self, tmp_path):
+        now = time.time()
+        self._touch(tmp_path / "trimmed_old.0000.log.gz", 10, now - 10 * 86400)
+        self._touch(tmp_path / "trimmed_old.0000.idx", 1, now - 10 * 86400)
+        self._touch(tmp_path / "trimmed_new.log", 10, now)
+
+        removed = enforce_retention(
+            tmp_path, ArchiveRetention(max_age_seconds=86400), now=now
+        )
+
+        assert sorted(p.name for p in removed) == [
+            "trimmed_old.0000.idx",
+            "trimmed_old.0000.log.gz",
+        ]
+        assert (tmp_path / "trimmed_new.log").exists()
+
+    def test_size_limit_keeps_current_segment(self, tmp_path):
+        now = time.time()
+        self._touch(tmp_path / "trimmed_a.log", 100, now - 30)
+        self._touch(tmp_path / "trimmed_b.log", 100, now - 20)
+        self._touch(tmp_path / "trimmed_cur.0000.log.gz", 100, now - 40)
+
+        enforce_retention(
+            tmp_path,
+            ArchiveRetention(max_total_bytes=150),
+            keep=("trimmed_cur.0000",),
+            now=now,
+        )
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "trimmed_cur.0000.log.gz"
+        ]
+
+    def test_no_limits_is_noop(self, tmp_path):
+        self._touch(tmp_path / "trimmed_a.log", 100, 0)
+        assert enforce_retention(tmp_path, ArchiveRetention()) == []
+
+
+class TestArchiveThroughWriter:
+    def test_writer_flush_emits_partial_block(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s")
+        writer = TrimLogWriter(tmp_path / "trimmed_s.log", sink=sink)
+        assert writer.open()
+
+        writer.submit(_lines(0, 4))
+        assert writer.flush(timeout=5)
+
+        segments = list_segments(tmp_path, "trimmed_s")
+        assert extract_lines(segments, 0, 4) == [f"line{i}" for i in range(4)]
+        assert writer.close(timeout=5)
+
+    def test_idle_partial_block_is_written_when_due(self, tmp_path):
+        sink = TrimArchiveSink(tmp_path, "trimmed_s")
+        sink.BLOCK_MAX_AGE = 0.3
+        writer = TrimLogWriter(
+            tmp_path / "trimmed_s.log", flush_interval=0.05, sink=sink
+        )
+        assert writer.open()
+
+        writer.submit(_lines(0, 3))
+        deadline = time.monotonic() + 5
+        while not load_index(sink.segment_path) and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert [b.lines for b in load_index(sink.segment_path)] == [3]
+        assert writer.close(timeout=5)
@@ -0,0 +1,86 @@
+"""
+测试 utils/trim_log.py
+"""
+
+import threading
+from unittest.mock import patch
+
+from utils.trim_log import TrimLogWriter
+
+
+class TestTrimLogWriter:
+    def test_submit_and_flush_writes_in_order(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "trim.log")
+        assert writer.open()
+
+        for i in range(100):
+            assert writer.submit(f"line{i}\n")
+        assert writer.flush(timeout=5)
+
+        content = (tmp_path / "trim.log").read_text(encoding="utf-8")
+        assert content.splitlines() == [f"line{i}" for i in range(100)]
+        assert writer.pending_bytes == 0
+        assert writer.close(timeout=5)
+
+    def test_file_opened_once_per_session(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "trim.log")
+        with patch("utils.trim_log.os.open", wraps=__import__("os").open) as opener:
+            assert writer.open()
+            writer.submit("a\n")
+            writer.flush(timeout=5)
+            assert writer.open()
+            writer.submit("b\n")
+            writer.flush(timeout=5)
+
+        assert opener.call_count == 1
+        writer.close(timeout=5)
+
+    def test_open_failure_reports_false(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "missing" / "trim.log")
+
+        assert writer.open() is False
+        assert writer.submit("x\n") is False
+
+    def test_submit_rejects_when_queue_full(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "trim.log", max_pending_bytes=10)
+        gate = threading.Event()
+        real_write = writer._write_batch
+
+        def slow_write(batch):
+            gate.wait(5)
+            real_write(batch)
+
+        writer._write_batch = slow_write
+        assert writer.open()
+
+        assert writer.submit("0123456789")
+        assert writer.submit("x") is False
+
+        gate.set()
+        assert writer.flush(timeout=5)
+        assert writer.submit("x")
+        writer.close(timeout=5)
+
+    def test_close_drains_pending_text(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "trim.log")
+        writer.open()
+        writer.submit("first\n")
+        writer.submit("last\n")
+
+        assert writer.close(timeout=5)
+
+        content = (tmp_path / "trim.log").read_text(encoding="utf-8")
+        assert content == "first\nlast\n"
+        assert writer.submit("late\n") is False
+
+    def test_write_error_is_reported(self, tmp_path):
+        writer = TrimLogWriter(tmp_path / "trim.log")
+        writer.open()
+
+        with patch("utils.trim_log.os.write", side_effect=OSError("disk full")):
+            writer.submit("x\n")
+            assert writer.flush(timeout=5) is False
+
+        assert isinstance(writer.error, OSError)
+        assert writer.submit("y\n") is False
+        writer.close(timeout=5)
@@ -0,0 +1,77 @@
+"""
+测试 utils/writer_loop.py
+"""
+
+import queue
+import threading
+import time
+
+from utils.writer_loop import FLUSH, run_writer_loop
+
+
+class _Recorder:
+    """记录调用的假输出端：写入后缓冲一个 `age` 秒后到期的块。"""
+
+    def __init__(self, age):
+        self.age = age
+        self.batches = []
+        self.syncs = []
+        self.flushes = 0
+        self._due = None
+
+    def write(self, batch):
+        self.batches.append(batch)
+        if self._due is None:
+            self._due = time.monotonic() + self.age
+
+    def sync(self, force):
+        self.syncs.append(force)
+        if self._due is not None and (force or time.monotonic() >= self._due):
+            self._due = None
+        return self._due
+
+    def flushed(self, count):
+        self.flushes += count
+
+
+def _start(items, recorder, flush_interval=0.05):
+    thread = threading.Thread(
+        target=run_writer_loop,
+        args=(items, flush_interval, recorder.write, recorder.sync, recorder.flushed),
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+class TestRunWriterLoop:
+    def test_batches_items_and_counts_flushes(self):
+        items = queue.Queue()
+        for item in ("a", "b", FLUSH, "c", FLUSH, None):
+            items.put(item)
+        recorder = _Recorder(age=60)
+
+        thread = _start(items, recorder)
+        thread.join(2)
+
+        assert not thread.is_alive()
+        assert recorder.batches == [["a", "b", "c"]]
+        assert recorder.flushes == 2
+        assert recorder.syncs == [True]
+
+    def test_idle_wakes_at_block_deadline(self):
+        items = queue.Queue()
+        recorder = _Recorder(age=0.3)
+        thread = _start(items, recorder)
+
+        items.put("a")
+        deadline = time.monotonic() + 5
+        while recorder._due is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        while recorder._due is not None and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert recorder._due is None
+        assert recorder.syncs and recorder.syncs[-1] is False
+        items.put(None)
+        thread.join(2)
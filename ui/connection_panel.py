@@ -25,6 +25,9 @@ class ConnectionPanel(QGroupBox):
     refresh_requested = pyqtSignal()
     dtr_changed = pyqtSignal(int)
     rts_changed = pyqtSignal(int)
+    write_policy_requested = pyqtSignal(str)
+
+    WRITE_POLICIES = ("interactive", "batched", "throughput")
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
@@ -59,6 +62,14 @@ class ConnectionPanel(QGroupBox):
         self.rfc2217_timeout_spinbox.setSuffix(" s")
         self.rfc2217_ignore_control_checkbox = QCheckBox()
 
+        self.socket_write_policy_label = QLabel()
+        self.socket_write_policy_combo = QComboBox()
+        for policy in self.WRITE_POLICIES:
+            self.socket_write_policy_combo.addItem(policy, policy)
+        self.socket_write_policy_combo.activated.connect(
+            self._on_write_policy_activated
+        )
+
         self.baudrate_label = QLabel()
         self.baudrate_combo = QComboBox()
         self.baudrate_combo.addItems(
@@ -124,6 +135,8 @@ class ConnectionPanel(QGroupBox):
             self.rfc2217_timeout_label,
             self.rfc2217_timeout_spinbox,
             self.rfc2217_ignore_control_checkbox,
+            self.socket_write_policy_label,
+            self.socket_write_policy_combo,
         ):
             row2.addWidget(widget)
         row2.addStretch()
@@ -159,6 +172,11 @@ class ConnectionPanel(QGroupBox):
             self.rfc2217_timeout_spinbox,
             self.rfc2217_ignore_control_checkbox,
         ]
+        # 发送策略可在会话中随时切换，不随连接状态禁用
+        self.tcp_option_widgets = [
+            self.socket_write_policy_label,
+            self.socket_write_policy_combo,
+        ]
 
     def set_mode(self, mode: str) -> None:
         serial_mode = mode == "serial"
@@ -171,6 +189,23 @@ class ConnectionPanel(QGroupBox):
             widget.setVisible(not serial_mode)
         for widget in self.rfc2217_option_widgets:
             widget.setVisible(rfc2217_mode)
+        for widget in self.tcp_option_widgets:
+            widget.setVisible(mode == "tcp")
+
+    def set_write_policy_texts(self, texts: dict[str, str]) -> None:
+        for index, policy in enumerate(self.WRITE_POLICIES):
+            self.socket_write_policy_combo.setItemText(index, texts[policy])
+
+    def set_write_policy(self, policy: str) -> None:
+        """显示当前生效的发送策略，不发出 write_policy_requested。"""
+        index = self.socket_write_policy_combo.findData(policy)
+        if index >= 0:
+            self.socket_write_policy_combo.setCurrentIndex(index)
+
+    def _on_write_policy_activated(self, index: int) -> None:
+        policy = self.socket_write_policy_combo.itemData(index)
+        if policy:
+            self.write_policy_requested.emit(policy)
 
     def select_serial_port(self, port: str) -> None:
         if not port:
@@ -22,6 +22,13 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from core.connection_controller import (
+    ConnectionConfig,
+    ConnectionMode,
+    Rfc2217ConnectionConfig,
+    SerialConnectionConfig,
+    TcpConnectionConfig,
+)
 from utils.i18n import I18N
 
 
@@ -183,3 +190,118 @@ class QuickSendItemDialog(QDialog):
             self.checksum_end_combo.currentIndex(),
             self.line_ending_combo.currentData(),
         )
+
+
+class AddSessionDialog(QDialog):
+    """添加附加会话：选择类型与端点，串口参数取常用默认值。"""
+
+    BAUDRATES = (
+        "9600",
+        "19200",
+        "38400",
+        "57600",
+        "115200",
+        "230400",
+        "460800",
+        "921600",
+    )
+
+    def __init__(
+        self,
+        parent: QWidget | None = None,
+        language: str = "zh",
+        ports: list[str] | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.language: str = language
+        self.init_ui(ports or [])
+
+    def t(self, key: str) -> str:
+        return I18N.get(self.language, key)
+
+    def init_ui(self, ports: list[str]) -> None:
+        self.setWindowTitle(self.t("add_session_title"))
+        self.setMinimumWidth(360)
+
+        layout = QVBoxLayout(self)
+
+        mode_layout = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        for mode in ConnectionMode:
+            self.mode_combo.addItem(self.t(f"mode_{mode.value}"), mode)
+        self.mode_combo.currentIndexChanged.connect(self._update_fields)
+        mode_layout.addWidget(QLabel(self.t("session_mode")))
+        mode_layout.addWidget(self.mode_combo)
+
+        self.serial_row = QWidget()
+        serial_layout = QHBoxLayout(self.serial_row)
+        serial_layout.setContentsMargins(0, 0, 0, 0)
+        self.port_combo = QComboBox()
+        self.port_combo.setEditable(True)
+        self.port_combo.addItems(ports)
+        serial_layout.addWidget(QLabel(self.t("port")))
+        serial_layout.addWidget(self.port_combo, 1)
+
+        self.network_row = QWidget()
+        network_layout = QHBoxLayout(self.network_row)
+        network_layout.setContentsMargins(0, 0, 0, 0)
+        self.host_input = QLineEdit()
+        self.host_input.setPlaceholderText("192.168.1.100")
+        self.tcp_port_input = QLineEdit()
+        self.tcp_port_input.setPlaceholderText("2217")
+        self.tcp_port_input.setFixedWidth(70)
+        network_layout.addWidget(QLabel(self.t("socket_host")))
+        network_layout.addWidget(self.host_input, 1)
+        network_layout.addWidget(QLabel(self.t("socket_port")))
+        network_layout.addWidget(self.tcp_port_input)
+
+        self.baudrate_row = QWidget()
+        baudrate_layout = QHBoxLayout(self.baudrate_row)
+        baudrate_layout.setContentsMargins(0, 0, 0, 0)
+        self.baudrate_combo = QComboBox()
+        self.baudrate_combo.setEditable(True)
+        self.baudrate_combo.addItems(self.BAUDRATES)
+        self.baudrate_combo.setCurrentText("115200")
+        baudrate_layout.addWidget(QLabel(self.t("baudrate")))
+        baudrate_layout.addWidget(self.baudrate_combo, 1)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+
+        layout.addLayout(mode_layout)
+        layout.addWidget(self.serial_row)
+        layout.addWidget(self.network_row)
+        layout.addWidget(self.baudrate_row)
+        layout.addWidget(button_box)
+        self._update_fields()
+
+    @property
+    def mode(self) -> ConnectionMode:
+        return ConnectionMode(self.mode_combo.currentData())
+
+    def _update_fields(self) -> None:
+        mode = self.mode
+        self.serial_row.setVisible(mode is ConnectionMode.SERIAL)
+        self.network_row.setVisible(mode is not ConnectionMode.SERIAL)
+        self.baudrate_row.setVisible(mode is not ConnectionMode.TCP)
+
+    def get_config(self) -> ConnectionConfig | None:
+        """按当前输入生成连接配置；端点不完整时返回 None。"""
+        mode = self.mode
+        baudrate = self.baudrate_combo.currentText().strip()
+        if mode is ConnectionMode.SERIAL:
+            port = self.port_combo.currentText().strip()
+            return SerialConnectionConfig(port, baudrate) if port else None
+        host = self.host_input.text().strip()
+        try:
+            port_number = int(self.tcp_port_input.text().strip())
+        except ValueError:
+            return None
+        if not host or not 1 <= port_number <= 65535:
+            return None
+        if mode is ConnectionMode.TCP:
+            return TcpConnectionConfig(host, port_number)
+        return Rfc2217ConnectionConfig(host, port_number, baudrate)
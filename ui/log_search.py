@@ -0,0 +1,319 @@
+"""
+日志视图搜索
+
+LogSearchIndex 为当前查询缓存全部匹配位置：新数据追加时只扫描末尾新增的块，
+裁剪管理器删掉开头的块时整体平移/丢弃旧匹配，其他编辑才会触发全量重建。
+上一个/下一个以及 "n / m" 计数都只需一次二分查找。
+
+HistorySearch 在后台线程中搜索已裁剪到日志文件里的历史，分批回传结果。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from utils.history_search import HistoryMatch, compile_query, search_history
+
+# Qt 的文档位置按 UTF-16 计数，含增补平面字符的行需要换算列号
+_ASTRAL = re.compile("[\U00010000-\U0010ffff]")
+
+
+def _utf16_len(text: str) -> int:
+    if _ASTRAL.search(text) is None:
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+class LogSearchIndex:
+    """QTextDocument 的匹配缓存。
+
+    匹配以 (流水块号, 列, 长度) 保存，列和长度按 UTF-16 计。流水块号 =
+    文档块号 + 已裁掉的块数，因此裁剪只需调整偏移并删掉最前面的匹配。
+    最后一个块可能还会继续追加内容，每次更新都会重新扫描它。
+    """
+
+    def __init__(self, document: QTextDocument) -> None:
+        self._doc = document
+        self._pattern: Optional[re.Pattern[str]] = None
+        self._query: Optional[tuple[str, bool]] = None
+        self._matches: list[tuple[int, int, int]] = []
+        self._base = 0
+        # 下次从这个流水块号开始扫描；None 表示需要全量重建
+        self._scan_from: Optional[int] = None
+        self._known_blocks = document.blockCount()
+        self.scanned_blocks = 0
+        # 没有布局的文档不发 contentsChange，独立使用时先创建布局
+        document.documentLayout()
+        document.contentsChange.connect(self._on_contents_change)
+
+    # ── 查询 ─────────────────────────────────────────────────
+
+    def set_query(self, text: str, case_sensitive: bool) -> None:
+        """切换查询；与当前查询相同时保留缓存。"""
+        query = (text, case_sensitive)
+        if query == self._query:
+            return
+        self._query = query
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._pattern = re.compile(re.escape(text), flags) if text else None
+        self._matches = []
+        self._scan_from = None
+
+    def count(self) -> int:
+        self._refresh()
+        return len(self._matches)
+
+    def find(
+        self, cursor: QTextCursor, forward: bool
+    ) -> Optional[tuple[int, QTextCursor]]:
+        """从 cursor 起查找下一个/上一个匹配（到头回绕）。
+
+        返回 (从 1 开始的序号, 选中该匹配的光标)；没有匹配返回 None。
+        """
+        self._refresh()
+        matches = self._matches
+        if not matches:
+            return None
+        if forward:
+            index = bisect_left(matches, self._key(cursor.selectionEnd()))
+            if index >= len(matches):
+                index = 0
+        else:
+            index = bisect_left(matches, self._key(cursor.selectionStart())) - 1
+            if index < 0:
+                index = len(matches) - 1
+        return index + 1, self._selection(matches[index])
+
+    # ── 内部 ─────────────────────────────────────────────────
+
+    def _key(self, position: int) -> tuple[int, int]:
+        block = self._doc.findBlock(position)
+        return block.blockNumber() + self._base, position - block.position()
+
+    def _selection(self, match: tuple[int, int, int]) -> QTextCursor:
+        block_no, column, length = match
+        block = self._doc.findBlockByNumber(block_no - self._base)
+        cursor = QTextCursor(self._doc)
+        cursor.setPosition(block.position() + column)
+        cursor.setPosition(
+            block.position() + column + length, QTextCursor.MoveMode.KeepAnchor
+        )
+        return cursor
+
+    def _on_contents_change(self, position: int, removed: int, added: int) -> None:
+        blocks = self._doc.blockCount()
+        previous, self._known_blocks = self._known_blocks, blocks
+        if self._scan_from is None:
+            return
+
+        tail = self._doc.findBlockByNumber(self._scan_from - self._base)
+        if self._doc.characterCount() <= 1:
+            # 文档被清空
+            self._matches = []
+            self._scan_from = None
+        elif tail.isValid() and position >= tail.position():
+            # 只动了尚未定稿的末尾，下次更新会重新扫描
+            pass
+        elif position == 0 and added == 0 and removed > 0 and blocks < previous:
+            # 裁剪管理器删掉了开头的整块
+            self._base += previous - blocks
+            del self._matches[: bisect_left(self._matches, (self._base, 0))]
+            self._scan_from = max(self._scan_from, self._base)
+        else:
+            self._matches = []
+            self._scan_from = None
+
+    def _refresh(self) -> None:
+        pattern = self._pattern
+        if pattern is None:
+            self._matches = []
+            return
+
+        if self._scan_from is None:
+            self._matches = []
+            self._base = 0
+            start = 0
+        else:
+            start = self._scan_from - self._base
+            del self._matches[bisect_left(self._matches, (self._scan_from, 0)) :]
+
+        matches = self._matches
+        block = self._doc.findBlockByNumber(start)
+        number = start
+        while block.isValid():
+            text = block.text()
+            astral = _ASTRAL.search(text) is not None
+            for m in pattern.finditer(text):
+                if astral:
+                    column = _utf16_len(text[: m.start()])
+                    length = _utf16_len(m.group())
+                else:
+                    column = m.start()
+                    length = m.end() - m.start()
+                matches.append((number + self._base, column, length))
+            self.scanned_blocks += 1
+            number += 1
+            block = block.next()
+
+        self._known_blocks = self._doc.blockCount()
+        self._scan_from = self._base + max(0, number - 1)
+
+
+class HistorySearch(QObject):
+    """裁剪历史的后台搜索。
+
+    同一时间只运行一次搜索，开始新搜索会取消旧的。结果每隔
+    `BATCH_INTERVAL` 秒或攒满 `BATCH_SIZE` 条通过 `results_found` 发出，
+    命中数达到 `MAX_RESULTS` 时提前结束。工作线程发出的内部信号带着搜索
+    代号，排队到 GUI 线程后再与当前代号比对：旧搜索晚到的结果、进度和
+    结束信号在这里丢弃，不会混进新搜索。
+    """
+
+    results_found = pyqtSignal(list)  # list[HistoryMatch]
+    progress_changed = pyqtSignal(int, int)  # scanned bytes, total bytes
+    search_finished = pyqtSignal(int, bool)  # total matches, cancelled
+
+    # 工作线程 → GUI 线程，第一个参数是搜索代号
+    _worker_results = pyqtSignal(int, list)
+    _worker_progress = pyqtSignal(int, int, int)
+    _worker_finished = pyqtSignal(int, int, bool, bool)  # ..., truncated
+
+    BATCH_SIZE = 200
+    BATCH_INTERVAL = 0.1
+    MAX_RESULTS = 10_000
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        # 每次搜索递增，旧线程晚到的信号据此丢弃
+        self._generation = 0
+        self.truncated = False
+        self._worker_results.connect(self._on_worker_results)
+        self._worker_progress.connect(self._on_worker_progress)
+        self._worker_finished.connect(self._on_worker_finished)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(
+        self,
+        paths: Sequence[Path],
+        text: str,
+        case_sensitive: bool,
+        prepare: Optional[Callable[[], object]] = None,
+    ) -> None:
+        """开始搜索。`prepare` 在工作线程中先执行，例如等待日志写盘。"""
+        self.cancel()
+        self._cancel = threading.Event()
+        self._generation += 1
+        self.truncated = False
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(
+                list(paths),
+                compile_query(text, case_sensitive),
+                prepare,
+                self._cancel,
+                self._generation,
+            ),
+            name="HistorySearch",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def cancel(self, timeout: Optional[float] = None) -> bool:
+        """请求取消当前搜索；给出 timeout 时等待线程退出。"""
+        self._cancel.set()
+        thread = self._thread
+        if thread is None:
+            return True
+        if timeout is not None:
+            thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run(
+        self,
+        paths: list[Path],
+        pattern: re.Pattern[str],
+        prepare: Optional[Callable[[], object]],
+        cancel: threading.Event,
+        generation: int,
+    ) -> None:
+        if prepare is not None:
+            prepare()
+        total_bytes = 0
+        for path in paths:
+            try:
+                total_bytes += path.stat().st_size
+            except OSError:
+                continue
+
+        scanned = 0
+        total = 0
+        batch: list[HistoryMatch] = []
+        last_emit = time.monotonic()
+
+        def emit_batch() -> None:
+            nonlocal batch, last_emit
+            # 已被新搜索取代时提前停下；晚到信号的丢弃在 GUI 线程完成
+            if generation != self._generation:
+                cancel.set()
+                return
+            if batch:
+                self._worker_results.emit(generation, batch)
+                batch = []
+            self._worker_progress.emit(
+                generation, min(scanned, total_bytes), total_bytes
+            )
+            last_emit = time.monotonic()
+
+        def on_progress(size: int) -> None:
+            nonlocal scanned
+            scanned += size
+            # 长时间没有命中时也要定期汇报进度
+            if time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                emit_batch()
+
+        truncated = False
+        for match in search_history(paths, pattern, cancel, on_progress):
+            batch.append(match)
+            total += 1
+            if total >= self.MAX_RESULTS:
+                truncated = True
+                break
+            if (
+                len(batch) >= self.BATCH_SIZE
+                or time.monotonic() - last_emit >= self.BATCH_INTERVAL
+            ):
+                emit_batch()
+        emit_batch()
+        self._worker_finished.emit(generation, total, cancel.is_set(), truncated)
+
+    # 以下槽在 GUI 线程执行
+
+    def _on_worker_results(self, generation: int, batch: list) -> None:
+        if generation == self._generation:
+            self.results_found.emit(batch)
+
+    def _on_worker_progress(self, generation: int, scanned: int, total: int) -> None:
+        if generation == self._generation:
+            self.progress_changed.emit(scanned, total)
+
+    def _on_worker_finished(
+        self, generation: int, total: int, cancelled: bool, truncated: bool
+    ) -> None:
+        if generation != self._generation:
+            return
+        self.truncated = truncated
+        self.search_finished.emit(total, cancelled)
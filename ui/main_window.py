@@ -6,14 +6,16 @@ Copyright (C) 2026 cpevor. Licensed under GPL v3.
 
 from __future__ import annotations
 
-import codecs
 import logging
 import os
+import re
 import sys
 import tempfile
+import time
 from dataclasses import replace
 from pathlib import Path
 from datetime import datetime
+from functools import partial
 from typing import Any, Optional
 
 from PyQt6.QtWidgets import (
@@ -32,6 +34,10 @@ from PyQt6.QtWidgets import (
     QToolButton,
     QMenu,
     QApplication,
+    QListWidget,
+    QFileDialog,
+    QDialog,
+    QDockWidget,
 )
 from PyQt6.QtCore import QTimer, Qt, QUrl
 from PyQt6.QtGui import (
@@ -49,17 +55,20 @@ from PyQt6.QtGui import (
 
 from core.ansi_parser import AnsiParser
 from core.connection_controller import (
+    ConnectionConfig,
     ConnectionController,
     ConnectionMode,
     Rfc2217ConnectionConfig,
     SerialConnectionConfig,
+    SessionRegistry,
     TcpConnectionConfig,
 )
+from core.replay_handler import AS_FAST_AS_POSSIBLE, ReplayStats
 from core.protocol import apply_checksum, format_hex, parse_payload
 from core.payload_sender import PayloadRequest, PayloadSender, SendResult, SendStatus
 from core.rfc2217_handler import Rfc2217Handler
 from core.serial_handler import SerialHandler
-from core.socket_handler import SocketHandler
+from core.socket_handler import SocketHandler, SocketWritePolicy, SocketWriteStats
 from core.transport import (
     DisconnectReason,
     TransportError,
@@ -69,9 +78,18 @@ from core.transport import (
 )
 from ui.quick_send_manager import QuickSendManager
 from ui.connection_panel import ConnectionPanel
-from ui.dialogs import HelpDialog
+from ui.dialogs import AddSessionDialog, HelpDialog
+from ui.log_search import HistorySearch, LogSearchIndex
+from ui.receive_pipeline import (
+    ReceiveAccumulator,
+    ReceivePart,
+    ReceiveTextDecoder,
+    format_timestamp,
+)
+from ui.session_view import SessionView
 from ui.terminal_emulator import TerminalEmulator
 from ui.search_bar import SearchBar
+from utils.history_search import HistoryMatch
 from utils.i18n import I18N
 from utils.settings import (
     AppSettings,
@@ -80,6 +98,9 @@ from utils.settings import (
     TcpSettings,
 )
 from utils.theme import Theme, is_system_dark_mode
+from utils.session_capture import CAPTURE_SUFFIX, SessionCapture
+from utils.trim_archive import ArchiveRetention, TrimArchiveSink, list_segments
+from utils.trim_log import TrimLogWriter
 from utils.config_manager import ConfigManager
 import qdarktheme
 
@@ -102,19 +123,32 @@ class TerminalTrimManager:
     """终端日志裁剪管理器。
 
     当终端行数超过阈值时，将旧内容写入临时日志文件并从终端移除。
+    写盘由 `TrimLogWriter` 在后台线程完成，GUI 线程只负责入队。
+    归档模式下改为写入带索引的 gzip 分段（见 `utils.trim_archive`）。
     """
 
     DEFAULT_MAX_LINES = 5000
     DEFAULT_BATCH_LINES = 800
+    WRITER_CLOSE_TIMEOUT = 1.0
 
-    def __init__(self) -> None:
+    def __init__(self, label: str = "") -> None:
+        """`label` 区分同一进程里多个会话的日志文件（附加会话传会话 ID）。"""
         self.enabled: bool = True
         self.max_lines: int = self.DEFAULT_MAX_LINES
         self.batch_lines: int = self.DEFAULT_BATCH_LINES
+        self.archive_enabled: bool = False
+        self.archive_segment_bytes: int = TrimArchiveSink.DEFAULT_SEGMENT_BYTES
+        self.retention = ArchiveRetention()
 
         self._log_dir = self._prepare_log_dir()
         session = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._log_file = self._log_dir / f"trimmed_{session}_{os.getpid()}.log"
+        name = f"trimmed_{session}_{os.getpid()}"
+        suffix = re.sub(r"[^0-9A-Za-z]+", "_", label).strip("_")
+        if suffix:
+            name = f"{name}_{suffix}"
+        self._log_file = self._log_dir / f"{name}.log"
+        self._writer: Optional[TrimLogWriter] = None
+        self._writer_config: tuple[Any, ...] = ()
 
     @property
     def log_dir(self) -> Path:
@@ -147,26 +181,70 @@ class TerminalTrimManager:
             suffix = "other"
         return base / f"SerialMonitorTrimmedLogs_{suffix}"
 
+    @property
+    def archive_stem(self) -> str:
+        """归档分段的文件名前缀，与纯文本日志同名。"""
+        return self._log_file.stem
+
+    def history_files(self) -> list[Path]:
+        """本会话已写出的裁剪日志：纯文本日志在前，归档段按序号在后。"""
+        files = [self._log_file] if self._log_file.is_file() else []
+        files.extend(list_segments(self._log_file.parent, self.archive_stem))
+        return files
+
+    def _log_writer(self) -> Optional[TrimLogWriter]:
+        """当前会话的写入器；首次使用、日志文件或归档设置变化时重新打开。"""
+        config = (
+            self._log_file,
+            self.archive_enabled,
+            self.archive_segment_bytes,
+            self.retention,
+        )
+        writer = self._writer
+        if writer is not None and (
+            config != self._writer_config or writer.error is not None
+        ):
+            # 新输出端可能接着写同一组文件，旧写入线程退出前不能打开；
+            # 超时则这次不裁剪，下次再等
+            if not writer.close(timeout=self.WRITER_CLOSE_TIMEOUT):
+                return None
+            writer = None
+        if writer is None:
+            sink = None
+            if self.archive_enabled:
+                sink = TrimArchiveSink(
+                    self._log_file.parent,
+                    self.archive_stem,
+                    segment_bytes=self.archive_segment_bytes,
+                    retention=self.retention,
+                )
+            writer = TrimLogWriter(self._log_file, sink=sink)
+            self._writer = writer
+            self._writer_config = config
+        return writer if writer.open() else None
+
     def _append_log(self, text: str) -> bool:
+        """把裁剪文本交给后台写入器；无法打开日志或队列已满时返回 False。"""
         if not text:
             return True
-        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
-        flags |= getattr(os, "O_NOFOLLOW", 0)
-        try:
-            fd = os.open(self._log_file, flags, 0o600)
-        except OSError as e:
-            logger.warning("Failed to open trim log: %s", e)
-            return False
-        try:
-            with os.fdopen(fd, "a", encoding="utf-8", errors="replace") as f:
-                f.write(text)
+        writer = self._log_writer()
+        return writer is not None and writer.submit(text)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已裁剪内容写入日志文件。"""
+        if self._writer is None:
             return True
-        except OSError as e:
-            logger.warning("Failed to write trim log: %s", e)
-            return False
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """写完剩余内容并关闭日志文件。"""
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return True
+        return writer.close(timeout)
 
     def trim_if_needed(self, document: QTextDocument) -> None:
-        """检查并裁剪文档内容。"""
+        """检查并裁剪文档内容。日志写不进去时保留文档内容，下次再试。"""
         if not self.enabled:
             return
 
@@ -179,25 +257,16 @@ class TerminalTrimManager:
         if trim_count <= 0:
             return
 
-        lines: list[str] = []
-        block = document.firstBlock()
-        for _ in range(trim_count):
-            if not block.isValid():
-                break
-            lines.append(block.text())
-            block = block.next()
-
-        trimmed_text = "\n".join(lines) + "\n"
-        if not self._append_log(trimmed_text):
-            return
-
         cursor = QTextCursor(document)
         cursor.movePosition(QTextCursor.MoveOperation.Start)
-        for _ in range(trim_count):
-            if not cursor.movePosition(
-                QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor
-            ):
-                break
+        cursor.movePosition(
+            QTextCursor.MoveOperation.NextBlock,
+            QTextCursor.MoveMode.KeepAnchor,
+            trim_count,
+        )
+        # 选区止于下一段开头，纯文本自带每行的换行符
+        if not self._append_log(cursor.selection().toPlainText()):
+            return
         cursor.removeSelectedText()
 
     def to_dict(self) -> dict[str, Any]:
@@ -205,17 +274,32 @@ class TerminalTrimManager:
             "trim_enabled": self.enabled,
             "max_terminal_lines": self.max_lines,
             "trim_batch_lines": self.batch_lines,
+            "trim_archive_enabled": self.archive_enabled,
+            "trim_archive_segment_mb": self.archive_segment_bytes // (1024 * 1024),
+            "trim_retention_mb": self.retention.max_total_bytes // (1024 * 1024),
+            "trim_retention_days": int(self.retention.max_age_seconds // 86400),
         }
 
     def load_from_dict(self, data: dict[str, Any]) -> None:
         self.enabled = data.get("trim_enabled", True)
         self.max_lines = data.get("max_terminal_lines", self.DEFAULT_MAX_LINES)
         self.batch_lines = data.get("trim_batch_lines", self.DEFAULT_BATCH_LINES)
+        self.archive_enabled = data.get("trim_archive_enabled", False)
+        self.archive_segment_bytes = (
+            data.get("trim_archive_segment_mb", 64) * 1024 * 1024
+        )
+        self.retention = ArchiveRetention(
+            max_total_bytes=data.get("trim_retention_mb", 0) * 1024 * 1024,
+            max_age_seconds=data.get("trim_retention_days", 0) * 86400,
+        )
 
 
 class SerialMonitor(QMainWindow):
     """串口监视器主窗口"""
 
+    # 异步写入在此时间内完成则记为"已发送"，否则先记为"已入队"
+    SEND_ACK_MS = 50
+
     def __init__(self) -> None:
         super().__init__()
         self.default_palette = QApplication.palette()
@@ -242,11 +326,7 @@ class SerialMonitor(QMainWindow):
         self._rfc2217_settings = Rfc2217Settings()
         self.language: str = "zh"
         self.enable_ansi_colors: bool = True
-        self._receive_decoder = codecs.getincrementaldecoder("utf-8")(
-            errors="backslashreplace"
-        )
-        self._receive_at_line_start: bool = True
-        self._receive_pending_cr: bool = False
+        self.receive_decoder = ReceiveTextDecoder()
         self.quick_send_manager = QuickSendManager(self)
         self.terminal_mode: bool = False
         self._silent_disconnect_modes: set[str] = set()
@@ -255,18 +335,39 @@ class SerialMonitor(QMainWindow):
 
         self.ansi_parser = AnsiParser()
         self.trim_manager = TerminalTrimManager()
+        # 接收数据按显示帧合并后再写入文档，避免逐块刷新占满 GUI 线程
+        self.receive_pipeline = ReceiveAccumulator(self._on_serial_batch, parent=self)
 
-        self.connection_controller.data_received.connect(self._on_serial_data)
+        self.connection_controller.data_received.connect(self.receive_pipeline.push)
         self.connection_controller.state_changed.connect(
             self._on_connection_state_changed
         )
         self.connection_controller.error_occurred.connect(
             self._on_connection_error
         )
+        self.connection_controller.replay_state_changed.connect(
+            self._on_replay_state_changed
+        )
+        self.connection_controller.replay_finished.connect(self._on_replay_finished)
         self.connection_controller.reconnecting.connect(self._on_reconnecting)
+        # 附加会话：每个会话一个停靠面板，数据按会话 ID 分发
+        self.session_views: dict[str, SessionView] = {}
+        self._session_docks: dict[str, QDockWidget] = {}
+        sessions = self.connection_controller.sessions
+        sessions.data_received.connect(self._on_session_data)
+        sessions.state_changed.connect(self._on_session_state_changed)
+        sessions.error_occurred.connect(self._on_session_error)
         self.payload_sender = PayloadSender(
-            self.connection_controller.write_payload, self.is_connected
+            self.connection_controller.write_payload,
+            self.is_connected,
+            self.connection_controller.last_write_ticket,
         )
+        # 票据号 → (显示文本, 已发送行, 已入队行, 载荷长度)，等待写入线程回报；
+        # 超时只先记一条"已入队"，条目保留到写完或下次连接
+        self._pending_send_lines: dict[int, tuple[str, str, str, int]] = {}
+        # 用户选择的 TCP 发送策略；终端模式下临时改用交互策略
+        self._socket_write_policy = SocketWritePolicy.INTERACTIVE
+        self.connection_controller.write_completed.connect(self._on_write_completed)
 
         self.init_ui()
         self.refresh_ports()
@@ -311,6 +412,8 @@ class SerialMonitor(QMainWindow):
         trim_layout.addWidget(self.trim_logs_button)
         trim_layout.addWidget(self.trim_menu_button)
 
+        self.add_session_button = QPushButton()
+        self.add_session_button.clicked.connect(self.add_session)
         self.quick_send_button = QPushButton()
         self.quick_send_button.clicked.connect(self.quick_send_manager.toggle_panel)
         self.help_button = QPushButton()
@@ -319,6 +422,7 @@ class SerialMonitor(QMainWindow):
         toolbar_layout.addWidget(self.lang_button)
         toolbar_layout.addWidget(self.theme_combo)
         toolbar_layout.addWidget(trim_container)
+        toolbar_layout.addWidget(self.add_session_button)
         toolbar_layout.addStretch()
         toolbar_layout.addWidget(self.help_button)
         toolbar_layout.addWidget(self.quick_send_button)
@@ -338,6 +442,8 @@ class SerialMonitor(QMainWindow):
             "rfc2217_timeout_label",
             "rfc2217_timeout_spinbox",
             "rfc2217_ignore_control_checkbox",
+            "socket_write_policy_label",
+            "socket_write_policy_combo",
             "baudrate_label",
             "baudrate_combo",
             "parity_label",
@@ -356,11 +462,15 @@ class SerialMonitor(QMainWindow):
         self.connection_panel.refresh_requested.connect(self.refresh_ports)
         self.connection_panel.dtr_changed.connect(self.toggle_dtr)
         self.connection_panel.rts_changed.connect(self.toggle_rts)
+        self.connection_panel.write_policy_requested.connect(
+            self._on_write_policy_requested
+        )
         self._update_connection_mode_ui()
 
         # ── 终端显示区域（普通模式） ──
         self.terminal_display = QTextEdit()
         self.terminal_display.setReadOnly(True)
+        self.search_index = LogSearchIndex(self.terminal_display.document())
 
         # ── 终端模拟器（终端模式） ──
         self.terminal_emulator = TerminalEmulator(rows=24, cols=80)
@@ -372,6 +482,17 @@ class SerialMonitor(QMainWindow):
         self.search_bar = SearchBar(self)
         self.search_bar.search_requested.connect(self._do_search)
         self.search_bar.close_requested.connect(self._close_search)
+        self.search_bar.history_requested.connect(self._do_history_search)
+        self.search_bar.history_cancel_requested.connect(self._cancel_history_search)
+
+        # ── 历史搜索结果 ──
+        self.history_results = QListWidget()
+        self.history_results.setMaximumHeight(160)
+        self.history_results.hide()
+        self.history_search = HistorySearch(self)
+        self.history_search.results_found.connect(self._on_history_results)
+        self.history_search.progress_changed.connect(self._on_history_progress)
+        self.history_search.search_finished.connect(self._on_history_finished)
 
         # ── 控制按钮区域 ──
         ctrl_layout = QHBoxLayout()
@@ -496,6 +617,7 @@ class SerialMonitor(QMainWindow):
         main_layout.addWidget(self.terminal_display)
         main_layout.addWidget(self.terminal_emulator)
         main_layout.addWidget(self.search_bar)
+        main_layout.addWidget(self.history_results)
         main_layout.addLayout(ctrl_layout)
         main_layout.addLayout(send_layout)
         main_layout.addLayout(ck_layout)
@@ -613,6 +735,14 @@ class SerialMonitor(QMainWindow):
         self.rfc2217_ignore_control_checkbox.setText(
             self.t("rfc2217_ignore_control")
         )
+        self.socket_write_policy_label.setText(self.t("socket_write_policy"))
+        self.connection_panel.set_write_policy_texts(
+            {
+                policy.value: self.t(f"write_policy_{policy.value}")
+                for policy in SocketWritePolicy
+            }
+        )
+        self._update_socket_write_stats()
         self.dtr_checkbox.setText(self.t("dtr"))
         self.rts_checkbox.setText(self.t("rts"))
 
@@ -678,6 +808,10 @@ class SerialMonitor(QMainWindow):
         self.calculate_checksum_button.setText(self.t("calculate_checksum"))
         self.lang_button.setText(self.t("lang_toggle"))
         self.trim_logs_button.setText(self.t("trimmed_logs"))
+        self.add_session_button.setText(self.t("add_session"))
+        for view in self.session_views.values():
+            view.language = self.language
+            view.update_texts()
         self.quick_send_button.setText(self.t("quick_send"))
         self.help_button.setText(self.t("help"))
 
@@ -690,6 +824,8 @@ class SerialMonitor(QMainWindow):
                 "search_next": self.t("search_next"),
                 "search_case": self.t("search_case"),
                 "search_close": self.t("search_close"),
+                "search_history": self.t("search_history"),
+                "search_stop": self.t("search_stop"),
             }
         )
 
@@ -714,6 +850,39 @@ class SerialMonitor(QMainWindow):
             enabled_action.setChecked(self.trim_manager.enabled)
             enabled_action.toggled.connect(self._set_trim_enabled)
 
+        archive_action = menu.addAction(self.t("trim_archive"))
+        if archive_action:
+            archive_action.setCheckable(True)
+            archive_action.setChecked(self.trim_manager.archive_enabled)
+            archive_action.toggled.connect(self._set_trim_archive)
+
+        capture_action = menu.addAction(self.t("capture_raw"))
+        if capture_action:
+            capture_action.setCheckable(True)
+            capture_action.setChecked(self.connection_controller.capture is not None)
+            capture_action.toggled.connect(self._set_capture_enabled)
+
+        replay_menu = menu.addMenu(self.t("replay_capture"))
+        if replay_menu:
+            replaying = self.connection_controller.is_replaying()
+            for key, speed in (
+                ("replay_realtime", 1.0),
+                ("replay_2x", 2.0),
+                ("replay_10x", 10.0),
+                ("replay_asap", AS_FAST_AS_POSSIBLE),
+            ):
+                action = replay_menu.addAction(self.t(key))
+                if action:
+                    action.setEnabled(not replaying)
+                    action.triggered.connect(
+                        lambda _=False, v=speed: self._choose_replay_file(v)
+                    )
+            replay_menu.addSeparator()
+            stop_action = replay_menu.addAction(self.t("replay_stop"))
+            if stop_action:
+                stop_action.setEnabled(replaying)
+                stop_action.triggered.connect(self.connection_controller.stop_replay)
+
         menu.addSeparator()
 
         max_menu = menu.addMenu(self.t("trim_max_lines"))
@@ -749,6 +918,95 @@ class SerialMonitor(QMainWindow):
     def _set_trim_enabled(self, enabled: bool) -> None:
         self.trim_manager.enabled = enabled
 
+    def _set_trim_archive(self, enabled: bool) -> None:
+        self.trim_manager.archive_enabled = enabled
+
+    def _set_capture_enabled(self, enabled: bool) -> None:
+        """开始/停止录制当前连接的原始收发数据，文件放在裁剪日志目录。"""
+        capture = self.connection_controller.capture
+        if not enabled:
+            self.connection_controller.set_capture(None)
+            if isinstance(capture, SessionCapture) and not capture.close(timeout=2.0):
+                logger.warning("Capture writer did not finish before stop")
+            return
+        if capture is not None:
+            return
+        # 精确到微秒：同一秒内停止后重新开始也不会撞上已有文件
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        path = self.trim_manager.log_dir / (
+            f"capture_{stamp}_{os.getpid()}{CAPTURE_SUFFIX}"
+        )
+        capture = SessionCapture(path)
+        if not capture.open():
+            QMessageBox.warning(
+                self, self.t("error"), self.t("capture_failed").format(capture.error)
+            )
+            self._rebuild_trim_menu()
+            return
+        self.connection_controller.set_capture(capture)
+
+    def _choose_replay_file(self, speed: float) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.t("replay_capture"),
+            str(self.trim_manager.log_dir),
+            f"*{CAPTURE_SUFFIX}",
+        )
+        if path:
+            self.start_replay(path, speed)
+
+    def start_replay(self, path: str | Path, speed: float = 1.0) -> bool:
+        """把录制文件回放到接收视图；连接中不回放。speed 为 0 时尽快回放。"""
+        if self.is_connection_active():
+            QMessageBox.warning(self, self.t("warning"), self.t("replay_busy"))
+            return False
+        self._reset_receive_state()
+        if not self.connection_controller.start_replay(path, speed):
+            QMessageBox.warning(
+                self,
+                self.t("error"),
+                self.t("replay_failed").format(
+                    self.connection_controller.replay.last_error or path
+                ),
+            )
+            return False
+        return True
+
+    def _on_replay_state_changed(self, transition: TransportTransition) -> None:
+        if transition.current is TransportState.CONNECTED:
+            message = self.t("replay_started").format(transition.endpoint)
+        elif transition.current is TransportState.DISCONNECTED:
+            # 正常播完由 _on_replay_finished 播报统计
+            if transition.reason is DisconnectReason.USER:
+                message = self.t("replay_stopped")
+            elif transition.reason is DisconnectReason.IO_ERROR:
+                message = self.t("replay_failed").format(
+                    self.connection_controller.replay.last_error
+                )
+            else:
+                message = ""
+        else:
+            return
+        self._rebuild_trim_menu()
+        if message and transition.session_was_connected and not self.terminal_mode:
+            self.receive_pipeline.flush()
+            self.append_to_terminal(message + "\n", with_timestamp=True)
+
+    def _on_replay_finished(self, stats: ReplayStats) -> None:
+        # 先把最后一帧交给显示端再计时，尽快模式下的耗时才包含整条显示链路
+        self.receive_pipeline.flush()
+        if stats.started_at:
+            stats = replace(stats, elapsed=time.monotonic() - stats.started_at)
+        message = self.t("replay_finished").format(
+            stats.records,
+            stats.bytes,
+            stats.elapsed,
+            stats.bytes_per_second / 1024,
+        )
+        logger.info(message)
+        if not self.terminal_mode:
+            self.append_to_terminal(message + "\n", with_timestamp=True)
+
     def _set_max_lines(self, value: int) -> None:
         self.trim_manager.max_lines = value
         self._rebuild_trim_menu()
@@ -847,9 +1105,7 @@ class SerialMonitor(QMainWindow):
             modes[(current_index + 1) % len(modes)]
         )
         self._apply_connection_settings(self.connection_mode)
-        self._receive_decoder.reset()
-        self._receive_at_line_start = True
-        self._receive_pending_cr = False
+        self._reset_receive_state()
         self._update_connection_mode_ui()
         self._set_connection_controls_enabled(True)
         self.update_texts()
@@ -875,6 +1131,34 @@ class SerialMonitor(QMainWindow):
     def _update_connection_mode_ui(self) -> None:
         self.connection_panel.set_mode(self.connection_mode)
 
+    def _on_write_policy_requested(self, policy: str) -> None:
+        self._socket_write_policy = SocketWritePolicy(policy)
+        self._apply_socket_write_policy()
+
+    def _apply_socket_write_policy(self) -> None:
+        """终端模式固定使用交互策略，离开后恢复用户选择的策略。"""
+        policy = (
+            SocketWritePolicy.INTERACTIVE
+            if self.terminal_mode
+            else self._socket_write_policy
+        )
+        self.socket_handler.set_write_policy(policy)
+        self.connection_panel.set_write_policy(policy.value)
+        self.socket_write_policy_combo.setEnabled(not self.terminal_mode)
+        self._update_socket_write_stats()
+
+    def _update_socket_write_stats(self) -> None:
+        """在发送策略下拉框的提示里显示本会话的发送统计。"""
+        stats = self.socket_handler.write_stats()
+        if not isinstance(stats, SocketWriteStats):
+            return
+        tip = self.t("socket_write_stats").format(
+            stats.writes, stats.flushes, stats.sends, stats.bytes_per_send
+        )
+        if self.terminal_mode:
+            tip = self.t("write_policy_terminal") + "\n" + tip
+        self.socket_write_policy_combo.setToolTip(tip)
+
     def _set_connection_controls_enabled(self, enabled: bool) -> None:
         self.connection_panel.set_controls_enabled(
             enabled,
@@ -888,6 +1172,9 @@ class SerialMonitor(QMainWindow):
         if mode != self.connection_mode:
             return
 
+        if transition.current is TransportState.CONNECTED:
+            # 上一次连接里没写完的发送不会再有回报
+            self._pending_send_lines.clear()
         if (
             transition.current is TransportState.CONNECTED
             and not self.terminal_mode
@@ -940,6 +1227,7 @@ class SerialMonitor(QMainWindow):
 
     def toggle_terminal_mode(self) -> None:
         """切换终端模式 / 普通模式。"""
+        self.receive_pipeline.flush()
         self.terminal_mode = not self.terminal_mode
         self.terminal_mode_button.setChecked(self.terminal_mode)
 
@@ -966,6 +1254,7 @@ class SerialMonitor(QMainWindow):
             self.terminal_emulator.search_highlight = None
             self.terminal_emulator._dirty = True
 
+        self._apply_socket_write_policy()
         self.update_texts()
 
     def _on_paste_warning(self, lines: int) -> None:
@@ -987,6 +1276,8 @@ class SerialMonitor(QMainWindow):
 
     def _close_search(self) -> None:
         self._clear_search_highlights()
+        self._cancel_history_search()
+        self.history_results.hide()
 
     def _do_search(self, text: str, forward: bool, case_sensitive: bool) -> None:
         if self.terminal_mode:
@@ -994,31 +1285,63 @@ class SerialMonitor(QMainWindow):
         else:
             self._search_normal(text, forward, case_sensitive)
 
-    def _search_normal(self, text: str, forward: bool, case_sensitive: bool) -> None:
-        doc = self.terminal_display.document()
-        cursor = self.terminal_display.textCursor()
+    def _do_history_search(self, text: str, case_sensitive: bool) -> None:
+        """在后台线程中搜索本会话全部已裁剪的日志文件。"""
+        self.history_results.clear()
+        self.history_results.show()
+        files = self.trim_manager.history_files()
+        if not files:
+            self.search_bar.set_status(self.t("history_empty"))
+            return
+        self.search_bar.set_history_running(True)
+        self.search_bar.set_status(self.t("history_searching", 0, 0))
+        # 先等后台写入器把已裁剪的内容落盘，再开始读文件
+        self.history_search.start(
+            files,
+            text,
+            case_sensitive,
+            prepare=lambda: self.trim_manager.flush(timeout=2.0),
+        )
+
+    def _cancel_history_search(self) -> None:
+        self.history_search.cancel()
 
-        find_flags = QTextDocument.FindFlag(0)
-        if not forward:
-            find_flags |= QTextDocument.FindFlag.FindBackward
-        if case_sensitive:
-            find_flags |= QTextDocument.FindFlag.FindCaseSensitively
-
-        result = doc.find(text, cursor, find_flags)
-
-        if result.isNull():
-            wrapped_cursor = QTextCursor(doc)
-            if not forward:
-                wrapped_cursor.movePosition(QTextCursor.MoveOperation.End)
-            result = doc.find(text, wrapped_cursor, find_flags)
-
-        if not result.isNull():
-            self.terminal_display.setTextCursor(result)
-            total = self._count_matches(doc, text, case_sensitive)
-            current = self._current_match_index(doc, result, text, case_sensitive)
-            self.search_bar.update_result(current, total)
+    def _on_history_results(self, matches: list[HistoryMatch]) -> None:
+        items = []
+        for match in matches:
+            stamp = ""
+            if match.timestamp is not None:
+                stamp = datetime.fromtimestamp(match.timestamp).strftime(
+                    "%Y-%m-%d %H:%M:%S  "
+                )
+            items.append(f"{match.source.name}:{match.line}  {stamp}{match.text}")
+        self.history_results.addItems(items)
+
+    def _on_history_progress(self, scanned: int, total: int) -> None:
+        percent = scanned * 100 // total if total else 100
+        self.search_bar.set_status(
+            self.t("history_searching", self.history_results.count(), percent)
+        )
+
+    def _on_history_finished(self, total: int, cancelled: bool) -> None:
+        self.search_bar.set_history_running(False)
+        if cancelled:
+            status = self.t("history_cancelled", total)
+        elif self.history_search.truncated:
+            status = self.t("history_truncated", total)
         else:
+            status = self.t("history_done", total)
+        self.search_bar.set_status(status)
+
+    def _search_normal(self, text: str, forward: bool, case_sensitive: bool) -> None:
+        self.search_index.set_query(text, case_sensitive)
+        found = self.search_index.find(self.terminal_display.textCursor(), forward)
+        if found is None:
             self.search_bar.set_no_result()
+            return
+        current, cursor = found
+        self.terminal_display.setTextCursor(cursor)
+        self.search_bar.update_result(current, self.search_index.count())
 
     def _search_terminal(self, text: str, forward: bool, case_sensitive: bool) -> None:
         grid = self.terminal_emulator.grid
@@ -1031,7 +1354,7 @@ class SerialMonitor(QMainWindow):
 
         matches: list[tuple[int, int]] = []
         for r in range(rows):
-            row_text = "".join(cell.char for cell in grid[r])
+            row_text = grid[r].text()
             start = 0
             while True:
                 if case_sensitive:
@@ -1081,41 +1404,6 @@ class SerialMonitor(QMainWindow):
             self.terminal_emulator._dirty = True
             self.terminal_emulator._schedule_render()
 
-    @staticmethod
-    def _count_matches(doc: QTextDocument, text: str, case_sensitive: bool) -> int:
-        cursor = QTextCursor(doc)
-        flags = QTextDocument.FindFlag(0)
-        if case_sensitive:
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        count = 0
-        while True:
-            cursor = doc.find(text, cursor, flags)
-            if cursor.isNull():
-                break
-            count += 1
-        return count
-
-    @staticmethod
-    def _current_match_index(
-        doc: QTextDocument,
-        current: QTextCursor,
-        text: str,
-        case_sensitive: bool,
-    ) -> int:
-        cursor = QTextCursor(doc)
-        flags = QTextDocument.FindFlag(0)
-        if case_sensitive:
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        idx = 0
-        while True:
-            cursor = doc.find(text, cursor, flags)
-            if cursor.isNull():
-                break
-            idx += 1
-            if cursor.selectionStart() == current.selectionStart():
-                return idx
-        return 0
-
     # ── 连接操作 ─────────────────────────────────────────────
 
     def refresh_ports(self) -> None:
@@ -1176,9 +1464,7 @@ class SerialMonitor(QMainWindow):
             return
         self._capture_connection_settings(ConnectionMode.SERIAL.value)
 
-        self._receive_decoder.reset()
-        self._receive_at_line_start = True
-        self._receive_pending_cr = False
+        self._reset_receive_state()
         config = SerialConnectionConfig(
             port=port,
             baudrate=self.baudrate_combo.currentText(),
@@ -1227,9 +1513,7 @@ class SerialMonitor(QMainWindow):
         self._capture_connection_settings(ConnectionMode.TCP.value)
         self.current_socket_host = host
         self.current_socket_port = port
-        self._receive_decoder.reset()
-        self._receive_at_line_start = True
-        self._receive_pending_cr = False
+        self._reset_receive_state()
 
         ok = self.connection_controller.connect(
             TcpConnectionConfig(host, port), interactive=show_error
@@ -1271,9 +1555,7 @@ class SerialMonitor(QMainWindow):
         self._capture_connection_settings(ConnectionMode.RFC2217.value)
         self.current_rfc2217_host = host
         self.current_rfc2217_port = port
-        self._receive_decoder.reset()
-        self._receive_at_line_start = True
-        self._receive_pending_cr = False
+        self._reset_receive_state()
 
         config = Rfc2217ConnectionConfig(
             host=host,
@@ -1333,9 +1615,19 @@ class SerialMonitor(QMainWindow):
 
     @staticmethod
     def get_timestamp() -> str:
-        return datetime.now().strftime("[%H:%M:%S.%f")[:-3] + "] "
+        return format_timestamp(time.time())
 
     def append_to_terminal(self, text: str, with_timestamp: bool = True) -> None:
+        # 先落下已缓冲的接收数据，保证状态消息与数据流的先后顺序
+        self.receive_pipeline.flush()
+        self._append_parts_to_terminal(
+            [(text, time.time() if with_timestamp else None)]
+        )
+
+    def _append_parts_to_terminal(self, parts: list[ReceivePart]) -> None:
+        """在一个编辑块内写入多段文本，只做一次裁剪检查与光标恢复。"""
+        if not parts:
+            return
         saved_cursor = self.terminal_display.textCursor()
         has_selection = saved_cursor.hasSelection()
 
@@ -1345,18 +1637,23 @@ class SerialMonitor(QMainWindow):
 
         cursor = self.terminal_display.textCursor()
         cursor.beginEditBlock()
-        if with_timestamp and self.show_timestamp:
-            cursor.insertText(
-                self.get_timestamp(), self.ansi_parser.get_timestamp_format()
-            )
+        last_stamp: float | None = None
+        timestamp = ""
+        for text, stamp in parts:
+            if stamp is not None and self.show_timestamp:
+                if stamp != last_stamp:
+                    # 同一数据块里的多行时刻相同，只格式化一次
+                    last_stamp = stamp
+                    timestamp = format_timestamp(stamp)
+                cursor.insertText(
+                    timestamp, self.ansi_parser.get_timestamp_format()
+                )
 
-        if not self.enable_ansi_colors:
-            clean_text = self.ansi_parser.strip_ansi(text)
-            cursor.insertText(clean_text)
-        else:
-            segments = self.ansi_parser.parse_text(text)
-            for segment_text, fmt in segments:
-                cursor.insertText(segment_text, fmt)
+            if not self.enable_ansi_colors:
+                cursor.insertText(self.ansi_parser.strip_ansi(text))
+            else:
+                for segment_text, fmt in self.ansi_parser.parse_text(text):
+                    cursor.insertText(segment_text, fmt)
 
         cursor.endEditBlock()
 
@@ -1370,51 +1667,58 @@ class SerialMonitor(QMainWindow):
             self.terminal_display.setTextCursor(saved_cursor)
 
     def _append_received_text(self, text: str) -> None:
-        if self._receive_pending_cr:
-            text = "\r" + text
-            self._receive_pending_cr = False
-        if text.endswith("\r"):
-            text = text[:-1]
-            self._receive_pending_cr = True
-
-        for part in text.splitlines(keepends=True):
-            self.append_to_terminal(
-                part, with_timestamp=self._receive_at_line_start
-            )
-            self._receive_at_line_start = part.endswith(("\n", "\r"))
+        self._append_parts_to_terminal(
+            self.receive_decoder.split_lines(text, time.time())
+        )
 
-    def _on_serial_data(self, data: bytes) -> None:
-        if not data:
-            return
+    def _reset_receive_state(self) -> None:
+        """切换会话/模式前落下缓冲数据并复位解码状态。"""
+        self.receive_pipeline.flush()
+        self.receive_decoder.reset()
 
-        if self.terminal_mode:
-            # 终端模式：模拟器渲染，同时镜像到隐藏文档以保留历史/参与裁剪
-            self.terminal_emulator.process_bytes(data)
-            text = self._receive_decoder.decode(data, final=False)
-            if text:
-                self._append_received_text(text)
-        elif self.receive_hex_mode:
-            text = format_hex(data) + "\n"
-            self.append_to_terminal(text, with_timestamp=True)
+    def _on_serial_data(self, data: bytes) -> None:
+        self._on_serial_batch([data], [time.time()])
+
+    def _on_serial_batch(self, chunks: list[bytes], stamps: list[float]) -> int:
+        """处理一批接收数据块，返回写入日志视图的行数。
+
+        `stamps` 是各数据块的到达时刻，行首时间戳取自行首所在的数据块。
+        """
+        if not any(chunks):
+            return 0
+
+        parts: list[ReceivePart]
+        if self.receive_hex_mode and not self.terminal_mode:
+            # HEX 模式保留数据块边界：每块一行
+            parts = [
+                (format_hex(chunk) + "\n", stamp)
+                for chunk, stamp in zip(chunks, stamps)
+                if chunk
+            ]
         else:
-            text = self._receive_decoder.decode(data, final=False)
-            if text:
-                self._append_received_text(text)
+            if self.terminal_mode:
+                # 终端模式：模拟器渲染，同时镜像到隐藏文档以保留历史/参与裁剪
+                data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+                self.terminal_emulator.process_bytes(data)
+            parts = self.receive_decoder.feed_chunks(chunks, stamps)
+
+        self._append_parts_to_terminal(parts)
+        return len(parts)
 
     def _append_transport_error(self, message: str) -> None:
+        self.receive_pipeline.flush()
         if self.terminal_mode:
             self.terminal_emulator.process_bytes(
                 (message + "\r\n").encode("utf-8", errors="replace")
             )
         # 错误插到数据流中间时，先冲刷数据流持有的行尾 CR，保持行序
-        if self._receive_pending_cr:
-            self._receive_pending_cr = False
-            self.append_to_terminal(
-                "\r", with_timestamp=self._receive_at_line_start
-            )
+        decoder = self.receive_decoder
+        if decoder.pending_cr:
+            decoder.pending_cr = False
+            self.append_to_terminal("\r", with_timestamp=decoder.at_line_start)
         self.append_to_terminal(message + "\n", with_timestamp=True)
         # 错误消息以换行结尾，后续接收数据应从带时间戳的新行开始
-        self._receive_at_line_start = True
+        decoder.at_line_start = True
 
     def _on_connection_error(
         self, mode: str, error: TransportError, interactive: bool
@@ -1458,6 +1762,93 @@ class SerialMonitor(QMainWindow):
             message = self.t("rfc2217_io_error").format(error.message)
         self._append_transport_error(message)
 
+    # ── 附加会话 ─────────────────────────────────────────────
+
+    def add_session(self) -> None:
+        dialog = AddSessionDialog(
+            self, self.language, self.serial_handler.get_available_ports()
+        )
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        config = dialog.get_config()
+        if config is None:
+            QMessageBox.warning(self, self.t("warning"), self.t("session_invalid"))
+            return
+        self.open_session(config)
+
+    def open_session(self, config: ConnectionConfig) -> str:
+        """在独立面板里打开（或重新打开）一个附加会话，返回会话 ID。
+
+        打开失败时面板保留并显示错误，可稍后重连或关闭。
+        """
+        session_id = SessionRegistry.default_id(config)
+        view = self.session_views.get(session_id)
+        if view is None:
+            view = self._create_session_view(session_id)
+        self._session_docks[session_id].raise_()
+        controller = self.connection_controller
+        if controller.session_state(session_id) is TransportState.DISCONNECTED:
+            controller.open_session(config, session_id)
+        return session_id
+
+    def reconnect_session(self, session_id: str) -> None:
+        sessions = self.connection_controller.sessions
+        if session_id in sessions:
+            self.open_session(sessions.session(session_id).config)
+
+    def close_session(self, session_id: str) -> None:
+        """断开会话、关闭它的裁剪日志并移除面板。"""
+        if not self.connection_controller.sessions.remove(session_id):
+            logger.warning("Session %s did not stop before close", session_id)
+        view = self.session_views.pop(session_id, None)
+        dock = self._session_docks.pop(session_id, None)
+        if view is not None and not view.shutdown(timeout=2.0):
+            logger.warning("Trim log of session %s did not finish", session_id)
+        if dock is not None:
+            self.removeDockWidget(dock)
+            dock.deleteLater()
+
+    def _create_session_view(self, session_id: str) -> SessionView:
+        trim_manager = TerminalTrimManager(label=session_id)
+        trim_manager.load_from_dict(self.trim_manager.to_dict())
+        view = SessionView(session_id, trim_manager, self.language)
+        view.show_timestamp = self.show_timestamp
+        view.enable_ansi_colors = self.enable_ansi_colors
+        view.close_requested.connect(self.close_session)
+        view.reconnect_requested.connect(self.reconnect_session)
+
+        dock = QDockWidget(session_id, self)
+        dock.setObjectName(f"session:{session_id}")
+        dock.setFeatures(
+            QDockWidget.DockWidgetFeature.DockWidgetMovable
+            | QDockWidget.DockWidgetFeature.DockWidgetFloatable
+        )
+        dock.setWidget(view)
+        docks = list(self._session_docks.values())
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, dock)
+        if docks:
+            self.tabifyDockWidget(docks[-1], dock)
+        self.session_views[session_id] = view
+        self._session_docks[session_id] = dock
+        return view
+
+    def _on_session_data(self, session_id: str, data: bytes) -> None:
+        view = self.session_views.get(session_id)
+        if view is not None:
+            view.push(data)
+
+    def _on_session_state_changed(
+        self, session_id: str, transition: TransportTransition
+    ) -> None:
+        view = self.session_views.get(session_id)
+        if view is not None:
+            view.set_state(transition)
+
+    def _on_session_error(self, session_id: str, error: TransportError) -> None:
+        view = self.session_views.get(session_id)
+        if view is not None:
+            view.append_message(self.t("session_error").format(error.message))
+
     # ── 数据发送 ─────────────────────────────────────────────
 
     def send_data(self) -> None:
@@ -1522,24 +1913,57 @@ class SerialMonitor(QMainWindow):
         if display_sent and display_text is not None:
             if result.checksum is not None:
                 display_text += self.t("ck_tag").format(result.checksum)
-            if result.status is SendStatus.QUEUED:
-                sent_key = queued_key or (
-                    "queued_hex" if display_as_hex else "queued"
+            queued_line = self.t(
+                queued_key or ("queued_hex" if display_as_hex else "queued")
+            ).format(display_text)
+            sent_line = self.t(
+                sent_key or ("sent_hex" if display_as_hex else "sent")
+            ).format(display_text)
+            if result.status is SendStatus.QUEUED and result.ticket is not None:
+                # 写入线程回报后再记录，不在 GUI 线程里等待写完
+                self._pending_send_lines[result.ticket] = (
+                    display_text,
+                    sent_line,
+                    queued_line,
+                    len(result.payload),
                 )
-            else:
-                sent_key = sent_key or (
-                    "sent_hex" if display_as_hex else "sent"
+                QTimer.singleShot(
+                    self.SEND_ACK_MS, partial(self._on_send_ack_timeout, result.ticket)
                 )
-            line = self.t(sent_key).format(display_text)
-            if self.terminal_mode:
-                self.statusBar().showMessage(line, 3000)
+            elif result.status is SendStatus.QUEUED:
+                self._show_send_line(queued_line)
             else:
-                self.append_to_terminal(line + "\n", with_timestamp=True)
+                self._show_send_line(sent_line)
         return result
 
+    def _show_send_line(self, line: str) -> None:
+        if self.terminal_mode:
+            self.statusBar().showMessage(line, 3000)
+        else:
+            self.append_to_terminal(line + "\n", with_timestamp=True)
+
+    def _on_write_completed(self, ticket: int, written: int, elapsed: float) -> None:
+        entry = self._pending_send_lines.pop(ticket, None)
+        if entry is None:
+            return
+        display_text, sent_line, _queued_line, size = entry
+        if written >= size:
+            self._show_send_line(sent_line)
+        elif written > 0:
+            self._show_send_line(
+                self.t("sent_partial").format(written, size, display_text)
+            )
+        # 一个字节都没写出时写入错误已经由 transport_error 报告
+
+    def _on_send_ack_timeout(self, ticket: int) -> None:
+        entry = self._pending_send_lines.get(ticket)
+        if entry is not None:
+            self._show_send_line(entry[2])
+
     # ── 模式切换 ─────────────────────────────────────────────
 
     def clear_receive_area(self) -> None:
+        self.receive_pipeline.flush()
         if self.terminal_mode:
             self.terminal_emulator.clear_screen()
             # 终端模式的历史镜像在隐藏文档里，必须一并清除
@@ -1551,10 +1975,9 @@ class SerialMonitor(QMainWindow):
         self.send_input.clear()
 
     def toggle_receive_mode(self) -> None:
+        # 已到达的数据按到达时的模式显示，再切换
+        self._reset_receive_state()
         self.receive_hex_mode = not self.receive_hex_mode
-        self._receive_decoder.reset()
-        self._receive_at_line_start = True
-        self._receive_pending_cr = False
         self.receive_mode_button.setText(
             self.t("receive_mode_hex")
             if self.receive_hex_mode
@@ -1578,10 +2001,14 @@ class SerialMonitor(QMainWindow):
 
     def toggle_timestamp(self) -> None:
         self.show_timestamp = self.timestamp_checkbox.isChecked()
+        for view in self.session_views.values():
+            view.show_timestamp = self.show_timestamp
 
     def toggle_ansi_colors(self) -> None:
         self.enable_ansi_colors = self.ansi_colors_checkbox.isChecked()
         self.terminal_emulator.enable_ansi_colors = self.enable_ansi_colors
+        for view in self.session_views.values():
+            view.enable_ansi_colors = self.enable_ansi_colors
 
     def toggle_auto_reconnect(self) -> None:
         self.auto_reconnect = self.auto_reconnect_checkbox.isChecked()
@@ -1598,6 +2025,8 @@ class SerialMonitor(QMainWindow):
                     self.connection_controller.disconnect(
                         DisconnectReason.DEVICE_REMOVED
                     )
+        if self.connection_mode == ConnectionMode.TCP.value:
+            self._update_socket_write_stats()
         self.connection_controller.poll_reconnect(
             auto_reconnect=self.auto_reconnect
         )
@@ -1694,13 +2123,32 @@ class SerialMonitor(QMainWindow):
         self.trim_manager.enabled = settings.trim_enabled
         self.trim_manager.max_lines = settings.max_terminal_lines
         self.trim_manager.batch_lines = settings.trim_batch_lines
+        self.trim_manager.archive_enabled = settings.trim_archive_enabled
+        self.trim_manager.archive_segment_bytes = (
+            settings.trim_archive_segment_mb * 1024 * 1024
+        )
+        self.trim_manager.retention = ArchiveRetention(
+            max_total_bytes=settings.trim_retention_mb * 1024 * 1024,
+            max_age_seconds=settings.trim_retention_days * 86400,
+        )
         self._rebuild_trim_menu()
+        self.receive_pipeline.interval_ms = settings.receive_flush_interval_ms
+        self.serial_handler.set_write_pacing(
+            settings.write_pacing, settings.write_pacing_bps
+        )
+        self.serial_handler.set_io_backend(settings.serial_io_backend)
+        self._socket_write_policy = SocketWritePolicy(settings.socket_write_policy)
+        self._apply_socket_write_policy()
+        self.terminal_emulator.set_scrollback_lines(
+            settings.terminal_scrollback_lines
+        )
 
         if settings.terminal_mode:
             self.toggle_terminal_mode()
 
     def save_settings(self) -> None:
         self._capture_connection_settings(self.connection_mode)
+        trim_data = self.trim_manager.to_dict()
         settings = AppSettings(
             geometry=self.saveGeometry().data().hex(),
             language=self.language,
@@ -1722,6 +2170,16 @@ class SerialMonitor(QMainWindow):
             trim_enabled=self.trim_manager.enabled,
             max_terminal_lines=self.trim_manager.max_lines,
             trim_batch_lines=self.trim_manager.batch_lines,
+            trim_archive_enabled=self.trim_manager.archive_enabled,
+            trim_archive_segment_mb=trim_data["trim_archive_segment_mb"],
+            trim_retention_mb=trim_data["trim_retention_mb"],
+            trim_retention_days=trim_data["trim_retention_days"],
+            receive_flush_interval_ms=self.receive_pipeline.interval_ms,
+            write_pacing=self.serial_handler.write_pacing.value,
+            write_pacing_bps=self.serial_handler.write_pacing_bps,
+            serial_io_backend=self.serial_handler.io_backend.value,
+            socket_write_policy=self._socket_write_policy.value,
+            terminal_scrollback_lines=self.terminal_emulator.scrollback_lines,
         )
         ConfigManager.save_app_settings(settings)
         self.quick_send_manager.save_settings()
@@ -1733,6 +2191,12 @@ class SerialMonitor(QMainWindow):
             mode.value for mode in ConnectionMode
         )
         self.close_connection(silent=True)
+        self.connection_controller.stop_replay()
+        self.receive_pipeline.discard()
+        self.history_search.cancel(timeout=1.0)
+        if not self.trim_manager.close(timeout=2.0):
+            logger.warning("Trim log writer did not finish before close")
+        self._set_capture_enabled(False)
         # 关闭不可被传输层否决：无法停止的后台任务只记录，不阻止用户退出
         if not self.rfc2217_handler.shutdown(timeout_ms=3000):
             logger.warning("RFC2217 worker did not stop before close")
@@ -1740,6 +2204,10 @@ class SerialMonitor(QMainWindow):
             logger.warning("Serial reader did not stop before close")
         self.device_check_timer.stop()
         self.socket_handler.shutdown(timeout_ms=1000)
+        for session_id in list(self.session_views):
+            self.close_session(session_id)
+        if not self.connection_controller.sessions.shutdown(timeout_ms=1000):
+            logger.warning("Some background sessions did not stop before close")
         self.quick_send_manager.close()
         self._closing = False
         event.accept()
@@ -39,6 +39,9 @@ class QuickSendManager:
         """创建快捷发送面板"""
         self.panel = QuickSendPanel(None, language=self.main_window.language)
         self.panel.send_requested.connect(self.send_item)
+        self.main_window.connection_controller.write_backpressure_changed.connect(
+            self.panel.set_send_paused
+        )
         self.panel.resize(300, 450)
 
         items = ConfigManager.load_quick_sends()
@@ -42,6 +42,8 @@ class QuickSendPanel(QWidget):
         super().__init__(parent, Qt.WindowType.Window)
         self.language: str = language
         self.quick_send_queue: list[QListWidgetItem] = []
+        # 发送队列积压（背压）时暂停顺序发送，积压消退后继续
+        self._paused = False
         self.quick_send_timer = QTimer()
         self.quick_send_timer.timeout.connect(self._send_next_in_queue)
 
@@ -322,11 +324,13 @@ class QuickSendPanel(QWidget):
         self.stop_button.setEnabled(True)
 
         self._send_next_in_queue()
-        if self.quick_send_queue:
+        if self.quick_send_queue and not self._paused:
             self.quick_send_timer.start(self.interval_spinbox.value())
 
     def _send_next_in_queue(self) -> None:
         """发送队列中的下一项"""
+        if self._paused:
+            return
         if not self.quick_send_queue:
             self.stop_sequence_send()
             return
@@ -338,6 +342,14 @@ class QuickSendPanel(QWidget):
         if not self.quick_send_queue:
             self.stop_sequence_send()
 
+    def set_send_paused(self, paused: bool) -> None:
+        """暂停/恢复顺序发送，不清空待发送队列"""
+        self._paused = paused
+        if paused:
+            self.quick_send_timer.stop()
+        elif self.quick_send_queue and not self.quick_send_timer.isActive():
+            self.quick_send_timer.start(self.interval_spinbox.value())
+
     def stop_sequence_send(self) -> None:
         """停止顺序发送"""
         self.quick_send_timer.stop()
@@ -0,0 +1,186 @@
+"""
+接收数据合并管线
+
+传输层每到一个数据块就发一次信号，高波特率下逐块刷新文档会占满 GUI 线程。
+这里把同一显示帧内到达的数据块攒起来，到点后一次性交给显示端处理；
+每个数据块在到达时记下时间，合并写入不会推迟行首时间戳。
+`ReceiveTextDecoder` 再把字节流切成带到达时间的显示行。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+# 显示片段：(文本, 行首时间戳的时刻)；续接上一行的片段不加时间戳，为 None
+ReceivePart = tuple[str, Optional[float]]
+
+
+def format_timestamp(stamp: float) -> str:
+    """把 time.time() 时刻格式化为日志视图的毫秒时间戳。"""
+    return datetime.fromtimestamp(stamp).strftime("[%H:%M:%S.%f")[:-3] + "] "
+
+
+@dataclass(frozen=True)
+class ReceiveFlushStats:
+    """一次刷新合并的数据量。"""
+
+    chunks: int
+    lines: int
+    bytes: int
+
+
+class ReceiveAccumulator(QObject):
+    """按显示帧节流的接收缓冲。
+
+    `push()` 只追加数据块（连同到达时间）并在需要时启动单发定时器；定时器
+    到点或显式调用 `flush()` 时把缓冲的全部数据块和对应的到达时间一次交给
+    sink。sink 返回本次写入的行数，用于统计每次刷新合并了多少内容。
+    """
+
+    flushed = pyqtSignal(object)
+
+    DEFAULT_INTERVAL_MS = 16
+    MIN_INTERVAL_MS = 1
+    MAX_INTERVAL_MS = 1000
+
+    def __init__(
+        self,
+        sink: Callable[[list[bytes], list[float]], int],
+        interval_ms: int = DEFAULT_INTERVAL_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._sink = sink
+        self._chunks: list[bytes] = []
+        self._stamps: list[float] = []
+        self._pending_bytes = 0
+        self.last_stats: ReceiveFlushStats | None = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.interval_ms = interval_ms
+
+    @property
+    def interval_ms(self) -> int:
+        return self._timer.interval()
+
+    @interval_ms.setter
+    def interval_ms(self, value: int) -> None:
+        self._timer.setInterval(
+            max(self.MIN_INTERVAL_MS, min(self.MAX_INTERVAL_MS, int(value)))
+        )
+
+    def pending_chunks(self) -> int:
+        return len(self._chunks)
+
+    def pending_bytes(self) -> int:
+        return self._pending_bytes
+
+    def push(self, data: bytes, stamp: Optional[float] = None) -> None:
+        """缓冲一个数据块；本帧第一个数据块负责启动刷新定时器。
+
+        `stamp` 为到达时刻（time.time()），缺省取当前时间。
+        """
+        if not data:
+            return
+        self._chunks.append(data)
+        self._stamps.append(time.time() if stamp is None else stamp)
+        self._pending_bytes += len(data)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> ReceiveFlushStats | None:
+        """立即把缓冲内容交给 sink。没有待处理数据时返回 None。"""
+        self._timer.stop()
+        if not self._chunks:
+            return None
+        # 先摘下缓冲再回调，sink 内部再触发 flush 时不会重复处理
+        chunks, self._chunks = self._chunks, []
+        stamps, self._stamps = self._stamps, []
+        size, self._pending_bytes = self._pending_bytes, 0
+        lines = self._sink(chunks, stamps)
+        stats = ReceiveFlushStats(chunks=len(chunks), lines=lines, bytes=size)
+        self.last_stats = stats
+        logger.debug(
+            "Receive flush merged %d chunks, %d lines, %d bytes",
+            stats.chunks,
+            stats.lines,
+            stats.bytes,
+        )
+        self.flushed.emit(stats)
+        return stats
+
+    def discard(self) -> None:
+        """丢弃尚未刷新的数据（关闭窗口时使用）。"""
+        self._timer.stop()
+        self._chunks = []
+        self._stamps = []
+        self._pending_bytes = 0
+
+
+class ReceiveTextDecoder:
+    """接收字节到显示行的增量解码。
+
+    UTF-8 多字节字符和 CRLF 跨数据块时不会被拆开；从行首开始的片段带上
+    所在数据块的到达时间（用于时间戳），续接上一行的片段为 None。每个
+    接收视图各持有一个。
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")(
+            errors="backslashreplace"
+        )
+        self.at_line_start: bool = True
+        self.pending_cr: bool = False
+
+    def reset(self) -> None:
+        self._decoder.reset()
+        self.at_line_start = True
+        self.pending_cr = False
+
+    def feed(self, data: bytes, stamp: float) -> list[ReceivePart]:
+        """解码一个数据块，返回 (文本, 时间戳时刻) 列表。"""
+        text = self._decoder.decode(data, final=False)
+        return self.split_lines(text, stamp) if text else []
+
+    def feed_chunks(
+        self, chunks: list[bytes], stamps: list[float]
+    ) -> list[ReceivePart]:
+        """逐块解码一批数据，每行取行首所在数据块的到达时间。
+
+        跨数据块的同一行合并成一个片段，插入次数与整批解码时相同。
+        """
+        parts: list[ReceivePart] = []
+        for chunk, stamp in zip(chunks, stamps):
+            for text, line_stamp in self.feed(chunk, stamp):
+                if line_stamp is None and parts:
+                    parts[-1] = (parts[-1][0] + text, parts[-1][1])
+                else:
+                    parts.append((text, line_stamp))
+        return parts
+
+    def split_lines(self, text: str, stamp: float) -> list[ReceivePart]:
+        """把解码后的文本切成行，从行首开始的行标上 stamp。"""
+        if self.pending_cr:
+            text = "\r" + text
+            self.pending_cr = False
+        if text.endswith("\r"):
+            text = text[:-1]
+            self.pending_cr = True
+
+        parts: list[ReceivePart] = []
+        for part in text.splitlines(keepends=True):
+            parts.append((part, stamp if self.at_line_start else None))
+            self.at_line_start = part.endswith(("\n", "\r"))
+        return parts
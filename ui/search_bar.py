@@ -2,6 +2,7 @@
 搜索栏组件
 
 提供内嵌式搜索栏，支持上/下查找、大小写敏感、匹配计数显示。
+打开"全部历史"后回车改为搜索已裁剪到日志文件中的内容，可随时停止。
 Ctrl+F 打开，Esc 关闭。
 
 Copyright (C) 2026 cpevor. Licensed under GPL v3.
@@ -26,10 +27,13 @@ class SearchBar(QFrame):
 
     search_requested = pyqtSignal(str, bool, bool)  # text, forward, case_sensitive
     close_requested = pyqtSignal()
+    history_requested = pyqtSignal(str, bool)  # text, case_sensitive
+    history_cancel_requested = pyqtSignal()
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._case_sensitive: bool = False
+        self._history_mode: bool = False
         self._init_ui()
 
     def _init_ui(self) -> None:
@@ -62,6 +66,18 @@ class SearchBar(QFrame):
         self.case_button.setToolTip("Case sensitive")
         self.case_button.clicked.connect(self._toggle_case)
 
+        self.history_button = QPushButton("All")
+        self.history_button.setFixedSize(36, 28)
+        self.history_button.setCheckable(True)
+        self.history_button.setToolTip("Search all history")
+        self.history_button.clicked.connect(self._toggle_history)
+
+        self.stop_button = QPushButton("■")
+        self.stop_button.setFixedSize(28, 28)
+        self.stop_button.setToolTip("Stop")
+        self.stop_button.clicked.connect(self.history_cancel_requested.emit)
+        self.stop_button.hide()
+
         self.result_label = QLabel("")
         self.result_label.setFixedWidth(80)
         self.result_label.setAlignment(
@@ -77,6 +93,8 @@ class SearchBar(QFrame):
         layout.addWidget(self.prev_button)
         layout.addWidget(self.next_button)
         layout.addWidget(self.case_button)
+        layout.addWidget(self.history_button)
+        layout.addWidget(self.stop_button)
         layout.addWidget(self.result_label)
         layout.addWidget(self.close_button)
 
@@ -97,6 +115,20 @@ class SearchBar(QFrame):
         self.next_button.setToolTip(texts.get("search_next", "Next"))
         self.case_button.setToolTip(texts.get("search_case", "Case sensitive"))
         self.close_button.setToolTip(texts.get("search_close", "Close"))
+        self.history_button.setToolTip(
+            texts.get("search_history", "Search all history")
+        )
+        self.stop_button.setToolTip(texts.get("search_stop", "Stop"))
+
+    @property
+    def history_mode(self) -> bool:
+        return self._history_mode
+
+    def set_history_running(self, running: bool) -> None:
+        self.stop_button.setVisible(running)
+
+    def set_status(self, text: str) -> None:
+        self.result_label.setText(text)
 
     def update_result(self, current: int, total: int) -> None:
         if total == 0:
@@ -108,14 +140,19 @@ class SearchBar(QFrame):
         self.result_label.setText("0 / 0")
 
     def _on_text_changed(self, text: str) -> None:
-        if text:
+        if self._history_mode:
+            # 历史搜索开销大，只在回车或点击按钮时开始
+            self.result_label.setText("")
+        elif text:
             self.search_requested.emit(text, True, self._case_sensitive)
         else:
             self.result_label.setText("")
 
     def _on_return_pressed(self) -> None:
         text = self.input.text()
-        if text:
+        if text and self._history_mode:
+            self.history_requested.emit(text, self._case_sensitive)
+        elif text:
             shift = (
                 self.input.queryKeyboardModifiers() & Qt.KeyboardModifier.ShiftModifier
             )
@@ -123,20 +160,33 @@ class SearchBar(QFrame):
 
     def _search_next(self) -> None:
         text = self.input.text()
-        if text:
+        if text and self._history_mode:
+            self.history_requested.emit(text, self._case_sensitive)
+        elif text:
             self.search_requested.emit(text, True, self._case_sensitive)
 
     def _search_prev(self) -> None:
         text = self.input.text()
-        if text:
+        if text and self._history_mode:
+            self.history_requested.emit(text, self._case_sensitive)
+        elif text:
             self.search_requested.emit(text, False, self._case_sensitive)
 
     def _toggle_case(self, checked: bool) -> None:
         self._case_sensitive = checked
         text = self.input.text()
-        if text:
+        if text and not self._history_mode:
             self.search_requested.emit(text, True, self._case_sensitive)
 
+    def _toggle_history(self, checked: bool) -> None:
+        self._history_mode = checked
+        self.result_label.setText("")
+        if not checked:
+            self.history_cancel_requested.emit()
+            text = self.input.text()
+            if text:
+                self.search_requested.emit(text, True, self._case_sensitive)
+
     def _on_close(self) -> None:
         self.hide_bar()
 
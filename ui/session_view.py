@@ -0,0 +1,208 @@
+"""
+附加会话视图
+
+同时监视多块板子时，主窗口的当前连接之外的每个会话在一个可停靠面板里
+显示。每个会话有自己的解码器、接收合并管线和裁剪日志；ANSI 格式取自全局
+共享的 FormatCache，串口会话由共享反应器读写，所有会话的数据都在同一个
+GUI 事件循环里处理。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.ansi_parser import AnsiParser
+from core.protocol import format_hex
+from core.transport import TransportState, TransportTransition
+from ui.receive_pipeline import (
+    ReceiveAccumulator,
+    ReceivePart,
+    ReceiveTextDecoder,
+    format_timestamp,
+)
+from utils.i18n import I18N
+
+if TYPE_CHECKING:
+    from ui.main_window import TerminalTrimManager
+
+
+class SessionView(QWidget):
+    """一个附加会话的接收面板。
+
+    `push()` 接收会话数据，按显示帧合并后解码写入日志视图；裁剪下来的内容
+    写入该会话自己的裁剪日志。关闭和重连只发出请求信号，由主窗口通过
+    会话注册表执行。
+    """
+
+    close_requested = pyqtSignal(str)
+    reconnect_requested = pyqtSignal(str)
+
+    def __init__(
+        self,
+        session_id: str,
+        trim_manager: TerminalTrimManager,
+        language: str = "zh",
+        parent: Optional[QWidget] = None,
+    ) -> None:
+        super().__init__(parent)
+        self.session_id = session_id
+        self.trim_manager = trim_manager
+        self.language = language
+        self.hex_mode: bool = False
+        self.show_timestamp: bool = True
+        self.enable_ansi_colors: bool = True
+        self.state = TransportState.DISCONNECTED
+
+        self.ansi_parser = AnsiParser()
+        self.receive_decoder = ReceiveTextDecoder()
+        self.receive_pipeline = ReceiveAccumulator(self._on_batch, parent=self)
+        self.init_ui()
+
+    def t(self, key: str, *args: Any) -> str:
+        return I18N.get(self.language, key, *args)
+
+    def init_ui(self) -> None:
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        header = QHBoxLayout()
+        self.state_label = QLabel()
+        self.hex_checkbox = QCheckBox("HEX")
+        self.hex_checkbox.toggled.connect(self._set_hex_mode)
+        self.clear_button = QPushButton()
+        self.clear_button.clicked.connect(self.clear)
+        self.reconnect_button = QPushButton()
+        self.reconnect_button.clicked.connect(
+            lambda: self.reconnect_requested.emit(self.session_id)
+        )
+        self.close_button = QPushButton()
+        self.close_button.clicked.connect(
+            lambda: self.close_requested.emit(self.session_id)
+        )
+        header.addWidget(self.state_label)
+        header.addStretch()
+        header.addWidget(self.hex_checkbox)
+        header.addWidget(self.clear_button)
+        header.addWidget(self.reconnect_button)
+        header.addWidget(self.close_button)
+
+        self.display = QTextEdit()
+        self.display.setReadOnly(True)
+
+        layout.addLayout(header)
+        layout.addWidget(self.display)
+        self.update_texts()
+
+    def update_texts(self) -> None:
+        state_key = {
+            TransportState.CONNECTED: "session_connected",
+            TransportState.CONNECTING: "session_connecting",
+        }.get(self.state, "session_disconnected")
+        self.state_label.setText(f"{self.session_id}  {self.t(state_key)}")
+        self.clear_button.setText(self.t("clear_receive"))
+        self.reconnect_button.setText(self.t("session_reconnect"))
+        self.close_button.setText(self.t("session_close"))
+        self.reconnect_button.setEnabled(
+            self.state is TransportState.DISCONNECTED
+        )
+
+    # ── 数据与状态 ───────────────────────────────────────────
+
+    def push(self, data: bytes) -> None:
+        self.receive_pipeline.push(data)
+
+    def set_state(self, transition: TransportTransition) -> None:
+        self.state = transition.current
+        if transition.current is TransportState.CONNECTED:
+            self.append_message(self.t("connected", self.session_id))
+        elif transition.current is TransportState.DISCONNECTED:
+            self.append_message(self.t("disconnected"))
+        self.update_texts()
+
+    def append_message(self, message: str) -> None:
+        """在数据流中插入一行状态/错误消息。"""
+        self.receive_pipeline.flush()
+        decoder = self.receive_decoder
+        now = time.time()
+        parts: list[ReceivePart] = []
+        if decoder.pending_cr:
+            decoder.pending_cr = False
+            parts.append(("\r", now if decoder.at_line_start else None))
+        elif not decoder.at_line_start:
+            parts.append(("\n", None))
+        parts.append((message + "\n", now))
+        decoder.at_line_start = True
+        self._append_parts(parts)
+
+    def clear(self) -> None:
+        self.receive_pipeline.flush()
+        self.display.clear()
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """丢弃未刷新的数据并关闭裁剪日志。"""
+        self.receive_pipeline.discard()
+        return self.trim_manager.close(timeout)
+
+    def _set_hex_mode(self, enabled: bool) -> None:
+        self.receive_pipeline.flush()
+        self.hex_mode = enabled
+
+    def _on_batch(self, chunks: list[bytes], stamps: list[float]) -> int:
+        parts: list[ReceivePart]
+        if self.hex_mode:
+            parts = [
+                (format_hex(chunk) + "\n", stamp)
+                for chunk, stamp in zip(chunks, stamps)
+                if chunk
+            ]
+        else:
+            parts = self.receive_decoder.feed_chunks(chunks, stamps)
+        self._append_parts(parts)
+        return len(parts)
+
+    def _append_parts(self, parts: list[ReceivePart]) -> None:
+        if not parts:
+            return
+        saved_cursor = self.display.textCursor()
+        scrollbar = self.display.verticalScrollBar()
+        at_bottom = scrollbar is None or scrollbar.value() >= scrollbar.maximum()
+
+        cursor = QTextCursor(self.display.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        last_stamp: float | None = None
+        timestamp = ""
+        for text, stamp in parts:
+            if stamp is not None and self.show_timestamp:
+                if stamp != last_stamp:
+                    last_stamp = stamp
+                    timestamp = format_timestamp(stamp)
+                cursor.insertText(timestamp, self.ansi_parser.get_timestamp_format())
+            if not self.enable_ansi_colors:
+                cursor.insertText(self.ansi_parser.strip_ansi(text))
+            else:
+                for segment_text, fmt in self.ansi_parser.parse_text(text):
+                    cursor.insertText(segment_text, fmt)
+        cursor.endEditBlock()
+
+        self.trim_manager.trim_if_needed(self.display.document())  # type: ignore[arg-type]
+
+        if saved_cursor.hasSelection() or not at_bottom:
+            self.display.setTextCursor(saved_cursor)
+        else:
+            self.display.moveCursor(QTextCursor.MoveOperation.End)
@@ -16,8 +16,11 @@ from __future__ import annotations
 
 import codecs
 import re
+from array import array
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from itertools import chain, groupby
+from typing import Iterable, Iterator, Optional
 
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import (
@@ -29,15 +32,174 @@ from PyQt6.QtGui import (
 )
 from PyQt6.QtWidgets import QApplication, QTextEdit
 
-from core.ansi_parser import AnsiParser
+from core.ansi_parser import DEFAULT_SGR_KEY, AnsiParser, SgrKey, default_format
 
 
-@dataclass
+@dataclass(frozen=True)
 class _Cell:
-    """终端网格中的一个单元格。"""
+    """网格单元格的只读快照。格式对象来自共享缓存，不得原地修改。"""
 
     char: str = " "
-    fmt: QTextCharFormat = field(default_factory=QTextCharFormat)
+    fmt: QTextCharFormat = field(default_factory=default_format)
+
+
+class _StyleTable:
+    """SGR 状态到小整数样式 ID 的驻留表，ID 0 固定为默认格式。
+
+    表内自己持有格式引用，共享 FormatCache 淘汰条目后 ID 仍然有效。
+    清屏时整表重置；表长到 `MAX_STYLES` 或终端复位时由终端调用
+    `compact()`，只保留屏幕和回滚缓冲仍在引用的样式。
+    """
+
+    DEFAULT_ID = 0
+    MAX_STYLES = 4096
+
+    def __init__(self) -> None:
+        self.formats: list[QTextCharFormat] = [default_format()]
+        self._ids: dict[SgrKey, int] = {DEFAULT_SGR_KEY: self.DEFAULT_ID}
+
+    def __len__(self) -> int:
+        return len(self.formats)
+
+    def intern(self, key: SgrKey, fmt: QTextCharFormat) -> int:
+        style = self._ids.get(key)
+        if style is None:
+            style = len(self.formats)
+            self._ids[key] = style
+            self.formats.append(fmt)
+        return style
+
+    def reset(self) -> None:
+        """只保留默认格式。调用方保证已没有行引用其他 ID。"""
+        del self.formats[1:]
+        self._ids = {DEFAULT_SGR_KEY: self.DEFAULT_ID}
+
+    def compact(self, style_arrays: Iterable[array]) -> None:
+        """丢弃 style_arrays 不再引用的样式，并就地把数组改写成新 ID。
+
+        新 ID 保持原有顺序，默认格式仍为 0。
+        """
+        arrays = list(style_arrays)
+        used = {self.DEFAULT_ID}
+        for styles in arrays:
+            used.update(styles)
+        if len(used) == len(self.formats):
+            return
+        remap: dict[int, int] = {}
+        formats: list[QTextCharFormat] = []
+        for old in sorted(used):
+            remap[old] = len(formats)
+            formats.append(self.formats[old])
+        self.formats[:] = formats
+        self._ids = {
+            key: remap[style] for key, style in self._ids.items() if style in remap
+        }
+        lookup = remap.__getitem__
+        for styles in arrays:
+            styles[:] = array("I", map(lookup, styles))
+
+
+class _Row:
+    """紧凑的终端行：字符列表 + 平行的样式 ID 数组。
+
+    按列下标访问返回 `_Cell` 快照，保持 `grid[r][c].char/.fmt` 的读取方式；
+    写入、擦除都走切片赋值。
+    """
+
+    __slots__ = ("chars", "styles", "_table")
+
+    def __init__(self, cols: int, table: _StyleTable) -> None:
+        self.chars: list[str] = [" "] * cols
+        self.styles: array = array("I", [_StyleTable.DEFAULT_ID]) * cols
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __getitem__(self, col: int) -> _Cell:
+        return _Cell(self.chars[col], self._table.formats[self.styles[col]])
+
+    def __iter__(self) -> Iterator[_Cell]:
+        formats = self._table.formats
+        for char, style in zip(self.chars, self.styles):
+            yield _Cell(char, formats[style])
+
+    def text(self) -> str:
+        return "".join(self.chars)
+
+    def is_blank(self) -> bool:
+        return self.chars.count(" ") == len(self.chars)
+
+    def write(self, col: int, text: str, style: int) -> None:
+        """从 col 开始写入 text（调用方保证不越过行尾）。"""
+        end = col + len(text)
+        self.chars[col:end] = text
+        self.styles[col:end] = array("I", [style]) * len(text)
+
+    def clear(self, start: int = 0, end: int | None = None) -> None:
+        """把 [start, end) 恢复为默认格式空格。"""
+        if end is None:
+            end = len(self.chars)
+        if end <= start:
+            return
+        self.chars[start:end] = [" "] * (end - start)
+        self.styles[start:end] = array("I", [_StyleTable.DEFAULT_ID]) * (end - start)
+
+    def resize(self, cols: int) -> None:
+        current = len(self.chars)
+        if cols > current:
+            self.chars.extend([" "] * (cols - current))
+            self.styles.extend(array("I", [_StyleTable.DEFAULT_ID]) * (cols - current))
+        else:
+            del self.chars[cols:]
+            del self.styles[cols:]
+
+
+# 回滚缓冲中的一行：文本 + 样式 ID（整行默认格式时为 None）
+_HistoryLine = tuple[str, Optional[array]]
+
+
+class _Scrollback:
+    """终端回滚缓冲：固定容量的环形队列，满后丢弃最旧的行。
+
+    只保存行文本和样式 ID，内存上限由行数决定，与会话时长无关。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._lines: deque[_HistoryLine] = deque(maxlen=max(0, int(capacity)))
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, index: int) -> _HistoryLine:
+        return self._lines[index]
+
+    @property
+    def capacity(self) -> int:
+        return self._lines.maxlen or 0
+
+    @capacity.setter
+    def capacity(self, value: int) -> None:
+        # 缩容时保留最新的行
+        self._lines = deque(self._lines, maxlen=max(0, int(value)))
+
+    def push(self, row: _Row) -> None:
+        if not self._lines.maxlen:
+            return
+        styles = row.styles
+        if styles.count(_StyleTable.DEFAULT_ID) == len(styles):
+            self._lines.append((row.text(), None))
+        else:
+            self._lines.append((row.text(), array("I", styles)))
+
+    def clear(self) -> None:
+        self._lines.clear()
+
+    def style_arrays(self) -> Iterator[array]:
+        """带非默认样式的行的样式 ID 数组（可就地改写）。"""
+        for _text, styles in self._lines:
+            if styles is not None:
+                yield styles
 
 
 _DEC_GRAPHICS = {
@@ -67,6 +229,10 @@ _DEC_GRAPHICS = {
     "}": "£",
     "~": "·",
 }
+_DEC_GRAPHICS_TABLE = str.maketrans(_DEC_GRAPHICS)
+
+# 不含 C0 控制字符（含 ESC）的最长可打印片段
+_PRINTABLE_RUN = re.compile(r"[^\x00-\x1f]+")
 
 
 class TerminalEmulator(QTextEdit):
@@ -84,12 +250,18 @@ class TerminalEmulator(QTextEdit):
     _ESC_BUF_LIMIT: int = 4096
     _PASTE_CONFIRM_SIZE: int = 1024
     _PASTE_CONFIRM_SECONDS: float = 3.0
+    _CURSOR_STYLE: int = -1
+    DEFAULT_SCROLLBACK_LINES: int = 10_000
+    MAX_SCROLLBACK_LINES: int = 100_000
+    _WHEEL_LINES: int = 3
+    _SEARCH_STYLE: int = -2
 
     def __init__(
         self,
         rows: int = 24,
         cols: int = 80,
         parent=None,
+        scrollback_lines: int = DEFAULT_SCROLLBACK_LINES,
     ) -> None:
         super().__init__(parent)
         self.rows = rows
@@ -102,12 +274,20 @@ class TerminalEmulator(QTextEdit):
         self.setTabChangesFocus(True)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        # 渲染是整行替换，撤销栈只会无限增长
+        self.setUndoRedoEnabled(False)
         self._apply_font()
 
-        # 网格：grid[row][col]
-        self.grid: list[list[_Cell]] = [
-            [_Cell() for _ in range(cols)] for _ in range(rows)
-        ]
+        # 网格：grid[row][col]，每行是字符 + 样式 ID 的紧凑存储
+        self._styles = _StyleTable()
+        self._compact_styles_at = _StyleTable.MAX_STYLES
+        self.grid: list[_Row] = self._blank_rows(rows, cols)
+
+        # 回滚缓冲与回看偏移（0 = 跟随实时屏幕）
+        self._scrollback = _Scrollback(
+            min(scrollback_lines, self.MAX_SCROLLBACK_LINES)
+        )
+        self._view_offset: int = 0
         self.cursor_row: int = 0
         self.cursor_col: int = 0
         self._wrap_pending: bool = False
@@ -138,6 +318,21 @@ class TerminalEmulator(QTextEdit):
         self._dirty: bool = True
         self._render_pending: bool = False
 
+        # 增量渲染：内容变化的行号；结构变化（清屏/改尺寸）时整屏重建
+        self._dirty_rows: set[int] = set()
+        self._needs_rebuild: bool = True
+        # 上次渲染时的光标/搜索高亮位置，变化时只重绘涉及的行
+        self._rendered_cursor: tuple[int, int] | None = None
+        self._rendered_search: tuple[int, int, int] | None = None
+        self._last_render_rows: int = 0
+
+        self._cursor_fmt = QTextCharFormat()
+        self._cursor_fmt.setBackground(QColor(128, 128, 128))
+        self._cursor_fmt.setForeground(QColor(255, 255, 255))
+        self._search_fmt = QTextCharFormat()
+        self._search_fmt.setBackground(QColor(255, 200, 0))
+        self._search_fmt.setForeground(QColor(0, 0, 0))
+
         # 光标可见性（DECTCEM）与闪烁
         self._cursor_visible: bool = True
         self._cursor_phase: bool = True
@@ -168,11 +363,16 @@ class TerminalEmulator(QTextEdit):
             self._schedule_render()
 
     def clear_screen(self) -> None:
-        """清空整个终端。"""
-        self.grid = [[_Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+        """清空整个终端（含回滚缓冲）。"""
+        self._scrollback.clear()
+        self._styles.reset()
+        self._compact_styles_at = _StyleTable.MAX_STYLES
+        self.grid = self._blank_rows(self.rows, self.cols)
+        self._view_offset = 0
         self.cursor_row = 0
         self.cursor_col = 0
         self._wrap_pending = False
+        self._needs_rebuild = True
         self._dirty = True
         self._render_full()
 
@@ -195,21 +395,17 @@ class TerminalEmulator(QTextEdit):
 
         if cols != self.cols:
             for row in self.grid:
-                if cols > self.cols:
-                    row.extend(_Cell() for _ in range(cols - self.cols))
-                else:
-                    del row[cols:]
+                row.resize(cols)
 
         if rows > self.rows:
-            blank = [[_Cell() for _ in range(cols)] for _ in range(rows - self.rows)]
-            self.grid = blank + self.grid
+            self.grid = self._blank_rows(rows - self.rows, cols) + self.grid
             self.cursor_row += rows - self.rows
         elif rows < self.rows:
             drop = self.rows - rows
             # 优先丢弃光标下方的空白行，避免缩小窗口时抹掉已有输出
             spare = 0
             for index in range(len(self.grid) - 1, self.cursor_row, -1):
-                if any(cell.char != " " for cell in self.grid[index]):
+                if not self.grid[index].is_blank():
                     break
                 spare += 1
             drop_bottom = min(drop, spare)
@@ -229,9 +425,67 @@ class TerminalEmulator(QTextEdit):
         self._wrap_pending = False
         self._scroll_top = 0
         self._scroll_bottom = rows - 1
+        self._needs_rebuild = True
         self._dirty = True
         self._schedule_render()
 
+    @property
+    def scrollback_lines(self) -> int:
+        """回滚缓冲容量（行）。"""
+        return self._scrollback.capacity
+
+    def set_scrollback_lines(self, lines: int) -> None:
+        self._scrollback.capacity = max(0, min(int(lines), self.MAX_SCROLLBACK_LINES))
+        self._set_view_offset(self._view_offset)
+
+    def history_length(self) -> int:
+        return len(self._scrollback)
+
+    @property
+    def view_offset(self) -> int:
+        """当前回看的行数，0 表示显示实时屏幕。"""
+        return self._view_offset
+
+    def scroll_view(self, lines: int) -> None:
+        """向历史方向（正数）或实时方向（负数）滚动视图。"""
+        self._set_view_offset(self._view_offset + lines)
+
+    def scroll_to_bottom(self) -> None:
+        self._set_view_offset(0)
+
+    def _set_view_offset(self, offset: int) -> None:
+        offset = max(0, min(offset, len(self._scrollback)))
+        if offset == self._view_offset:
+            return
+        if offset == 0:
+            # 回到实时屏幕：文档里是历史窗口，需要整屏重建
+            self._needs_rebuild = True
+        self._view_offset = offset
+        self._dirty = True
+        self._schedule_render()
+
+    def _blank_rows(self, rows: int, cols: int) -> list[_Row]:
+        return [_Row(cols, self._styles) for _ in range(rows)]
+
+    def _current_style(self) -> int:
+        """当前 SGR 状态对应的样式 ID。"""
+        if len(self._styles) >= self._compact_styles_at:
+            self._compact_styles()
+        parser = self._ansi_parser
+        return self._styles.intern(parser.current_key, parser.current_format)
+
+    def _compact_styles(self) -> None:
+        """回收屏幕和回滚缓冲都不再引用的样式 ID。
+
+        仍在使用的样式很多时提高下次压缩的门槛，避免每出现一个新样式就
+        扫描一遍回滚缓冲。
+        """
+        rows = (row.styles for row in self.grid)
+        self._styles.compact(chain(rows, self._scrollback.style_arrays()))
+        self._compact_styles_at = max(
+            _StyleTable.MAX_STYLES, 2 * len(self._styles)
+        )
+
     def _fit_dimensions(self, width: int, height: int) -> tuple[int, int]:
         """按可用像素和字体度量计算可容纳的行列数。"""
         from PyQt6.QtGui import QFontMetricsF
@@ -258,6 +512,15 @@ class TerminalEmulator(QTextEdit):
         """终端独占 Tab：只读 QTextEdit 默认会用 Tab 切换焦点，这里禁止。"""
         return False
 
+    def wheelEvent(self, event) -> None:
+        # 每个滚轮刻度（120）滚动 3 行；没有历史时保持默认行为
+        lines = event.angleDelta().y() * self._WHEEL_LINES // 120
+        if lines and len(self._scrollback):
+            self.scroll_view(lines)
+            event.accept()
+            return
+        super().wheelEvent(event)
+
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
         self.resize_to_fit()
@@ -268,6 +531,15 @@ class TerminalEmulator(QTextEdit):
         key = event.key()
         mod = event.modifiers()
 
+        # Shift+PageUp/PageDown 本地翻阅回滚缓冲，不发送到设备
+        if mod == Qt.KeyboardModifier.ShiftModifier and key in (
+            Qt.Key.Key_PageUp,
+            Qt.Key.Key_PageDown,
+        ):
+            page = max(1, self.rows - 1)
+            self.scroll_view(page if key == Qt.Key.Key_PageUp else -page)
+            return
+
         if (
             mod & Qt.KeyboardModifier.ControlModifier
             and mod & Qt.KeyboardModifier.ShiftModifier
@@ -284,7 +556,7 @@ class TerminalEmulator(QTextEdit):
             mod & Qt.KeyboardModifier.ControlModifier
             and Qt.Key.Key_A <= key <= Qt.Key.Key_Z
         ):
-            self.key_pressed.emit(bytes([key - Qt.Key.Key_A + 1]))
+            self._emit_key(bytes([key - Qt.Key.Key_A + 1]))
             return
 
         # 特殊键映射
@@ -319,13 +591,18 @@ class TerminalEmulator(QTextEdit):
         }
 
         if key in special:
-            self.key_pressed.emit(special[key])
+            self._emit_key(special[key])
             return
 
         # 普通文本
         text = event.text()
         if text and text.isprintable():
-            self.key_pressed.emit(text.encode("utf-8"))
+            self._emit_key(text.encode("utf-8"))
+
+    def _emit_key(self, data: bytes) -> None:
+        """发送键盘输入；正在回看历史时先回到实时屏幕。"""
+        self.scroll_to_bottom()
+        self.key_pressed.emit(data)
 
     def _paste_clipboard(self) -> None:
         """粘贴剪贴板；多行或超大内容需 3 秒内二次确认。"""
@@ -337,7 +614,7 @@ class TerminalEmulator(QTextEdit):
             "\n" in text or "\r" in text or len(text) > self._PASTE_CONFIRM_SIZE
         )
         if not risky:
-            self.key_pressed.emit(text.encode("utf-8"))
+            self._emit_key(text.encode("utf-8"))
             return
 
         now = self._paste_clock()
@@ -347,7 +624,7 @@ class TerminalEmulator(QTextEdit):
             and now - self._pending_paste[1] < self._PASTE_CONFIRM_SECONDS
         ):
             self._pending_paste = None
-            self.key_pressed.emit(text.encode("utf-8"))
+            self._emit_key(text.encode("utf-8"))
             return
 
         self._pending_paste = (text, now)
@@ -360,15 +637,23 @@ class TerminalEmulator(QTextEdit):
     # ── 内部：文本处理 ───────────────────────────────────────
 
     def _process_text(self, text: str) -> None:
-        """逐字符处理文本，更新网格状态。"""
+        """处理文本，更新网格状态。可打印片段整段写入，控制字符逐个处理。"""
         i = 0
         length = len(text)
+        printable_run = _PRINTABLE_RUN.match
 
         while i < length:
             ch = text[i]
 
+            # ── 普通字符（整段） ──
+            if ch >= " ":
+                run = printable_run(text, i)
+                self._put_text(run.group())
+                i = run.end()
+                self._dirty = True
+
             # ── 转义序列 ──
-            if ch == "\x1b":
+            elif ch == "\x1b":
                 if i + 1 < length and text[i + 1] == "[":
                     rest = text[i + 2 :]
                     m = self._csi_terminator.match(rest)
@@ -457,14 +742,6 @@ class TerminalEmulator(QTextEdit):
                 i += 1
                 self._dirty = True
 
-            # ── 普通字符 ──
-            elif ch >= " ":
-                if self._dec_graphics:
-                    ch = _DEC_GRAPHICS.get(ch, ch)
-                self._put_char(ch)
-                i += 1
-                self._dirty = True
-
             # ── 其他控制字符 ──
             else:
                 i += 1
@@ -493,26 +770,66 @@ class TerminalEmulator(QTextEdit):
             self._newline()
             self._wrap_pending = False
 
-        cell = self.grid[self.cursor_row][self.cursor_col]
-        cell.char = ch
-        cell.fmt = QTextCharFormat(self._ansi_parser.current_format)
+        row = self.grid[self.cursor_row]
+        row.chars[self.cursor_col] = ch
+        row.styles[self.cursor_col] = self._current_style()
+        self._dirty_rows.add(self.cursor_row)
         if self.cursor_col == self.cols - 1:
             self._wrap_pending = True
         else:
             self.cursor_col += 1
 
+    def _put_text(self, text: str) -> None:
+        """写入一段不含控制字符的文本：按行切片整段写入，换行/滚屏按段处理。"""
+        if self._dec_graphics:
+            text = text.translate(_DEC_GRAPHICS_TABLE)
+        style = self._current_style()
+        cols = self.cols
+        pos = 0
+        length = len(text)
+        while pos < length:
+            if self._wrap_pending:
+                self.cursor_col = 0
+                self._newline()
+                self._wrap_pending = False
+
+            col = self.cursor_col
+            take = min(cols - col, length - pos)
+            self.grid[self.cursor_row].write(col, text[pos : pos + take], style)
+            self._dirty_rows.add(self.cursor_row)
+            pos += take
+
+            if col + take == cols:
+                self.cursor_col = cols - 1
+                self._wrap_pending = True
+            else:
+                self.cursor_col = col + take
+
     def _newline(self) -> None:
         """光标下移一行，到达滚动区域底部则区域内滚屏。"""
         if self.cursor_row == self._scroll_bottom:
-            blank = [_Cell() for _ in range(self.cols)]
-            self.grid.pop(self._scroll_top)
-            self.grid.insert(self._scroll_bottom, blank)
+            row = self.grid.pop(self._scroll_top)
+            if self._scroll_top == 0 and self._scroll_bottom == self.rows - 1:
+                self._push_history(row)
+            row.clear()
+            self.grid.insert(self._scroll_bottom, row)
+            self._mark_rows(self._scroll_top, self._scroll_bottom)
         elif self.cursor_row < self.rows - 1:
             self.cursor_row += 1
 
+    def _push_history(self, row: _Row) -> None:
+        """整屏滚动时把移出顶部的行存入回滚缓冲。"""
+        if not self._scrollback.capacity:
+            return
+        self._scrollback.push(row)
+        if self._view_offset:
+            # 回看中保持视图停在同一段历史上
+            self._view_offset = min(self._view_offset + 1, len(self._scrollback))
+
     def _reset(self) -> None:
         """RIS（ESC c）：完整复位终端状态。"""
-        self.grid = [[_Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+        for row in self.grid:
+            row.clear()
         self.cursor_row = 0
         self.cursor_col = 0
         self._saved_row = 0
@@ -523,15 +840,19 @@ class TerminalEmulator(QTextEdit):
         self._dec_graphics = False
         self._cursor_visible = True
         self._ansi_parser.reset_format()
+        # 屏幕已清空，只剩回滚缓冲可能引用旧样式
+        self._compact_styles()
+        self._needs_rebuild = True
         self._dirty = True
         self._schedule_render()
 
     def _reverse_index(self) -> None:
         """RI（ESC M）：光标上移一行，到达滚动区域顶部则区域内下滚。"""
         if self.cursor_row == self._scroll_top:
-            blank = [_Cell() for _ in range(self.cols)]
-            self.grid.pop(self._scroll_bottom)
-            self.grid.insert(self._scroll_top, blank)
+            row = self.grid.pop(self._scroll_bottom)
+            row.clear()
+            self.grid.insert(self._scroll_top, row)
+            self._mark_rows(self._scroll_top, self._scroll_bottom)
         elif self.cursor_row > 0:
             self.cursor_row -= 1
         self._wrap_pending = False
@@ -547,7 +868,11 @@ class TerminalEmulator(QTextEdit):
     def _blink_cursor(self) -> None:
         """切换光标闪烁相位；隐藏或有选区时跳过重绘。"""
         self._cursor_phase = not self._cursor_phase
-        if self._cursor_visible and not self.textCursor().hasSelection():
+        if (
+            self._cursor_visible
+            and not self._view_offset
+            and not self.textCursor().hasSelection()
+        ):
             self._dirty = True
             self._schedule_render()
 
@@ -636,33 +961,39 @@ class TerminalEmulator(QTextEdit):
         self._wrap_pending = False
         if mode == 0:
             # 从光标到屏幕末尾
-            for c in range(self.cursor_col, self.cols):
-                self.grid[self.cursor_row][c] = _Cell()
+            self.grid[self.cursor_row].clear(self.cursor_col)
             for r in range(self.cursor_row + 1, self.rows):
-                self.grid[r] = [_Cell() for _ in range(self.cols)]
+                self.grid[r].clear()
+            self._mark_rows(self.cursor_row, self.rows - 1)
         elif mode == 1:
             # 从屏幕开头到光标
             for r in range(0, self.cursor_row):
-                self.grid[r] = [_Cell() for _ in range(self.cols)]
-            for c in range(0, self.cursor_col + 1):
-                self.grid[self.cursor_row][c] = _Cell()
+                self.grid[r].clear()
+            self.grid[self.cursor_row].clear(0, self.cursor_col + 1)
+            self._mark_rows(0, self.cursor_row)
         elif mode == 2 or mode == 3:
-            self.grid = [[_Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+            for row in self.grid:
+                row.clear()
+            if mode == 3:
+                # xterm 扩展：ED 3 同时清除回滚缓冲
+                self._scrollback.clear()
+                self._set_view_offset(0)
+                self._compact_styles()
+            self._mark_rows(0, self.rows - 1)
         self._dirty = True
 
     def _erase_line(self, mode: int) -> None:
         self._wrap_pending = False
         if mode == 0:
             # 从光标到行尾
-            for c in range(self.cursor_col, self.cols):
-                self.grid[self.cursor_row][c] = _Cell()
+            self.grid[self.cursor_row].clear(self.cursor_col)
         elif mode == 1:
             # 从行首到光标
-            for c in range(0, self.cursor_col + 1):
-                self.grid[self.cursor_row][c] = _Cell()
+            self.grid[self.cursor_row].clear(0, self.cursor_col + 1)
         elif mode == 2:
             # 整行清除
-            self.grid[self.cursor_row] = [_Cell() for _ in range(self.cols)]
+            self.grid[self.cursor_row].clear()
+        self._dirty_rows.add(self.cursor_row)
         self._dirty = True
 
     # ── 内部：渲染 ───────────────────────────────────────────
@@ -683,53 +1014,176 @@ class TerminalEmulator(QTextEdit):
     def _do_scheduled_render(self) -> None:
         self._render_pending = False
         if self._dirty:
+            self._render_dirty()
+
+    def _mark_rows(self, first: int, last: int) -> None:
+        """标记 [first, last] 行内容已变化。"""
+        self._dirty_rows.update(range(first, last + 1))
+
+    def _cursor_cell(self) -> tuple[int, int] | None:
+        """当前需要绘制光标的位置；隐藏或闪烁熄灭时为 None。"""
+        if self._cursor_visible and self._cursor_phase:
+            return (self.cursor_row, self.cursor_col)
+        return None
+
+    def _row_runs(
+        self, row_idx: int, cursor_cell: tuple[int, int] | None
+    ) -> list[tuple[str, QTextCharFormat]]:
+        """把一行单元格合并成 (文本, 格式) 段，相邻同格式字符只插入一次。"""
+        highlight = self.search_highlight
+        if highlight is not None and highlight[0] == row_idx:
+            hl_start, hl_end = highlight[1], highlight[1] + highlight[2]
+        else:
+            hl_start = hl_end = 0
+        cursor_col = (
+            cursor_cell[1]
+            if cursor_cell is not None and cursor_cell[0] == row_idx
+            else -1
+        )
+
+        row = self.grid[row_idx]
+        # 叠加层用负数样式 ID 表示，与普通样式一起按连续段切分
+        if hl_end > hl_start or cursor_col >= 0:
+            styles = list(row.styles)
+            if 0 <= cursor_col < len(styles):
+                styles[cursor_col] = self._CURSOR_STYLE
+            styles[hl_start:hl_end] = [self._SEARCH_STYLE] * len(
+                styles[hl_start:hl_end]
+            )
+        else:
+            styles = row.styles
+        return self._style_runs(row.chars, styles)
+
+    def _style_runs(self, chars, styles) -> list[tuple[str, QTextCharFormat]]:
+        formats = self._styles.formats
+        runs: list[tuple[str, QTextCharFormat]] = []
+        start = 0
+        for style, group in groupby(styles):
+            end = start + sum(1 for _ in group)
+            if style == self._CURSOR_STYLE:
+                fmt = self._cursor_fmt
+            elif style == self._SEARCH_STYLE:
+                fmt = self._search_fmt
+            else:
+                fmt = formats[style]
+            runs.append(("".join(chars[start:end]), fmt))
+            start = end
+        return runs
+
+    def _view_line_runs(self, line: int) -> list[tuple[str, QTextCharFormat]]:
+        """回看视图中第 line 行（含历史与实时屏幕）的格式段，按当前列宽补齐/截断。"""
+        history = len(self._scrollback)
+        index = history - self._view_offset + line
+        if index >= history:
+            return self._row_runs(index - history, None)
+        text, styles = self._scrollback[index]
+        text = text[: self.cols].ljust(self.cols)
+        if styles is None:
+            return [(text, self._styles.formats[_StyleTable.DEFAULT_ID])]
+        styles = styles[: self.cols]
+        if len(styles) < self.cols:
+            styles = styles + array("I", [_StyleTable.DEFAULT_ID]) * (
+                self.cols - len(styles)
+            )
+        return self._style_runs(text, styles)
+
+    def _insert_row(
+        self,
+        cursor: QTextCursor,
+        row_idx: int,
+        cursor_cell: tuple[int, int] | None,
+    ) -> None:
+        for text, fmt in self._row_runs(row_idx, cursor_cell):
+            cursor.insertText(text, fmt)
+
+    def _render_dirty(self) -> None:
+        """只重写内容、光标或搜索高亮有变化的行。"""
+        if self._view_offset:
+            self._render_history_view()
+            return
+        doc = self.document()
+        if self._needs_rebuild or doc.blockCount() != self.rows:
             self._render_full()
+            return
 
-    def _render_full(self) -> None:
-        """从网格重建整个 QTextEdit 内容（含 ANSI 颜色 + 光标高亮）。"""
         self._dirty = False
+        cursor_cell = self._cursor_cell()
+        rows, self._dirty_rows = self._dirty_rows, set()
+        if cursor_cell != self._rendered_cursor:
+            for cell in (self._rendered_cursor, cursor_cell):
+                if cell is not None:
+                    rows.add(cell[0])
+        if self.search_highlight != self._rendered_search:
+            for highlight in (self._rendered_search, self.search_highlight):
+                if highlight is not None:
+                    rows.add(highlight[0])
+        self._rendered_cursor = cursor_cell
+        self._rendered_search = self.search_highlight
+
+        targets = sorted(r for r in rows if 0 <= r < self.rows)
+        self._last_render_rows = len(targets)
+        if not targets:
+            return
 
         sb = self.verticalScrollBar()
         at_bottom = sb and sb.value() >= sb.maximum() - self._SCROLL_MARGIN
 
+        cursor = QTextCursor(doc)
+        cursor.beginEditBlock()
+        for row_idx in targets:
+            block = doc.findBlockByNumber(row_idx)
+            start = block.position()
+            cursor.setPosition(start)
+            cursor.setPosition(
+                start + block.length() - 1, QTextCursor.MoveMode.KeepAnchor
+            )
+            self._insert_row(cursor, row_idx, cursor_cell)
+        cursor.endEditBlock()
+
+        if at_bottom:
+            self.moveCursor(QTextCursor.MoveOperation.End)
+
+    def _render_history_view(self) -> None:
+        """回看历史时只渲染可见的 rows 行（虚拟化），不画光标和搜索高亮。"""
+        self._dirty = False
+        self._dirty_rows.clear()
+        # 返回实时屏幕时必须整屏重建
+        self._needs_rebuild = True
+        self._last_render_rows = self.rows
+
         cursor = QTextCursor(self.document())
         cursor.select(QTextCursor.SelectionType.Document)
         cursor.beginEditBlock()
+        for line in range(self.rows):
+            if line > 0:
+                cursor.insertText("\n")
+            for text, fmt in self._view_line_runs(line):
+                cursor.insertText(text, fmt)
+        cursor.endEditBlock()
 
-        cursor_fmt = QTextCharFormat()
-        cursor_fmt.setBackground(QColor(128, 128, 128))
-        cursor_fmt.setForeground(QColor(255, 255, 255))
+    def _render_full(self) -> None:
+        """从网格重建整个 QTextEdit 内容（含 ANSI 颜色 + 光标高亮）。"""
+        self._dirty = False
+        self._needs_rebuild = False
+        self._dirty_rows.clear()
+        cursor_cell = self._cursor_cell()
+        self._rendered_cursor = cursor_cell
+        self._rendered_search = self.search_highlight
+        self._last_render_rows = self.rows
 
-        search_fmt = QTextCharFormat()
-        search_fmt.setBackground(QColor(255, 200, 0))
-        search_fmt.setForeground(QColor(0, 0, 0))
+        sb = self.verticalScrollBar()
+        at_bottom = sb and sb.value() >= sb.maximum() - self._SCROLL_MARGIN
 
-        cursor_active = self._cursor_visible and self._cursor_phase
+        cursor = QTextCursor(self.document())
+        cursor.select(QTextCursor.SelectionType.Document)
+        cursor.beginEditBlock()
 
-        for row_idx, row in enumerate(self.grid):
+        for row_idx in range(len(self.grid)):
             if row_idx > 0:
                 cursor.insertText("\n")
-
-            for col_idx, cell in enumerate(row):
-                if (
-                    self.search_highlight is not None
-                    and row_idx == self.search_highlight[0]
-                    and self.search_highlight[1]
-                    <= col_idx
-                    < self.search_highlight[1] + self.search_highlight[2]
-                ):
-                    cursor.insertText(cell.char, search_fmt)
-                elif (
-                    cursor_active
-                    and row_idx == self.cursor_row
-                    and col_idx == self.cursor_col
-                ):
-                    cursor.insertText(cell.char, cursor_fmt)
-                else:
-                    cursor.insertText(cell.char, QTextCharFormat(cell.fmt))
+            self._insert_row(cursor, row_idx, cursor_cell)
 
         cursor.endEditBlock()
 
         if at_bottom:
             self.moveCursor(QTextCursor.MoveOperation.End)
-
@@ -0,0 +1,153 @@
+"""
+裁剪历史搜索
+
+在会话的裁剪日志（纯文本 `.log` 与压缩归档段 `.log.gz`）中流式查找匹配行。
+纯文本日志按固定大小分块读取，归档段逐块解压，内存占用与文件大小无关。
+这里的函数都是同步生成器，由调用方放到后台线程里执行，并通过
+`threading.Event` 随时取消。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from utils.trim_archive import SEGMENT_SUFFIX, load_index, read_block
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+MAX_LINE_CHARS = 400
+
+ProgressCallback = Callable[[int], None]
+
+
+@dataclass(frozen=True)
+class HistoryMatch:
+    """一条命中的历史行。
+
+    `line` 从 1 开始：纯文本日志为文件内行号，归档段为会话内行号（跨段连续）。
+    `timestamp` 为归档块的裁剪时间，纯文本日志没有记录，为 None。
+    """
+
+    source: Path
+    line: int
+    text: str
+    timestamp: Optional[float] = None
+
+
+def compile_query(text: str, case_sensitive: bool) -> re.Pattern[str]:
+    """按字面文本编译查询，与日志视图搜索的匹配规则一致。"""
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(re.escape(text), flags)
+
+
+def _clip(line: str) -> str:
+    line = line.rstrip("\r")
+    if len(line) > MAX_LINE_CHARS:
+        return line[:MAX_LINE_CHARS] + "…"
+    return line
+
+
+def _scan_text(text: str, pattern: re.Pattern[str]) -> Iterator[tuple[int, str]]:
+    """在一段以完整行组成的文本中查找，返回 (行偏移, 行文本)，每行至多一次。"""
+    line_no = 0
+    counted_to = 0
+    pos = 0
+    while True:
+        m = pattern.search(text, pos)
+        if m is None:
+            return
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.start())
+        if end < 0:
+            end = len(text)
+        line_no += text.count("\n", counted_to, start)
+        counted_to = start
+        yield line_no, _clip(text[start:end])
+        pos = end + 1
+        if pos > len(text):
+            return
+
+
+def search_plain_log(
+    path: Path,
+    pattern: re.Pattern[str],
+    cancel: Optional[threading.Event] = None,
+    progress: Optional[ProgressCallback] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[HistoryMatch]:
+    """分块扫描纯文本日志。块尾不完整的行留到下一块一起处理。"""
+    path = Path(path)
+    line_base = 1
+    carry = b""
+    with open(path, "rb") as f:
+        while cancel is None or not cancel.is_set():
+            data = f.read(chunk_size)
+            if progress is not None and data:
+                progress(len(data))
+            if data:
+                buf = carry + data
+                cut = buf.rfind(b"\n") + 1
+                if cut == 0:
+                    carry = buf
+                    continue
+                buf, carry = buf[:cut], buf[cut:]
+            elif carry:
+                buf, carry = carry, b""
+            else:
+                return
+            text = buf.decode("utf-8", errors="replace")
+            for offset, line in _scan_text(text, pattern):
+                yield HistoryMatch(path, line_base + offset, line)
+            line_base += text.count("\n")
+
+
+def search_archive_segment(
+    segment: Path,
+    pattern: re.Pattern[str],
+    cancel: Optional[threading.Event] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[HistoryMatch]:
+    """按索引逐块解压归档段；索引缺失或损坏的块跳过。"""
+    segment = Path(segment)
+    for block in load_index(segment):
+        if cancel is not None and cancel.is_set():
+            return
+        try:
+            text = read_block(block)
+        except (OSError, EOFError) as e:
+            logger.warning("Failed to read trim archive block in %s: %s", segment, e)
+            continue
+        if progress is not None:
+            progress(block.size)
+        for offset, line in _scan_text(text, pattern):
+            yield HistoryMatch(
+                segment, block.first_line + offset + 1, line, block.start
+            )
+
+
+def search_history(
+    paths: Iterable[Path],
+    pattern: re.Pattern[str],
+    cancel: Optional[threading.Event] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[HistoryMatch]:
+    """依次搜索多个裁剪日志文件，按扩展名区分纯文本与归档段。"""
+    for path in paths:
+        if cancel is not None and cancel.is_set():
+            return
+        path = Path(path)
+        try:
+            if path.name.endswith(SEGMENT_SUFFIX):
+                yield from search_archive_segment(path, pattern, cancel, progress)
+            else:
+                yield from search_plain_log(path, pattern, cancel, progress)
+        except OSError as e:
+            logger.warning("Failed to search trim log %s: %s", path, e)
@@ -27,6 +27,12 @@ class I18N:
             "mode_rfc2217": "RFC2217",
             "rfc2217_timeout": "协议超时:",
             "rfc2217_ignore_control": "兼容控制确认",
+            "socket_write_policy": "发送策略:",
+            "write_policy_interactive": "交互",
+            "write_policy_batched": "合并",
+            "write_policy_throughput": "吞吐",
+            "socket_write_stats": "写入 {} 次，flush {} 次，交给内核 {} 次，平均 {:.0f} 字节/次",
+            "write_policy_terminal": "终端模式下固定为交互策略",
             "baudrate": "波特率:",
             "parity": "校验位:",
             "databits": "数据位:",
@@ -54,6 +60,7 @@ class I18N:
             "disconnected": "已断开连接",
             "sent": "[已发送] {}",
             "sent_hex": "[已发送HEX] {}",
+            "sent_partial": "[已发送 {}/{} 字节] {}",
             "queued": "[已入队] {}",
             "queued_hex": "[已入队HEX] {}",
             "quick_send": "快捷发送",
@@ -115,6 +122,30 @@ class I18N:
             "trim_enabled": "启用自动裁剪",
             "trim_max_lines": "最大行数",
             "trim_batch_lines": "每次裁剪行数",
+            "trim_archive": "压缩归档裁剪日志",
+            "capture_raw": "录制原始数据",
+            "capture_failed": "无法创建录制文件:\n{}",
+            "replay_capture": "回放录制",
+            "replay_realtime": "实时 (1×)",
+            "replay_2x": "2×",
+            "replay_10x": "10×",
+            "replay_asap": "尽快（吞吐测试）",
+            "replay_stop": "停止回放",
+            "replay_busy": "请先断开连接再回放录制文件",
+            "replay_failed": "无法回放录制文件:\n{}",
+            "replay_started": "开始回放 {}",
+            "replay_stopped": "回放已停止",
+            "replay_finished": "回放结束: {} 块, {} 字节, 用时 {:.3f} 秒 ({:.1f} KiB/s)",
+            "add_session": "+ 会话",
+            "add_session_title": "添加并行会话",
+            "session_mode": "类型:",
+            "session_invalid": "请填写有效的端口或 主机/端口。",
+            "session_connected": "已连接",
+            "session_connecting": "连接中",
+            "session_disconnected": "未连接",
+            "session_reconnect": "重连",
+            "session_close": "关闭会话",
+            "session_error": "[错误] {}",
             "dialog_content": "内容:",
             "dialog_hex_mode": "HEX模式",
             "dialog_auto_checksum": "自动添加校验和",
@@ -137,6 +168,13 @@ class I18N:
             "search_next": "下一个",
             "search_case": "区分大小写",
             "search_close": "关闭",
+            "search_history": "搜索全部历史（含已裁剪日志，回车开始）",
+            "search_stop": "停止",
+            "history_searching": "{} 条 {}%",
+            "history_done": "{} 条",
+            "history_truncated": "{}+ 条",
+            "history_cancelled": "已停止 {}",
+            "history_empty": "无历史",
             "help": "使用说明",
             "help_content": """
 # 使用说明
@@ -176,6 +214,11 @@ class I18N:
 为了防止长时间运行导致内存占用过高，程序默认开启日志裁剪。
 - 当行数超过限制时，旧的日志会被移动到临时文件中。
 - 点击“裁剪日志”按钮可以打开保存这些临时文件的文件夹。
+- 在“裁剪设置”中开启“压缩归档”后，裁剪内容按块 gzip 压缩并分段保存，配套的 .idx 索引可按行号或时间快速定位。
+- 搜索栏中按下"All"后回车，会在后台搜索全部已裁剪的历史，结果列出文件、行号和归档时间，点击"■"可停止。
+
+## 6. 并行会话
+点击“+ 会话”可在主连接之外同时监视其他串口、TCP 或 RFC2217 端点。每个会话在独立的停靠面板中显示，拥有自己的解码和裁剪日志；面板可叠成标签页、浮动，或用“关闭会话”关闭。
 """,
         },
         "en": {
@@ -192,6 +235,12 @@ class I18N:
             "mode_rfc2217": "RFC2217",
             "rfc2217_timeout": "Protocol timeout:",
             "rfc2217_ignore_control": "Compatible control ACK",
+            "socket_write_policy": "Send policy:",
+            "write_policy_interactive": "Interactive",
+            "write_policy_batched": "Batched",
+            "write_policy_throughput": "Throughput",
+            "socket_write_stats": "{} writes, {} flushes, {} sends, {:.0f} bytes/send",
+            "write_policy_terminal": "Terminal mode always uses the interactive policy",
             "baudrate": "Baudrate:",
             "parity": "Parity:",
             "databits": "Data Bits:",
@@ -219,6 +268,7 @@ class I18N:
             "disconnected": "Disconnected",
             "sent": "[Sent] {}",
             "sent_hex": "[Sent HEX] {}",
+            "sent_partial": "[Sent {}/{} bytes] {}",
             "queued": "[Queued] {}",
             "queued_hex": "[Queued HEX] {}",
             "quick_send": "Quick Send",
@@ -280,6 +330,30 @@ class I18N:
             "trim_enabled": "Enable Auto Trim",
             "trim_max_lines": "Max Lines",
             "trim_batch_lines": "Trim Batch",
+            "trim_archive": "Compress Trimmed Logs",
+            "capture_raw": "Record Raw Capture",
+            "capture_failed": "Failed to create capture file:\n{}",
+            "replay_capture": "Replay Capture",
+            "replay_realtime": "Real Time (1×)",
+            "replay_2x": "2×",
+            "replay_10x": "10×",
+            "replay_asap": "As Fast As Possible (Benchmark)",
+            "replay_stop": "Stop Replay",
+            "replay_busy": "Disconnect before replaying a capture file",
+            "replay_failed": "Failed to replay capture file:\n{}",
+            "replay_started": "Replaying {}",
+            "replay_stopped": "Replay stopped",
+            "replay_finished": "Replay finished: {} chunks, {} bytes in {:.3f} s ({:.1f} KiB/s)",
+            "add_session": "+ Session",
+            "add_session_title": "Add Concurrent Session",
+            "session_mode": "Type:",
+            "session_invalid": "Enter a valid port or host/port.",
+            "session_connected": "Connected",
+            "session_connecting": "Connecting",
+            "session_disconnected": "Not connected",
+            "session_reconnect": "Reconnect",
+            "session_close": "Close Session",
+            "session_error": "[Error] {}",
             "dialog_content": "Content:",
             "dialog_hex_mode": "HEX Mode",
             "dialog_auto_checksum": "Auto Checksum",
@@ -302,6 +376,13 @@ class I18N:
             "search_next": "Next",
             "search_case": "Case sensitive",
             "search_close": "Close",
+            "search_history": "Search all history, including trimmed logs (Enter to start)",
+            "search_stop": "Stop",
+            "history_searching": "{} hits {}%",
+            "history_done": "{} hits",
+            "history_truncated": "{}+ hits",
+            "history_cancelled": "Stopped {}",
+            "history_empty": "No history",
             "help": "Help",
             "help_content": """
 # User Manual
@@ -341,6 +422,11 @@ Click "Quick Send" to open the panel.
 To prevent high memory usage, old logs are automatically trimmed.
 - Trimmed logs are saved to temporary files.
 - Click "Trim Logs" to open the folder containing these files.
+- Enable "Compress Trimmed Logs" in Trim Settings to store them as gzip-compressed, size-capped segments with an .idx index for seeking by line or time.
+- Press "All" in the search bar and hit Enter to search every trimmed log in the background. Results list the file, line number and archive time; click "■" to stop.
+
+## 6. Concurrent Sessions
+Click "+ Session" to watch another serial port, TCP or RFC2217 endpoint alongside the main connection. Each session opens in its own dock panel with its own decoder and trim log; panels can be tabbed, floated or closed with "Close Session".
 """,
         },
     }
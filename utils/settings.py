@@ -150,6 +150,16 @@ class AppSettings:
     trim_enabled: bool = True
     max_terminal_lines: int = 5000
     trim_batch_lines: int = 800
+    receive_flush_interval_ms: int = 16
+    write_pacing: str = "off"
+    write_pacing_bps: int = 0
+    serial_io_backend: str = "threads"
+    socket_write_policy: str = "interactive"
+    terminal_scrollback_lines: int = 10_000
+    trim_archive_enabled: bool = False
+    trim_archive_segment_mb: int = 64
+    trim_retention_mb: int = 0
+    trim_retention_days: int = 0
 
     @classmethod
     def from_dict(cls, raw: Any) -> "AppSettings":
@@ -202,6 +212,15 @@ class AppSettings:
         language = _string(data.get("language"), "zh")
         if language not in ("zh", "en"):
             language = "zh"
+        write_pacing = _string(data.get("write_pacing"), "off")
+        if write_pacing not in ("off", "baud", "custom"):
+            write_pacing = "off"
+        serial_io_backend = _string(data.get("serial_io_backend"), "threads")
+        if serial_io_backend not in ("threads", "reactor"):
+            serial_io_backend = "threads"
+        socket_write_policy = _string(data.get("socket_write_policy"), "interactive")
+        if socket_write_policy not in ("interactive", "batched", "throughput"):
+            socket_write_policy = "interactive"
 
         return cls(
             geometry=_valid_geometry(data.get("geometry")),
@@ -234,6 +253,31 @@ class AppSettings:
             trim_batch_lines=_integer(
                 data.get("trim_batch_lines"), 800, minimum=1, maximum=10_000_000
             ),
+            receive_flush_interval_ms=_integer(
+                data.get("receive_flush_interval_ms"), 16, minimum=1, maximum=1000
+            ),
+            write_pacing=write_pacing,
+            write_pacing_bps=_integer(
+                data.get("write_pacing_bps"), 0, minimum=0, maximum=100_000_000
+            ),
+            serial_io_backend=serial_io_backend,
+            socket_write_policy=socket_write_policy,
+            terminal_scrollback_lines=_integer(
+                data.get("terminal_scrollback_lines"),
+                10_000,
+                minimum=0,
+                maximum=100_000,
+            ),
+            trim_archive_enabled=_boolean(data.get("trim_archive_enabled"), False),
+            trim_archive_segment_mb=_integer(
+                data.get("trim_archive_segment_mb"), 64, minimum=1, maximum=4096
+            ),
+            trim_retention_mb=_integer(
+                data.get("trim_retention_mb"), 0, minimum=0, maximum=10_000_000
+            ),
+            trim_retention_days=_integer(
+                data.get("trim_retention_days"), 0, minimum=0, maximum=3650
+            ),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -261,4 +305,14 @@ class AppSettings:
             "trim_enabled": self.trim_enabled,
             "max_terminal_lines": self.max_terminal_lines,
             "trim_batch_lines": self.trim_batch_lines,
+            "receive_flush_interval_ms": self.receive_flush_interval_ms,
+            "write_pacing": self.write_pacing,
+            "write_pacing_bps": self.write_pacing_bps,
+            "serial_io_backend": self.serial_io_backend,
+            "socket_write_policy": self.socket_write_policy,
+            "terminal_scrollback_lines": self.terminal_scrollback_lines,
+            "trim_archive_enabled": self.trim_archive_enabled,
+            "trim_archive_segment_mb": self.trim_archive_segment_mb,
+            "trim_retention_mb": self.trim_retention_mb,
+            "trim_retention_days": self.trim_retention_days,
         }
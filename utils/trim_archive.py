@@ -0,0 +1,383 @@
+"""
+裁剪日志压缩归档
+
+归档模式下裁剪内容按块压缩：每个块是一个独立的 gzip 成员，整段文件仍可
+直接 `zcat`；同名 `.idx` 旁路索引逐行记录块的偏移、行号和时间范围，按行号
+或时间取一小段历史时只需解压命中的块。段文件达到大小上限后轮换，目录内的
+旧日志按总大小或保存天数清理。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log.gz"
+INDEX_SUFFIX = ".idx"
+LOG_PREFIX = "trimmed_"
+
+
+@dataclass(frozen=True)
+class ArchiveRetention:
+    """归档保留策略；0 表示不限制。"""
+
+    max_total_bytes: int = 0
+    max_age_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class ArchiveBlock:
+    """索引中的一个压缩块。时间为块内内容被裁剪归档时的墙钟时间。"""
+
+    segment: Path
+    offset: int
+    size: int
+    first_line: int
+    lines: int
+    start: float
+    end: float
+
+
+def _open_append(path: Path) -> int:
+    flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+    flags |= getattr(os, "O_NOFOLLOW", 0)
+    return os.open(path, flags, 0o600)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _log_group(path: Path) -> str:
+    """同一段的 .log.gz 与 .idx 属于一组，清理时一起删除。"""
+    name = path.name
+    for suffix in (SEGMENT_SUFFIX, INDEX_SUFFIX, ".log"):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def enforce_retention(
+    directory: Path,
+    retention: ArchiveRetention,
+    keep: Iterable[str] = (),
+    now: Optional[float] = None,
+) -> list[Path]:
+    """按保存时间和总大小删除最旧的裁剪日志，返回被删除的文件。
+
+    `keep` 中的分组（正在写入的段）永远不删，但计入总大小。
+    """
+    if not retention.max_total_bytes and not retention.max_age_seconds:
+        return []
+    now = time.time() if now is None else now
+    keep = set(keep)
+
+    groups: dict[str, list[tuple[Path, os.stat_result]]] = {}
+    try:
+        candidates = list(directory.glob(f"{LOG_PREFIX}*"))
+    except OSError as e:
+        logger.warning("Failed to list trim logs: %s", e)
+        return []
+    for path in candidates:
+        try:
+            st = path.lstat()
+        except OSError:
+            continue
+        if path.is_symlink() or not path.is_file():
+            continue
+        groups.setdefault(_log_group(path), []).append((path, st))
+
+    ordered = sorted(
+        groups.items(), key=lambda item: max(st.st_mtime for _, st in item[1])
+    )
+    total = sum(st.st_size for _, files in ordered for _, st in files)
+    removed: list[Path] = []
+    for name, files in ordered:
+        if name in keep:
+            continue
+        newest = max(st.st_mtime for _, st in files)
+        expired = (
+            retention.max_age_seconds
+            and now - newest > retention.max_age_seconds
+        )
+        oversize = retention.max_total_bytes and total > retention.max_total_bytes
+        if not expired and not oversize:
+            continue
+        for path, st in files:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning("Failed to remove trim log %s: %s", path, e)
+                continue
+            total -= st.st_size
+            removed.append(path)
+    return removed
+
+
+class TrimArchiveSink:
+    """TrimLogWriter 的归档输出端，只在写入线程里调用。
+
+    写入的文本先在内存里攒成块，满 `block_bytes` 或块内最早的文本超过
+    `BLOCK_MAX_AGE` 秒后压缩成一个 gzip 成员追加到当前段，再把块信息
+    追加到索引。调用方保证每次写入的文本以换行结尾，块边界总落在行尾。
+
+    目录里已有同名归档（同一会话内关闭后重新开启归档）时，接着最后一段
+    追加，行号从索引末尾继续。
+    """
+
+    DEFAULT_BLOCK_BYTES = 256 * 1024
+    DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+    BLOCK_MAX_AGE = 10.0
+    COMPRESS_LEVEL = 6
+
+    def __init__(
+        self,
+        directory: Path,
+        stem: str,
+        block_bytes: int = DEFAULT_BLOCK_BYTES,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        retention: ArchiveRetention = ArchiveRetention(),
+    ) -> None:
+        self.directory = Path(directory)
+        self.stem = stem
+        self.block_bytes = max(1, int(block_bytes))
+        self.segment_bytes = max(1, int(segment_bytes))
+        self.retention = retention
+
+        self._seq = 0
+        self._segment_fd: Optional[int] = None
+        self._index_fd: Optional[int] = None
+        self._segment_size = 0
+        self._next_line = 0
+
+        self._buffer: list[bytes] = []
+        self._buffered = 0
+        self._buffered_lines = 0
+        self._block_start = 0.0
+        self._block_end = 0.0
+        self._block_opened = 0.0
+        self._retention_checked = False
+
+    @property
+    def segment_path(self) -> Path:
+        return self.directory / f"{self.stem}.{self._seq:04d}{SEGMENT_SUFFIX}"
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / f"{self.stem}.{self._seq:04d}{INDEX_SUFFIX}"
+
+    def open(self) -> None:
+        self._resume()
+        self._open_segment()
+        if self._segment_size >= self.segment_bytes:
+            self._rotate()
+
+    def write(self, chunks: list[tuple[str, float]]) -> None:
+        for text, stamp in chunks:
+            if not self._buffer:
+                self._block_start = stamp
+                self._block_opened = time.monotonic()
+            self._block_end = stamp
+            data = text.encode("utf-8", errors="replace")
+            self._buffer.append(data)
+            self._buffered += len(data)
+            self._buffered_lines += text.count("\n")
+            if self._buffered >= self.block_bytes:
+                self._emit_block()
+
+    def sync(self, force: bool = False) -> Optional[float]:
+        if self._buffer and (force or self._block_due_in() <= 0):
+            self._emit_block()
+        for fd in (self._segment_fd, self._index_fd):
+            if fd is not None:
+                os.fsync(fd)
+        return self._block_due_in() if self._buffer else None
+
+    def _block_due_in(self) -> float:
+        return self.BLOCK_MAX_AGE - (time.monotonic() - self._block_opened)
+
+    def close(self) -> None:
+        try:
+            if self._buffer:
+                self._emit_block()
+        finally:
+            self._close_segment()
+
+    def _resume(self) -> None:
+        segments = list_segments(self.directory, self.stem)
+        if not segments:
+            return
+        self._seq = _segment_seq(segments[-1], self.stem)
+        for segment in reversed(segments):
+            blocks = load_index(segment)
+            if blocks:
+                self._next_line = blocks[-1].first_line + blocks[-1].lines
+                return
+
+    def _open_segment(self) -> None:
+        segment_fd = _open_append(self.segment_path)
+        try:
+            index_fd = _open_append(self.index_path)
+        except OSError:
+            os.close(segment_fd)
+            raise
+        self._segment_fd = segment_fd
+        self._index_fd = index_fd
+        self._segment_size = os.fstat(segment_fd).st_size
+
+    def _close_segment(self) -> None:
+        for fd in (self._segment_fd, self._index_fd):
+            if fd is not None:
+                os.close(fd)
+        self._segment_fd = None
+        self._index_fd = None
+
+    def _emit_block(self) -> None:
+        if self._segment_fd is None or self._index_fd is None:
+            raise OSError("trim archive segment is not open")
+        payload = gzip.compress(
+            b"".join(self._buffer),
+            compresslevel=self.COMPRESS_LEVEL,
+            mtime=int(self._block_start),
+        )
+        offset = self._segment_size
+        _write_all(self._segment_fd, payload)
+        entry = {
+            "offset": offset,
+            "size": len(payload),
+            "first_line": self._next_line,
+            "lines": self._buffered_lines,
+            "start": round(self._block_start, 3),
+            "end": round(self._block_end, 3),
+        }
+        _write_all(self._index_fd, (json.dumps(entry) + "\n").encode("ascii"))
+        self._segment_size += len(payload)
+        self._next_line += self._buffered_lines
+
+        self._buffer = []
+        self._buffered = 0
+        self._buffered_lines = 0
+
+        if self._segment_size >= self.segment_bytes:
+            self._rotate()
+        elif not self._retention_checked:
+            self._enforce_retention()
+
+    def _enforce_retention(self) -> None:
+        self._retention_checked = True
+        enforce_retention(
+            self.directory, self.retention, keep=(_log_group(self.segment_path),)
+        )
+
+    def _rotate(self) -> None:
+        self._close_segment()
+        self._seq += 1
+        self._open_segment()
+        self._enforce_retention()
+
+
+# ── 读取 ─────────────────────────────────────────────────
+
+
+def _segment_seq(segment: Path, stem: str) -> int:
+    try:
+        return int(segment.name[len(stem) + 1 : -len(SEGMENT_SUFFIX)])
+    except ValueError:
+        return -1
+
+
+def list_segments(directory: Path, stem: str) -> list[Path]:
+    """某个会话的全部归档段，按序号排列。"""
+    segments = Path(directory).glob(f"{stem}.*{SEGMENT_SUFFIX}")
+    return sorted(
+        (s for s in segments if _segment_seq(s, stem) >= 0),
+        key=lambda s: _segment_seq(s, stem),
+    )
+
+
+def load_index(segment: Path) -> list[ArchiveBlock]:
+    """读取段的旁路索引；末尾未写完的行直接忽略。"""
+    index_path = segment.with_name(_log_group(segment) + INDEX_SUFFIX)
+    blocks: list[ArchiveBlock] = []
+    try:
+        with open(index_path, encoding="ascii") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    blocks.append(
+                        ArchiveBlock(
+                            segment=segment,
+                            offset=int(entry["offset"]),
+                            size=int(entry["size"]),
+                            first_line=int(entry["first_line"]),
+                            lines=int(entry["lines"]),
+                            start=float(entry["start"]),
+                            end=float(entry["end"]),
+                        )
+                    )
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError as e:
+        logger.warning("Failed to read trim archive index %s: %s", index_path, e)
+    return blocks
+
+
+def read_block(block: ArchiveBlock) -> str:
+    """只解压一个块。"""
+    with open(block.segment, "rb") as f:
+        f.seek(block.offset)
+        payload = f.read(block.size)
+    return gzip.decompress(payload).decode("utf-8", errors="replace")
+
+
+def _block_lines(text: str) -> list[str]:
+    """只按换行符切行并去掉末尾的空段。
+
+    索引按换行符计行数；splitlines 还会在回车、换页、行分隔符等字符处断行，
+    设备输出里出现这些字符时后面的行号会整体错位。
+    """
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _blocks(segments: Iterable[Path]) -> list[ArchiveBlock]:
+    return [block for segment in segments for block in load_index(segment)]
+
+
+def extract_lines(segments: Iterable[Path], first_line: int, count: int) -> list[str]:
+    """按会话内行号（从 0 开始）取出 [first_line, first_line + count) 行。"""
+    last_line = first_line + count
+    lines: list[str] = []
+    for block in _blocks(segments):
+        block_end = block.first_line + block.lines
+        if block_end <= first_line or block.first_line >= last_line:
+            continue
+        block_lines = _block_lines(read_block(block))
+        lo = max(first_line - block.first_line, 0)
+        hi = min(last_line - block.first_line, len(block_lines))
+        lines.extend(block_lines[lo:hi])
+    return lines
+
+
+def extract_time_range(segments: Iterable[Path], start: float, end: float) -> list[str]:
+    """取出归档时间与 [start, end] 相交的块中的全部行（块粒度）。"""
+    lines: list[str] = []
+    for block in _blocks(segments):
+        if block.end < start or block.start > end:
+            continue
+        lines.extend(_block_lines(read_block(block)))
+    return lines
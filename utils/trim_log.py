@@ -0,0 +1,232 @@
+"""
+裁剪日志后台写入
+
+日志视图裁剪下来的旧内容写入会话日志文件。写盘放在专用线程里，GUI 线程
+只负责把文本放进有界队列，慢速或网络挂载的临时目录不会卡住界面。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Protocol, Union
+
+from utils.writer_loop import FLUSH, FlushRequest, run_writer_loop
+
+logger = logging.getLogger(__name__)
+
+
+class TrimLogSink(Protocol):
+    """写入线程的输出端。open 在调用方线程执行，其余方法只在写入线程调用。"""
+
+    def open(self) -> None: ...
+
+    def write(self, chunks: list[tuple[str, float]]) -> None: ...
+
+    def sync(self, force: bool = False) -> Optional[float]:
+        """落盘；返回内存中未写出的块还有几秒到期，没有缓冲时返回 None。"""
+        ...
+
+    def close(self) -> None: ...
+
+
+class PlainLogSink:
+    """按 UTF-8 纯文本追加到单个日志文件。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def open(self) -> None:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        flags |= getattr(os, "O_NOFOLLOW", 0)
+        self._fd = os.open(self.path, flags, 0o600)
+
+    def write(self, chunks: list[tuple[str, float]]) -> None:
+        if self._fd is None:
+            raise OSError("trim log is not open")
+        data = "".join(text for text, _stamp in chunks).encode(
+            "utf-8", errors="replace"
+        )
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view) :]
+
+    def sync(self, force: bool = False) -> Optional[float]:
+        if self._fd is not None:
+            os.fsync(self._fd)
+        return None
+
+    def close(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+
+
+_QueueItem = Union[tuple[str, float], FlushRequest, None]
+
+
+class TrimLogWriter:
+    """单个会话日志文件的后台写入器。
+
+    文件在 `open()` 时打开一次（拒绝符号链接），之后整个会话复用同一个
+    输出端（默认纯文本，归档模式为压缩分段）。`submit()` 不做任何磁盘
+    操作：待写数据量（按字符计）超过上限时直接返回 False，由调用方决定
+    稍后重试。写入线程每次唤醒把队列里的文本合并成一次 write，并至多每
+    `flush_interval` 秒 fsync 一次；输出端还缓冲着未满的块时，即使没有
+    新数据也会在块到期时唤醒写出。
+    """
+
+    DEFAULT_MAX_PENDING_BYTES = 8 * 1024 * 1024
+    DEFAULT_FLUSH_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path: Path,
+        max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        sink: Optional[TrimLogSink] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.sink: TrimLogSink = sink if sink is not None else PlainLogSink(path)
+        self.max_pending_bytes = max(1, int(max_pending_bytes))
+        self.flush_interval = max(0.01, float(flush_interval))
+
+        self._queue: queue.Queue[_QueueItem] = queue.Queue()
+        self._lock = threading.Lock()
+        self._written_cond = threading.Condition(self._lock)
+        self._pending_bytes = 0
+        self._submitted = 0
+        self._written = 0
+        self._opened = False
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.error: Optional[OSError] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened and not self._closed
+
+    @property
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return self._pending_bytes
+
+    def open(self) -> bool:
+        """打开日志文件并启动写入线程。失败时返回 False，可稍后重试。"""
+        if self.is_open:
+            return True
+        if self._closed:
+            return False
+        try:
+            self.sink.open()
+        except OSError as e:
+            logger.warning("Failed to open trim log: %s", e)
+            return False
+        self._opened = True
+        self._thread = threading.Thread(
+            target=self._run, name="TrimLogWriter", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def submit(self, text: str) -> bool:
+        """把文本交给写入线程。未打开、已出错或队列已满时返回 False。"""
+        if not text:
+            return True
+        if not self.is_open or self.error is not None:
+            return False
+        size = len(text)
+        with self._lock:
+            # 队列为空时总是接受，避免单批超过上限后永远写不进去
+            pending = self._pending_bytes
+            if pending and pending + size > self.max_pending_bytes:
+                return False
+            self._pending_bytes += size
+            self._submitted += 1
+        self._queue.put((text, time.time()))
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待此前提交的文本全部写入文件（含归档中未满的块）。超时返回 False。"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._written_cond:
+            if self.is_open:
+                self._submitted += 1
+                self._queue.put(FLUSH)
+            target = self._submitted
+            while self._written < target:
+                if self.error is not None or self._thread is None:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._written_cond.wait(remaining)
+        return self.error is None
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """写完队列中的内容后关闭文件。线程未在超时内退出时返回 False。
+
+        可重复调用：已关闭但线程仍在写的写入器会继续等待它退出。
+        """
+        thread = self._thread
+        if not self._closed:
+            self._closed = True
+            if thread is not None:
+                self._queue.put(None)
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run(self) -> None:
+        run_writer_loop(
+            self._queue,
+            self.flush_interval,
+            self._write_batch,
+            self._sync,
+            self._flushed,
+        )
+        try:
+            self.sink.close()
+        except OSError as e:
+            self.error = self.error or e
+            logger.warning("Failed to close trim log: %s", e)
+        with self._written_cond:
+            self._written_cond.notify_all()
+
+    def _write_batch(self, batch: list[tuple[str, float]]) -> None:
+        if self.error is None:
+            try:
+                self.sink.write(batch)
+            except OSError as e:
+                self.error = e
+                logger.warning("Failed to write trim log: %s", e)
+        with self._written_cond:
+            self._pending_bytes -= sum(len(text) for text, _stamp in batch)
+            self._written += len(batch)
+            self._written_cond.notify_all()
+
+    def _flushed(self, flushes: int) -> None:
+        with self._written_cond:
+            self._written += flushes
+            self._written_cond.notify_all()
+
+    def _sync(self, force: bool) -> Optional[float]:
+        """落盘；返回输出端缓冲块到期的单调时钟时刻。"""
+        if self.error is not None:
+            return None
+        try:
+            due_in = self.sink.sync(force)
+        except OSError as e:
+            # 归档输出端在 sync 时可能还要写出未满的块
+            self.error = e
+            logger.warning("Failed to sync trim log: %s", e)
+            return None
+        return None if due_in is None else time.monotonic() + due_in
@@ -0,0 +1,83 @@
+"""
+后台写入线程的公共循环
+
+裁剪日志写入器和会话录制器都由一个线程消费队列：把同一次唤醒取到的数据
+合并成一批写出，至多每 `flush_interval` 秒落盘一次，响应显式刷新请求，
+收到 None 后退出。输出端在内存里攒块时，`sync` 返回块的到期时刻，循环
+按它设置队列等待的超时，链路空闲时未满的块也能按时写出。
+
+Copyright (C) 2026 cpevor. Licensed under GPL v3.
+"""
+
+from __future__ import annotations
+
+import queue
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class FlushRequest:
+    """队列中的显式刷新标记。"""
+
+
+FLUSH = FlushRequest()
+
+
+def run_writer_loop(
+    items: queue.Queue[Any],
+    flush_interval: float,
+    write: Callable[[list[T]], None],
+    sync: Callable[[bool], Optional[float]],
+    flushed: Callable[[int], None],
+) -> None:
+    """在写入线程里运行，直到从队列取到 None。
+
+    `write(batch)` 写出一批数据项；`sync(force)` 落盘并返回输出端缓冲块
+    到期的单调时钟时刻，没有缓冲时返回 None；`flushed(n)` 在处理完 n 个
+    `FLUSH` 标记（且已强制落盘）后调用。
+    """
+    last_sync = time.monotonic()
+    dirty = False
+    block_due: Optional[float] = None
+    stop = False
+    while not stop:
+        timeout = flush_interval
+        if block_due is not None:
+            timeout = max(0.0, min(timeout, block_due - time.monotonic()))
+        try:
+            item = items.get(timeout=timeout)
+        except queue.Empty:
+            now = time.monotonic()
+            if dirty or (block_due is not None and now >= block_due):
+                block_due = sync(False)
+                dirty = False
+                last_sync = time.monotonic()
+            continue
+
+        batch: list[T] = []
+        flushes = 0
+        while True:
+            if item is None:
+                stop = True
+            elif item is FLUSH:
+                flushes += 1
+            else:
+                batch.append(item)
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                break
+
+        if batch:
+            write(batch)
+            dirty = True
+        now = time.monotonic()
+        due = dirty and (stop or now - last_sync >= flush_interval)
+        if flushes or due:
+            block_due = sync(bool(flushes) or stop)
+            dirty = False
+            last_sync = time.monotonic()
+        if flushes:
+            flushed(flushes)